@@ -0,0 +1,524 @@
+"""
+Parallel bulk import of the files in the bulk_import directory.
+
+Before parsing, the start coordinates of every file are read and their
+locations resolved at once into the reverse geocoding cache, so the parsers do
+not request the same location from the provider once per file. The prefill
+stops after LOCATION_PREFILL_MAX_SECONDS, the parsers resolve the remaining
+locations in parallel.
+
+Files are parsed in a process pool sized by BULK_IMPORT_WORKERS. Parsed
+activities are funnelled back to a single writer, running in the calling
+thread, that owns the only database session used to store them.
+"""
+
+import asyncio
+import gzip
+import multiprocessing
+import os
+import xml.etree.ElementTree as ElementTree
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import fitdecode
+
+import activities.activity.utils as activities_utils
+
+import geocoding.utils as geocoding_utils
+
+import websocket.schema as websocket_schema
+import websocket.utils as websocket_utils
+
+import core.config as core_config
+import core.database as core_database
+import core.logger as core_logger
+
+# WebSocket messages sent to the frontend
+BULK_IMPORT_PROGRESS_MESSAGE = "BULK_IMPORT_PROGRESS"
+BULK_IMPORT_COMPLETED_MESSAGE = "BULK_IMPORT_COMPLETED"
+
+# Files queued per parser process, bounds the parsed data held in memory
+FILES_IN_FLIGHT_PER_WORKER = 2
+
+# Seconds the import waits for the reverse geocoding prefill at most
+LOCATION_PREFILL_MAX_SECONDS = 60
+
+# FIT positions are stored in semicircles
+FIT_SEMICIRCLES_TO_DEGREES = 180 / 2**31
+
+
+def _init_parser_process(workers: int) -> None:
+    """
+    Initialize a bulk import parser process.
+
+    Args:
+        workers: Number of parser processes in the pool.
+    """
+    core_logger.setup_main_logger()
+
+    # Each process throttles its own reverse geocoding requests, spread the
+    # configured rate limit across all of them
+    core_config.REVERSE_GEO_MIN_INTERVAL = (
+        core_config.REVERSE_GEO_MIN_INTERVAL * workers
+    )
+
+
+def parse_file_in_process(
+    user_id: int, file_path: str
+) -> tuple[str, str, list[dict]] | None:
+    """
+    Parse a bulk import file inside a parser process.
+
+    Args:
+        user_id: ID of the user importing the file.
+        file_path: Path of the file to parse.
+
+    Returns:
+        The result of activities_utils.parse_activity_file.
+
+    Raises:
+        RuntimeError: If the file could not be parsed. Parser exceptions are
+            converted so they can be sent back to the writer process.
+    """
+    db = core_database.SessionLocal()
+    try:
+        return activities_utils.parse_activity_file(user_id, file_path, db)
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Bulk file import: Error while parsing {file_path} - {str(err)}",
+            "error",
+            exc=err,
+        )
+        raise RuntimeError(str(getattr(err, "detail", err))) from None
+    finally:
+        db.close()
+
+
+def _xml_local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _read_xml_start_coordinates(file) -> tuple[float, float] | None:
+    """
+    Read the first track point coordinates of a GPX or TCX file.
+
+    Parsing stops at the first position, only the file head is held in memory.
+    """
+    for _, element in ElementTree.iterparse(file, events=("end",)):
+        name = _xml_local_name(element.tag)
+        if name == "trkpt":
+            # GPX track point, coordinates are attributes
+            return float(element.get("lat")), float(element.get("lon"))
+        if name == "Position":
+            # TCX track point position, coordinates are child elements
+            values = {_xml_local_name(child.tag): child.text for child in element}
+            if values.get("LatitudeDegrees") and values.get("LongitudeDegrees"):
+                return (
+                    float(values["LatitudeDegrees"]),
+                    float(values["LongitudeDegrees"]),
+                )
+    return None
+
+
+def _read_fit_start_coordinates(file) -> tuple[float, float] | None:
+    """
+    Read the first record position of a FIT file.
+    """
+    with fitdecode.FitReader(file) as fit_file:
+        for frame in fit_file:
+            if (
+                not isinstance(frame, fitdecode.FitDataMessage)
+                or frame.name != "record"
+            ):
+                continue
+            latitude = frame.get_value("position_lat", fallback=None)
+            longitude = frame.get_value("position_long", fallback=None)
+            if latitude is not None and longitude is not None:
+                return (
+                    latitude * FIT_SEMICIRCLES_TO_DEGREES,
+                    longitude * FIT_SEMICIRCLES_TO_DEGREES,
+                )
+    return None
+
+
+def read_start_coordinates(file_path: str) -> tuple[float, float] | None:
+    """
+    Read the start coordinates of an activity file without parsing it.
+
+    Only the file head is read, up to the first track point with a position.
+
+    Args:
+        file_path: Path of a FIT, GPX or TCX file, optionally gzipped.
+
+    Returns:
+        Tuple of (latitude, longitude), or None if the file has no position
+        or cannot be read. Parsing errors are reported by the parsers.
+    """
+    path = Path(file_path)
+    gzipped = path.suffix.lower() == ".gz"
+    file_extension = Path(path.stem).suffix if gzipped else path.suffix
+
+    try:
+        with gzip.open(path) if gzipped else open(path, "rb") as file:
+            if file_extension.lower() == ".fit":
+                return _read_fit_start_coordinates(file)
+            if file_extension.lower() in (".gpx", ".tcx"):
+                return _read_xml_start_coordinates(file)
+    except Exception:
+        return None
+    return None
+
+
+def prefill_import_locations(file_paths: list[str]) -> None:
+    """
+    Resolve the start locations of the files into the reverse geocoding cache.
+
+    The parser processes then read them from the database cache.
+
+    Args:
+        file_paths: Paths of the files to import.
+    """
+    try:
+        coordinates = [
+            coordinate
+            for coordinate in map(read_start_coordinates, file_paths)
+            if coordinate is not None
+        ]
+        fetched_cells = geocoding_utils.prefill_location_cache(
+            coordinates, LOCATION_PREFILL_MAX_SECONDS
+        )
+        core_logger.print_to_log(
+            f"Bulk file import: Prefilled the locations of {len(coordinates)} "
+            f"files, {fetched_cells} requested from the provider"
+        )
+    except Exception as err:
+        # The parsers resolve the locations themselves
+        core_logger.print_to_log(
+            f"Bulk file import: Unable to prefill the locations: {err}",
+            "warning",
+            exc=err,
+        )
+
+
+def _notify_progress(
+    user_id: int,
+    websocket_manager: websocket_schema.WebSocketManager,
+    event_loop: asyncio.AbstractEventLoop | None,
+    json_data: dict,
+) -> None:
+    """
+    Send a bulk import progress message to the user, if connected.
+
+    Args:
+        user_id: ID of the user importing the files.
+        websocket_manager: WebSocket manager holding the user connection.
+        event_loop: Event loop that owns the WebSocket connections.
+        json_data: Message to send.
+    """
+    if event_loop is None or event_loop.is_closed():
+        return
+
+    try:
+        asyncio.run_coroutine_threadsafe(
+            websocket_utils.notify_frontend(user_id, websocket_manager, json_data),
+            event_loop,
+        )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Bulk file import: Unable to send progress to user {user_id}: {err}",
+            "warning",
+        )
+
+
+class _BulkImportWriter:
+    """
+    Single writer that stores parsed files in batches and reports progress.
+
+    Attributes:
+        user_id: ID of the user importing the files.
+        total_files: Number of files in the import.
+        processed_files: Number of files stored successfully.
+        failed_files: Names of the files that failed to import.
+        skipped_files: Names of the files without activities, left in place.
+    """
+
+    def __init__(
+        self,
+        user_id: int,
+        total_files: int,
+        websocket_manager: websocket_schema.WebSocketManager,
+        event_loop: asyncio.AbstractEventLoop | None,
+    ):
+        self.user_id = user_id
+        self.total_files = total_files
+        self.processed_files = 0
+        self.failed_files: list[str] = []
+        self.skipped_files: list[str] = []
+        self._websocket_manager = websocket_manager
+        self._event_loop = event_loop
+        self._pending: list[tuple[str, tuple[str, str, list[dict]]]] = []
+        self._db = core_database.SessionLocal()
+
+    def add(self, original_path: str, parsed_file) -> None:
+        """
+        Queue a parsed file for storage, flushing when the batch is full.
+
+        Args:
+            original_path: Path of the file in the bulk_import directory.
+            parsed_file: Result of parse_file_in_process.
+        """
+        if parsed_file is None:
+            core_logger.print_to_log(
+                f"Bulk file import: No activity parsed from {original_path}, skipping",
+                "warning",
+            )
+            self.report(original_path, None, skipped=True)
+            return
+
+        self._pending.append((original_path, parsed_file))
+        if len(self._pending) >= core_config.BULK_IMPORT_WRITE_BATCH_SIZE:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Store every queued file using the writer session.
+        """
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        asyncio.run(self._store_batch(pending))
+
+    async def _store_batch(
+        self, pending: list[tuple[str, tuple[str, str, list[dict]]]]
+    ) -> None:
+        for original_path, (file_path, file_extension, parsed_activities) in pending:
+            try:
+                created_activities = await activities_utils.store_parsed_activities(
+                    parsed_activities,
+                    file_path,
+                    file_extension,
+                    self._websocket_manager,
+                    self._db,
+                )
+            except Exception as err:
+                core_logger.print_to_log(
+                    f"Bulk file import: Error while storing {original_path} - {str(err)}",
+                    "error",
+                    exc=err,
+                )
+                activities_utils.move_file_to_import_errors(file_path)
+                self.report(original_path, str(getattr(err, "detail", err)))
+                continue
+
+            self.report(
+                original_path,
+                None,
+                [activity.id for activity in created_activities],
+            )
+
+    def report(
+        self,
+        original_path: str,
+        error: str | None,
+        activity_ids: list[int] | None = None,
+        skipped: bool = False,
+    ) -> None:
+        """
+        Record the outcome of a file and notify the user.
+
+        Args:
+            original_path: Path of the file in the bulk_import directory.
+            error: Error message if the file failed, otherwise None.
+            activity_ids: IDs of the activities created from the file.
+            skipped: Whether no activity was parsed from the file.
+        """
+        file_name = os.path.basename(original_path)
+        if skipped:
+            self.skipped_files.append(file_name)
+            file_status = "skipped"
+        elif error is None:
+            self.processed_files += 1
+            file_status = "processed"
+        else:
+            self.failed_files.append(file_name)
+            file_status = "failed"
+
+        _notify_progress(
+            self.user_id,
+            self._websocket_manager,
+            self._event_loop,
+            {
+                "message": BULK_IMPORT_PROGRESS_MESSAGE,
+                "file": file_name,
+                "status": file_status,
+                "error": error,
+                "activity_ids": activity_ids or [],
+                "processed": self.processed_files,
+                "failed": len(self.failed_files),
+                "skipped": len(self.skipped_files),
+                "total": self.total_files,
+            },
+        )
+
+    def close(self) -> None:
+        """
+        Store any remaining files and release the writer session.
+        """
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+
+def import_files(
+    user_id: int,
+    file_paths: list[str],
+    websocket_manager: websocket_schema.WebSocketManager,
+    event_loop: asyncio.AbstractEventLoop | None = None,
+) -> None:
+    """
+    Parse files in parallel and store them through a single writer.
+
+    Intended to run in a background thread. Files that fail to parse or store
+    are moved to the import errors directory and can be retried with
+    get_import_error_files.
+
+    Args:
+        user_id: ID of the user importing the files.
+        file_paths: Paths of the files to import.
+        websocket_manager: WebSocket manager used for progress notifications.
+        event_loop: Event loop that owns the WebSocket connections.
+    """
+    total_files = len(file_paths)
+    workers = max(1, min(core_config.BULK_IMPORT_WORKERS, total_files))
+    writer = _BulkImportWriter(user_id, total_files, websocket_manager, event_loop)
+
+    core_logger.print_to_log_and_console(
+        f"Bulk import started: {total_files} files for user {user_id} using {workers} parser processes"
+    )
+
+    prefill_import_locations(file_paths)
+
+    try:
+        # Spawn fresh interpreters, forking would share the parent DB connections
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_parser_process,
+            initargs=(workers,),
+        ) as pool:
+            queued_files = iter(file_paths)
+            in_flight: dict[Future, str] = {}
+
+            def submit_next() -> bool:
+                file_path = next(queued_files, None)
+                if file_path is None:
+                    return False
+                in_flight[pool.submit(parse_file_in_process, user_id, file_path)] = (
+                    file_path
+                )
+                return True
+
+            for _ in range(workers * FILES_IN_FLIGHT_PER_WORKER):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    submit_next()
+                    try:
+                        parsed_file = future.result()
+                    except Exception as err:
+                        activities_utils.move_file_to_import_errors(file_path)
+                        writer.report(file_path, str(err))
+                        continue
+
+                    writer.add(file_path, parsed_file)
+    finally:
+        writer.close()
+
+    core_logger.print_to_log_and_console(
+        f"Bulk import completed: {writer.processed_files}/{total_files} files "
+        f"processed for user {user_id}, {len(writer.failed_files)} failed, "
+        f"{len(writer.skipped_files)} skipped"
+    )
+
+    _notify_progress(
+        user_id,
+        websocket_manager,
+        event_loop,
+        {
+            "message": BULK_IMPORT_COMPLETED_MESSAGE,
+            "processed": writer.processed_files,
+            "failed": len(writer.failed_files),
+            "failed_files": writer.failed_files,
+            "skipped": len(writer.skipped_files),
+            "skipped_files": writer.skipped_files,
+            "total": total_files,
+        },
+    )
+
+
+def get_import_files(directory: str, file_names: list[str] | None = None) -> list[str]:
+    """
+    List the supported files of a directory that can be imported.
+
+    Args:
+        directory: Directory to scan.
+        file_names: Optional file names to restrict the list to.
+
+    Returns:
+        List of file paths with a supported extension.
+    """
+    os.makedirs(directory, exist_ok=True)
+
+    files_to_process = []
+    for filename in sorted(os.listdir(directory)):
+        if file_names is not None and filename not in file_names:
+            continue
+
+        file_path = os.path.join(directory, filename)
+
+        # Check if file is one we can process
+        _, file_extension = os.path.splitext(file_path)
+        if file_extension not in core_config.SUPPORTED_FILE_FORMATS:
+            core_logger.print_to_log_and_console(
+                f"Skipping file {file_path} due to not having a supported file extension. Supported extensions are: {core_config.SUPPORTED_FILE_FORMATS}."
+            )
+            continue
+
+        if os.path.isfile(file_path):
+            files_to_process.append(file_path)
+            # Log the file being processed
+            core_logger.print_to_log_and_console(
+                f"Queuing file for processing: {file_path}"
+            )
+
+    return files_to_process
+
+
+def get_import_error_files(file_names: list[str] | None = None) -> list[str]:
+    """
+    Move files from the import errors directory back into the bulk_import directory.
+
+    Args:
+        file_names: Optional file names to retry, all failed files if None.
+
+    Returns:
+        List of file paths ready to be imported again.
+    """
+    retry_files = []
+    for file_path in get_import_files(
+        core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR, file_names
+    ):
+        activities_utils.move_file(
+            core_config.FILES_BULK_IMPORT_DIR, os.path.basename(file_path), file_path
+        )
+        retry_files.append(
+            os.path.join(core_config.FILES_BULK_IMPORT_DIR, os.path.basename(file_path))
+        )
+
+    return retry_files
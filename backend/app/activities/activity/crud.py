@@ -1,13 +1,17 @@
-from datetime import date, datetime
-from urllib.parse import unquote
+from collections.abc import Callable
+from datetime import date, datetime, time, timedelta
 
 import activities.activity.models as activities_models
 import activities.activity.schema as activities_schema
+import activities.activity.search as activities_search
 import activities.activity.utils as activities_utils
 
+import activities.activity_summaries.utils as activity_summaries_utils
+
 import followers.models as followers_models
 
 import core.logger as core_logger
+import core.pagination as core_pagination
 
 import notifications.utils as notifications_utils
 
@@ -20,6 +24,54 @@ from pydantic import BaseModel
 from sqlalchemy import and_, desc, func, or_
 from sqlalchemy.orm import Session, joinedload
 
+# Activities start times are stored in UTC, local dates span from UTC-12 to UTC+14
+LOCAL_DATE_MAX_UTC_OFFSET_BEHIND = timedelta(hours=12)
+LOCAL_DATE_MAX_UTC_OFFSET_AHEAD = timedelta(hours=14)
+
+
+def start_date_filters(start_date: date | None, end_date: date | None) -> list:
+    """
+    Build the filters selecting activities whose start date, in the activity
+    timezone, is between start_date and end_date, both inclusive.
+
+    The UTC range widened by the largest offsets leaves start_time unwrapped,
+    so Postgres can use the (user_id, start_time) indexes; the local date is
+    only checked on the rows of that range.
+
+    Args:
+        start_date: First local date, no lower bound if None.
+        end_date: Last local date, no upper bound if None.
+
+    Returns:
+        The filters to apply to the Activity query.
+    """
+    local_start_time = activity_summaries_utils.local_start_time(
+        activities_models.Activity
+    )
+    filters = []
+
+    if start_date:
+        if isinstance(start_date, datetime):
+            start_date = start_date.date()
+        start = datetime.combine(start_date, time.min)
+        filters += [
+            activities_models.Activity.start_time
+            >= start - LOCAL_DATE_MAX_UTC_OFFSET_AHEAD,
+            local_start_time >= start,
+        ]
+
+    if end_date:
+        if isinstance(end_date, datetime):
+            end_date = end_date.date()
+        end = datetime.combine(end_date + timedelta(days=1), time.min)
+        filters += [
+            activities_models.Activity.start_time
+            < end + LOCAL_DATE_MAX_UTC_OFFSET_BEHIND,
+            local_start_time < end,
+        ]
+
+    return filters
+
 
 def get_all_activities(db: Session):
     try:
@@ -93,38 +145,13 @@ def get_user_activities(
                 activities_models.Activity.activity_type == activity_type
             )
 
-        if start_date:
-            # add filter for start date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) >= start_date
-            )
-
-        if end_date:
-            # add filter for end date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) <= end_date
-            )
+        if start_date or end_date:
+            # add filters for the start and end dates
+            query = query.filter(*start_date_filters(start_date, end_date))
 
         if name_search:
-            # Decode and prepare search term
-            search_term = unquote(name_search).replace("+", " ").lower()
             # Apply search across name, town, city, and country
-            query = query.filter(
-                or_(
-                    func.lower(activities_models.Activity.name).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.town).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.city).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.country).like(
-                        f"%{search_term}%"
-                    ),
-                )
-            )
+            query = query.filter(activities_search.search_filter(name_search))
 
         # Apply sorting
         query = query.order_by(desc(activities_models.Activity.start_time))
@@ -221,6 +248,132 @@ def get_user_activities_by_user_id_and_garminconnect_gear_set(
         ) from err
 
 
+# Sortable columns of the activity lists, nullable numeric columns are sorted
+# with nulls as the lowest value
+ACTIVITIES_SORT_MAP = {
+    "type": activities_models.Activity.activity_type,
+    "name": func.coalesce(activities_models.Activity.name, ""),
+    "start_time": activities_models.Activity.start_time,
+    "duration": activities_models.Activity.total_timer_time,
+    "distance": activities_models.Activity.distance,
+    "calories": func.coalesce(activities_models.Activity.calories, -999999),
+    "elevation": func.coalesce(activities_models.Activity.elevation_gain, -999999),
+    "pace": func.coalesce(activities_models.Activity.pace, -999999),
+    "average_hr": func.coalesce(activities_models.Activity.average_hr, -999999),
+    # Sort by country, then city, then town
+    "location": (
+        func.coalesce(activities_models.Activity.country, ""),
+        func.coalesce(activities_models.Activity.city, ""),
+        func.coalesce(activities_models.Activity.town, ""),
+    ),
+}
+
+
+def get_activities_sort_keys(
+    sort_by: str | None, sort_order: str | None
+) -> tuple[str, list, bool]:
+    """
+    Resolve the sort of the activity lists.
+
+    Args:
+        sort_by: Key of ACTIVITIES_SORT_MAP, start_time if None or unknown.
+        sort_order: "asc" or "desc", descending if None.
+
+    Returns:
+        The sort name, the sort keys ending with the activity ID and whether
+        the sort is descending.
+    """
+    if sort_by not in ACTIVITIES_SORT_MAP:
+        sort_by = "start_time"
+    descending = not (sort_order and sort_order.lower() == "asc")
+
+    sort_keys = ACTIVITIES_SORT_MAP[sort_by]
+    if not isinstance(sort_keys, tuple):
+        sort_keys = (sort_keys,)
+
+    return (
+        f"{sort_by}:{'desc' if descending else 'asc'}",
+        [*sort_keys, activities_models.Activity.id],
+        descending,
+    )
+
+
+def get_user_activities_query(
+    user_id: int,
+    db: Session,
+    activity_type: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    name_search: str | None = None,
+):
+    """
+    Build the query of the user activities matching the list filters.
+
+    Args:
+        user_id: ID of the user.
+        db: Database session.
+        activity_type: Only return activities of this type.
+        start_date: Only return activities started on or after this local date.
+        end_date: Only return activities started on or before this local date.
+        name_search: Only return activities whose name or location contains it.
+
+    Returns:
+        The unordered Activity query.
+    """
+    # Base query
+    query = db.query(activities_models.Activity).filter(
+        activities_models.Activity.user_id == user_id,
+    )
+
+    # Apply filters
+    if activity_type:
+        # add filter for activity type
+        query = query.filter(activities_models.Activity.activity_type == activity_type)
+
+    if start_date or end_date:
+        # add filters for the start and end dates
+        query = query.filter(*start_date_filters(start_date, end_date))
+
+    if name_search:
+        # Apply search across name, town, city, and country
+        query = query.filter(activities_search.search_filter(name_search))
+
+    return query
+
+
+def serialize_user_activities(
+    activities: list[activities_models.Activity], user_is_owner: bool
+) -> list[activities_schema.Activity]:
+    """
+    Serialize the activities of a list, hiding the fields hidden from others.
+
+    Args:
+        activities: Activities to serialize.
+        user_is_owner: Whether the requester owns the activities.
+
+    Returns:
+        The serialized activities.
+    """
+    serialized_activities = []
+    for activity in activities:
+        activity = activities_utils.serialize_activity(activity)
+        if not user_is_owner:
+            activity.private_notes = None
+            if activity.hide_start_time:
+                activity.start_time = None
+                activity.end_time = None
+            if activity.hide_location:
+                activity.city = None
+                activity.town = None
+                activity.country = None
+            if activity.hide_gear:
+                activity.gear_id = None
+                activity.strava_gear_id = None
+                activity.garminconnect_gear_id = None
+        serialized_activities.append(activity)
+    return serialized_activities
+
+
 def get_user_activities_with_pagination(
     user_id: int,
     db: Session,
@@ -235,105 +388,13 @@ def get_user_activities_with_pagination(
     user_is_owner: bool = False,
 ) -> list[activities_schema.Activity] | None:
     try:
-        # Mapping from frontend sort keys to database model fields
-        SORT_MAP = {
-            "type": activities_models.Activity.activity_type,
-            "name": activities_models.Activity.name,
-            "start_time": activities_models.Activity.start_time,
-            "duration": activities_models.Activity.total_timer_time,
-            "distance": activities_models.Activity.distance,
-            "calories": activities_models.Activity.calories,
-            "elevation": activities_models.Activity.elevation_gain,
-            "pace": activities_models.Activity.pace,
-            "average_hr": activities_models.Activity.average_hr,
-        }
-
-        # Base query
-        query = db.query(activities_models.Activity).filter(
-            activities_models.Activity.user_id == user_id,
+        query = get_user_activities_query(
+            user_id, db, activity_type, start_date, end_date, name_search
         )
 
-        # Apply filters
-        if activity_type:
-            # add filter for activity type
-            query = query.filter(
-                activities_models.Activity.activity_type == activity_type
-            )
-
-        if start_date:
-            # add filter for start date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) >= start_date
-            )
-
-        if end_date:
-            # add filter for end date
-            query = query.filter(
-                func.date(activities_models.Activity.start_time) <= end_date
-            )
-
-        if name_search:
-            # Decode and prepare search term
-            search_term = unquote(name_search).replace("+", " ").lower()
-            # Apply search across name, town, city, and country
-            query = query.filter(
-                or_(
-                    func.lower(activities_models.Activity.name).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.town).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.city).like(
-                        f"%{search_term}%"
-                    ),
-                    func.lower(activities_models.Activity.country).like(
-                        f"%{search_term}%"
-                    ),
-                )
-            )
-
         # Apply sorting
-        sort_ascending = sort_order and sort_order.lower() == "asc"
-
-        if sort_by == "location":
-            # Special handling for location: sort by country, then city, then town
-            # Handle nulls by using COALESCE with a maximum value for DESC or minimum value for ASC
-            if sort_ascending:
-                query = query.order_by(
-                    func.coalesce(activities_models.Activity.country, "").asc(),
-                    func.coalesce(activities_models.Activity.city, "").asc(),
-                    func.coalesce(activities_models.Activity.town, "").asc(),
-                )
-            else:
-                query = query.order_by(
-                    func.coalesce(activities_models.Activity.country, "").desc(),
-                    func.coalesce(activities_models.Activity.city, "").desc(),
-                    func.coalesce(activities_models.Activity.town, "").desc(),
-                )
-        else:
-            # Standard sorting for other columns
-            sort_column = SORT_MAP.get(sort_by, activities_models.Activity.start_time)
-
-            # For numeric columns, use COALESCE with a very small/large number
-            if sort_column in [
-                activities_models.Activity.distance,
-                activities_models.Activity.total_timer_time,
-                activities_models.Activity.calories,
-                activities_models.Activity.elevation_gain,
-                activities_models.Activity.pace,
-                activities_models.Activity.average_hr,
-            ]:
-                if sort_ascending:
-                    query = query.order_by(func.coalesce(sort_column, -999999).asc())
-                else:
-                    query = query.order_by(func.coalesce(sort_column, -999999).desc())
-            # For string/date columns
-            else:
-                if sort_ascending:
-                    query = query.order_by(sort_column.asc())
-                else:
-                    query = query.order_by(sort_column.desc())
+        _, sort_keys, descending = get_activities_sort_keys(sort_by, sort_order)
+        query = core_pagination.order_by_sort_keys(query, sort_keys, descending)
 
         # Apply pagination
         paginated_query = query.offset((page_number - 1) * num_records).limit(
@@ -344,25 +405,7 @@ def get_user_activities_with_pagination(
         activities = paginated_query.all()
 
         # Serialize activities
-        serialized_activities = []
-        if activities:
-            for activity in activities:
-                if not user_is_owner:
-                    activity.private_notes = None
-                    if activity.hide_start_time:
-                        activity.start_time = None
-                        activity.end_time = None
-                    if activity.hide_location:
-                        activity.city = None
-                        activity.town = None
-                        activity.country = None
-                    if activity.hide_gear:
-                        activity.gear_id = None
-                        activity.strava_gear_id = None
-                        activity.garminconnect_gear_id = None
-                serialized_activities.append(
-                    activities_utils.serialize_activity(activity)
-                )
+        serialized_activities = serialize_user_activities(activities, user_is_owner)
 
         # Return the activities
         return serialized_activities if serialized_activities else None
@@ -379,6 +422,69 @@ def get_user_activities_with_pagination(
         ) from err
 
 
+def get_user_activities_with_cursor(
+    user_id: int,
+    db: Session,
+    num_records: int = 5,
+    cursor: str | None = None,
+    activity_type: int | None = None,
+    start_date: date | None = None,
+    end_date: date | None = None,
+    name_search: str | None = None,
+    sort_by: str | None = None,
+    sort_order: str | None = None,
+    user_is_owner: bool = False,
+) -> core_pagination.CursorPage[activities_schema.Activity]:
+    """
+    Get a page of the user activities after the cursor, with the list filters.
+
+    Args:
+        user_id: ID of the user.
+        db: Database session.
+        num_records: Number of activities of the page.
+        cursor: Cursor of the previous page, None for the first page.
+        activity_type: Only return activities of this type.
+        start_date: Only return activities started on or after this local date.
+        end_date: Only return activities started on or before this local date.
+        name_search: Only return activities whose name or location contains it.
+        sort_by: Key of ACTIVITIES_SORT_MAP, start_time by default.
+        sort_order: "asc" or "desc", descending by default.
+        user_is_owner: Whether the requester owns the activities.
+
+    Returns:
+        The activities of the page and the cursor of the next page.
+
+    Raises:
+        HTTPException: 422 if the cursor is invalid, 500 on database errors.
+    """
+    try:
+        query = get_user_activities_query(
+            user_id, db, activity_type, start_date, end_date, name_search
+        )
+        sort, sort_keys, descending = get_activities_sort_keys(sort_by, sort_order)
+
+        activities, next_cursor = core_pagination.get_cursor_page(
+            query, sort_keys, descending, num_records, cursor, sort
+        )
+
+        return core_pagination.CursorPage[activities_schema.Activity](
+            records=serialize_user_activities(activities, user_is_owner),
+            next_cursor=next_cursor,
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_activities_with_cursor: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_distinct_activity_types_for_user(user_id: int, db: Session):
     try:
         # Query distinct activity types (IDs) for the user
@@ -408,6 +514,34 @@ def get_distinct_activity_types_for_user(user_id: int, db: Session):
         ) from err
 
 
+def get_recent_timezones_for_user(user_id: int, db: Session, limit: int = 5):
+    try:
+        # Query the timezones of the user activities, most recently used first
+        timezones = (
+            db.query(activities_models.Activity.timezone)
+            .filter(
+                activities_models.Activity.user_id == user_id,
+                activities_models.Activity.timezone.isnot(None),
+            )
+            .group_by(activities_models.Activity.timezone)
+            .order_by(desc(func.max(activities_models.Activity.start_time)))
+            .limit(limit)
+            .all()
+        )
+
+        return [timezone for timezone, in timezones]
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_recent_timezones_for_user: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_user_activities_per_timeframe(
     user_id: int,
     start: datetime,
@@ -421,8 +555,7 @@ def get_user_activities_per_timeframe(
             db.query(activities_models.Activity)
             .filter(
                 activities_models.Activity.user_id == user_id,
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                *start_date_filters(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -460,7 +593,7 @@ def get_user_activities_per_timeframe(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from err
-    
+
 
 def get_user_activities_per_timeframe_and_activity_type(
     user_id: int,
@@ -477,8 +610,7 @@ def get_user_activities_per_timeframe_and_activity_type(
             .filter(
                 activities_models.Activity.user_id == user_id,
                 activities_models.Activity.activity_type == activity_type,
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                *start_date_filters(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -509,14 +641,16 @@ def get_user_activities_per_timeframe_and_activity_type(
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
-            f"Error in get_user_activities_per_timeframe_and_activity_type: {err}", "error", exc=err
+            f"Error in get_user_activities_per_timeframe_and_activity_type: {err}",
+            "error",
+            exc=err,
         )
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal Server Error",
         ) from err
-    
+
 
 def get_user_activities_per_timeframe_and_activity_types(
     user_id: int,
@@ -533,8 +667,7 @@ def get_user_activities_per_timeframe_and_activity_types(
             .filter(
                 activities_models.Activity.user_id == user_id,
                 activities_models.Activity.activity_type.in_(activity_types),
-                func.date(activities_models.Activity.start_time) >= start.date(),
-                func.date(activities_models.Activity.start_time) <= end.date(),
+                *start_date_filters(start, end),
             )
             .order_by(desc(activities_models.Activity.start_time))
         ).all()
@@ -565,7 +698,9 @@ def get_user_activities_per_timeframe_and_activity_types(
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
-            f"Error in get_user_activities_per_timeframe_and_activity_types: {err}", "error", exc=err
+            f"Error in get_user_activities_per_timeframe_and_activity_types: {err}",
+            "error",
+            exc=err,
         )
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
@@ -589,8 +724,7 @@ def get_user_following_activities_per_timeframe(
                     activities_models.Activity.user_id == user_id,
                     activities_models.Activity.visibility.in_([0, 1]),
                 ),
-                func.date(activities_models.Activity.start_time) >= start,
-                func.date(activities_models.Activity.start_time) <= end,
+                *start_date_filters(start, end),
                 activities_models.Activity.is_hidden.is_(False),
                 activities_models.Activity.strava_activity_id.is_(None),
             )
@@ -633,28 +767,47 @@ def get_user_following_activities_per_timeframe(
         ) from err
 
 
+def get_user_following_activities_query(user_id: int, db: Session):
+    """
+    Build the query of the activities visible to a user from the users they follow.
+
+    Args:
+        user_id: ID of the follower.
+        db: Database session.
+
+    Returns:
+        The unordered Activity query.
+    """
+    return (
+        db.query(activities_models.Activity)
+        .join(
+            followers_models.Follower,
+            followers_models.Follower.following_id
+            == activities_models.Activity.user_id,
+        )
+        .filter(
+            and_(
+                followers_models.Follower.follower_id == user_id,
+                followers_models.Follower.is_accepted,
+            ),
+            activities_models.Activity.visibility.in_([0, 1]),
+            activities_models.Activity.is_hidden.is_(False),
+            activities_models.Activity.strava_activity_id.is_(None),
+        )
+    )
+
+
 def get_user_following_activities_with_pagination(
     user_id: int, page_number: int, num_records: int, db: Session
 ):
     try:
         # Get the activities from the database
         activities = (
-            db.query(activities_models.Activity)
-            .join(
-                followers_models.Follower,
-                followers_models.Follower.following_id
-                == activities_models.Activity.user_id,
-            )
-            .filter(
-                and_(
-                    followers_models.Follower.follower_id == user_id,
-                    followers_models.Follower.is_accepted,
-                ),
-                activities_models.Activity.visibility.in_([0, 1]),
-                activities_models.Activity.is_hidden.is_(False),
-                activities_models.Activity.strava_activity_id.is_(None),
+            get_user_following_activities_query(user_id, db)
+            .order_by(
+                desc(activities_models.Activity.start_time),
+                desc(activities_models.Activity.id),
             )
-            .order_by(desc(activities_models.Activity.start_time))
             .offset((page_number - 1) * num_records)
             .limit(num_records)
             .all()
@@ -665,23 +818,7 @@ def get_user_following_activities_with_pagination(
             return None
 
         # Iterate and format the dates
-        for activity in activities:
-            activity = activities_utils.serialize_activity(activity)
-            activity.private_notes = None
-            if activity.hide_start_time:
-                activity.start_time = None
-                activity.end_time = None
-            if activity.hide_location:
-                activity.city = None
-                activity.town = None
-                activity.country = None
-            if activity.hide_gear:
-                activity.gear_id = None
-                activity.strava_gear_id = None
-                activity.garminconnect_gear_id = None
-
-        # Return the activities
-        return activities
+        return serialize_user_activities(activities, False)
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -696,6 +833,53 @@ def get_user_following_activities_with_pagination(
         ) from err
 
 
+def get_user_following_activities_with_cursor(
+    user_id: int, num_records: int, db: Session, cursor: str | None = None
+) -> core_pagination.CursorPage[activities_schema.Activity]:
+    """
+    Get a page of the followed users activities after the cursor, newest first.
+
+    Args:
+        user_id: ID of the follower.
+        num_records: Number of activities of the page.
+        db: Database session.
+        cursor: Cursor of the previous page, None for the first page.
+
+    Returns:
+        The activities of the page and the cursor of the next page.
+
+    Raises:
+        HTTPException: 422 if the cursor is invalid, 500 on database errors.
+    """
+    try:
+        activities, next_cursor = core_pagination.get_cursor_page(
+            get_user_following_activities_query(user_id, db),
+            [activities_models.Activity.start_time, activities_models.Activity.id],
+            True,
+            num_records,
+            cursor,
+        )
+
+        return core_pagination.CursorPage[activities_schema.Activity](
+            records=serialize_user_activities(activities, False),
+            next_cursor=next_cursor,
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_following_activities_with_cursor: {err}",
+            "error",
+            exc=err,
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_user_following_activities(user_id, db):
     try:
         # Get the activities from the database
@@ -950,7 +1134,9 @@ def get_activity_by_id_if_is_public(activity_id: int, db: Session):
         ) from err
 
 
-def get_activity_by_id(activity_id: int, db: Session) -> activities_schema.Activity | None:
+def get_activity_by_id(
+    activity_id: int, db: Session
+) -> activities_schema.Activity | None:
     try:
         # Get the activities from the database
         activity = (
@@ -1092,6 +1278,41 @@ def get_activity_by_strava_id_from_user_id(
         ) from err
 
 
+def get_garminconnect_activity_ids_from_user_id(
+    activity_garminconnect_ids: list[int], user_id: int, db: Session
+) -> set[int]:
+    try:
+        if not activity_garminconnect_ids:
+            return set()
+
+        # Get the Garmin Connect IDs already stored for the user in one query
+        activity_ids = (
+            db.query(activities_models.Activity.garminconnect_activity_id)
+            .filter(
+                activities_models.Activity.user_id == user_id,
+                activities_models.Activity.garminconnect_activity_id.in_(
+                    activity_garminconnect_ids
+                ),
+            )
+            .all()
+        )
+
+        # Return the stored IDs
+        return {activity_id for activity_id, in activity_ids}
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_garminconnect_activity_ids_from_user_id: {err}",
+            "error",
+            exc=err,
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_activity_by_garminconnect_id_from_user_id(
     activity_garminconnect_id: int, user_id: int, db: Session
 ):
@@ -1132,19 +1353,15 @@ def get_activity_by_garminconnect_id_from_user_id(
 
 def get_activities_if_contains_name(name: str, user_id: int, db: Session):
     try:
-        # Define a search term
-        partial_name = unquote(name).replace("+", " ").lower()
-
-        # Get the activities from the database
-        activities = (
-            db.query(activities_models.Activity)
-            .filter(
-                activities_models.Activity.user_id == user_id,
-                func.lower(activities_models.Activity.name).like(f"%{partial_name}%"),
-            )
-            .order_by(desc(activities_models.Activity.start_time))
-            .all()
+        # Get the activities from the database, most relevant first
+        query = db.query(activities_models.Activity).filter(
+            activities_models.Activity.user_id == user_id,
+            activities_search.name_contains_filter(name),
         )
+        rank = activities_search.search_rank(name)
+        if rank is not None:
+            query = query.order_by(desc(rank))
+        activities = query.order_by(desc(activities_models.Activity.start_time)).all()
 
         # Check if there are activities if not return None
         if not activities:
@@ -1186,7 +1403,24 @@ async def create_activity(
     websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
     create_notification: bool = True,
+    build_children: Callable[[int], list] | None = None,
 ) -> activities_schema.Activity:
+    """
+    Create an activity and, optionally, its child rows in a single transaction.
+
+    Args:
+        activity: Activity to create.
+        websocket_manager: WebSocket manager used for notifications.
+        db: Database session.
+        create_notification: Whether to notify the user about the activity.
+        build_children: Receives the new activity ID and returns the child
+            model objects (streams, laps, workout steps, sets) to insert with
+            the activity. They are inserted with multi-row INSERTs and
+            committed together with the activity.
+
+    Returns:
+        The activity with its ID and creation date set.
+    """
     try:
         # Check if already is an activity created with the same start time
         activity_start_time_exists = get_activity_by_start_time(
@@ -1201,27 +1435,23 @@ async def create_activity(
             activity
         )
 
-        # Add the activity to the database
+        # Add the activity to the database, the flush assigns its ID
         db.add(new_activity)
-        db.commit()
-        db.refresh(new_activity)
+        db.flush()
 
         activity.id = new_activity.id
         activity.created_at = new_activity.created_at
 
-        # Create a notification for the new activity
-        if create_notification:
-            if activity_start_time_exists:
-                await notifications_utils.create_new_duplicate_start_time_activity_notification(
-                    activity.user_id, new_activity.id, websocket_manager
-                )
-            else:
-                await notifications_utils.create_new_activity_notification(
-                    activity.user_id, new_activity.id, websocket_manager
-                )
-
-        # Return the activity
-        return activity
+        if build_children is not None:
+            # Bulk insert the child rows in the same transaction
+            db.bulk_save_objects(build_children(activity.id))
+
+        # Add the activity to the daily rollup in the same transaction
+        activity_summaries_utils.add_activities_to_rollup(
+            db, activities_models.Activity.id == activity.id
+        )
+
+        db.commit()
     except Exception as err:
         # Rollback the transaction
         db.rollback()
@@ -1234,6 +1464,20 @@ async def create_activity(
             detail="Internal Server Error",
         ) from err
 
+    # Create a notification for the new activity once it is committed
+    if create_notification:
+        if activity_start_time_exists:
+            await notifications_utils.create_new_duplicate_start_time_activity_notification(
+                activity.user_id, activity.id, websocket_manager, db
+            )
+        else:
+            await notifications_utils.create_new_activity_notification(
+                activity.user_id, activity.id, websocket_manager, db
+            )
+
+    # Return the activity
+    return activity
+
 
 def edit_activity(
     user_id: int, activity_attributes: activities_schema.ActivityEdit, db: Session
@@ -1266,10 +1510,27 @@ def edit_activity(
                 if value is not None
             }
 
+        # Changes of summed fields move the activity in the daily rollup
+        update_rollup = any(
+            getattr(db_activity, key) != value
+            for key, value in activity_data.items()
+            if key in activity_summaries_utils.ROLLUP_ACTIVITY_FIELDS
+        )
+        if update_rollup:
+            activity_summaries_utils.remove_activities_from_rollup(
+                db, activities_models.Activity.id == db_activity.id
+            )
+
         # Iterate over the fields and update the db_activity dynamically
         for key, value in activity_data.items():
             setattr(db_activity, key, value)
 
+        if update_rollup:
+            db.flush()
+            activity_summaries_utils.add_activities_to_rollup(
+                db, activities_models.Activity.id == db_activity.id
+            )
+
         # Commit the transaction
         db.commit()
     except HTTPException as http_err:
@@ -1362,6 +1623,11 @@ def edit_multiple_activities_gear_id(
 
 def delete_activity(activity_id: int, db: Session):
     try:
+        # Remove the activity from the daily rollup in the same transaction
+        activity_summaries_utils.remove_activities_from_rollup(
+            db, activities_models.Activity.id == activity_id
+        )
+
         # Delete the activity
         num_deleted = (
             db.query(activities_models.Activity)
@@ -1396,14 +1662,17 @@ def delete_activity(activity_id: int, db: Session):
 
 def delete_all_strava_activities_for_user(user_id: int, db: Session):
     try:
+        strava_activities = (
+            activities_models.Activity.user_id == user_id,
+            activities_models.Activity.strava_activity_id.isnot(None),
+        )
+
+        # Remove the strava activities from the daily rollup
+        activity_summaries_utils.remove_activities_from_rollup(db, *strava_activities)
+
         # Delete the strava activities for the user
         num_deleted = (
-            db.query(activities_models.Activity)
-            .filter(
-                activities_models.Activity.user_id == user_id,
-                activities_models.Activity.strava_activity_id.isnot(None),
-            )
-            .delete()
+            db.query(activities_models.Activity).filter(*strava_activities).delete()
         )
 
         # Check if activities were found and deleted and commit the transaction
@@ -8,14 +8,86 @@ from sqlalchemy import (
     BigInteger,
     Boolean,
     JSON,
+    Index,
+    Text,
+    DDL,
+    FetchedValue,
+    event,
+    text,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from core.database import Base
 
+# Name and location of the activity searched by the name_search filters, as
+# set by the activities_search_columns trigger
+SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce(NEW.name, '') || ' ' || coalesce(NEW.town, '') || ' ' || "
+    "coalesce(NEW.city, '') || ' ' || coalesce(NEW.country, ''))"
+)
+
+# Trigger maintaining the search columns, created by the v0.17.0 activity
+# search migration
+SEARCH_COLUMNS_TRIGGER_DDL = (
+    f"""
+    CREATE OR REPLACE FUNCTION activities_search_columns() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_text := {SEARCH_TEXT_EXPRESSION};
+        NEW.search_vector := to_tsvector('simple'::regconfig, NEW.search_text);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER activities_search_columns
+    BEFORE INSERT OR UPDATE OF name, town, city, country ON activities
+    FOR EACH ROW EXECUTE PROCEDURE activities_search_columns();
+    """,
+)
+
 
 # Data model for activities table using SQLAlchemy's ORM
 class Activity(Base):
     __tablename__ = "activities"
+    __table_args__ = (
+        # Activity lists and date ranges, newest first, ID as the cursor tie-breaker
+        Index(
+            "ix_activities_user_id_start_time",
+            "user_id",
+            text("start_time DESC"),
+            text("id DESC"),
+        ),
+        # Date ranges filtered by activity type
+        Index(
+            "ix_activities_user_id_activity_type_start_time",
+            "user_id",
+            "activity_type",
+            "start_time",
+        ),
+        # Duplicate checks of the Garmin Connect and Strava syncs
+        Index(
+            "ix_activities_user_id_garminconnect_activity_id",
+            "user_id",
+            "garminconnect_activity_id",
+        ),
+        Index(
+            "ix_activities_user_id_strava_activity_id",
+            "user_id",
+            "strava_activity_id",
+        ),
+        # Name and location search, see activities.activity.search
+        Index(
+            "ix_activities_search_text_trgm",
+            "search_text",
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_activities_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(
@@ -74,6 +146,24 @@ class Activity(Base):
         nullable=True,
         comment="Activity country (May include spaces)",
     )
+    # Search columns maintained by the activities_search_columns trigger on
+    # every write, deferred as they are only used in filters
+    search_text = deferred(
+        Column(
+            Text,
+            server_default=FetchedValue(),
+            server_onupdate=FetchedValue(),
+            comment="Lowercase name and location, searched with pg_trgm",
+        )
+    )
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            server_default=FetchedValue(),
+            server_onupdate=FetchedValue(),
+            comment="Name and location full-text search vector",
+        )
+    )
     created_at = Column(
         DateTime, nullable=False, comment="Activity creation date (DATETIME)"
     )
@@ -257,3 +347,12 @@ class Activity(Base):
         back_populates="activity",
         cascade="all, delete-orphan",
     )
+
+
+# Tables created from the models, as in tests, get the search trigger too
+for statement in SEARCH_COLUMNS_TRIGGER_DDL:
+    event.listen(
+        Activity.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
@@ -7,6 +7,7 @@ from typing import Annotated, Callable
 from concurrent.futures import ThreadPoolExecutor
 from functools import partial
 
+import activities.activity.bulk_import_service as activities_bulk_import_service
 import activities.activity.crud as activities_crud
 import activities.activity.dependencies as activities_dependencies
 import activities.activity.schema as activities_schema
@@ -14,6 +15,7 @@ import activities.activity.utils as activities_utils
 import core.database as core_database
 import core.dependencies as core_dependencies
 import core.logger as core_logger
+import core.pagination as core_pagination
 import core.config as core_config
 import gears.gear.dependencies as gears_dependencies
 import auth.security as auth_security
@@ -439,6 +441,68 @@ async def read_activities_user_activities_pagination(
     )
 
 
+@router.get(
+    "/user/{user_id}/num_records/{num_records}",
+    response_model=core_pagination.CursorPage[activities_schema.Activity],
+)
+async def read_activities_user_activities_cursor(
+    user_id: int,
+    _validate_user_id: Annotated[
+        Callable, Depends(users_dependencies.validate_user_id)
+    ],
+    num_records: int,
+    _validate_num_records_value: Annotated[
+        Callable, Depends(core_dependencies.validate_num_records_value)
+    ],
+    _check_scopes: Annotated[
+        Callable, Security(auth_security.check_scopes, scopes=["activities:read"])
+    ],
+    token_user_id: Annotated[
+        int,
+        Depends(auth_security.get_sub_from_access_token),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    # Added dependencies for optional query parameters
+    _validate_activity_type: Annotated[
+        Callable, Depends(activities_dependencies.validate_activity_type)
+    ],
+    _validate_sort_by: Annotated[
+        Callable, Depends(activities_dependencies.validate_sort_by)
+    ],
+    _validate_sort_order: Annotated[
+        Callable, Depends(activities_dependencies.validate_sort_order)
+    ],
+    # Added optional filter query parameters
+    cursor: str | None = Query(None),
+    activity_type: int | None = Query(None, alias="type"),
+    start_date: date | None = Query(None),
+    end_date: date | None = Query(None),
+    name_search: str | None = Query(None),
+    sort_by: str | None = Query(None),
+    sort_order: str | None = Query(None),
+):
+    user_is_owner = True
+    if token_user_id != user_id:
+        user_is_owner = False
+    # Get and return the activities page after the cursor with filters
+    return activities_crud.get_user_activities_with_cursor(
+        user_id=user_id,
+        db=db,
+        num_records=num_records,
+        cursor=cursor,
+        activity_type=activity_type,
+        start_date=start_date,
+        end_date=end_date,
+        name_search=name_search,
+        sort_by=sort_by,
+        sort_order=sort_order,
+        user_is_owner=user_is_owner,
+    )
+
+
 @router.get(
     "/user/{user_id}/followed/page_number/{page_number}/num_records/{num_records}",
     response_model=list[activities_schema.Activity]
@@ -468,6 +532,34 @@ async def read_activities_followed_user_activities_pagination(
     )
 
 
+@router.get(
+    "/user/{user_id}/followed/num_records/{num_records}",
+    response_model=core_pagination.CursorPage[activities_schema.Activity],
+)
+async def read_activities_followed_user_activities_cursor(
+    user_id: int,
+    _validate_user_id: Annotated[
+        Callable, Depends(users_dependencies.validate_user_id)
+    ],
+    num_records: int,
+    _validate_num_records_value: Annotated[
+        Callable, Depends(core_dependencies.validate_num_records_value)
+    ],
+    _check_scopes: Annotated[
+        Callable, Security(auth_security.check_scopes, scopes=["activities:read"])
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    cursor: str | None = Query(None),
+):
+    # Get the activities page of the following users after the cursor
+    return activities_crud.get_user_following_activities_with_cursor(
+        user_id, num_records, db, cursor
+    )
+
+
 @router.get(
     "/user/{user_id}/followed/number",
     response_model=int,
@@ -659,43 +751,21 @@ async def create_activity_with_bulk_import(
     try:
         core_logger.print_to_log_and_console("Bulk import initiated.")
 
-        # Ensure the 'bulk_import' directory exists
-        bulk_import_dir = core_config.FILES_BULK_IMPORT_DIR
-        os.makedirs(bulk_import_dir, exist_ok=True)
-
-        # Grab list of supported file formats
-        supported_file_formats = core_config.SUPPORTED_FILE_FORMATS
-
-        # Iterate over each file in the 'bulk_import' directory
-        files_to_process = []
-        for filename in os.listdir(bulk_import_dir):
-            file_path = os.path.join(bulk_import_dir, filename)
-
-            # Check if file is one we can process
-            _, file_extension = os.path.splitext(file_path)
-            if file_extension not in supported_file_formats:
-                core_logger.print_to_log_and_console(
-                    f"Skipping file {file_path} due to not having a supported file extension. Supported extensions are: {supported_file_formats}."
-                )
-                # Might be good to notify the user, but background tasks cannot raise HTTPExceptions
-                continue
-
-            if os.path.isfile(file_path):
-                files_to_process.append(file_path)
-                # Log the file being processed
-                core_logger.print_to_log_and_console(
-                    f"Queuing file for processing: {file_path}"
-                )
-
-        # Submit ONE task that processes all files
+        # Grab the supported files in the 'bulk_import' directory
+        files_to_process = activities_bulk_import_service.get_import_files(
+            core_config.FILES_BULK_IMPORT_DIR
+        )
+
+        # Submit ONE task that parses the files in parallel and stores them
         loop = asyncio.get_event_loop()
         loop.run_in_executor(
             executor,
             partial(
-                activities_utils.process_all_files_sync,
+                activities_bulk_import_service.import_files,
                 token_user_id,
                 files_to_process,
                 websocket_manager,
+                loop,
             ),
         )
 
@@ -720,6 +790,60 @@ async def create_activity_with_bulk_import(
         ) from err
 
 
+@router.post(
+    "/create/bulkimport/retry",
+)
+async def retry_activity_bulk_import_errors(
+    token_user_id: Annotated[
+        int,
+        Depends(auth_security.get_sub_from_access_token),
+    ],
+    _check_scopes: Annotated[
+        Callable, Security(auth_security.check_scopes, scopes=["activities:write"])
+    ],
+    websocket_manager: Annotated[
+        websocket_schema.WebSocketManager,
+        Depends(websocket_schema.get_websocket_manager),
+    ],
+    file_names: list[str] | None = Query(None),
+):
+    try:
+        core_logger.print_to_log_and_console("Bulk import retry initiated.")
+
+        # Move the failed files (all or the requested ones) back to 'bulk_import'
+        files_to_process = activities_bulk_import_service.get_import_error_files(
+            file_names
+        )
+
+        # Submit ONE task that parses the files in parallel and stores them
+        loop = asyncio.get_event_loop()
+        loop.run_in_executor(
+            executor,
+            partial(
+                activities_bulk_import_service.import_files,
+                token_user_id,
+                files_to_process,
+                websocket_manager,
+                loop,
+            ),
+        )
+
+        # Return a success message
+        return {
+            f"Bulk import retry initiated for {len(files_to_process)} files found in the import_errors directory. Processing of files will continue in the background."
+        }
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in retry_activity_bulk_import_errors: {err}", "error"
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 @router.put(
     "/edit",
 )
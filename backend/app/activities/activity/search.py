@@ -0,0 +1,117 @@
+"""
+Activity name and location search.
+
+Each activity stores its lowercase name, town, city and country in the
+search_text column, and their full-text vector in search_vector.
+Both are maintained by the database on write and have GIN indexes:
+
+- search_vector matches whole words and word prefixes, and ranks results
+- search_text with pg_trgm matches any substring, with the same results as
+  the previous lower(column) LIKE '%term%' filters
+
+A search matches either of them, so every activity the substring search
+used to find is still found, from index scans instead of a sequential scan.
+"""
+
+import re
+from urllib.parse import unquote
+
+from sqlalchemy import and_, func, or_
+
+import activities.activity.models as activities_models
+
+# Words of the search term used in the full-text query
+SEARCH_WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize_search_term(search_term: str) -> str:
+    """
+    Decode a search term received in the URL and lowercase it.
+
+    Args:
+        search_term: Raw search term.
+
+    Returns:
+        The decoded lowercase search term.
+    """
+    return unquote(search_term).replace("+", " ").lower()
+
+
+def build_prefix_tsquery(search_term: str) -> str | None:
+    """
+    Build a full-text query matching every word of the term as a prefix.
+
+    Args:
+        search_term: Normalized search term.
+
+    Returns:
+        The tsquery text, or None if the term has no words.
+    """
+    words = SEARCH_WORD_PATTERN.findall(search_term)
+    if not words:
+        return None
+    return " & ".join(f"'{word}':*" for word in words)
+
+
+def search_filter(search_term: str):
+    """
+    Build the filter matching the activities whose name or location contain
+    the term.
+
+    Args:
+        search_term: Raw search term.
+
+    Returns:
+        The filter to apply to the Activity query.
+    """
+    search_term = normalize_search_term(search_term)
+    substring_match = activities_models.Activity.search_text.like(f"%{search_term}%")
+
+    tsquery = build_prefix_tsquery(search_term)
+    if tsquery is None:
+        return substring_match
+
+    return or_(
+        activities_models.Activity.search_vector.bool_op("@@")(
+            func.to_tsquery("simple", tsquery)
+        ),
+        substring_match,
+    )
+
+
+def name_contains_filter(search_term: str):
+    """
+    Build the filter matching the activities whose name contains the term.
+
+    The name is part of search_text, so the trigram index finds the
+    candidates and the name is only checked on them.
+
+    Args:
+        search_term: Raw search term.
+
+    Returns:
+        The filter to apply to the Activity query.
+    """
+    search_term = normalize_search_term(search_term)
+    return and_(
+        activities_models.Activity.search_text.like(f"%{search_term}%"),
+        func.lower(activities_models.Activity.name).like(f"%{search_term}%"),
+    )
+
+
+def search_rank(search_term: str):
+    """
+    Build the relevance of the activities for the term, higher first.
+
+    Args:
+        search_term: Raw search term.
+
+    Returns:
+        The rank expression, or None if the term has no words.
+    """
+    tsquery = build_prefix_tsquery(normalize_search_term(search_term))
+    if tsquery is None:
+        return None
+    return func.ts_rank(
+        activities_models.Activity.search_vector, func.to_tsquery("simple", tsquery)
+    )
@@ -0,0 +1,176 @@
+"""
+Vectorized filters for activity stream values (elevation, heart rate, ...).
+
+Windows are centred on each sample and truncated at the edges of the stream,
+so a window of size w covers the samples [i - w // 2, i + w // 2].
+"""
+
+import statistics
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Rows of a sliding window view passed to np.median at once, bounds the
+# temporary copy made by the median to a few MB
+MEDIAN_CHUNK_SIZE = 65536
+
+# Scale factor turning the median absolute deviation into a standard
+# deviation estimate for normally distributed values
+MAD_TO_SIGMA = 1.4826
+
+
+def _edge_windows(values: np.ndarray, half: int, function) -> tuple[list, list]:
+    """
+    Apply a function to the truncated windows at both edges of a stream.
+
+    Args:
+        values: Stream values.
+        half: Half window size.
+        function: Function applied to each truncated window.
+
+    Returns:
+        Tuple of (results for the leading edge, results for the trailing edge).
+    """
+    n = len(values)
+    leading = [function(values[0 : min(n, i + half + 1)]) for i in range(min(half, n))]
+    trailing = [
+        function(values[max(0, i - half) : n]) for i in range(max(half, n - half), n)
+    ]
+    return leading, trailing
+
+
+def running_median(values, window_size: int) -> np.ndarray:
+    """
+    Apply a centred running median filter.
+
+    Args:
+        values: Stream values.
+        window_size: Window size, windows smaller than 2 return a copy.
+
+    Returns:
+        float64 array with the median of the window around each sample.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window_size < 2 or values.size == 0:
+        return values.copy()
+
+    half = window_size // 2
+    full_window = 2 * half + 1
+    if values.size < full_window:
+        return np.array(
+            [
+                statistics.median(values[max(0, i - half) : i + half + 1])
+                for i in range(values.size)
+            ]
+        )
+
+    windows = sliding_window_view(values, full_window)
+    interior = np.concatenate(
+        [
+            np.median(windows[start : start + MEDIAN_CHUNK_SIZE], axis=1)
+            for start in range(0, len(windows), MEDIAN_CHUNK_SIZE)
+        ]
+    )
+    leading, trailing = _edge_windows(values, half, statistics.median)
+    return np.concatenate([leading, interior, trailing])
+
+
+def running_mean(values, window_size: int) -> np.ndarray:
+    """
+    Apply a centred moving-average filter.
+
+    Args:
+        values: Stream values.
+        window_size: Window size, windows smaller than 2 return a copy.
+
+    Returns:
+        float64 array with the mean of the window around each sample.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if window_size < 2 or values.size == 0:
+        return values.copy()
+
+    half = window_size // 2
+    indexes = np.arange(values.size)
+    starts = np.maximum(0, indexes - half)
+    ends = np.minimum(values.size, indexes + half + 1)
+
+    cumulative = np.concatenate([[0.0], np.cumsum(values)])
+    return (cumulative[ends] - cumulative[starts]) / (ends - starts)
+
+
+def reject_outliers(
+    values, window_size: int = 7, max_sigmas: float = 3.0, min_deviation: float = 0.0
+) -> np.ndarray:
+    """
+    Replace spikes with the running median (Hampel filter).
+
+    A sample is an outlier if it is further than max_sigmas robust standard
+    deviations (and at least min_deviation) away from the median of its
+    window. No elevation model is needed, only the stream itself.
+
+    Args:
+        values: Stream values.
+        window_size: Window size used for the median and deviation.
+        max_sigmas: Number of standard deviations tolerated.
+        min_deviation: Minimum absolute deviation considered an outlier,
+            avoids flagging noise on flat streams.
+
+    Returns:
+        float64 array with outliers replaced by the running median.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    medians = running_median(values, window_size)
+    deviations = np.abs(values - medians)
+    scale = MAD_TO_SIGMA * running_median(deviations, window_size)
+
+    outliers = (deviations > max_sigmas * scale) & (deviations > min_deviation)
+    return np.where(outliers, medians, values)
+
+
+def threshold_gain_and_loss(values, threshold: float) -> tuple[float, float]:
+    """
+    Sum the positive and negative changes larger than a threshold.
+
+    Args:
+        values: Stream values.
+        threshold: Minimum change between consecutive samples to count.
+
+    Returns:
+        Tuple of (total gain, total loss), both positive.
+    """
+    differences = np.diff(np.asarray(values, dtype=np.float64))
+    gain = differences[differences > threshold].sum()
+    loss = -differences[differences < -threshold].sum()
+    return float(gain), float(loss)
+
+
+def smooth_elevation(
+    values,
+    median_window: int = 6,
+    avg_window: int = 3,
+    outlier_window: int | None = None,
+    outlier_max_sigmas: float = 3.0,
+    outlier_min_deviation: float = 5.0,
+) -> np.ndarray:
+    """
+    Smooth an elevation stream before computing gain and loss.
+
+    Args:
+        values: Elevation values in meters.
+        median_window: Running median window size.
+        avg_window: Moving-average window size, applied after the median.
+        outlier_window: Window size used to reject spikes before smoothing,
+            None to disable outlier rejection.
+        outlier_max_sigmas: See reject_outliers.
+        outlier_min_deviation: See reject_outliers, in meters.
+
+    Returns:
+        float64 array with the smoothed elevations.
+    """
+    if outlier_window is not None:
+        values = reject_outliers(
+            values, outlier_window, outlier_max_sigmas, outlier_min_deviation
+        )
+
+    return running_mean(running_median(values, median_window), avg_window)
@@ -1,20 +1,16 @@
+import contextlib
 import gzip
+import io
 import os
 import shutil
-import asyncio
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
-import requests
-import statistics
-import time
-from geopy.distance import geodesic
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException, status, UploadFile
 
 from datetime import datetime
-from urllib.parse import urlencode
 from statistics import mean
 from sqlalchemy.orm import Session
 from sqlalchemy import func
@@ -22,9 +18,12 @@ from sqlalchemy import func
 import activities.activity.schema as activities_schema
 import activities.activity.crud as activities_crud
 import activities.activity.models as activities_models
+import activities.activity.signal_utils as activities_signal_utils
 
 import users.user.crud as users_crud
 
+import geocoding.utils as geocoding_utils
+
 import users.user_privacy_settings.crud as users_privacy_settings_crud
 import users.user_privacy_settings.schema as users_privacy_settings_schema
 
@@ -45,7 +44,6 @@ import fit.utils as fit_utils
 
 import core.logger as core_logger
 import core.config as core_config
-import core.database as core_database
 
 # Global Activity Type Mappings (ID to Name)
 ACTIVITY_ID_TO_NAME = {
@@ -373,133 +371,256 @@ def handle_gzipped_file(
             return temp_file.name, inner_file_extension
 
 
-async def parse_and_store_activity_from_file(
+def open_activity_file(file, mode: str = "rb"):
+    """
+    Open an activity file given by path, or reuse an in-memory file object.
+
+    Args:
+        file: Path of the file, or a file object such as io.BytesIO.
+        mode: Mode used to open paths.
+
+    Returns:
+        Context manager yielding the file object. File objects are rewound
+        and left open.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        return open(file, mode)
+
+    file.seek(0)
+    return contextlib.nullcontext(file)
+
+
+def parse_activity_file(
     token_user_id: int,
     file_path: str,
-    websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
     from_garmin: bool = False,
     garminconnect_gear: dict | None = None,
     activity_name: str | None = None,
-):
-    try:
-        core_logger.print_to_log_and_console(
-            f"Bulk file import: Beginning processing of {file_path}"
-        )
+    file_data: bytes | None = None,
+) -> tuple[str, str, list[dict]] | None:
+    """
+    Parse an activity file into the activities it contains, without storing them.
 
-        # Get file extension
-        _, file_extension = os.path.splitext(file_path)
-        garmin_connect_activity_id = None
+    Args:
+        token_user_id: ID of the user importing the file.
+        file_path: Path of the file to parse, gzipped files are decompressed
+            first. When file_data is set, only its name and extension are used.
+        db: Database session used by the parsers for user settings and gear lookups.
+        from_garmin: Whether the file was downloaded from Garmin Connect.
+        garminconnect_gear: Garmin Connect gear of the activity, if any.
+        activity_name: Optional name to use for the parsed activities.
+        file_data: Content of the file, parsed in memory without touching disk.
+
+    Returns:
+        Tuple of (path of the parsed file, its extension, list of parsed
+        activities ready for store_activity), or None if nothing was parsed.
+    """
+    # Get file extension
+    _, file_extension = os.path.splitext(file_path)
+    garmin_connect_activity_id = None
 
-        if from_garmin:
-            garmin_connect_activity_id = os.path.basename(file_path).split("_")[0]
+    if from_garmin:
+        garmin_connect_activity_id = os.path.basename(file_path).split("_")[0]
 
-        if file_extension.lower() == ".gz":
+    if file_extension.lower() == ".gz":
+        if file_data is None:
             file_path, file_extension = handle_gzipped_file(file_path)
+        else:
+            file_data = gzip.decompress(file_data)
+            file_path = str(Path(file_path).with_suffix(""))
+            file_extension = Path(file_path).suffix
 
-        # Open the file and process it
-        with open(file_path, "rb"):
-            user = users_crud.get_user_by_id(token_user_id, db)
-            if user is None:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail="User not found",
-                )
-
-            user_privacy_settings = (
-                users_privacy_settings_crud.get_user_privacy_settings_by_user_id(
-                    user.id, db
-                )
+    # Open the file and process it
+    with open_activity_file(file_path if file_data is None else io.BytesIO(file_data)):
+        user = users_crud.get_user_by_id(token_user_id, db)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
             )
 
-            # Parse the file
-            parsed_info = parse_file(
-                token_user_id,
-                user_privacy_settings,
-                file_extension,
-                file_path,
-                db,
-                activity_name,
+        user_privacy_settings = (
+            users_privacy_settings_crud.get_user_privacy_settings_by_user_id(
+                user.id, db
             )
+        )
 
-            if parsed_info is not None:
-                created_activities = []
-                idsToFileName = ""
-                if file_extension.lower() in (
-                    ".gpx",
-                    ".tcx",
-                ):
-                    # Store the activity in the database
-                    created_activity = await store_activity(
-                        parsed_info, websocket_manager, db
-                    )
-                    created_activities.append(created_activity)
-                    idsToFileName = idsToFileName + str(created_activity.id)
-                elif file_extension.lower() == ".fit":
-                    # Split the records by activity (check for multiple activities in the file)
-                    split_records_by_activity = fit_utils.split_records_by_activity(
-                        parsed_info
-                    )
+        # Parse the file
+        parsed_info = parse_file(
+            token_user_id,
+            user_privacy_settings,
+            file_extension,
+            file_path,
+            db,
+            activity_name,
+            file_data,
+        )
 
-                    # Create activity objects for each activity in the file
-                    if from_garmin:
-                        created_activities_objects = fit_utils.create_activity_objects(
-                            split_records_by_activity,
-                            token_user_id,
-                            user_privacy_settings,
-                            (
-                                int(garmin_connect_activity_id)
-                                if garmin_connect_activity_id
-                                else None
-                            ),
-                            garminconnect_gear if garminconnect_gear else None,
-                            db,
-                        )
-                    else:
-                        created_activities_objects = fit_utils.create_activity_objects(
-                            split_records_by_activity,
-                            token_user_id,
-                            user_privacy_settings,
-                            None,
-                            None,
-                            db,
-                        )
+        if parsed_info is None:
+            return None
 
-                    for activity in created_activities_objects:
-                        # Store the activity in the database
-                        created_activity = await store_activity(
-                            activity, websocket_manager, db
-                        )
-                        created_activities.append(created_activity)
-
-                    for index, activity in enumerate(created_activities):
-                        idsToFileName += str(activity.id)  # Add the id to the string
-                        # Add an underscore if it's not the last item
-                        if index < len(created_activities) - 1:
-                            idsToFileName += (
-                                "_"  # Add an underscore if it's not the last item
-                            )
-                else:
-                    # Should no longer get here due to screening of extensions in router.py, but why not.
-                    core_logger.print_to_log_and_console(
-                        f"File extension not supported: {file_extension}", "error"
-                    )
-                # Define the directory where the processed files will be stored
-                processed_dir = core_config.FILES_PROCESSED_DIR
+        if file_extension.lower() in (
+            ".gpx",
+            ".tcx",
+        ):
+            return file_path, file_extension, [parsed_info]
 
-                # Define new file path with activity ID as filename
-                new_file_name = f"{idsToFileName}{file_extension}"
+        if file_extension.lower() == ".fit":
+            # Split the records by activity (check for multiple activities in the file)
+            split_records_by_activity = fit_utils.split_records_by_activity(
+                parsed_info
+            )
 
-                # Move the file to the processed directory
-                move_file(processed_dir, new_file_name, file_path)
-                core_logger.print_to_log_and_console(
-                    f"Bulk file import: File successfully processed and moved. {file_path} - has become {new_file_name}"
+            # Create activity objects for each activity in the file
+            if from_garmin:
+                created_activities_objects = fit_utils.create_activity_objects(
+                    split_records_by_activity,
+                    token_user_id,
+                    user_privacy_settings,
+                    (
+                        int(garmin_connect_activity_id)
+                        if garmin_connect_activity_id
+                        else None
+                    ),
+                    garminconnect_gear if garminconnect_gear else None,
+                    db,
                 )
-
-                # Return the created activity
-                return created_activities
             else:
-                return None
+                created_activities_objects = fit_utils.create_activity_objects(
+                    split_records_by_activity,
+                    token_user_id,
+                    user_privacy_settings,
+                    None,
+                    None,
+                    db,
+                )
+
+            return file_path, file_extension, created_activities_objects
+
+        # Should no longer get here due to screening of extensions in router.py, but why not.
+        core_logger.print_to_log_and_console(
+            f"File extension not supported: {file_extension}", "error"
+        )
+        return file_path, file_extension, []
+
+
+async def store_parsed_activities(
+    parsed_activities: list[dict],
+    file_path: str,
+    file_extension: str,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+    file_data: bytes | None = None,
+) -> list[activities_schema.Activity]:
+    """
+    Store the activities parsed from a file and move the file to the processed directory.
+
+    Args:
+        parsed_activities: Activities returned by parse_activity_file.
+        file_path: Path of the parsed file.
+        file_extension: Extension of the parsed file.
+        websocket_manager: WebSocket manager used for notifications.
+        db: Database session.
+        file_data: Content of a file parsed in memory, written to the
+            processed directory instead of moving file_path.
+
+    Returns:
+        List of the created activities.
+    """
+    created_activities = []
+    for activity in parsed_activities:
+        # Store the activity in the database
+        created_activity = await store_activity(activity, websocket_manager, db)
+        created_activities.append(created_activity)
+
+    # Join the activity ids with underscores (multiple activities in one file)
+    ids_to_file_name = "_".join(str(activity.id) for activity in created_activities)
+
+    # Define the directory where the processed files will be stored
+    processed_dir = core_config.FILES_PROCESSED_DIR
+
+    # Define new file path with activity ID as filename
+    new_file_name = f"{ids_to_file_name}{file_extension}"
+
+    if file_data is None:
+        # Move the file to the processed directory
+        move_file(processed_dir, new_file_name, file_path)
+    else:
+        # Write the in-memory file once, straight into the processed directory
+        write_file(processed_dir, new_file_name, file_data)
+    core_logger.print_to_log_and_console(
+        f"Bulk file import: File successfully processed and moved. {file_path} - has become {new_file_name}"
+    )
+
+    return created_activities
+
+
+def move_file_to_import_errors(file_path: str, file_data: bytes | None = None):
+    """
+    Move a file that failed to import to the bulk import errors directory.
+
+    Args:
+        file_path: Path of the file that failed to import.
+        file_data: Content of a file parsed in memory, written to the import
+            errors directory under the file_path name.
+    """
+    try:
+        # Move the exception-causing file to an import errors directory.
+        error_file_dir = core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR
+        os.makedirs(error_file_dir, exist_ok=True)
+        if file_data is None:
+            move_file(error_file_dir, os.path.basename(file_path), file_path)
+        else:
+            write_file(error_file_dir, os.path.basename(file_path), file_data)
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Due to import error, file {file_path} has been moved to {error_file_dir}"
+        )
+    except Exception:
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Failed to move the error-producing file {file_path} to the import-error directory."
+        )
+
+
+async def parse_and_store_activity_from_file(
+    token_user_id: int,
+    file_path: str,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session,
+    from_garmin: bool = False,
+    garminconnect_gear: dict | None = None,
+    activity_name: str | None = None,
+    file_data: bytes | None = None,
+):
+    try:
+        core_logger.print_to_log_and_console(
+            f"Bulk file import: Beginning processing of {file_path}"
+        )
+
+        parsed_file = parse_activity_file(
+            token_user_id,
+            file_path,
+            db,
+            from_garmin,
+            garminconnect_gear,
+            activity_name,
+            file_data,
+        )
+
+        if parsed_file is None:
+            return None
+
+        parsed_file_path, file_extension, parsed_activities = parsed_file
+
+        # Store the activities and return them
+        return await store_parsed_activities(
+            parsed_activities,
+            parsed_file_path,
+            file_extension,
+            websocket_manager,
+            db,
+            file_data,
+        )
     # except HTTPException as http_err:
     # This is causing a crash on the back end when the try fails.  Looks like we cannot raise an http exception in a background task.
     # raise http_err
@@ -510,18 +631,7 @@ async def parse_and_store_activity_from_file(
             "error",
             exc=err,
         )
-        try:
-            # Move the exception-causing file to an import errors directory.
-            error_file_dir = core_config.FILES_BULK_IMPORT_IMPORT_ERRORS_DIR
-            os.makedirs(error_file_dir, exist_ok=True)
-            move_file(error_file_dir, os.path.basename(file_path), file_path)
-            core_logger.print_to_log_and_console(
-                f"Bulk file import: Due to import error, file {file_path} has been moved to {error_file_dir}"
-            )
-        except Exception:
-            core_logger.print_to_log_and_console(
-                f"Bulk file import: Failed to move the error-producing file {file_path} to the import-error directory."
-            )
+        move_file_to_import_errors(file_path, file_data)
 
 
 async def parse_and_store_activity_from_uploaded_file(
@@ -675,6 +785,24 @@ def move_file(new_dir: str, new_filename: str, file_path: str):
         ) from err
 
 
+def write_file(new_dir: str, new_filename: str, file_data: bytes):
+    try:
+        # Ensure the new directory exists
+        os.makedirs(new_dir, exist_ok=True)
+
+        # Write the file
+        with open(os.path.join(new_dir, new_filename), "wb") as new_file:
+            new_file.write(file_data)
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(f"Error in write_file - {str(err)}", "error", exc=err)
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Internal Server Error: {str(err)}",
+        ) from err
+
+
 def parse_file(
     token_user_id: int,
     user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
@@ -682,15 +810,18 @@ def parse_file(
     filename: str,
     db: Session,
     activity_name: str | None = None,
+    file_data: bytes | None = None,
 ) -> dict | None:
     try:
         if filename.lower() != "bulk_import/__init__.py":
             core_logger.print_to_log(f"Parsing file: {filename}")
+            # Parsers accept a path or an in-memory file object
+            file = filename if file_data is None else io.BytesIO(file_data)
             # Choose the appropriate parser based on file extension
             if file_extension.lower() == ".gpx":
                 # Parse the GPX file
                 parsed_info = gpx_utils.parse_gpx_file(
-                    filename,
+                    file,
                     token_user_id,
                     user_privacy_settings,
                     db,
@@ -698,7 +829,7 @@ def parse_file(
                 )
             elif file_extension.lower() == ".tcx":
                 parsed_info = tcx_utils.parse_tcx_file(
-                    filename,
+                    file,
                     token_user_id,
                     user_privacy_settings,
                     db,
@@ -706,7 +837,7 @@ def parse_file(
                 )
             elif file_extension.lower() == ".fit":
                 # Parse the FIT file
-                parsed_info = fit_utils.parse_fit_file(filename, db, activity_name)
+                parsed_info = fit_utils.parse_fit_file(file, db, activity_name)
             else:
                 # file extension not supported raise an HTTPException with a 406 Not Acceptable status code
                 raise HTTPException(
@@ -731,9 +862,47 @@ def parse_file(
 async def store_activity(
     parsed_info: dict, websocket_manager: websocket_schema.WebSocketManager, db: Session
 ):
-    # create the activity in the database
+    def build_children(activity_id: int) -> list:
+        children = []
+
+        # Parse the activity streams from the parsed info
+        activity_streams = parse_activity_streams_from_file(parsed_info, activity_id)
+
+        if activity_streams is not None:
+            children.extend(
+                activity_streams_crud.build_activity_streams(
+                    activity_streams,
+                    activity_streams_crud.get_user_max_heart_rate(
+                        parsed_info["activity"].user_id,
+                        parsed_info["activity"].start_time,
+                        db,
+                    ),
+                )
+            )
+
+        if parsed_info.get("laps") is not None:
+            children.extend(
+                activity_laps_crud.build_activity_laps(parsed_info["laps"], activity_id)
+            )
+
+        if parsed_info.get("workout_steps") is not None:
+            children.extend(
+                activity_workout_steps_crud.build_activity_workout_steps(
+                    parsed_info["workout_steps"], activity_id
+                )
+            )
+
+        if parsed_info.get("sets") is not None:
+            children.extend(
+                activity_sets_crud.build_activity_sets(parsed_info["sets"], activity_id)
+            )
+
+        return children
+
+    # create the activity and its streams, laps, workout steps and sets in a
+    # single transaction
     created_activity = await activities_crud.create_activity(
-        parsed_info["activity"], websocket_manager, db
+        parsed_info["activity"], websocket_manager, db, build_children=build_children
     )
 
     # Check if created_activity is None
@@ -749,33 +918,6 @@ async def store_activity(
             detail="Error creating activity",
         )
 
-    # Parse the activity streams from the parsed info
-    activity_streams = parse_activity_streams_from_file(
-        parsed_info, created_activity.id
-    )
-
-    if activity_streams is not None:
-        # Create activity streams in the database
-        activity_streams_crud.create_activity_streams(activity_streams, db)
-
-    if parsed_info.get("laps") is not None:
-        # Create activity laps in the database
-        activity_laps_crud.create_activity_laps(
-            parsed_info["laps"], created_activity.id, db
-        )
-
-    if parsed_info.get("workout_steps") is not None:
-        # Create activity workout steps in the database
-        activity_workout_steps_crud.create_activity_workout_steps(
-            parsed_info["workout_steps"], created_activity.id, db
-        )
-
-    if parsed_info.get("sets") is not None:
-        # Create activity sets in the database
-        activity_sets_crud.create_activity_sets(
-            parsed_info["sets"], created_activity.id, db
-        )
-
     # Return the created activity
     return created_activity
 
@@ -890,101 +1032,8 @@ def location_based_on_coordinates(latitude, longitude) -> dict | None:
             "country": None,
         }
 
-    # Create a dictionary with the parameters for the request
-    if core_config.REVERSE_GEO_PROVIDER == "nominatim":
-        # Create the URL for the request
-        url_params = {
-            "format": "jsonv2",
-            "lat": latitude,
-            "lon": longitude,
-        }
-        protocol = "https"
-        if not core_config.NOMINATIM_API_USE_HTTPS:
-            protocol = "http"
-        url = f"{protocol}://{core_config.NOMINATIM_API_HOST}/reverse?{urlencode(url_params)}"
-    elif core_config.REVERSE_GEO_PROVIDER == "photon":
-        # Create the URL for the request
-        url_params = {
-            "lat": latitude,
-            "lon": longitude,
-        }
-        protocol = "https"
-        if not core_config.PHOTON_API_USE_HTTPS:
-            protocol = "http"
-        url = f"{protocol}://{core_config.PHOTON_API_HOST}/reverse?{urlencode(url_params)}"
-    elif core_config.REVERSE_GEO_PROVIDER == "geocode":
-        # Check if the API key is set
-        if core_config.GEOCODES_MAPS_API == "changeme":
-            return {
-                "city": None,
-                "town": None,
-                "country": None,
-            }
-        # Create the URL for the request
-        url_params = {
-            "lat": latitude,
-            "lon": longitude,
-            "api_key": core_config.GEOCODES_MAPS_API,
-        }
-        url = f"https://geocode.maps.co/reverse?{urlencode(url_params)}"
-    else:
-        # If no provider is set, return None
-        return {
-            "city": None,
-            "town": None,
-            "country": None,
-        }
-
-    # Throttle requests according to configured rate limit
-    if core_config.REVERSE_GEO_MIN_INTERVAL > 0:
-        with core_config.REVERSE_GEO_LOCK:
-            now = time.monotonic()
-            interval = core_config.REVERSE_GEO_MIN_INTERVAL - (
-                now - core_config.REVERSE_GEO_LAST_CALL
-            )
-            if interval > 0:
-                time.sleep(interval)
-            core_config.REVERSE_GEO_LAST_CALL = time.monotonic()
-
-    # Make the request and get the response
-    try:
-        headers = {
-            "User-Agent": f"Endurain/{core_config.API_VERSION} (ReverseGeocoding)"
-        }
-        # Make the request and get the response
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-
-        if core_config.REVERSE_GEO_PROVIDER in ("geocode", "nominatim"):
-            # Get the data from the response
-            data = response.json().get("address", {})
-            # Return the location based on the coordinates
-            # Note: 'town' is used for district in Geocode API
-            return {
-                "city": data.get("city"),
-                "town": data.get("town"),
-                "country": data.get("country"),
-            }
-
-        # Get the data from the response
-        data_root = response.json().get("features", [])
-        data = data_root[0].get("properties", {}) if data_root else {}
-        # Return the location based on the coordinates
-        # Note: 'district' is used for city and 'city' is used for town in Photon API
-        return {
-            "city": data.get("district"),
-            "town": data.get("city"),
-            "country": data.get("country"),
-        }
-    except Exception as err:
-        # Log the error
-        core_logger.print_to_log_and_console(
-            f"Error in location_based_on_coordinates - {str(err)}", "error"
-        )
-        raise HTTPException(
-            status_code=status.HTTP_424_FAILED_DEPENDENCY,
-            detail=f"Error in location_based_on_coordinates: {str(err)}",
-        ) from err
+    # Resolve the location from the reverse geocoding cache, or the provider
+    return geocoding_utils.get_location(latitude, longitude)
 
 
 def append_if_not_none(waypoint_list, waypoint_time, value, key):
@@ -992,70 +1041,9 @@ def append_if_not_none(waypoint_list, waypoint_time, value, key):
         waypoint_list.append({"time": waypoint_time, key: value})
 
 
-def calculate_instant_speed(
-    prev_time, waypoint_time, latitude, longitude, prev_latitude, prev_longitude
-):
-    # Convert the time strings to datetime objects
-    time_calc = datetime.fromisoformat(waypoint_time.strftime("%Y-%m-%dT%H:%M:%S"))
-
-    # If prev_time is None, return a default value
-    if prev_time is None:
-        return 0
-
-    # Convert the time strings to datetime objects
-    prev_time_calc = datetime.fromisoformat(prev_time.strftime("%Y-%m-%dT%H:%M:%S"))
-
-    # Calculate the time difference in seconds
-    time_difference = (time_calc - prev_time_calc).total_seconds()
-
-    # If the time difference is positive, calculate the instant speed
-    if time_difference > 0:
-        # Calculate the distance in meters
-        distance = geodesic(
-            (prev_latitude, prev_longitude), (latitude, longitude)
-        ).meters
-
-        # Calculate the instant speed in m/s
-        instant_speed = distance / time_difference
-    else:
-        # If the time difference is not positive, return a default value
-        instant_speed = 0
-
-    # Return the instant speed
-    return instant_speed
-
-
 def compute_elevation_gain_and_loss(
     elevations, median_window=6, avg_window=3, threshold=0.1
 ):
-    # 1) Median Filter
-    def median_filter(values, window_size):
-        if window_size < 2:
-            return values[:]
-        half = window_size // 2
-        filtered = []
-        for i in range(len(values)):
-            start = max(0, i - half)
-            end = min(len(values), i + half + 1)
-            window_vals = values[start:end]
-            m = statistics.median(window_vals)
-            filtered.append(m)
-        return filtered
-
-    # 2) Moving-Average Smoothing
-    def moving_average(values, window_size):
-        if window_size < 2:
-            return values[:]
-        half = window_size // 2
-        smoothed = []
-        n = len(values)
-        for i in range(n):
-            start = max(0, i - half)
-            end = min(n, i + half + 1)
-            window_vals = values[start:end]
-            smoothed.append(statistics.mean(window_vals))
-        return smoothed
-
     try:
         # Get the values from the elevations
         values = [float(waypoint["ele"]) for waypoint in elevations]
@@ -1064,19 +1052,12 @@ def compute_elevation_gain_and_loss(
         return 0, 0
 
     # Apply median filter -> then average smoothing
-    filtered = median_filter(values, median_window)
-    filtered = moving_average(filtered, avg_window)
+    filtered = activities_signal_utils.smooth_elevation(
+        values, median_window=median_window, avg_window=avg_window
+    )
 
-    # 3) Compute gain/loss with threshold
-    total_gain = 0.0
-    total_loss = 0.0
-    for i in range(1, len(filtered)):
-        diff = filtered[i] - filtered[i - 1]
-        if diff > threshold:
-            total_gain += diff
-        elif diff < -threshold:
-            total_loss -= diff  # diff is negative, so subtracting it is adding positive
-    return total_gain, total_loss
+    # Compute gain/loss with threshold
+    return activities_signal_utils.threshold_gain_and_loss(filtered, threshold)
 
 
 def calculate_pace(distance, first_waypoint_time, last_waypoint_time):
@@ -1175,42 +1156,3 @@ def set_activity_name_based_on_activity_type(activity_type_id: int) -> str:
 
     # If type is not 10 (Workout), return the mapping with " workout" suffix
     return mapping + " workout" if mapping != "Workout" else mapping
-
-
-def process_all_files_sync(
-    user_id: int,
-    file_paths: list[str],
-    websocket_manager: websocket_schema.WebSocketManager,
-):
-    """
-    Process all files sequentially in single thread.
-
-    Args:
-        user_id: User ID.
-        file_paths: List of file paths to process.
-        websocket_manager: WebSocket manager instance.
-    """
-    db = next(core_database.get_db())
-    try:
-        total_files = len(file_paths)
-        for idx, file_path in enumerate(file_paths, 1):
-            core_logger.print_to_log_and_console(
-                f"Processing file {idx}/{total_files}: " f"{file_path}"
-            )
-            asyncio.run(
-                parse_and_store_activity_from_file(
-                    user_id,
-                    file_path,
-                    websocket_manager,
-                    db,
-                )
-            )
-            # Small delay between files
-            time.sleep(0.1)
-
-        core_logger.print_to_log_and_console(
-            f"Bulk import completed: {total_files} files "
-            f"processed for user {user_id}"
-        )
-    finally:
-        db.close()
@@ -180,65 +180,75 @@ def get_public_activity_laps(activity_id: int, db: Session):
         ) from err
 
 
+def build_activity_laps(
+    activity_laps: list[activity_laps_schema.ActivityLaps],
+    activity_id: int,
+) -> list[activity_laps_models.ActivityLaps]:
+    # Create a list to store the ActivityLaps objects
+    laps = []
+
+    # Iterate over the list of ActivityLaps objects
+    for lap in activity_laps:
+        # Create an ActivityLaps object
+        db_stream = activity_laps_models.ActivityLaps(
+            activity_id=activity_id,
+            **{
+                key: lap.get(key)
+                for key in [
+                    "start_time",
+                    "start_position_lat",
+                    "start_position_long",
+                    "end_position_lat",
+                    "end_position_long",
+                    "total_elapsed_time",
+                    "total_timer_time",
+                    "total_distance",
+                    "total_cycles",
+                    "total_calories",
+                    "avg_heart_rate",
+                    "max_heart_rate",
+                    "avg_cadence",
+                    "max_cadence",
+                    "avg_power",
+                    "max_power",
+                    "total_ascent",
+                    "total_descent",
+                    "intensity",
+                    "lap_trigger",
+                    "sport",
+                    "sub_sport",
+                    "normalized_power",
+                    "total_work",
+                    "avg_vertical_oscillation",
+                    "avg_stance_time",
+                    "avg_fractional_cadence",
+                    "max_fractional_cadence",
+                    "enhanced_avg_pace",
+                    "enhanced_avg_speed",
+                    "enhanced_max_pace",
+                    "enhanced_max_speed",
+                    "enhanced_min_altitude",
+                    "enhanced_max_altitude",
+                    "avg_vertical_ratio",
+                    "avg_step_length",
+                ]
+            },
+        )
+
+        # Append the object to the list
+        laps.append(db_stream)
+
+    return laps
+
+
 def create_activity_laps(
     activity_laps: list[activity_laps_schema.ActivityLaps],
     activity_id: int,
     db: Session,
 ):
     try:
-        # Create a list to store the ActivityLaps objects
-        laps = []
-
-        # Iterate over the list of ActivityLaps objects
-        for lap in activity_laps:
-            # Create an ActivityLaps object
-            db_stream = activity_laps_models.ActivityLaps(
-                activity_id=activity_id,
-                **{
-                    key: lap.get(key)
-                    for key in [
-                        "start_time",
-                        "start_position_lat",
-                        "start_position_long",
-                        "end_position_lat",
-                        "end_position_long",
-                        "total_elapsed_time",
-                        "total_timer_time",
-                        "total_distance",
-                        "total_cycles",
-                        "total_calories",
-                        "avg_heart_rate",
-                        "max_heart_rate",
-                        "avg_cadence",
-                        "max_cadence",
-                        "avg_power",
-                        "max_power",
-                        "total_ascent",
-                        "total_descent",
-                        "intensity",
-                        "lap_trigger",
-                        "sport",
-                        "sub_sport",
-                        "normalized_power",
-                        "total_work",
-                        "avg_vertical_oscillation",
-                        "avg_stance_time",
-                        "avg_fractional_cadence",
-                        "max_fractional_cadence",
-                        "enhanced_avg_pace",
-                        "enhanced_avg_speed",
-                        "enhanced_max_pace",
-                        "enhanced_max_speed",
-                        "enhanced_min_altitude",
-                        "enhanced_max_altitude",
-                        "avg_vertical_ratio",
-                        "avg_step_length",
-                    ]
-                },
-            )
-
-            # Append the object to the list
-            laps.append(db_stream)
+        # Create the ActivityLaps objects
+        laps = build_activity_laps(activity_laps, activity_id)
 
         # Bulk insert the list of ActivityLaps objects
         db.bulk_save_objects(laps)
@@ -1,14 +1,30 @@
+from collections.abc import Callable
 from zoneinfo import ZoneInfo
 
 from datetime import datetime
 
+import numpy as np
+
 import activities.activity_laps.schema as activity_laps_schema
 
 import activities.activity.schema as activities_schema
+import activities.activity.utils as activities_utils
+import activities.activity.trackpoint_utils as activities_trackpoint_utils
 
 import core.config as core_config
 
-def serialize_activity_lap(activity: activities_schema.Activity, activity_lap: activity_laps_schema.ActivityLaps):
+# Auto lap triggers, stored in the lap_trigger column
+LAP_TRIGGER_DISTANCE = "distance"
+LAP_TRIGGER_TIME = "time"
+
+# Auto lap distance used when the activity type has no custom distance
+DEFAULT_AUTO_LAP_DISTANCE_KM = 1.0
+
+
+def serialize_activity_lap(
+    activity: activities_schema.Activity,
+    activity_lap: activity_laps_schema.ActivityLaps,
+):
     def make_aware_and_format(dt, timezone):
         if isinstance(dt, str):
             dt = datetime.fromisoformat(dt)
@@ -17,11 +33,303 @@ def serialize_activity_lap(activity: activities_schema.Activity, activity_lap: a
         return dt.astimezone(timezone).strftime("%Y-%m-%dT%H:%M:%S")
 
     timezone = (
-        ZoneInfo(activity.timezone)
-        if activity.timezone
-        else ZoneInfo(core_config.TZ)
+        ZoneInfo(activity.timezone) if activity.timezone else ZoneInfo(core_config.TZ)
     )
 
     activity_lap.start_time = make_aware_and_format(activity_lap.start_time, timezone)
 
-    return activity_lap
\ No newline at end of file
+    return activity_lap
+
+
+def get_auto_lap_distance_km(activity_type: int | None) -> float:
+    """
+    Get the auto lap distance for an activity type.
+
+    Args:
+        activity_type: Activity type ID, or None.
+
+    Returns:
+        The distance configured in AUTO_LAP_DISTANCES_KM for the activity
+        type, or DEFAULT_AUTO_LAP_DISTANCE_KM.
+    """
+    return core_config.AUTO_LAP_DISTANCES_KM.get(
+        activity_type, DEFAULT_AUTO_LAP_DISTANCE_KM
+    )
+
+
+def get_auto_lap_seconds(activity_type: int | None) -> float | None:
+    """
+    Get the auto lap duration for an activity type.
+
+    Args:
+        activity_type: Activity type ID, or None.
+
+    Returns:
+        The duration configured in AUTO_LAP_SECONDS for the activity type, or
+        None if its laps are split by distance.
+    """
+    return core_config.AUTO_LAP_SECONDS.get(activity_type)
+
+
+def split_lap_boundaries(
+    values: np.ndarray,
+    lap_size: float,
+    keep_partial_lap: Callable[[int, int], bool],
+) -> list[tuple[int, int]]:
+    """
+    Split a monotonic series into laps of a given size.
+
+    A lap ends at the first point where the series advanced by at least
+    lap_size since the lap start, and the next lap starts at that point.
+
+    Args:
+        values: Non-decreasing series, e.g. cumulative distance or seconds.
+        lap_size: Amount the series must advance to complete a lap.
+        keep_partial_lap: Receives the (start, end) indexes of the remaining
+            points and returns whether they form a final lap.
+
+    Returns:
+        List of (start index, end index) tuples, both inclusive.
+    """
+    boundaries = []
+    if len(values) < 2 or lap_size <= 0:
+        return boundaries
+
+    start = 0
+    last = len(values) - 1
+    while start < last:
+        end = int(np.searchsorted(values, values[start] + lap_size, side="left"))
+        # Guarantee progress on floating point ties
+        end = max(end, start + 1)
+        if end > last:
+            break
+        boundaries.append((start, end))
+        start = end
+
+    if start < last and keep_partial_lap(start, last):
+        boundaries.append((start, last))
+
+    return boundaries
+
+
+def slice_waypoints_by_time(
+    waypoints: list[dict],
+) -> Callable[[int, int], list[dict]]:
+    """
+    Build a slicer returning the waypoints inside a time window.
+
+    Waypoint times are parsed once. Sorted streams are sliced with a binary
+    search, unsorted ones fall back to a vectorized mask.
+
+    Args:
+        waypoints: Waypoints with a "%Y-%m-%dT%H:%M:%S" time key.
+
+    Returns:
+        Function (start_seconds, end_seconds) -> list of waypoints whose time
+        is within the window, both ends inclusive.
+    """
+    seconds = activities_trackpoint_utils.to_epoch_seconds(
+        [waypoint["time"] for waypoint in waypoints]
+    )
+    is_sorted = bool(np.all(seconds[1:] >= seconds[:-1]))
+
+    def slice_window(start_seconds: int, end_seconds: int) -> list[dict]:
+        if is_sorted:
+            start = np.searchsorted(seconds, start_seconds, side="left")
+            end = np.searchsorted(seconds, end_seconds, side="right")
+            return waypoints[start:end]
+
+        indexes = np.flatnonzero((seconds >= start_seconds) & (seconds <= end_seconds))
+        return [waypoints[index] for index in indexes]
+
+    return slice_window
+
+
+def build_auto_lap(
+    lat_lon_waypoints: list[dict],
+    start: int,
+    end: int,
+    seconds: np.ndarray,
+    cumulative_distances: np.ndarray,
+    stream_slicers: dict,
+    lap_trigger: str,
+) -> dict:
+    """
+    Build a lap dictionary for the waypoints between two indexes.
+
+    Args:
+        lat_lon_waypoints: Position waypoints of the activity.
+        start: Index of the first lap waypoint.
+        end: Index of the last lap waypoint.
+        seconds: Seconds of each position waypoint.
+        cumulative_distances: Cumulative distance of each position waypoint in meters.
+        stream_slicers: Mapping of stream key to slice_waypoints_by_time slicer.
+        lap_trigger: LAP_TRIGGER_DISTANCE or LAP_TRIGGER_TIME.
+
+    Returns:
+        Lap dictionary in the format used by activity_laps_crud.create_activity_laps.
+    """
+    start_seconds, end_seconds = int(seconds[start]), int(seconds[end])
+    lap_ele_waypoints = stream_slicers["ele"](start_seconds, end_seconds)
+    lap_power_waypoints = stream_slicers["power"](start_seconds, end_seconds)
+    lap_hr_waypoints = stream_slicers["hr"](start_seconds, end_seconds)
+    lap_cad_waypoints = stream_slicers["cad"](start_seconds, end_seconds)
+    lap_vel_waypoints = stream_slicers["vel"](start_seconds, end_seconds)
+    ele_gain, ele_loss = None, None
+    avg_hr, max_hr = None, None
+    avg_cadence, max_cadence = None, None
+    avg_speed, max_speed = None, None
+    avg_power, max_power, np_value = None, None, None
+
+    # Calculate total ascent and descent
+    if lap_ele_waypoints:
+        ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
+            elevations=lap_ele_waypoints
+        )
+
+    # Calculate average and maximum heart rate
+    if lap_hr_waypoints:
+        avg_hr, max_hr = activities_utils.calculate_avg_and_max(lap_hr_waypoints, "hr")
+
+    # Calculate average and maximum cadence
+    if lap_cad_waypoints:
+        avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
+            lap_cad_waypoints, "cad"
+        )
+
+    # Calculate average and maximum velocity
+    if lap_vel_waypoints:
+        avg_speed, max_speed = activities_utils.calculate_avg_and_max(
+            lap_vel_waypoints, "vel"
+        )
+
+    # Calculate average and maximum power
+    if lap_power_waypoints:
+        avg_power, max_power = activities_utils.calculate_avg_and_max(
+            lap_power_waypoints, "power"
+        )
+
+        # Calculate normalised power
+        np_value = activities_utils.calculate_np(lap_power_waypoints)
+
+    elapsed_time = float(end_seconds - start_seconds)
+
+    return {
+        "start_time": lat_lon_waypoints[start]["time"],
+        "start_position_lat": lat_lon_waypoints[start]["lat"],
+        "start_position_long": lat_lon_waypoints[start]["lon"],
+        "end_position_lat": lat_lon_waypoints[end]["lat"],
+        "end_position_long": lat_lon_waypoints[end]["lon"],
+        "total_elapsed_time": elapsed_time,
+        "total_timer_time": elapsed_time,
+        "total_distance": float(
+            cumulative_distances[end] - cumulative_distances[start]
+        ),
+        "avg_heart_rate": round(avg_hr) if avg_hr else None,
+        "max_heart_rate": round(max_hr) if max_hr else None,
+        "avg_cadence": round(avg_cadence) if avg_cadence else None,
+        "max_cadence": round(max_cadence) if max_cadence else None,
+        "avg_power": round(avg_power) if avg_power else None,
+        "max_power": round(max_power) if max_power else None,
+        "total_ascent": round(ele_gain) if ele_gain else None,
+        "total_descent": round(ele_loss) if ele_loss else None,
+        "normalized_power": round(np_value) if np_value else None,
+        "lap_trigger": lap_trigger,
+        "enhanced_avg_pace": (
+            1 / avg_speed if avg_speed != 0 and avg_speed is not None else None
+        ),
+        "enhanced_avg_speed": avg_speed,
+        "enhanced_max_pace": (
+            1 / max_speed if max_speed != 0 and max_speed is not None else None
+        ),
+        "enhanced_max_speed": max_speed,
+    }
+
+
+def generate_auto_laps(
+    lat_lon_waypoints: list[dict],
+    ele_waypoints: list[dict],
+    power_waypoints: list[dict],
+    hr_waypoints: list[dict],
+    cad_waypoints: list[dict],
+    vel_waypoints: list[dict],
+    distance_per_lap_km: float | None = None,
+    time_per_lap_seconds: float | None = None,
+    activity_type: int | None = None,
+) -> list[dict]:
+    """
+    Split an activity without recorded laps into auto laps.
+
+    Laps are split by distance if distance_per_lap_km is set, by time if
+    time_per_lap_seconds is set, otherwise as configured for the activity
+    type: by time if it has a lap duration, see get_auto_lap_seconds, or by
+    its lap distance, see get_auto_lap_distance_km. Each stream is parsed once
+    and sliced per lap, so the whole split is linear in the number of
+    waypoints.
+
+    Args:
+        lat_lon_waypoints: Position waypoints of the activity.
+        ele_waypoints: Elevation waypoints.
+        power_waypoints: Power waypoints.
+        hr_waypoints: Heart rate waypoints.
+        cad_waypoints: Cadence waypoints.
+        vel_waypoints: Velocity waypoints.
+        distance_per_lap_km: Lap distance in kilometers.
+        time_per_lap_seconds: Lap duration in seconds.
+        activity_type: Activity type ID used to pick the lap distance.
+
+    Returns:
+        List of lap dictionaries.
+    """
+    if len(lat_lon_waypoints) < 2:
+        return []
+
+    kinematics = activities_trackpoint_utils.compute_track_kinematics(
+        [waypoint["time"] for waypoint in lat_lon_waypoints],
+        [waypoint["lat"] for waypoint in lat_lon_waypoints],
+        [waypoint["lon"] for waypoint in lat_lon_waypoints],
+    )
+    seconds = kinematics["seconds"]
+    cumulative_distances = kinematics["cumulative_distances"]
+
+    if distance_per_lap_km is None and time_per_lap_seconds is None:
+        time_per_lap_seconds = get_auto_lap_seconds(activity_type)
+
+    if distance_per_lap_km is None and time_per_lap_seconds is not None:
+        lap_trigger = LAP_TRIGGER_TIME
+        boundaries = split_lap_boundaries(
+            # Elapsed time can go backwards in files with unordered points
+            np.maximum.accumulate(seconds),
+            time_per_lap_seconds,
+            lambda start, end: True,
+        )
+    else:
+        if distance_per_lap_km is None:
+            distance_per_lap_km = get_auto_lap_distance_km(activity_type)
+        lap_trigger = LAP_TRIGGER_DISTANCE
+        boundaries = split_lap_boundaries(
+            cumulative_distances,
+            distance_per_lap_km * 1000,
+            lambda start, end: cumulative_distances[end] > cumulative_distances[start],
+        )
+
+    stream_slicers = {
+        "ele": slice_waypoints_by_time(ele_waypoints),
+        "power": slice_waypoints_by_time(power_waypoints),
+        "hr": slice_waypoints_by_time(hr_waypoints),
+        "cad": slice_waypoints_by_time(cad_waypoints),
+        "vel": slice_waypoints_by_time(vel_waypoints),
+    }
+
+    return [
+        build_auto_lap(
+            lat_lon_waypoints,
+            start,
+            end,
+            seconds,
+            cumulative_distances,
+            stream_slicers,
+            lap_trigger,
+        )
+        for start, end in boundaries
+    ]
@@ -5,4 +5,7 @@ STREAM_TYPE_CADENCE = 3
 STREAM_TYPE_ELEVATION = 4
 STREAM_TYPE_SPEED = 5
 STREAM_TYPE_PACE = 6
-STREAM_TYPE_MAP = 7
\ No newline at end of file
+STREAM_TYPE_MAP = 7
+
+# Heart rate zone lower bounds, as fractions of the maximum heart rate
+HR_ZONE_THRESHOLDS = (0.6, 0.7, 0.8, 0.9)
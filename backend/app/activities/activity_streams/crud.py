@@ -1,11 +1,13 @@
+from datetime import datetime
+
 from fastapi import HTTPException, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-import numpy as np
-import datetime
 
 import activities.activity_streams.constants as activity_streams_constants
 import activities.activity_streams.schema as activity_streams_schema
 import activities.activity_streams.models as activity_streams_models
+import activities.activity_streams.utils as activity_streams_utils
 
 import activities.activity.crud as activity_crud
 import activities.activity.models as activity_models
@@ -13,10 +15,13 @@ import activities.activity.schema as activities_schema
 
 import server_settings.utils as server_settings_utils
 
-import users.user.crud as users_crud
+import users.user.models as users_models
 
 import core.logger as core_logger
 
+# Number of HR streams recomputed per query
+HR_ZONES_BATCH_SIZE = 200
+
 
 def get_activity_streams(
     activity_id: int, token_user_id: int, db: Session
@@ -88,11 +93,8 @@ def get_activity_streams(
                 )
             ]
 
-        # Return the activity streams
-        return [
-            transform_activity_streams(stream, activity, db)
-            for stream in activity_streams
-        ]
+        # Return the activity streams, HR streams hold their zone percentages
+        return activity_streams
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -125,9 +127,6 @@ def get_activities_streams(
         if not activities:
             return []
 
-        # Map: activity_id -> activity
-        activity_map = {activity.id: activity for activity in activities}
-
         # Filter out hidden sets for activities the user doesn't own
         allowed_ids = [
             activity.id for activity in activities if activity.user_id == token_user_id
@@ -148,11 +147,8 @@ def get_activities_streams(
         if not all_streams:
             return []
 
-        # Transform all allowed streams
-        return [
-            transform_activity_streams(stream, activity_map[stream.activity_id], db)
-            for stream in all_streams
-        ]
+        # Return all allowed streams, HR streams hold their zone percentages
+        return all_streams
 
     except Exception as err:
         core_logger.print_to_log(
@@ -239,11 +235,8 @@ def get_public_activity_streams(activity_id: int, db: Session):
             )
         ]
 
-        # Return the activity streams
-        return [
-            transform_activity_streams(stream, activity, db)
-            for stream in activity_streams
-        ]
+        # Return the activity streams, HR streams hold their zone percentages
+        return activity_streams
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -329,7 +322,7 @@ def get_activity_stream_by_type(
                 return None
 
         # Return the activity stream
-        return transform_activity_streams(activity_stream, activity, db)
+        return activity_stream
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -342,108 +335,6 @@ def get_activity_stream_by_type(
         ) from err
 
 
-def transform_activity_streams(activity_stream, activity, db):
-    """
-    Transforms an activity stream based on its stream type.
-    If the stream type of the given activity_stream is heart rate (HR), this function delegates
-    the transformation to the `transform_activity_streams_hr` function. Otherwise, it returns
-    the activity_stream unchanged.
-    Args:
-        activity_stream: The activity stream object to be transformed.
-        activity: The activity object associated with the stream.
-        db: The database session or connection object.
-    Returns:
-        The transformed activity stream if the stream type is HR, otherwise the original activity_stream.
-    """
-    if activity_stream.stream_type == activity_streams_constants.STREAM_TYPE_HR:
-        return transform_activity_streams_hr(activity_stream, activity, db)
-
-    return activity_stream
-
-
-def transform_activity_streams_hr(activity_stream, activity, db):
-    """
-    Transforms an activity stream by calculating the percentage of time spent in each heart rate zone based on user details.
-    Args:
-        activity_stream: The activity stream object containing waypoints with heart rate data.
-        activity: The activity object associated with the stream, used to retrieve the user ID.
-        db: The database session or connection used to fetch user details.
-    Returns:
-        The activity stream object with an added 'hr_zone_percentages' attribute, which contains the percentage of time spent in each heart rate zone and their respective HR boundaries. If waypoints or user details are missing, returns the original activity stream unchanged.
-    Notes:
-        - Heart rate zones are calculated using the formula: max_heart_rate = 220 - age.
-        - The function expects waypoints to be a list of dicts with an "hr" key.
-        - If no valid heart rate data is present, the activity stream is returned as is.
-    """
-    # Check if the activity stream has waypoints
-    waypoints = activity_stream.stream_waypoints
-    if not waypoints or not isinstance(waypoints, list):
-        # If there are no waypoints, return the activity stream as is
-        return activity_stream
-
-    # Get the user details to calculate heart rate zones
-    detail_user = users_crud.get_user_by_id(activity.user_id, db)
-    if not detail_user:
-        # If user details are not available, return the activity stream as is
-        return activity_stream
-
-    # Use user's max_heart_rate if set, otherwise calculate based on age formula
-    if detail_user.max_heart_rate:
-        max_heart_rate = detail_user.max_heart_rate
-    elif detail_user.birthdate:
-        # Calculate the maximum heart rate based on the user's birthdate
-        year = int(detail_user.birthdate.split("-")[0])
-        current_year = datetime.datetime.now().year
-        max_heart_rate = 220 - (current_year - year)
-    else:
-        # If neither max_heart_rate nor birthdate is available, return the activity stream as is
-        return activity_stream
-
-    # Calculate heart rate zones based on the maximum heart rate
-    zone_1 = max_heart_rate * 0.6
-    zone_2 = max_heart_rate * 0.7
-    zone_3 = max_heart_rate * 0.8
-    zone_4 = max_heart_rate * 0.9
-
-    # Extract heart rate values from waypoints
-    hr_values = np.array(
-        [float(wp.get("hr")) for wp in waypoints if wp.get("hr") is not None]
-    )
-
-    # If there are no valid heart rate values, return the activity stream as is
-    total = len(hr_values)
-    if total == 0:
-        return activity_stream
-
-    # Calculate the percentage of time spent in each heart rate zone
-    zone_counts = [
-        np.sum(hr_values < zone_1),
-        np.sum((hr_values >= zone_1) & (hr_values < zone_2)),
-        np.sum((hr_values >= zone_2) & (hr_values < zone_3)),
-        np.sum((hr_values >= zone_3) & (hr_values < zone_4)),
-        np.sum(hr_values >= zone_4),
-    ]
-    zone_percentages = [round((count / total) * 100, 2) for count in zone_counts]
-
-    # Calculate zone HR boundaries for display
-    zone_hr = {
-        "zone_1": f"< {int(zone_1)}",
-        "zone_2": f"{int(zone_1)} - {int(zone_2) - 1}",
-        "zone_3": f"{int(zone_2)} - {int(zone_3) - 1}",
-        "zone_4": f"{int(zone_3)} - {int(zone_4) - 1}",
-        "zone_5": f">= {int(zone_4)}",
-    }
-    activity_stream.hr_zone_percentages = {
-        "zone_1": {"percent": zone_percentages[0], "hr": zone_hr["zone_1"]},
-        "zone_2": {"percent": zone_percentages[1], "hr": zone_hr["zone_2"]},
-        "zone_3": {"percent": zone_percentages[2], "hr": zone_hr["zone_3"]},
-        "zone_4": {"percent": zone_percentages[3], "hr": zone_hr["zone_4"]},
-        "zone_5": {"percent": zone_percentages[4], "hr": zone_hr["zone_5"]},
-    }
-
-    return activity_stream
-
-
 def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: Session):
     try:
         # Check if public sharable links are enabled in server settings
@@ -523,7 +414,7 @@ def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: S
             return None
 
         # Return the activity stream
-        return transform_activity_streams(activity_stream, activity, db)
+        return activity_stream
     except Exception as err:
         # Log the exception
         core_logger.print_to_log(
@@ -536,36 +427,170 @@ def get_public_activity_stream_by_type(activity_id: int, stream_type: int, db: S
         ) from err
 
 
+def get_user_max_heart_rate(
+    user_id: int, activity_start_time: datetime | str | None, db: Session
+) -> int | None:
+    """
+    Get the maximum heart rate of a user at the time of an activity.
+
+    Args:
+        user_id: User ID.
+        activity_start_time: Activity start time.
+        db: Database session.
+
+    Returns:
+        The maximum heart rate, or None if the user has neither a maximum
+        heart rate nor a birthdate.
+    """
+    user = (
+        db.query(users_models.User.max_heart_rate, users_models.User.birthdate)
+        .filter(users_models.User.id == user_id)
+        .first()
+    )
+    if user is None:
+        return None
+
+    return activity_streams_utils.calculate_max_heart_rate(
+        user.max_heart_rate, user.birthdate, activity_start_time
+    )
+
+
+def build_activity_streams(
+    activity_streams: list[activity_streams_schema.ActivityStreams],
+    max_heart_rate: int | None = None,
+) -> list[activity_streams_models.ActivityStreams]:
+    # Create an ActivityStreams object for each stream, waypoints are stored
+    # in the columnar, compressed encoding whenever they can be encoded. The
+    # HR zone percentages are computed once here and served as stored
+    return [
+        activity_streams_models.ActivityStreams(
+            activity_id=stream.activity_id,
+            stream_type=stream.stream_type,
+            stream_waypoints=stream.stream_waypoints,
+            strava_activity_stream_id=stream.strava_activity_stream_id,
+            hr_zone_percentages=(
+                activity_streams_utils.calculate_hr_zone_percentages(
+                    activity_streams_utils.get_stream_hr_values(
+                        None, stream.stream_waypoints
+                    ),
+                    max_heart_rate,
+                )
+                if stream.stream_type == activity_streams_constants.STREAM_TYPE_HR
+                else None
+            ),
+        )
+        for stream in activity_streams
+    ]
+
+
 def create_activity_streams(
-    activity_streams: list[activity_streams_schema.ActivityStreams], db: Session
+    activity_streams: list[activity_streams_schema.ActivityStreams],
+    db: Session,
+    max_heart_rate: int | None = None,
 ):
     try:
-        # Create a list to store the ActivityStreams objects
-        streams = []
-
-        # Iterate over the list of ActivityStreams objects
-        for stream in activity_streams:
-            # Create an ActivityStreams object
-            db_stream = activity_streams_models.ActivityStreams(
-                activity_id=stream.activity_id,
-                stream_type=stream.stream_type,
-                stream_waypoints=stream.stream_waypoints,
-                strava_activity_stream_id=stream.strava_activity_stream_id,
+        # Bulk insert the ActivityStreams objects
+        db.bulk_save_objects(build_activity_streams(activity_streams, max_heart_rate))
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log_and_console(
+            f"Error in create_activity_streams: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def edit_user_hr_zone_percentages(user_id: int, db: Session) -> int:
+    """
+    Recompute the HR zone percentages of all HR streams of a user.
+
+    Call it when the user maximum heart rate or birthdate changes. Streams are
+    processed in batches of HR_ZONES_BATCH_SIZE, only their heart rate values
+    are decoded.
+
+    Args:
+        user_id: User ID.
+        db: Database session.
+
+    Returns:
+        The number of HR streams updated.
+    """
+    try:
+        user = (
+            db.query(users_models.User.max_heart_rate, users_models.User.birthdate)
+            .filter(users_models.User.id == user_id)
+            .first()
+        )
+        if user is None:
+            return 0
+
+        updated_streams = 0
+        last_stream_id = 0
+        while True:
+            # Get the next batch of HR streams, without loading ORM instances
+            streams = (
+                db.query(
+                    activity_streams_models.ActivityStreams.id,
+                    activity_streams_models.ActivityStreams.stream_data,
+                    activity_streams_models.ActivityStreams.stream_waypoints_json,
+                    activity_models.Activity.start_time,
+                )
+                .join(
+                    activity_models.Activity,
+                    activity_models.Activity.id
+                    == activity_streams_models.ActivityStreams.activity_id,
+                )
+                .filter(
+                    activity_models.Activity.user_id == user_id,
+                    activity_streams_models.ActivityStreams.stream_type
+                    == activity_streams_constants.STREAM_TYPE_HR,
+                    activity_streams_models.ActivityStreams.id > last_stream_id,
+                )
+                .order_by(activity_streams_models.ActivityStreams.id)
+                .limit(HR_ZONES_BATCH_SIZE)
+                .all()
             )
+            if not streams:
+                break
 
-            # Append the object to the list
-            streams.append(db_stream)
+            zone_updates = []
+            for stream in streams:
+                max_heart_rate = activity_streams_utils.calculate_max_heart_rate(
+                    user.max_heart_rate, user.birthdate, stream.start_time
+                )
+                hr_values = activity_streams_utils.get_stream_hr_values(
+                    stream.stream_data, stream.stream_waypoints_json
+                )
+                zone_updates.append(
+                    {
+                        "id": stream.id,
+                        "hr_zone_percentages": activity_streams_utils.calculate_hr_zone_percentages(
+                            hr_values, max_heart_rate
+                        ),
+                    }
+                )
+
+            # Bulk update the batch by primary key
+            db.execute(update(activity_streams_models.ActivityStreams), zone_updates)
+            updated_streams += len(streams)
+            last_stream_id = streams[-1].id
 
-        # Bulk insert the list of ActivityStreams objects
-        db.bulk_save_objects(streams)
         db.commit()
+        return updated_streams
     except Exception as err:
         # Rollback the transaction
         db.rollback()
 
         # Log the exception
-        core_logger.print_to_log_and_console(
-            f"Error in create_activity_streams: {err}", "error", exc=err
+        core_logger.print_to_log(
+            f"Error in edit_user_hr_zone_percentages: {err}", "error", exc=err
         )
         # Raise an HTTPException with a 500 Internal Server Error status code
         raise HTTPException(
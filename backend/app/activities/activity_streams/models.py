@@ -4,10 +4,14 @@ from sqlalchemy import (
     ForeignKey,
     BigInteger,
     JSON,
+    LargeBinary,
 )
 from sqlalchemy.orm import relationship
 from core.database import Base
 
+import activities.activity_streams.utils as activity_streams_utils
+
+
 class ActivityStreams(Base):
     __tablename__ = "activities_streams"
 
@@ -24,10 +28,48 @@ class ActivityStreams(Base):
         nullable=False,
         comment="Stream type (1 - HR, 2 - Power, 3 - Cadence, 4 - Elevation, 5 - Velocity, 6 - Pace, 7 - lat/lon)",
     )
-    stream_waypoints = Column(JSON, nullable=False, comment="Store waypoints data")
+    stream_waypoints_json = Column(
+        "stream_waypoints",
+        JSON,
+        nullable=True,
+        comment="Store waypoints data (legacy/unencodable streams)",
+    )
+    stream_data = Column(
+        LargeBinary,
+        nullable=True,
+        comment="Store waypoints data (columnar, compressed)",
+    )
     strava_activity_stream_id = Column(
         BigInteger, nullable=True, comment="Strava activity stream ID"
     )
+    hr_zone_percentages = Column(
+        JSON,
+        nullable=True,
+        comment="Percentage of time in each heart rate zone (HR streams)",
+    )
 
     # Define a relationship to the User model
-    activity = relationship("Activity", back_populates="activities_streams")
\ No newline at end of file
+    activity = relationship("Activity", back_populates="activities_streams")
+
+    @property
+    def stream_waypoints(self) -> list[dict] | None:
+        """
+        Waypoints in the list-of-dicts API schema.
+
+        Encoded streams are decoded lazily on first access and memoized on the
+        instance, so only streams that are actually serialized pay the cost.
+        """
+        if self.stream_data is None:
+            return self.stream_waypoints_json
+
+        decoded = self.__dict__.get("_decoded_stream_waypoints")
+        if decoded is None:
+            decoded = activity_streams_utils.decode_stream_waypoints(self.stream_data)
+            self.__dict__["_decoded_stream_waypoints"] = decoded
+        return decoded
+
+    @stream_waypoints.setter
+    def stream_waypoints(self, waypoints: list[dict] | None) -> None:
+        self.__dict__.pop("_decoded_stream_waypoints", None)
+        self.stream_data = activity_streams_utils.encode_stream_waypoints(waypoints)
+        self.stream_waypoints_json = waypoints if self.stream_data is None else None
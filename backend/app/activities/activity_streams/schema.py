@@ -12,7 +12,7 @@ class ActivityStreams(BaseModel):
         stream_type (int): Type of the stream (e.g., GPS, heart rate, etc.).
         stream_waypoints (List[dict]): List of waypoints or data points in the stream.
         strava_activity_stream_id (int | None): Identifier for the corresponding Strava activity stream (optional).
-        hr_zone_percentages (dict | None): Heart rate zone percentages for the activity (optional).
+        hr_zone_percentages (dict | None): Heart rate zone percentages, computed when the HR stream is stored (optional).
     """
 
     id: int | None = None
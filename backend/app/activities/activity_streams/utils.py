@@ -0,0 +1,352 @@
+"""
+Columnar, compressed encoding for activity stream waypoints.
+
+A stream is stored as a start timestamp, a delta-encoded time array and one
+typed array per value key (``hr``, ``lat``/``lon``, ...), packed into a single
+zlib-compressed blob. Streams that do not fit the columnar layout (mixed keys,
+non-numeric values, irregular timestamps) are kept as plain JSON waypoints.
+"""
+
+import json
+import struct
+import zlib
+from datetime import date, datetime
+
+import numpy as np
+
+import activities.activity_streams.constants as activity_streams_constants
+
+# Encoding format version, stored as part of the blob magic
+STREAM_ENCODING_MAGIC = b"ESW1"
+
+# Time column kinds
+TIME_KIND_ISO = "iso"
+TIME_KIND_NUMBER = "number"
+
+# Timestamp format produced by the parsers ("%Y-%m-%dT%H:%M:%S")
+ISO_TIMESTAMP_LENGTH = 19
+
+# zlib compression level used for new blobs
+STREAM_COMPRESSION_LEVEL = 6
+
+_HEADER_LENGTH = struct.Struct("<I")
+
+
+def _column_dtype(values: list) -> str | None:
+    """
+    Determine the NumPy dtype that holds a list of waypoint values losslessly.
+
+    Args:
+        values: Values of a single waypoint key, possibly containing None.
+
+    Returns:
+        "<i8" if all non-null values are ints, "<f8" if they are ints or
+        floats, or None if any value is not numeric.
+    """
+    all_int = True
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)):
+            return None
+        if not isinstance(value, int):
+            all_int = False
+    return "<i8" if all_int else "<f8"
+
+
+def _encode_times(times: list) -> tuple[dict, np.ndarray] | None:
+    """
+    Delta-encode the time column of a stream.
+
+    Args:
+        times: List of waypoint times, either "%Y-%m-%dT%H:%M:%S" strings or numbers.
+
+    Returns:
+        Tuple of (time header, time array) or None if the times cannot be
+        represented losslessly.
+    """
+    if all(isinstance(t, str) and len(t) == ISO_TIMESTAMP_LENGTH for t in times):
+        try:
+            parsed = np.array(times, dtype="datetime64[s]")
+        except ValueError:
+            return None
+        # Only accept timestamps that round-trip to the exact same string
+        if not np.array_equal(parsed.astype(str), np.array(times)):
+            return None
+        seconds = parsed.astype("int64")
+        deltas = np.diff(seconds, prepend=seconds[0])
+        return {"kind": TIME_KIND_ISO, "start": times[0]}, deltas.astype("<i8")
+
+    dtype = _column_dtype(times)
+    if dtype is None or any(t is None for t in times):
+        return None
+    numbers = np.array(times, dtype=dtype)
+    # Float times are stored as-is, delta-encoding them would not round-trip
+    if dtype != "<i8":
+        return {"kind": TIME_KIND_NUMBER, "dtype": dtype, "delta": False}, numbers
+    deltas = np.diff(numbers, prepend=numbers[0])
+    return {
+        "kind": TIME_KIND_NUMBER,
+        "dtype": dtype,
+        "delta": True,
+        "start": times[0],
+    }, deltas
+
+
+def _decode_times(time_header: dict, deltas: np.ndarray) -> list:
+    """
+    Rebuild the time column from its delta-encoded representation.
+
+    Args:
+        time_header: Time header written by _encode_times.
+        deltas: Delta (or raw, for float times) array read from the blob.
+
+    Returns:
+        List of times in their original representation.
+    """
+    if time_header["kind"] == TIME_KIND_ISO:
+        start = np.datetime64(time_header["start"], "s")
+        return (start + np.cumsum(deltas).astype("timedelta64[s]")).astype(str).tolist()
+
+    if not time_header["delta"]:
+        return deltas.tolist()
+
+    return (np.cumsum(deltas) + time_header["start"]).tolist()
+
+
+def encode_stream_waypoints(waypoints: list[dict] | None) -> bytes | None:
+    """
+    Encode a list of stream waypoints into the columnar, compressed format.
+
+    Args:
+        waypoints: List of waypoint dicts sharing the same keys, e.g.
+            ``[{"time": "2024-01-01T10:00:00", "hr": 142}, ...]``.
+
+    Returns:
+        The encoded blob, or None if the waypoints cannot be encoded
+        losslessly and should be stored as JSON instead.
+    """
+    if not waypoints or not isinstance(waypoints, list):
+        return None
+
+    first = waypoints[0]
+    if not isinstance(first, dict) or "time" not in first:
+        return None
+
+    keys = list(first.keys())
+    key_set = first.keys()
+    for waypoint in waypoints:
+        if not isinstance(waypoint, dict) or waypoint.keys() != key_set:
+            return None
+
+    encoded_times = _encode_times([waypoint["time"] for waypoint in waypoints])
+    if encoded_times is None:
+        return None
+    time_header, time_deltas = encoded_times
+
+    fields = []
+    arrays = [time_deltas]
+    for key in keys:
+        if key == "time":
+            continue
+        values = [waypoint[key] for waypoint in waypoints]
+        dtype = _column_dtype(values)
+        if dtype is None:
+            return None
+
+        nullable = any(value is None for value in values)
+        if nullable:
+            mask = np.array([value is None for value in values], dtype=np.uint8)
+            values = [0 if value is None else value for value in values]
+            arrays.append(mask)
+        arrays.append(np.array(values, dtype=dtype))
+        fields.append({"name": key, "dtype": dtype, "nullable": nullable})
+
+    header = json.dumps(
+        {
+            "count": len(waypoints),
+            "keys": keys,
+            "time": time_header,
+            "fields": fields,
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+    payload = b"".join(
+        [_HEADER_LENGTH.pack(len(header)), header]
+        + [array.tobytes() for array in arrays]
+    )
+    return STREAM_ENCODING_MAGIC + zlib.compress(payload, STREAM_COMPRESSION_LEVEL)
+
+
+def decode_stream_columns(data: bytes) -> tuple[list[str], dict[str, list]]:
+    """
+    Decode an encoded stream into its columns.
+
+    Args:
+        data: Blob produced by encode_stream_waypoints.
+
+    Returns:
+        Tuple of (waypoint keys in their original order, mapping of key to
+        list of values).
+
+    Raises:
+        ValueError: If the blob is not a supported stream encoding.
+    """
+    if not data or bytes(data[: len(STREAM_ENCODING_MAGIC)]) != STREAM_ENCODING_MAGIC:
+        raise ValueError("Unsupported activity stream encoding")
+
+    payload = zlib.decompress(bytes(data[len(STREAM_ENCODING_MAGIC) :]))
+    (header_length,) = _HEADER_LENGTH.unpack_from(payload, 0)
+    offset = _HEADER_LENGTH.size
+    header = json.loads(payload[offset : offset + header_length])
+    offset += header_length
+    count = header["count"]
+
+    def read_array(dtype: str) -> np.ndarray:
+        nonlocal offset
+        array = np.frombuffer(payload, dtype=dtype, count=count, offset=offset)
+        offset += array.nbytes
+        return array
+
+    time_dtype = (
+        "<i8" if header["time"]["kind"] == TIME_KIND_ISO else header["time"]["dtype"]
+    )
+    columns = {"time": _decode_times(header["time"], read_array(time_dtype))}
+
+    for field in header["fields"]:
+        mask = read_array("u1") if field["nullable"] else None
+        values = read_array(field["dtype"]).tolist()
+        if mask is not None:
+            values = [
+                None if is_null else value for is_null, value in zip(mask, values)
+            ]
+        columns[field["name"]] = values
+
+    return header["keys"], columns
+
+
+def decode_stream_waypoints(data: bytes) -> list[dict]:
+    """
+    Decode an encoded stream back into the list-of-dicts waypoint schema.
+
+    Args:
+        data: Blob produced by encode_stream_waypoints.
+
+    Returns:
+        List of waypoint dicts, identical to the ones that were encoded.
+    """
+    keys, columns = decode_stream_columns(data)
+    return [dict(zip(keys, values)) for values in zip(*(columns[key] for key in keys))]
+
+
+def get_stream_hr_values(
+    stream_data: bytes | None, stream_waypoints: list[dict] | None
+) -> list:
+    """
+    Get the heart rate values of a stream.
+
+    Encoded streams only decode their heart rate column.
+
+    Args:
+        stream_data: Blob produced by encode_stream_waypoints, or None.
+        stream_waypoints: JSON waypoints, used when the stream is not encoded.
+
+    Returns:
+        List of heart rate values, possibly containing None.
+    """
+    if stream_data is not None:
+        _, columns = decode_stream_columns(stream_data)
+        return columns.get("hr", [])
+
+    if not stream_waypoints or not isinstance(stream_waypoints, list):
+        return []
+    return [
+        waypoint.get("hr")
+        for waypoint in stream_waypoints
+        if isinstance(waypoint, dict)
+    ]
+
+
+def calculate_max_heart_rate(
+    max_heart_rate: int | None,
+    birthdate: date | None,
+    activity_start_time: datetime | str | None,
+) -> int | None:
+    """
+    Get the maximum heart rate of a user at the time of an activity.
+
+    Args:
+        max_heart_rate: Maximum heart rate set by the user.
+        birthdate: User birthdate, used with the 220 - age formula when no
+            maximum heart rate is set.
+        activity_start_time: Activity start time, the age is the one reached
+            on the activity year. The current year is used when None.
+
+    Returns:
+        The maximum heart rate, or None if neither value is set.
+    """
+    if max_heart_rate:
+        return max_heart_rate
+    if not birthdate:
+        return None
+
+    if activity_start_time is None:
+        year = datetime.now().year
+    elif isinstance(activity_start_time, str):
+        year = int(activity_start_time[:4])
+    else:
+        year = activity_start_time.year
+    return 220 - (year - birthdate.year)
+
+
+def calculate_hr_zone_percentages(
+    hr_values: list, max_heart_rate: int | None
+) -> dict | None:
+    """
+    Calculate the percentage of time spent in each heart rate zone.
+
+    Zones start at 60, 70, 80 and 90% of the maximum heart rate.
+
+    Args:
+        hr_values: Heart rate values of a stream, None values are ignored.
+        max_heart_rate: Maximum heart rate of the user.
+
+    Returns:
+        Mapping of zone_1 to zone_5 to their percentage of time and heart rate
+        boundaries, or None if there is no maximum heart rate or no value.
+    """
+    if not max_heart_rate:
+        return None
+
+    values = np.array(
+        [value for value in hr_values if value is not None], dtype=np.float64
+    )
+    if values.size == 0:
+        return None
+
+    zone_1, zone_2, zone_3, zone_4 = (
+        max_heart_rate * threshold
+        for threshold in activity_streams_constants.HR_ZONE_THRESHOLDS
+    )
+    # Zone index of every value, values on a boundary belong to the upper zone
+    zone_counts = np.bincount(
+        np.searchsorted([zone_1, zone_2, zone_3, zone_4], values, side="right"),
+        minlength=5,
+    )
+    zone_percentages = [
+        round(float(count) / values.size * 100, 2) for count in zone_counts
+    ]
+
+    # Zone HR boundaries for display
+    zone_hr = [
+        f"< {int(zone_1)}",
+        f"{int(zone_1)} - {int(zone_2) - 1}",
+        f"{int(zone_2)} - {int(zone_3) - 1}",
+        f"{int(zone_3)} - {int(zone_4) - 1}",
+        f">= {int(zone_4)}",
+    ]
+    return {
+        f"zone_{index + 1}": {"percent": percent, "hr": hr}
+        for index, (percent, hr) in enumerate(zip(zone_percentages, zone_hr))
+    }
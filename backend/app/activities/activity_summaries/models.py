@@ -0,0 +1,58 @@
+from sqlalchemy import (
+    Column,
+    Integer,
+    Date,
+    ForeignKey,
+    DECIMAL,
+    BigInteger,
+)
+from core.database import Base
+
+
+# Data model for user_daily_activity_rollup table using SQLAlchemy's ORM
+class UserDailyActivityRollup(Base):
+    __tablename__ = "user_daily_activity_rollup"
+
+    user_id = Column(
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        comment="User ID that the activities belong",
+    )
+    day = Column(
+        Date,
+        primary_key=True,
+        comment="Activities start date (DATE)",
+    )
+    activity_type = Column(
+        Integer,
+        primary_key=True,
+        comment="Activity type (1 - run, 2 - trail run, ...)",
+    )
+    total_distance = Column(
+        BigInteger, nullable=False, default=0, comment="Total distance in meters"
+    )
+    total_timer_time = Column(
+        DECIMAL(precision=20, scale=10),
+        nullable=False,
+        default=0,
+        comment="Total timer time (s)",
+    )
+    total_elapsed_time = Column(
+        DECIMAL(precision=20, scale=10),
+        nullable=False,
+        default=0,
+        comment="Total elapsed time (s)",
+    )
+    total_elevation_gain = Column(
+        BigInteger,
+        nullable=False,
+        default=0,
+        comment="Total elevation gain in meters",
+    )
+    total_calories = Column(
+        BigInteger, nullable=False, default=0, comment="Total calories in kcal"
+    )
+    activity_count = Column(
+        Integer, nullable=False, default=0, comment="Number of activities"
+    )
@@ -0,0 +1,43 @@
+"""
+Rebuild the daily activity rollup read by the activity summaries and goals.
+
+The rollup is kept up to date when activities are created, edited or deleted.
+Run this after changing activities outside of the application:
+
+    python -m activities.activity_summaries.rebuild_rollup [--user-id ID]
+"""
+
+import argparse
+
+# Registers every model referenced by the activity relationships
+import core.routes  # noqa: F401
+
+import activities.activity_summaries.utils as activity_summaries_utils
+
+import core.logger as core_logger
+from core.database import SessionLocal
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        description="Rebuild the daily activity rollup from the activities table."
+    )
+    parser.add_argument(
+        "--user-id",
+        type=int,
+        default=None,
+        help="Only rebuild the rollup of this user (default: all users)",
+    )
+    args = parser.parse_args(argv)
+
+    with SessionLocal() as db:
+        activity_summaries_utils.rebuild_user_daily_activity_rollup(db, args.user_id)
+
+    core_logger.print_to_log_and_console(
+        "Daily activity rollup rebuilt"
+        + (f" for user {args.user_id}" if args.user_id is not None else "")
+    )
+
+
+if __name__ == "__main__":
+    main()
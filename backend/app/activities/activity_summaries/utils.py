@@ -0,0 +1,161 @@
+from sqlalchemy import Date, cast, delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+import activities.activity.models as activities_models
+import activities.activity_summaries.models as activity_summaries_models
+
+import core.config as core_config
+import core.logger as core_logger
+
+# Core table, the rollup statements do not need the Activity relationships
+ACTIVITIES_TABLE = activities_models.Activity.__table__
+
+# Columns summed from the activities into each rollup row
+ROLLUP_TOTALS = {
+    "total_distance": ACTIVITIES_TABLE.c.distance,
+    "total_timer_time": ACTIVITIES_TABLE.c.total_timer_time,
+    "total_elapsed_time": ACTIVITIES_TABLE.c.total_elapsed_time,
+    "total_elevation_gain": ACTIVITIES_TABLE.c.elevation_gain,
+    "total_calories": ACTIVITIES_TABLE.c.calories,
+}
+
+# Activity fields that change its contribution to the rollup
+ROLLUP_ACTIVITY_FIELDS = frozenset(
+    {"user_id", "start_time", "timezone", "activity_type"}
+    | {column.key for column in ROLLUP_TOTALS.values()}
+)
+
+
+def local_start_time(activity):
+    """
+    Build the activity start time in the activity timezone, or TZ if unset.
+
+    Activity lists, summaries and goals all date an activity with it, so an
+    activity close to midnight falls on the same day everywhere.
+
+    Args:
+        activity: The Activity model or the activities table columns.
+
+    Returns:
+        The local start time SQL expression.
+    """
+    return func.timezone(
+        func.coalesce(activity.timezone, core_config.TZ),
+        func.timezone("UTC", activity.start_time),
+    )
+
+
+def _apply_activities_to_rollup(db: Session, sign: int, *criteria) -> None:
+    """
+    Add (sign 1) or subtract (sign -1) the activities matching the criteria
+    to the daily rollup, in the caller's transaction.
+    """
+    activity = ACTIVITIES_TABLE.c
+    rollup = activity_summaries_models.UserDailyActivityRollup
+    day = cast(local_start_time(activity), Date)
+
+    activities_per_day = (
+        select(
+            activity.user_id,
+            day,
+            activity.activity_type,
+            *(
+                sign * func.coalesce(func.sum(column), 0)
+                for column in ROLLUP_TOTALS.values()
+            ),
+            sign * func.count(activity.id),
+        )
+        .where(*criteria)
+        .group_by(activity.user_id, day, activity.activity_type)
+    )
+
+    columns = [
+        "user_id",
+        "day",
+        "activity_type",
+        *ROLLUP_TOTALS,
+        "activity_count",
+    ]
+    statement = insert(rollup).from_select(columns, activities_per_day)
+    db.execute(
+        statement.on_conflict_do_update(
+            index_elements=["user_id", "day", "activity_type"],
+            set_={
+                column: getattr(rollup, column) + statement.excluded[column]
+                for column in [*ROLLUP_TOTALS, "activity_count"]
+            },
+        )
+    )
+
+    if sign < 0:
+        # Days without activities left are removed
+        db.execute(
+            delete(rollup).where(
+                rollup.activity_count <= 0,
+                rollup.user_id.in_(select(activity.user_id).where(*criteria)),
+            )
+        )
+
+
+def add_activities_to_rollup(db: Session, *criteria) -> None:
+    """
+    Add the activities matching the criteria to the daily activity rollup.
+
+    Must run in the same transaction that creates or edits the activities,
+    after they are flushed.
+
+    Args:
+        db: Database session.
+        *criteria: SQLAlchemy filters on the Activity model.
+    """
+    _apply_activities_to_rollup(db, 1, *criteria)
+
+
+def remove_activities_from_rollup(db: Session, *criteria) -> None:
+    """
+    Remove the activities matching the criteria from the daily activity rollup.
+
+    Must run in the same transaction that edits or deletes the activities,
+    before their rows change.
+
+    Args:
+        db: Database session.
+        *criteria: SQLAlchemy filters on the Activity model.
+    """
+    _apply_activities_to_rollup(db, -1, *criteria)
+
+
+def rebuild_user_daily_activity_rollup(db: Session, user_id: int | None = None):
+    """
+    Recompute the daily activity rollup from the activities table.
+
+    Concurrent activity writes wait for the rebuild to commit, so none of
+    them is lost or counted twice.
+
+    Args:
+        db: Database session.
+        user_id: Only rebuild the rows of this user, all users if None.
+    """
+    rollup = activity_summaries_models.UserDailyActivityRollup
+    try:
+        db.execute(text("LOCK TABLE user_daily_activity_rollup IN EXCLUSIVE MODE"))
+
+        if user_id is None:
+            db.execute(delete(rollup))
+            add_activities_to_rollup(db)
+        else:
+            db.execute(delete(rollup).where(rollup.user_id == user_id))
+            add_activities_to_rollup(db, activities_models.Activity.user_id == user_id)
+
+        # Commit the transaction
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in rebuild_user_daily_activity_rollup: {err}", "error", exc=err
+        )
+        raise err
@@ -168,36 +168,48 @@ def get_public_activity_workout_steps(activity_id: int, db: Session):
         ) from err
 
 
+def build_activity_workout_steps(
+    activity_workout_steps: list[activity_workout_steps_schema.ActivityWorkoutSteps],
+    activity_id: int,
+) -> list[activity_workout_steps_models.ActivityWorkoutSteps]:
+    # Create a list to store the ActivityWorkoutSteps objects
+    workout_steps = []
+
+    # Iterate over the list of ActivityWorkoutSteps objects
+    for step in activity_workout_steps:
+        # Create an ActivityWorkoutSteps object
+        db_stream = activity_workout_steps_models.ActivityWorkoutSteps(
+            activity_id=activity_id,
+            message_index=step.message_index,
+            duration_type=step.duration_type,
+            duration_value=step.duration_value,
+            target_type=step.target_type,
+            target_value=step.target_value,
+            intensity=step.intensity,
+            notes=step.notes,
+            exercise_category=step.exercise_category,
+            exercise_name=step.exercise_name,
+            exercise_weight=step.exercise_weight,
+            weight_display_unit=step.weight_display_unit,
+            secondary_target_value=step.secondary_target_value,
+        )
+
+        # Append the object to the list
+        workout_steps.append(db_stream)
+
+    return workout_steps
+
+
 def create_activity_workout_steps(
     activity_workout_steps: list[activity_workout_steps_schema.ActivityWorkoutSteps],
     activity_id: int,
     db: Session,
 ):
     try:
-        # Create a list to store the ActivityWorkoutSteps objects
-        workout_steps = []
-
-        # Iterate over the list of ActivityWorkoutSteps objects
-        for step in activity_workout_steps:
-            # Create an ActivityWorkoutSteps object
-            db_stream = activity_workout_steps_models.ActivityWorkoutSteps(
-                activity_id=activity_id,
-                message_index=step.message_index,
-                duration_type=step.duration_type,
-                duration_value=step.duration_value,
-                target_type=step.target_type,
-                target_value=step.target_value,
-                intensity=step.intensity,
-                notes=step.notes,
-                exercise_category=step.exercise_category,
-                exercise_name=step.exercise_name,
-                exercise_weight=step.exercise_weight,
-                weight_display_unit=step.weight_display_unit,
-                secondary_target_value=step.secondary_target_value,
-            )
-
-            # Append the object to the list
-            workout_steps.append(db_stream)
+        # Create the ActivityWorkoutSteps objects
+        workout_steps = build_activity_workout_steps(
+            activity_workout_steps, activity_id
+        )
 
         # Bulk insert the list of ActivityWorkoutSteps objects
         db.bulk_save_objects(workout_steps)
@@ -13,9 +13,11 @@ import activities.activity_media.models
 import activities.activity_sets.models
 import activities.activity_streams.models
 import activities.activity_workout_steps.models
+import activities.activity_summaries.models
 import followers.models
 import gears.gear.models
 import gears.gear_components.models
+import geocoding.models
 import health_sleep.models
 import health_steps.models
 import health_targets.models
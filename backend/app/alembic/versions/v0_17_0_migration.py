@@ -0,0 +1,322 @@
+"""v0.17.0 migration
+
+Revision ID: 9ab507ec6f4a
+Revises: 2af2c0629b37
+Create Date: 2026-10-17 09:12:31.415926
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+import activities.activity_streams.utils as activity_streams_utils
+
+import core.config as core_config
+
+# revision identifiers, used by Alembic.
+revision: str = "9ab507ec6f4a"
+down_revision: Union[str, None] = "2af2c0629b37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Add the columnar, compressed waypoints column to activities_streams
+    op.add_column(
+        "activities_streams",
+        sa.Column(
+            "stream_data",
+            sa.LargeBinary(),
+            nullable=True,
+            comment="Store waypoints data (columnar, compressed)",
+        ),
+    )
+    # Encoded streams no longer store the JSON waypoints
+    op.alter_column(
+        "activities_streams",
+        "stream_waypoints",
+        existing_type=sa.JSON(),
+        nullable=True,
+        comment="Store waypoints data (legacy/unencodable streams)",
+        existing_comment="Store waypoints data",
+    )
+    # Create the reverse geocoding cache table
+    op.create_table(
+        "reverse_geocoding_cache",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column(
+            "cell_key",
+            sa.String(length=64),
+            nullable=False,
+            comment="Provider, precision and rounded coordinates of the cell",
+        ),
+        sa.Column(
+            "provider",
+            sa.String(length=45),
+            nullable=False,
+            comment="Reverse geocoding provider",
+        ),
+        sa.Column("city", sa.String(length=250), nullable=True, comment="Cell city"),
+        sa.Column("town", sa.String(length=250), nullable=True, comment="Cell town"),
+        sa.Column(
+            "country", sa.String(length=250), nullable=True, comment="Cell country"
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+            comment="Cell resolution date (DATETIME)",
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_reverse_geocoding_cache_cell_key"),
+        "reverse_geocoding_cache",
+        ["cell_key"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_reverse_geocoding_cache_created_at"),
+        "reverse_geocoding_cache",
+        ["created_at"],
+        unique=False,
+    )
+    # Add the Garmin Connect activities sync watermark
+    op.add_column(
+        "users_integrations",
+        sa.Column(
+            "garminconnect_activities_synced_at",
+            sa.DateTime(),
+            nullable=True,
+            comment="Date of the last successful Garmin Connect activities sync",
+        ),
+    )
+    # Keep a single health entry per user and day, required by the bulk upserts
+    for table in ("health_weight", "health_steps", "health_sleep"):
+        op.execute(f"""
+        DELETE FROM {table} AS duplicate
+        USING {table} AS kept
+        WHERE duplicate.user_id = kept.user_id
+        AND duplicate.date = kept.date
+        AND duplicate.id < kept.id;
+        """)
+        op.create_unique_constraint(
+            f"uq_{table}_user_id_date", table, ["user_id", "date"]
+        )
+    # Create the shared state table used across workers, unlogged as it only
+    # holds short-lived entries that may be lost on a crash
+    op.create_table(
+        "shared_state",
+        sa.Column("key", sa.Text(), nullable=False, comment="Entry key"),
+        sa.Column(
+            "value",
+            postgresql.JSONB(),
+            nullable=False,
+            comment="Entry value",
+        ),
+        sa.Column(
+            "expires_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            comment="Entry expiration date (DATETIME)",
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        prefixes=["UNLOGGED"],
+    )
+    op.create_index(
+        op.f("ix_shared_state_expires_at"),
+        "shared_state",
+        ["expires_at"],
+        unique=False,
+    )
+    # Create the daily activity rollup read by the summaries and goals
+    op.create_table(
+        "user_daily_activity_rollup",
+        sa.Column(
+            "user_id",
+            sa.Integer(),
+            nullable=False,
+            comment="User ID that the activities belong",
+        ),
+        sa.Column(
+            "day", sa.Date(), nullable=False, comment="Activities start date (DATE)"
+        ),
+        sa.Column(
+            "activity_type",
+            sa.Integer(),
+            nullable=False,
+            comment="Activity type (1 - run, 2 - trail run, ...)",
+        ),
+        sa.Column(
+            "total_distance",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total distance in meters",
+        ),
+        sa.Column(
+            "total_timer_time",
+            sa.DECIMAL(precision=20, scale=10),
+            nullable=False,
+            comment="Total timer time (s)",
+        ),
+        sa.Column(
+            "total_elapsed_time",
+            sa.DECIMAL(precision=20, scale=10),
+            nullable=False,
+            comment="Total elapsed time (s)",
+        ),
+        sa.Column(
+            "total_elevation_gain",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total elevation gain in meters",
+        ),
+        sa.Column(
+            "total_calories",
+            sa.BigInteger(),
+            nullable=False,
+            comment="Total calories in kcal",
+        ),
+        sa.Column(
+            "activity_count",
+            sa.Integer(),
+            nullable=False,
+            comment="Number of activities",
+        ),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "day", "activity_type"),
+    )
+    # Backfill the rollup from the existing activities, dated in their timezone
+    op.execute(sa.text("""
+    INSERT INTO user_daily_activity_rollup (
+        user_id, day, activity_type, total_distance, total_timer_time,
+        total_elapsed_time, total_elevation_gain, total_calories, activity_count
+    )
+    SELECT
+        user_id,
+        CAST(timezone(COALESCE(timezone, :tz), timezone('UTC', start_time)) AS date),
+        activity_type,
+        COALESCE(SUM(distance), 0),
+        COALESCE(SUM(total_timer_time), 0),
+        COALESCE(SUM(total_elapsed_time), 0),
+        COALESCE(SUM(elevation_gain), 0),
+        COALESCE(SUM(calories), 0),
+        COUNT(id)
+    FROM activities
+    GROUP BY
+        user_id,
+        CAST(timezone(COALESCE(timezone, :tz), timezone('UTC', start_time)) AS date),
+        activity_type;
+    """).bindparams(tz=core_config.TZ))
+    # Add the composite indexes used by the activity lists, date ranges and syncs
+    op.create_index(
+        "ix_activities_user_id_start_time",
+        "activities",
+        ["user_id", sa.text("start_time DESC"), sa.text("id DESC")],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activities_user_id_activity_type_start_time",
+        "activities",
+        ["user_id", "activity_type", "start_time"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activities_user_id_garminconnect_activity_id",
+        "activities",
+        ["user_id", "garminconnect_activity_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_activities_user_id_strava_activity_id",
+        "activities",
+        ["user_id", "strava_activity_id"],
+        unique=False,
+    )
+    # Add the precomputed HR zone percentages to activities_streams
+    op.add_column(
+        "activities_streams",
+        sa.Column(
+            "hr_zone_percentages",
+            sa.JSON(),
+            nullable=True,
+            comment="Percentage of time in each heart rate zone (HR streams)",
+        ),
+    )
+    # Add the new entry to the migrations table
+    op.execute("""
+    INSERT INTO migrations (id, name, description, executed) VALUES
+    (7, 'v0.17.0', 'Encode existing activity streams in the columnar format', false),
+    (8, 'v0.17.0', 'Compute the HR zones of existing activity streams', false);
+    """)
+
+
+def downgrade() -> None:
+    # Remove the entry from the migrations table
+    op.execute("""
+    DELETE FROM migrations 
+    WHERE id IN (7, 8);
+    """)
+    # Decode the columnar streams back into JSON waypoints
+    connection = op.get_bind()
+    encoded_streams = connection.execute(
+        sa.text(
+            "SELECT id, stream_data FROM activities_streams WHERE stream_data IS NOT NULL"
+        )
+    )
+    update_statement = sa.text(
+        "UPDATE activities_streams SET stream_waypoints = :waypoints WHERE id = :id"
+    ).bindparams(sa.bindparam("waypoints", type_=sa.JSON()))
+    for stream_id, stream_data in encoded_streams.fetchall():
+        connection.execute(
+            update_statement,
+            {
+                "id": stream_id,
+                "waypoints": activity_streams_utils.decode_stream_waypoints(
+                    stream_data
+                ),
+            },
+        )
+    op.alter_column(
+        "activities_streams",
+        "stream_waypoints",
+        existing_type=sa.JSON(),
+        nullable=False,
+        comment="Store waypoints data",
+        existing_comment="Store waypoints data (legacy/unencodable streams)",
+    )
+    op.drop_column("activities_streams", "stream_data")
+    # Drop the reverse geocoding cache table
+    op.drop_index(
+        op.f("ix_reverse_geocoding_cache_created_at"),
+        table_name="reverse_geocoding_cache",
+    )
+    op.drop_index(
+        op.f("ix_reverse_geocoding_cache_cell_key"),
+        table_name="reverse_geocoding_cache",
+    )
+    op.drop_table("reverse_geocoding_cache")
+    # Drop the Garmin Connect activities sync watermark
+    op.drop_column("users_integrations", "garminconnect_activities_synced_at")
+    # Drop the health entries unique constraints
+    for table in ("health_weight", "health_steps", "health_sleep"):
+        op.drop_constraint(f"uq_{table}_user_id_date", table, type_="unique")
+    # Drop the shared state table
+    op.drop_index(op.f("ix_shared_state_expires_at"), table_name="shared_state")
+    op.drop_table("shared_state")
+    # Drop the daily activity rollup table
+    op.drop_table("user_daily_activity_rollup")
+    # Drop the activities composite indexes
+    for index in (
+        "ix_activities_user_id_start_time",
+        "ix_activities_user_id_activity_type_start_time",
+        "ix_activities_user_id_garminconnect_activity_id",
+        "ix_activities_user_id_strava_activity_id",
+    ):
+        op.drop_index(index, table_name="activities")
+    # Drop the precomputed HR zone percentages
+    op.drop_column("activities_streams", "hr_zone_percentages")
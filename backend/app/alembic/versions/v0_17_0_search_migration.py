@@ -0,0 +1,134 @@
+"""v0.17.0 activity search migration
+
+Adds the activities name and location search columns and indexes without
+blocking activity reads or writes:
+
+- The columns are added without a default, which does not rewrite the table,
+  and a trigger fills them on every insert or update of the searched fields.
+- Existing activities are backfilled in batches, each committed on its own.
+- The GIN indexes are built concurrently. An index left invalid by a failed
+  build is dropped and built again.
+
+Every step can be run again, so a failed upgrade can be retried.
+
+Revision ID: 7f49435ac569
+Revises: 9ab507ec6f4a
+Create Date: 2026-10-17 16:40:12.204781
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "7f49435ac569"
+down_revision: Union[str, None] = "9ab507ec6f4a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Activities backfilled per transaction
+BACKFILL_BATCH_SIZE = 5000
+
+SEARCH_TEXT_EXPRESSION = (
+    "lower(coalesce({row}name, '') || ' ' || coalesce({row}town, '') || ' ' || "
+    "coalesce({row}city, '') || ' ' || coalesce({row}country, ''))"
+)
+
+
+def create_index_concurrently(connection, name: str, column: str, **kwargs) -> None:
+    """
+    Build an activities index concurrently, unless a valid one exists.
+    """
+    valid = connection.execute(
+        sa.text(
+            "SELECT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+        ),
+        {"name": name},
+    ).scalar()
+    if valid:
+        return
+    if valid is not None:
+        # Left invalid by a failed concurrent build
+        op.drop_index(name, table_name="activities", postgresql_concurrently=True)
+    op.create_index(
+        name,
+        "activities",
+        [column],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_concurrently=True,
+        **kwargs,
+    )
+
+
+def upgrade() -> None:
+    # Add the search columns, without a default so the table is not rewritten
+    op.execute("""
+    ALTER TABLE activities
+        ADD COLUMN IF NOT EXISTS search_text TEXT,
+        ADD COLUMN IF NOT EXISTS search_vector TSVECTOR;
+    """)
+    op.execute("""
+    COMMENT ON COLUMN activities.search_text IS
+        'Lowercase name and location, searched with pg_trgm';
+    """)
+    op.execute("""
+    COMMENT ON COLUMN activities.search_vector IS
+        'Name and location full-text search vector';
+    """)
+    # Fill the search columns of new and edited activities
+    op.execute(f"""
+    CREATE OR REPLACE FUNCTION activities_search_columns() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_text := {SEARCH_TEXT_EXPRESSION.format(row="NEW.")};
+        NEW.search_vector := to_tsvector('simple'::regconfig, NEW.search_text);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql;
+    """)
+    op.execute("DROP TRIGGER IF EXISTS activities_search_columns ON activities;")
+    op.execute("""
+    CREATE TRIGGER activities_search_columns
+    BEFORE INSERT OR UPDATE OF name, town, city, country ON activities
+    FOR EACH ROW EXECUTE PROCEDURE activities_search_columns();
+    """)
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm;")
+
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        # Backfill the existing activities in short transactions
+        search_text = SEARCH_TEXT_EXPRESSION.format(row="")
+        max_id = connection.execute(sa.text("SELECT max(id) FROM activities")).scalar()
+        for start_id in range(0, (max_id or 0) + 1, BACKFILL_BATCH_SIZE):
+            connection.execute(
+                sa.text(f"""
+                UPDATE activities
+                SET search_text = {search_text},
+                    search_vector = to_tsvector('simple'::regconfig, {search_text})
+                WHERE id >= :start_id AND id < :end_id AND search_text IS NULL
+                """),
+                {"start_id": start_id, "end_id": start_id + BACKFILL_BATCH_SIZE},
+            )
+        # Build the search indexes without blocking activity writes
+        create_index_concurrently(
+            connection,
+            "ix_activities_search_text_trgm",
+            "search_text",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+        create_index_concurrently(
+            connection, "ix_activities_search_vector", "search_vector"
+        )
+
+
+def downgrade() -> None:
+    # Drop the activities search indexes, trigger and columns, pg_trgm is kept
+    # as other database objects may use it
+    op.drop_index("ix_activities_search_vector", table_name="activities")
+    op.drop_index("ix_activities_search_text_trgm", table_name="activities")
+    op.execute("DROP TRIGGER IF EXISTS activities_search_columns ON activities;")
+    op.execute("DROP FUNCTION IF EXISTS activities_search_columns();")
+    op.drop_column("activities", "search_vector")
+    op.drop_column("activities", "search_text")
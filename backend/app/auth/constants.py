@@ -12,6 +12,8 @@ JWT_REFRESH_TOKEN_EXPIRE_DAYS: Final[int] = int(
     os.environ.get("REFRESH_TOKEN_EXPIRE_DAYS", "7")
 )
 JWT_SECRET_KEY: Final[str | None] = core_config.read_secret("SECRET_KEY")
+# Recently verified tokens kept by TokenManager.decode_token until they expire
+JWT_DECODED_TOKEN_CACHE_SIZE: Final[int] = 1024
 
 if JWT_ACCESS_TOKEN_EXPIRE_MINUTES <= 0:
     raise ValueError("ACCESS_TOKEN_EXPIRE_MINUTES must be positive")
@@ -185,7 +185,7 @@ async def handle_callback(
         ) = auth_utils.create_tokens(user_read, token_manager)
 
         # Create the session and store it in the database
-        session_utils.create_session(
+        await session_utils.create_session(
             session_id, user_read, request, refresh_token, password_hasher, db
         )
 
@@ -1670,6 +1670,9 @@ class IdentityProviderService:
         db.commit()
         db.refresh(user)
 
+        # Drop the cached user on every worker
+        users_crud.USERS_CACHE.invalidate(user.id)
+
         return user
 
     async def refresh_idp_session(
@@ -1,12 +1,33 @@
-from typing import Tuple
+from typing import Any, Callable, Tuple
 from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import statistics
 import string
 import secrets
+import threading
+import time
 
+import argon2
+from fastapi import HTTPException, status
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 from pwdlib.hashers.bcrypt import BcryptHasher
 
+import core.config as core_config
+import core.logger as core_logger
+import core.shared_state as core_shared_state
+
+# Shared state key of the calibrated Argon2 parameters, so every backend
+# worker and instance hashes with the same parameters
+ARGON2_PARAMETERS_KEY = "password_hasher:argon2_parameters"
+
+# Seconds the calibrated Argon2 parameters are kept before a new calibration
+ARGON2_PARAMETERS_TTL_SECONDS = 30 * 24 * 3600
+
+# Highest Argon2 time cost tried by the calibration
+ARGON2_MAX_TIME_COST = 16
+
 
 class PasswordPolicyError(ValueError):
     """
@@ -20,6 +41,115 @@ class PasswordPolicyError(ValueError):
     """
 
 
+class PasswordHashingPool:
+    """
+    Bounded thread pool running password hashing and verification off the event loop.
+
+    Argon2 and bcrypt release the GIL, so hashes run in parallel up to max_workers.
+    At most max_queue operations wait for a thread, further ones are rejected with
+    a 503 so a burst of logins cannot pile up behind the hashing cost.
+
+    Attributes:
+        max_workers (int): Number of hashing threads.
+        max_queue (int): Number of operations allowed to wait for a thread.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hashing"
+        )
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    async def run(self, func: Callable[..., Any], *args) -> Any:
+        """
+        Run a hashing function on the pool.
+
+        Args:
+            func (Callable): The blocking function to run.
+            *args: Arguments of the function.
+
+        Returns:
+            Any: The function result.
+
+        Raises:
+            HTTPException: 503 if the queue is full.
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                self._pending += 1
+                self._max_queued = max(
+                    self._max_queued, self._pending - self.max_workers
+                )
+        if rejected:
+            core_logger.print_to_log(
+                f"Password hashing queue full, rejecting operation: {self.get_stats()}",
+                "warning",
+            )
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many authentication requests in progress, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        submitted_at = time.perf_counter()
+
+        def task():
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_seconds += started_at - submitted_at
+            try:
+                return func(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._pending -= 1
+                    self._completed += 1
+                    self._run_seconds += time.perf_counter() - started_at
+
+        return await asyncio.wrap_future(self._executor.submit(task))
+
+    def get_stats(self) -> dict:
+        """
+        Get the pool queueing metrics.
+
+        Returns:
+            dict: Workers, queue limit, queued and running operations, highest
+            queue length, completed and rejected operations and average wait
+            and run times in milliseconds.
+        """
+        with self._lock:
+            completed = self._completed
+            return {
+                "workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._pending - self._running,
+                "running": self._running,
+                "max_queued": self._max_queued,
+                "completed": completed,
+                "rejected": self._rejected,
+                "avg_wait_ms": (
+                    self._wait_seconds * 1000 / completed if completed else 0.0
+                ),
+                "avg_run_ms": (
+                    self._run_seconds * 1000 / completed if completed else 0.0
+                ),
+            }
+
+
 class PasswordHasher:
     """
     PasswordHasher provides secure password hashing, verification, and password policy enforcement.
@@ -48,6 +178,12 @@ class PasswordHasher:
         verify_and_update(plain_password: str, hashed_password: str) -> Tuple[bool, str | None]:
             Verifies a password and updates the hash if the algorithm or parameters have changed.
 
+        hash_password_async, verify_async, verify_and_update_async:
+            Same as above, run on the bounded password hashing pool.
+
+        use_argon2_parameters(time_cost: int, memory_cost: int, parallelism: int) -> None:
+            Hashes new passwords with the given Argon2 parameters, keeping the other hashers.
+
         generate_password(length: int = 8) -> str:
             Generates a secure random password of specified length, ensuring complexity.
 
@@ -76,6 +212,7 @@ class PasswordHasher:
         hasher: (
             Argon2Hasher | BcryptHasher | Iterable[object] | PasswordHash | None
         ) = None,
+        pool: PasswordHashingPool | None = None,
     ):
         """
         Initialize the password hasher configuration.
@@ -86,10 +223,13 @@ class PasswordHasher:
                 - PasswordHash: Uses the provided PasswordHash instance.
                 - Argon2Hasher or BcryptHasher: Uses the single hasher instance.
                 - Iterable: Uses a list of hasher instances.
+            pool (PasswordHashingPool | None, optional): Pool running the async methods.
+                Defaults to the module-level hashing_pool.
         Raises:
             TypeError: If the provided hasher is not of a supported type.
         """
 
+        self._pool = pool
         if hasher is None:
             # Default: strongest recommended config
             self._password_hash = PasswordHash.recommended()
@@ -149,6 +289,85 @@ class PasswordHasher:
         """
         return self._password_hash.verify_and_update(plain_password, hashed_password)
 
+    @property
+    def pool(self) -> PasswordHashingPool:
+        return self._pool or hashing_pool
+
+    async def hash_password_async(self, password: str) -> str:
+        """
+        Hashes a password on the password hashing pool.
+
+        Args:
+            password (str): The plain text password to be hashed.
+
+        Returns:
+            str: The resulting hashed password.
+
+        Raises:
+            HTTPException: 503 if the password hashing queue is full.
+        """
+        return await self.pool.run(self.hash_password, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """
+        Verifies a password on the password hashing pool.
+
+        Args:
+            plain_password (str): The plain text password to verify.
+            hashed_password (str): The hashed password to compare against.
+
+        Returns:
+            bool: True if the plain password matches the hashed password, False otherwise.
+
+        Raises:
+            HTTPException: 503 if the password hashing queue is full.
+        """
+        return await self.pool.run(self.verify, plain_password, hashed_password)
+
+    async def verify_and_update_async(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, str | None]:
+        """
+        Verifies a password and updates its hash if necessary on the password hashing pool.
+
+        Args:
+            plain_password (str): The plain text password to verify.
+            hashed_password (str): The hashed password to verify against.
+
+        Returns:
+            Tuple[bool, str | None]: Whether the password is correct and the updated hash, if any.
+
+        Raises:
+            HTTPException: 503 if the password hashing queue is full.
+        """
+        return await self.pool.run(
+            self.verify_and_update, plain_password, hashed_password
+        )
+
+    def use_argon2_parameters(
+        self, time_cost: int, memory_cost: int, parallelism: int
+    ) -> None:
+        """
+        Hashes new passwords with the given Argon2 parameters.
+
+        The other hashers stay available for verification. Hashes made with other
+        parameters are upgraded by verify_and_update.
+
+        Args:
+            time_cost (int): Argon2 number of iterations.
+            memory_cost (int): Argon2 memory usage in kibibytes.
+            parallelism (int): Argon2 number of lanes.
+        """
+        argon2_hasher = Argon2Hasher(
+            time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+        )
+        other_hashers = [
+            hasher
+            for hasher in self._password_hash.hashers
+            if not isinstance(hasher, Argon2Hasher)
+        ]
+        self._password_hash = PasswordHash([argon2_hasher, *other_hashers])
+
     @staticmethod
     def generate_password(length: int = 8) -> str:
         """
@@ -243,6 +462,97 @@ class PasswordHasher:
             return False
 
 
+def benchmark_argon2(
+    time_cost: int, memory_cost: int, parallelism: int, rounds: int = 3
+) -> float:
+    """
+    Measure the median duration of an Argon2 hash with the given parameters.
+
+    Args:
+        time_cost (int): Argon2 number of iterations.
+        memory_cost (int): Argon2 memory usage in kibibytes.
+        parallelism (int): Argon2 number of lanes.
+        rounds (int, optional): Number of hashes measured. Defaults to 3.
+
+    Returns:
+        float: Median duration in milliseconds.
+    """
+    hasher = Argon2Hasher(
+        time_cost=time_cost, memory_cost=memory_cost, parallelism=parallelism
+    )
+    durations = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        hasher.hash(secrets.token_urlsafe(16))
+        durations.append((time.perf_counter() - started_at) * 1000)
+    return statistics.median(durations)
+
+
+def calibrate_argon2(
+    target_ms: int,
+    memory_cost: int = argon2.DEFAULT_MEMORY_COST,
+    parallelism: int = argon2.DEFAULT_PARALLELISM,
+    benchmark: Callable[[int, int, int], float] = benchmark_argon2,
+) -> dict:
+    """
+    Pick the lowest Argon2 time cost whose hash takes at least target_ms.
+
+    Memory cost and parallelism are kept, only the number of iterations grows,
+    from argon2.DEFAULT_TIME_COST up to ARGON2_MAX_TIME_COST. The time cost is
+    never lowered below the argon2 default, since existing hashes would be
+    rehashed with the weaker setting on verification.
+
+    Args:
+        target_ms (int): Target hash duration in milliseconds.
+        memory_cost (int, optional): Argon2 memory usage in kibibytes.
+        parallelism (int, optional): Argon2 number of lanes.
+        benchmark (Callable, optional): Returns the hash duration of (time_cost, memory_cost, parallelism).
+
+    Returns:
+        dict: The time_cost, memory_cost and parallelism picked.
+    """
+    time_cost = argon2.DEFAULT_TIME_COST
+    duration_ms = benchmark(time_cost, memory_cost, parallelism)
+    while duration_ms < target_ms and time_cost < ARGON2_MAX_TIME_COST:
+        time_cost += 1
+        duration_ms = benchmark(time_cost, memory_cost, parallelism)
+    core_logger.print_to_log_and_console(
+        f"Argon2 calibrated to time_cost={time_cost}, memory_cost={memory_cost}, "
+        f"parallelism={parallelism} ({duration_ms:.0f} ms, target {target_ms} ms)"
+    )
+    return {
+        "time_cost": time_cost,
+        "memory_cost": memory_cost,
+        "parallelism": parallelism,
+    }
+
+
+def calibrate_password_hasher(target_ms: int) -> None:
+    """
+    Apply calibrated Argon2 parameters to the module-level password hasher.
+
+    Parameters calibrated by another backend worker or instance are reused from
+    the shared state, so every backend produces hashes the others do not upgrade.
+
+    Args:
+        target_ms (int): Target hash duration in milliseconds.
+    """
+    shared_state = core_shared_state.get_shared_state()
+    parameters = shared_state.get(ARGON2_PARAMETERS_KEY)
+    if (
+        parameters is None
+        or parameters.get("target_ms") != target_ms
+        or parameters.get("time_cost", 0) < argon2.DEFAULT_TIME_COST
+    ):
+        parameters = {**calibrate_argon2(target_ms), "target_ms": target_ms}
+        shared_state.set(
+            ARGON2_PARAMETERS_KEY, parameters, ARGON2_PARAMETERS_TTL_SECONDS
+        )
+    password_hasher.use_argon2_parameters(
+        parameters["time_cost"], parameters["memory_cost"], parameters["parallelism"]
+    )
+
+
 def get_password_hasher():
     """
     Returns the password hasher instance.
@@ -258,3 +568,8 @@ def get_password_hasher():
 # Initialize the PasswordHasher with both Argon2 and Bcrypt support
 # Argon2 listed first => new hashes use Argon2; bcrypt remains verifiable for legacy rows.
 password_hasher = PasswordHasher(hasher=[Argon2Hasher(), BcryptHasher()])
+
+# Bounded pool running the async hashing methods of every PasswordHasher
+hashing_pool = PasswordHashingPool(
+    core_config.PASSWORD_HASHING_WORKERS, core_config.PASSWORD_HASHING_MAX_QUEUE
+)
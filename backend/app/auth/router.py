@@ -83,7 +83,7 @@ async def login_for_access_token(
     Raises:
         HTTPException: If authentication fails or the user is inactive
     """
-    user = auth_utils.authenticate_user(
+    user = await auth_utils.authenticate_user(
         form_data.username, form_data.password, password_hasher, db
     )
 
@@ -111,7 +111,7 @@ async def login_for_access_token(
             }
 
     # If no MFA required, proceed with normal login
-    return auth_utils.complete_login(
+    return await auth_utils.complete_login(
         response, request, user, client_type, password_hasher, token_manager, db
     )
 
@@ -189,7 +189,7 @@ async def verify_mfa_and_login(
     pending_mfa_store.delete_pending_login(mfa_request.username)
 
     # Complete the login
-    return auth_utils.complete_login(
+    return await auth_utils.complete_login(
         response, request, user, client_type, password_hasher, token_manager, db
     )
 
@@ -264,7 +264,9 @@ async def refresh_token(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    is_valid = password_hasher.verify(refresh_token_value, session.refresh_token)
+    is_valid = await password_hasher.verify_async(
+        refresh_token_value, session.refresh_token
+    )
 
     if not is_valid:
         raise HTTPException(
@@ -297,7 +299,9 @@ async def refresh_token(
     ) = auth_utils.create_tokens(user, token_manager, session.id)
 
     # Edit the session and store it in the database
-    session_utils.edit_session(session, request, new_refresh_token, password_hasher, db)
+    await session_utils.edit_session(
+        session, request, new_refresh_token, password_hasher, db
+    )
 
     # Opportunistically refresh IdP tokens for all linked identity providers
     await idp_utils.refresh_idp_tokens_if_needed(user.id, db)
@@ -378,7 +382,9 @@ async def logout(
     # Check if the session was found
     if session is not None:
         # Verify the refresh token
-        is_valid = password_hasher.verify(refresh_token_value, session.refresh_token)
+        is_valid = await password_hasher.verify_async(
+            refresh_token_value, session.refresh_token
+        )
 
         # If the refresh token is not valid, raise an exception
         if not is_valid:
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
 
+import core.shared_state as core_shared_state
+
 
 class LoginRequest(BaseModel):
     """
@@ -47,11 +49,12 @@ class PendingMFALogin:
     A class to manage pending Multi-Factor Authentication (MFA) login sessions.
 
     This class provides methods to add, retrieve, delete, and check pending login entries
-    for users who are in the process of MFA authentication. It uses an internal dictionary
-    to store the mapping between usernames and their associated user IDs.
+    for users who are in the process of MFA authentication. Entries are kept in the
+    shared state, so the MFA verification may reach any backend worker, and expire
+    after ttl_seconds.
 
     Attributes:
-        _store (dict): Internal storage mapping usernames to user IDs for pending logins.
+        _ttl_seconds (int): Time-to-live of the pending login entries.
 
     Methods:
         add_pending_login(username: str, user_id: int):
@@ -67,17 +70,19 @@ class PendingMFALogin:
             Checks if the specified username has a pending login entry.
 
         clear_all():
-            Clears all pending login entries from the internal store.
+            Clears all pending login entries from the shared state.
     """
 
-    def __init__(self):
-        self._store = {}
+    KEY_PREFIX = "pending_mfa_login:"
+
+    def __init__(self, ttl_seconds: int = 300):
+        self._ttl_seconds = ttl_seconds
 
     def add_pending_login(self, username: str, user_id: int):
         """
         Adds a pending login entry for a user.
 
-        Stores the provided username and associated user ID in the internal store,
+        Stores the provided username and associated user ID in the shared state,
         marking the user as pending login.
 
         Args:
@@ -85,7 +90,9 @@ class PendingMFALogin:
             user_id (int): The unique identifier of the user.
 
         """
-        self._store[username] = user_id
+        core_shared_state.get_shared_state().set(
+            self.KEY_PREFIX + username, user_id, self._ttl_seconds
+        )
 
     def get_pending_login(self, username: str):
         """
@@ -97,11 +104,11 @@ class PendingMFALogin:
         Returns:
             Any: The pending login information associated with the username, or None if not found.
         """
-        return self._store.get(username)
+        return core_shared_state.get_shared_state().get(self.KEY_PREFIX + username)
 
     def delete_pending_login(self, username: str):
         """
-        Removes the pending login entry for the specified username from the internal store.
+        Removes the pending login entry for the specified username from the shared state.
 
         Args:
             username (str): The username whose pending login entry should be deleted.
@@ -109,8 +116,7 @@ class PendingMFALogin:
         Returns:
             None
         """
-        if username in self._store:
-            del self._store[username]
+        core_shared_state.get_shared_state().delete(self.KEY_PREFIX + username)
 
     def has_pending_login(self, username: str):
         """
@@ -122,13 +128,13 @@ class PendingMFALogin:
         Returns:
             bool: True if the username has a pending login session, False otherwise.
         """
-        return username in self._store
+        return self.get_pending_login(username) is not None
 
     def clear_all(self):
         """
-        Removes all items from the internal store, effectively resetting it to an empty state.
+        Removes all pending login entries from the shared state.
         """
-        self._store.clear()
+        core_shared_state.get_shared_state().clear(self.KEY_PREFIX)
 
 
 def get_pending_mfa_store():
@@ -136,7 +142,7 @@ def get_pending_mfa_store():
     Retrieve the current pending MFA (Multi-Factor Authentication) store.
 
     Returns:
-        dict: The pending MFA store containing MFA-related data.
+        PendingMFALogin: The pending MFA store containing MFA-related data.
     """
     return pending_mfa_store
 
@@ -1,5 +1,5 @@
 from typing import Annotated, Union
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import (
     OAuth2PasswordBearer,
     SecurityScopes,
@@ -78,6 +78,36 @@ def get_token(
     )
 
 
+def get_token_claims(
+    request: Request,
+    token: str,
+    token_manager: auth_token_manager.TokenManager,
+) -> dict:
+    """
+    Decodes a token once per request, caching its claims on request.state.
+
+    Every security dependency of a route reads the same token, so its signature is
+    only verified by the first one.
+
+    Args:
+        request (Request): The incoming request, holding the decoded tokens in request.state.decoded_tokens.
+        token (str): The token to decode.
+        token_manager (auth_token_manager.TokenManager): The token manager used to decode the token.
+
+    Returns:
+        dict: The claims of the token.
+
+    Raises:
+        HTTPException: If the token cannot be decoded.
+    """
+    decoded_tokens = getattr(request.state, "decoded_tokens", None)
+    if decoded_tokens is None:
+        decoded_tokens = request.state.decoded_tokens = {}
+    if token not in decoded_tokens:
+        decoded_tokens[token] = token_manager.decode_token(token).claims
+    return decoded_tokens[token]
+
+
 ## ACCESS TOKEN VALIDATION
 def get_access_token(
     non_cookie_access_token: Annotated[Union[str, None], Depends(oauth2_scheme)],
@@ -144,9 +174,53 @@ def get_access_token_for_browser_redirect(
     )
 
 
+def get_access_token_claims(
+    request: Request,
+    access_token: Annotated[str, Depends(get_access_token)],
+    token_manager: Annotated[
+        auth_token_manager.TokenManager,
+        Depends(auth_token_manager.get_token_manager),
+    ],
+) -> dict:
+    """
+    Retrieves the claims of the access token, decoded once per request.
+
+    Args:
+        request (Request): The incoming request.
+        access_token (str): The access token extracted from the request.
+        token_manager (auth_token_manager.TokenManager): The token manager used to decode the token.
+
+    Returns:
+        dict: The claims of the access token.
+    """
+    return get_token_claims(request, access_token, token_manager)
+
+
+def get_access_token_claims_for_browser_redirect(
+    request: Request,
+    access_token: Annotated[str, Depends(get_access_token_for_browser_redirect)],
+    token_manager: Annotated[
+        auth_token_manager.TokenManager,
+        Depends(auth_token_manager.get_token_manager),
+    ],
+) -> dict:
+    """
+    Retrieves the claims of the access token for browser redirects, decoded once per request.
+
+    Args:
+        request (Request): The incoming request.
+        access_token (str): The access token extracted from the request.
+        token_manager (auth_token_manager.TokenManager): The token manager used to decode the token.
+
+    Returns:
+        dict: The claims of the access token.
+    """
+    return get_token_claims(request, access_token, token_manager)
+
+
 def validate_access_token(
     # access_token: Annotated[str, Depends(get_access_token_from_cookies)]
-    access_token: Annotated[str, Depends(get_access_token)],
+    access_token_claims: Annotated[dict, Depends(get_access_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -160,7 +234,7 @@ def validate_access_token(
     Any unexpected errors during validation are also logged and result in a 500 Internal Server Error.
 
     Args:
-        access_token (str): The access token to be validated.
+        access_token_claims (dict): The claims of the access token to be validated.
         token_manager (auth_token_manager.TokenManager): The token manager instance used for validation.
 
     Raises:
@@ -168,7 +242,7 @@ def validate_access_token(
     """
     try:
         # Validate the token expiration
-        token_manager.validate_token_expiration(access_token)
+        token_manager.validate_token_claims(access_token_claims)
     except HTTPException as http_err:
         core_logger.print_to_log(
             f"Access token validation failed: {http_err.detail}",
@@ -192,7 +266,9 @@ def validate_access_token(
 
 def validate_access_token_for_browser_redirect(
     # access_token: Annotated[str, Depends(get_access_token_from_cookies)]
-    access_token: Annotated[str, Depends(get_access_token_for_browser_redirect)],
+    access_token_claims: Annotated[
+        dict, Depends(get_access_token_claims_for_browser_redirect)
+    ],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -206,7 +282,7 @@ def validate_access_token_for_browser_redirect(
     Any unexpected errors during validation are also logged and result in a 500 Internal Server Error.
 
     Args:
-        access_token (str): The access token to be validated.
+        access_token_claims (dict): The claims of the access token to be validated.
         token_manager (auth_token_manager.TokenManager): The token manager instance used for validation.
 
     Raises:
@@ -214,7 +290,7 @@ def validate_access_token_for_browser_redirect(
     """
     try:
         # Validate the token expiration
-        token_manager.validate_token_expiration(access_token)
+        token_manager.validate_token_claims(access_token_claims)
     except HTTPException as http_err:
         core_logger.print_to_log(
             f"Access token validation failed: {http_err.detail}",
@@ -237,7 +313,7 @@ def validate_access_token_for_browser_redirect(
 
 
 def get_sub_from_access_token(
-    access_token: Annotated[str, Depends(get_access_token)],
+    access_token_claims: Annotated[dict, Depends(get_access_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -247,7 +323,7 @@ def get_sub_from_access_token(
     Retrieves the user ID ('sub' claim) from the provided access token.
 
     Args:
-        access_token (str): The access token from which to extract the claim.
+        access_token_claims (dict): The claims of the access token from which to extract the claim.
         token_manager (auth_token_manager.TokenManager): The token manager instance used to decode and validate the token.
 
     Returns:
@@ -257,7 +333,7 @@ def get_sub_from_access_token(
         Exception: If the token is invalid or the 'sub' claim is missing.
     """
     # Return the user ID associated with the token
-    sub = token_manager.get_token_claim(access_token, "sub")
+    sub = token_manager.get_claim(access_token_claims, "sub")
     if not isinstance(sub, int):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -267,7 +343,9 @@ def get_sub_from_access_token(
 
 
 def get_sub_from_access_token_for_browser_redirect(
-    access_token: Annotated[str, Depends(get_access_token_for_browser_redirect)],
+    access_token_claims: Annotated[
+        dict, Depends(get_access_token_claims_for_browser_redirect)
+    ],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -277,7 +355,7 @@ def get_sub_from_access_token_for_browser_redirect(
     Retrieves the user ID ('sub' claim) from the provided access token for browser redirects.
 
     Args:
-        access_token (str): The access token from which to extract the claim.
+        access_token_claims (dict): The claims of the access token from which to extract the claim.
         token_manager (auth_token_manager.TokenManager): The token manager instance used to decode and validate the token.
 
     Returns:
@@ -286,7 +364,7 @@ def get_sub_from_access_token_for_browser_redirect(
     Raises:
         Exception: If the token is invalid or the 'sub' claim is missing.
     """
-    sub = token_manager.get_token_claim(access_token, "sub")
+    sub = token_manager.get_claim(access_token_claims, "sub")
     if not isinstance(sub, int):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -296,7 +374,7 @@ def get_sub_from_access_token_for_browser_redirect(
 
 
 def get_sid_from_access_token(
-    access_token: Annotated[str, Depends(get_access_token)],
+    access_token_claims: Annotated[dict, Depends(get_access_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -306,7 +384,7 @@ def get_sid_from_access_token(
     Retrieves the session ID ('sid') from the provided access token.
 
     Args:
-        access_token (str): The access token from which to extract the session ID.
+        access_token_claims (dict): The claims of the access token from which to extract the session ID.
         token_manager (auth_token_manager.TokenManager): The token manager used to validate and extract claims from the token.
 
     Returns:
@@ -316,7 +394,7 @@ def get_sid_from_access_token(
         Exception: If the token is invalid or the 'sid' claim is not present.
     """
     # Return the session ID associated with the token
-    sid = token_manager.get_token_claim(access_token, "sid")
+    sid = token_manager.get_claim(access_token_claims, "sid")
     if not isinstance(sid, str):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -366,9 +444,31 @@ def get_refresh_token(
     )
 
 
+def get_refresh_token_claims(
+    request: Request,
+    refresh_token: Annotated[str, Depends(get_refresh_token)],
+    token_manager: Annotated[
+        auth_token_manager.TokenManager,
+        Depends(auth_token_manager.get_token_manager),
+    ],
+) -> dict:
+    """
+    Retrieves the claims of the refresh token, decoded once per request.
+
+    Args:
+        request (Request): The incoming request.
+        refresh_token (str): The refresh token extracted from the request.
+        token_manager (auth_token_manager.TokenManager): The token manager used to decode the token.
+
+    Returns:
+        dict: The claims of the refresh token.
+    """
+    return get_token_claims(request, refresh_token, token_manager)
+
+
 def validate_refresh_token(
     # access_token: Annotated[str, Depends(get_access_token_from_cookies)]
-    refresh_token: Annotated[str, Depends(get_refresh_token)],
+    refresh_token_claims: Annotated[dict, Depends(get_refresh_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -378,7 +478,7 @@ def validate_refresh_token(
     Validates the expiration of a refresh token using the provided token manager.
 
     Args:
-        refresh_token (str): The refresh token to be validated, extracted via dependency injection.
+        refresh_token_claims (dict): The claims of the refresh token to be validated, extracted via dependency injection.
         token_manager (auth_token_manager.TokenManager): The token manager instance used to validate the token, injected via dependency.
 
     Raises:
@@ -389,7 +489,7 @@ def validate_refresh_token(
     """
     try:
         # Validate the token expiration
-        token_manager.validate_token_expiration(refresh_token)
+        token_manager.validate_token_claims(refresh_token_claims)
     except HTTPException as http_err:
         core_logger.print_to_log(
             f"Refresh token validation failed: {http_err.detail}",
@@ -412,7 +512,7 @@ def validate_refresh_token(
 
 
 def get_sub_from_refresh_token(
-    refresh_token: Annotated[str, Depends(get_refresh_token)],
+    refresh_token_claims: Annotated[dict, Depends(get_refresh_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -422,7 +522,7 @@ def get_sub_from_refresh_token(
     Retrieves the user ID ('sub' claim) from a given refresh token.
 
     Args:
-        refresh_token (str): The refresh token from which to extract the user ID.
+        refresh_token_claims (dict): The claims of the refresh token from which to extract the user ID.
         token_manager (auth_token_manager.TokenManager): The token manager instance used to validate and parse the token.
 
     Returns:
@@ -432,7 +532,7 @@ def get_sub_from_refresh_token(
         Exception: If the token is invalid or the 'sub' claim is not found.
     """
     # Return the user ID associated with the token
-    sub = token_manager.get_token_claim(refresh_token, "sub")
+    sub = token_manager.get_claim(refresh_token_claims, "sub")
     if not isinstance(sub, int):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -442,7 +542,7 @@ def get_sub_from_refresh_token(
 
 
 def get_sid_from_refresh_token(
-    refresh_token: Annotated[str, Depends(get_refresh_token)],
+    refresh_token_claims: Annotated[dict, Depends(get_refresh_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -452,7 +552,7 @@ def get_sid_from_refresh_token(
     Retrieves the session ID ('sid') from a given refresh token.
 
     Args:
-        refresh_token (str): The refresh token from which to extract the session ID.
+        refresh_token_claims (dict): The claims of the refresh token from which to extract the session ID.
         token_manager (auth_token_manager.TokenManager): The token manager used to validate and extract claims from the token.
 
     Returns:
@@ -462,7 +562,7 @@ def get_sid_from_refresh_token(
         Exception: If the token is invalid or the 'sid' claim is not present.
     """
     # Return the session ID associated with the token
-    sid = token_manager.get_token_claim(refresh_token, "sid")
+    sid = token_manager.get_claim(refresh_token_claims, "sid")
     if not isinstance(sid, str):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -488,7 +588,7 @@ def get_and_return_refresh_token(
 
 
 def check_scopes(
-    access_token: Annotated[str, Depends(get_access_token)],
+    access_token_claims: Annotated[dict, Depends(get_access_token_claims)],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -499,7 +599,7 @@ def check_scopes(
     Validates that the access token contains all required security scopes.
 
     Args:
-        access_token (str): The access token extracted from the request.
+        access_token_claims (dict): The claims of the access token extracted from the request.
         token_manager (auth_token_manager.TokenManager): Instance responsible for managing and validating tokens.
         security_scopes (SecurityScopes): Required scopes for the endpoint.
 
@@ -511,7 +611,7 @@ def check_scopes(
         Errors and exceptions are logged using core_logger for debugging and auditing purposes.
     """
     # Get the scope from the token
-    scope = token_manager.get_token_claim(access_token, "scope")
+    scope = token_manager.get_claim(access_token_claims, "scope")
 
     # Ensure the scope is a list
     if not isinstance(scope, list):
@@ -553,7 +653,9 @@ def check_scopes(
 
 
 def check_scopes_for_browser_redirect(
-    access_token: Annotated[str, Depends(get_access_token_for_browser_redirect)],
+    access_token_claims: Annotated[
+        dict, Depends(get_access_token_claims_for_browser_redirect)
+    ],
     token_manager: Annotated[
         auth_token_manager.TokenManager,
         Depends(auth_token_manager.get_token_manager),
@@ -564,7 +666,7 @@ def check_scopes_for_browser_redirect(
     Validates that the access token contains all required security scopes for browser redirection.
 
     Args:
-        access_token (str): The access token extracted from the request.
+        access_token_claims (dict): The claims of the access token extracted from the request.
         token_manager (auth_token_manager.TokenManager): Instance responsible for managing and validating tokens.
         security_scopes (SecurityScopes): Required scopes for the endpoint.
 
@@ -576,7 +678,7 @@ def check_scopes_for_browser_redirect(
         Errors and exceptions are logged using core_logger for debugging and auditing purposes.
     """
     # Get the scope from the token
-    scope = token_manager.get_token_claim(access_token, "scope")
+    scope = token_manager.get_claim(access_token_claims, "scope")
 
     # Ensure the scope is a list
     if not isinstance(scope, list):
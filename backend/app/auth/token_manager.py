@@ -1,6 +1,11 @@
+import hashlib
 import secrets
+import threading
+import time
 import uuid
 
+from collections import OrderedDict
+
 from enum import Enum
 
 from datetime import datetime, timedelta, timezone
@@ -41,16 +46,21 @@ class TokenManager:
     Attributes:
         algorithm (str): The algorithm used for token operations (default: "HS256").
         _key: The imported key object used for cryptographic operations.
+        _decoded_tokens: LRU of verified tokens by SHA-256 digest, with their expiration.
 
     Methods:
         __init__(secret_key: str, algorithm: str = "HS256"):
 
         get_token_claim(token: str, claim: str) -> str | list[str] | int:
 
+        get_claim(claims: dict, claim: str) -> str | list[str] | int:
+
         decode_token(token: str) -> dict:
 
         validate_token_expiration(token: str) -> None:
 
+        validate_token_claims(claims: dict) -> None:
+
         create_token(session_id: str, user: users_schema.UserRead, token_type: TokenType) -> tuple[datetime, str]:
 
         create_csrf_token() -> str:
@@ -60,18 +70,27 @@ class TokenManager:
         ValueError: Raised for missing or invalid parameters during token creation.
     """
 
-    def __init__(self, secret_key: str, algorithm: str = "HS256"):
+    def __init__(
+        self,
+        secret_key: str,
+        algorithm: str = "HS256",
+        cache_size: int = auth_constants.JWT_DECODED_TOKEN_CACHE_SIZE,
+    ):
         """
         Initializes the TokenManager with the provided secret key and algorithm.
 
         Args:
             secret_key (str): The secret key used for token encryption and decryption.
             algorithm (str, optional): The algorithm to use for token operations. Defaults to "HS256".
+            cache_size (int, optional): Number of verified tokens kept in memory. Defaults to JWT_DECODED_TOKEN_CACHE_SIZE.
 
         """
         self.secret_key = secret_key
         self.algorithm = algorithm
         self._key = OctKey.import_key(secret_key)
+        self._cache_size = cache_size
+        self._decoded_tokens: OrderedDict[bytes, tuple[object, float]] = OrderedDict()
+        self._decoded_tokens_lock = threading.Lock()
 
     def get_token_claim(self, token: str, claim: str) -> str | list[str] | int:
         """
@@ -90,31 +109,48 @@ class TokenManager:
         try:
             # Decode the token
             payload = self.decode_token(token)
-
-            # Get the claim from the payload and return it
-            return payload.claims[claim]
-        except KeyError as err:
+        except Exception as err:
             core_logger.print_to_log(
-                f"Claim '{claim}' not found in token: {err}",
+                f"Error retrieving claim '{claim}' from token: {err}",
                 "error",
                 exc=err,
                 context={"token": "[REDACTED]"},
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Claim '{claim}' is missing in the token.",
+                detail=f"Unable to retrieve claim '{claim}' from token.",
                 headers={"WWW-Authenticate": "Bearer"},
             ) from err
-        except Exception as err:
+
+        # Get the claim from the payload and return it
+        return self.get_claim(payload.claims, claim)
+
+    def get_claim(self, claims: dict, claim: str) -> str | list[str] | int:
+        """
+        Retrieves a specific claim from already decoded token claims.
+
+        Args:
+            claims (dict): The claims of a decoded token.
+            claim (str): The name of the claim to retrieve.
+
+        Returns:
+            str | list[str] | int: The value of the requested claim.
+
+        Raises:
+            HTTPException: If the claim is not found in the claims.
+        """
+        try:
+            return claims[claim]
+        except KeyError as err:
             core_logger.print_to_log(
-                f"Error retrieving claim '{claim}' from token: {err}",
+                f"Claim '{claim}' not found in token: {err}",
                 "error",
                 exc=err,
                 context={"token": "[REDACTED]"},
             )
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail=f"Unable to retrieve claim '{claim}' from token.",
+                detail=f"Claim '{claim}' is missing in the token.",
                 headers={"WWW-Authenticate": "Bearer"},
             ) from err
 
@@ -122,6 +158,9 @@ class TokenManager:
         """
         Decodes a JWT token and returns its payload as a dictionary.
 
+        Tokens verified recently are served from an in-memory LRU, keyed by
+        the token digest and kept until the token's exp claim.
+
         Args:
             token (str): The JWT token to decode.
 
@@ -132,8 +171,13 @@ class TokenManager:
             HTTPException: If the token cannot be decoded, raises an HTTP 401 Unauthorized exception.
         """
         try:
-            # Decode the token and return the payload
-            return jwt.decode(token, OctKey.import_key(self.secret_key))
+            digest = hashlib.sha256(token.encode()).digest()
+            payload = self._get_decoded_token(digest)
+            if payload is None:
+                # Decode the token and cache the payload
+                payload = jwt.decode(token, self._key)
+                self._cache_decoded_token(digest, payload)
+            return payload
         except InvalidPayloadError as payload_err:
             core_logger.print_to_log(
                 f"Invalid token payload: {payload_err}",
@@ -159,6 +203,33 @@ class TokenManager:
                 headers={"WWW-Authenticate": "Bearer"},
             ) from err
 
+    def _get_decoded_token(self, digest: bytes):
+        """
+        Return the cached payload of a verified token, if not expired.
+        """
+        with self._decoded_tokens_lock:
+            entry = self._decoded_tokens.get(digest)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._decoded_tokens[digest]
+                return None
+            self._decoded_tokens.move_to_end(digest)
+            return entry[0]
+
+    def _cache_decoded_token(self, digest: bytes, payload) -> None:
+        """
+        Cache a verified token payload until its exp claim, evicting the least recently used.
+        """
+        exp = payload.claims.get("exp")
+        if self._cache_size <= 0 or not isinstance(exp, (int, float)):
+            return
+        with self._decoded_tokens_lock:
+            self._decoded_tokens[digest] = (payload, exp)
+            self._decoded_tokens.move_to_end(digest)
+            while len(self._decoded_tokens) > self._cache_size:
+                self._decoded_tokens.popitem(last=False)
+
     def validate_token_expiration(self, token: str) -> None:
         """
         Validates the expiration and required claims of a JWT token.
@@ -175,6 +246,36 @@ class TokenManager:
             HTTPException: If the token is missing required claims, expired, not yet valid,
                            or contains invalid claims.
         """
+        try:
+            # Decode the token to get the payload
+            payload = self.decode_token(token)
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error validating token expiration: {err}",
+                "error",
+                exc=err,
+                context={"token": "[REDACTED]"},
+            )
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Token is expired or invalid.",
+                headers={"WWW-Authenticate": "Bearer"},
+            ) from err
+
+        # Validate token expiration
+        self.validate_token_claims(payload.claims)
+
+    def validate_token_claims(self, claims: dict) -> None:
+        """
+        Validates the expiration and required claims of already decoded token claims.
+
+        Args:
+            claims (dict): The claims of a decoded token.
+
+        Raises:
+            HTTPException: If the claims are missing required entries, expired, not yet valid,
+                           or invalid.
+        """
         try:
             # Define required claims
             claims_requests = jwt.JWTClaimsRegistry(
@@ -189,11 +290,8 @@ class TokenManager:
                 jti={"essential": True},
             )
 
-            # Decode the token to get the payload
-            payload = self.decode_token(token)
-
             # Validate token expiration
-            claims_requests.validate(payload.claims)
+            claims_requests.validate(claims)
         except MissingClaimError as missing_err:
             core_logger.print_to_log(
                 f"JWT missing claim error: {missing_err}",
@@ -245,7 +343,7 @@ class TokenManager:
             ) from claims_err
         except Exception as err:
             core_logger.print_to_log(
-                f"Error validating token expiration: {err}",
+                f"Error validating token claims: {err}",
                 "error",
                 exc=err,
                 context={"token": "[REDACTED]"},
@@ -308,7 +406,7 @@ class TokenManager:
         encoded_token = jwt.encode(
             {"alg": self.algorithm},
             scope_dict.copy(),
-            OctKey.import_key(self.secret_key),
+            self._key,
         )
 
         # Return the expiration and the encoded token
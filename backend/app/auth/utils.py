@@ -28,7 +28,7 @@ import auth.identity_providers.service as idp_service
 import core.logger as core_logger
 
 
-def authenticate_user(
+async def authenticate_user(
     username: str,
     password: str,
     password_hasher: auth_password_hasher.PasswordHasher,
@@ -60,8 +60,8 @@ def authenticate_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify password and get updated hash if applicable
-    is_password_valid, updated_hash = password_hasher.verify_and_update(
+    # Verify password and get updated hash if applicable, off the event loop
+    is_password_valid, updated_hash = await password_hasher.verify_and_update_async(
         password, user.password
     )
     if not is_password_valid:
@@ -180,7 +180,7 @@ def create_response_with_tokens(
     return response
 
 
-def complete_login(
+async def complete_login(
     response: Response,
     request: Request,
     user: users_schema.UserRead,
@@ -220,7 +220,7 @@ def complete_login(
     ) = create_tokens(user, token_manager)
 
     # Create the session and store it in the database
-    session_utils.create_session(
+    await session_utils.create_session(
         session_id, user, request, refresh_token, password_hasher, db
     )
 
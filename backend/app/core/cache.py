@@ -0,0 +1,319 @@
+"""
+In-process cache for hot, rarely-changing reads.
+
+A TTLCache keeps up to max_size entries for ttl_seconds and evicts the least
+recently used ones first. It counts hits, misses, evictions and
+invalidations. Getters are wrapped with the cached decorator, and the
+functions writing the cached rows call invalidate after committing.
+
+CACHE_BACKEND selects how far invalidations reach:
+- shared: invalidations also bump a generation counter in the shared state
+  (see core.shared_state). Every worker checks the generations at most every
+  SHARED_SYNC_SECONDS and drops its entries of an invalidated cache, so other
+  workers serve stale values for at most that long.
+- memory: invalidations only reach the current worker, for a single worker.
+- none: nothing is cached.
+
+ORM instances must not be shared between requests or sessions. Cache them
+with copy=detached_copy, so every caller gets its own detached copy.
+"""
+
+import functools
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+
+import core.config as core_config
+import core.logger as core_logger
+import core.shared_state as core_shared_state
+
+# Returned by TTLCache.get when the key is not cached
+MISSING = object()
+
+# Seconds between two checks of the shared invalidation generations
+SHARED_SYNC_SECONDS = 1.0
+
+# Generation counters outlive every cached entry
+GENERATION_TTL_SECONDS = 86400
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries expire after ttl_seconds.
+
+    Attributes:
+        name: Unique cache name, also used for the shared invalidations.
+        max_size: Maximum number of entries.
+        ttl_seconds: Seconds an entry is served for.
+        hits, misses, evictions, invalidations: Usage counters.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_size: int = 1024,
+        ttl_seconds: float = 300,
+        copy: Callable[[Any], Any] | None = None,
+    ):
+        """
+        Args:
+            name: Unique cache name.
+            max_size: Maximum number of entries.
+            ttl_seconds: Seconds an entry is served for.
+            copy: Applied to the values stored and returned, so callers never
+                share a cached value.
+        """
+        self.name = name
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._copy = copy
+        self._entries: OrderedDict[Hashable, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        # Incremented on every invalidation, values read before are not stored
+        self._version = 0
+        self._generation = None
+        self._generation_checked_at = float("-inf")
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        _caches[name] = self
+
+    @property
+    def version(self) -> int:
+        """
+        Local version, pass it to set to skip values read before an invalidation.
+        """
+        return self._version
+
+    def _generation_key(self) -> str:
+        return f"cache:{self.name}:generation"
+
+    def _clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version += 1
+
+    def _sync(self) -> None:
+        """
+        Drop every entry if the cache was invalidated by another worker.
+        """
+        now = time.monotonic()
+        if now - self._generation_checked_at < SHARED_SYNC_SECONDS:
+            return
+        self._generation_checked_at = now
+
+        try:
+            generation = core_shared_state.get_shared_state().get(
+                self._generation_key()
+            )
+        except Exception as err:
+            # Without the generation, no entry can be trusted
+            core_logger.print_to_log(
+                f"Error reading the {self.name} cache generation: {err}",
+                "error",
+                exc=err,
+            )
+            self._clear()
+            return
+
+        if generation != self._generation:
+            self._clear()
+            self._generation = generation
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key.
+
+        Returns:
+            The value, or MISSING if the key is not cached or expired.
+        """
+        if core_config.CACHE_BACKEND == "none":
+            return MISSING
+        if core_config.CACHE_BACKEND == "shared":
+            self._sync()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return MISSING
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[0]
+
+        return self._copy(value) if self._copy else value
+
+    def set(self, key: Hashable, value: Any, version: int | None = None) -> None:
+        """
+        Cache a value.
+
+        Args:
+            key: Cache key.
+            value: Value to cache.
+            version: Version read before loading the value, the value is not
+                stored if the cache was invalidated since.
+        """
+        if core_config.CACHE_BACKEND == "none":
+            return
+        if self._copy:
+            value = self._copy(value)
+
+        with self._lock:
+            if version is not None and version != self._version:
+                return
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: Hashable) -> None:
+        """
+        Drop the given keys, or every entry if none is given, on every worker.
+
+        Call it after committing the change of the cached rows.
+
+        Args:
+            *keys: Cache keys to drop.
+        """
+        with self._lock:
+            if keys:
+                for key in keys:
+                    self._entries.pop(key, None)
+            else:
+                self._entries.clear()
+            self._version += 1
+            self.invalidations += 1
+
+        if core_config.CACHE_BACKEND != "shared":
+            return
+
+        try:
+            generation = core_shared_state.get_shared_state().incr(
+                self._generation_key(), 1, GENERATION_TTL_SECONDS
+            )
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error sharing the {self.name} cache invalidation: {err}",
+                "error",
+                exc=err,
+            )
+            return
+
+        # Other workers invalidations missed meanwhile are applied on next sync,
+        # a missing generation counter is the same as 0
+        if generation == (self._generation or 0) + 1:
+            self._generation = generation
+
+    def stats(self) -> dict:
+        """
+        Get the cache usage counters.
+
+        Returns:
+            The size, hits, misses, hit ratio, evictions and invalidations.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def cached(cache: TTLCache, key: Callable[..., Hashable]):
+    """
+    Cache the results of a getter.
+
+    None results and exceptions are not cached.
+
+    Args:
+        cache: Cache holding the results.
+        key: Called with the getter arguments, returns the cache key.
+
+    Returns:
+        The decorator.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            cache_key = key(*args, **kwargs)
+            value = cache.get(cache_key)
+            if value is not MISSING:
+                return value
+
+            version = cache.version
+            value = func(*args, **kwargs)
+            if value is not None:
+                cache.set(cache_key, value, version)
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def detached_copy(instance):
+    """
+    Copy the column values of an ORM instance into a new detached instance.
+
+    The copy is never attached to a session, its relationships are not
+    loaded.
+
+    Args:
+        instance: ORM instance.
+
+    Returns:
+        The detached copy.
+    """
+    state = inspect(instance)
+    copy = state.mapper.class_manager.new_instance()
+    for attribute in state.mapper.column_attrs:
+        if attribute.key in state.dict:
+            value = state.dict[attribute.key]
+        elif state.session is not None and not attribute.deferred:
+            # Expired by a commit, reloaded from the session
+            value = getattr(instance, attribute.key)
+        else:
+            continue
+        set_committed_value(copy, attribute.key, value)
+    make_transient_to_detached(copy)
+    return copy
+
+
+def get_caches_stats() -> dict[str, dict]:
+    """
+    Get the usage counters of every cache of this worker.
+
+    Returns:
+        The counters by cache name.
+    """
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def clear_caches() -> None:
+    """
+    Drop the entries of every cache of this worker.
+    """
+    for cache in _caches.values():
+        cache._clear()
+
+
+_caches: dict[str, TTLCache] = {}
@@ -52,12 +52,174 @@ REVERSE_GEO_MIN_INTERVAL = (
 )
 REVERSE_GEO_LOCK = threading.Lock()
 REVERSE_GEO_LAST_CALL = 0.0
+try:
+    REVERSE_GEO_CACHE_PRECISION = max(
+        0, int(os.getenv("REVERSE_GEO_CACHE_PRECISION", "3"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid REVERSE_GEO_CACHE_PRECISION value, expected an int; defaulting to 3",
+        "warning",
+    )
+    REVERSE_GEO_CACHE_PRECISION = 3
+try:
+    REVERSE_GEO_CACHE_TTL_DAYS = max(
+        0, int(os.getenv("REVERSE_GEO_CACHE_TTL_DAYS", "180"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid REVERSE_GEO_CACHE_TTL_DAYS value, expected an int; defaulting to 180",
+        "warning",
+    )
+    REVERSE_GEO_CACHE_TTL_DAYS = 180
+try:
+    REVERSE_GEO_CACHE_SIZE = max(0, int(os.getenv("REVERSE_GEO_CACHE_SIZE", "1024")))
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid REVERSE_GEO_CACHE_SIZE value, expected an int; defaulting to 1024",
+        "warning",
+    )
+    REVERSE_GEO_CACHE_SIZE = 1024
 SUPPORTED_FILE_FORMATS = [
     ".fit",
     ".gpx",
     ".tcx",
     ".gz",
 ]  # used to screen bulk import files
+try:
+    BULK_IMPORT_WORKERS = max(
+        1, int(os.getenv("BULK_IMPORT_WORKERS", str(os.cpu_count() or 1)))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid BULK_IMPORT_WORKERS value, expected an int; defaulting to the CPU count",
+        "warning",
+    )
+    BULK_IMPORT_WORKERS = os.cpu_count() or 1
+try:
+    BULK_IMPORT_WRITE_BATCH_SIZE = max(
+        1, int(os.getenv("BULK_IMPORT_WRITE_BATCH_SIZE", "20"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid BULK_IMPORT_WRITE_BATCH_SIZE value, expected an int; defaulting to 20",
+        "warning",
+    )
+    BULK_IMPORT_WRITE_BATCH_SIZE = 20
+try:
+    # Comma separated "<activity type id>:<km>" pairs, e.g. "4:5,8:0.1"
+    AUTO_LAP_DISTANCES_KM = {
+        int(activity_type): float(distance)
+        for activity_type, distance in (
+            pair.split(":")
+            for pair in os.getenv("AUTO_LAP_DISTANCES_KM", "").split(",")
+            if pair.strip()
+        )
+    }
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid AUTO_LAP_DISTANCES_KM value, expected <activity type id>:<km> pairs; defaulting to 1 km laps",
+        "warning",
+    )
+    AUTO_LAP_DISTANCES_KM = {}
+try:
+    # Comma separated "<activity type id>:<seconds>" pairs, e.g. "3:300"
+    AUTO_LAP_SECONDS = {
+        int(activity_type): float(seconds)
+        for activity_type, seconds in (
+            pair.split(":")
+            for pair in os.getenv("AUTO_LAP_SECONDS", "").split(",")
+            if pair.strip()
+        )
+    }
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid AUTO_LAP_SECONDS value, expected <activity type id>:<seconds> pairs; defaulting to distance laps",
+        "warning",
+    )
+    AUTO_LAP_SECONDS = {}
+try:
+    STRAVA_SYNC_CONCURRENCY = max(1, int(os.getenv("STRAVA_SYNC_CONCURRENCY", "4")))
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid STRAVA_SYNC_CONCURRENCY value, expected an int; defaulting to 4",
+        "warning",
+    )
+    STRAVA_SYNC_CONCURRENCY = 4
+try:
+    GARMINCONNECT_SYNC_CONCURRENCY = max(
+        1, int(os.getenv("GARMINCONNECT_SYNC_CONCURRENCY", "4"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid GARMINCONNECT_SYNC_CONCURRENCY value, expected an int; defaulting to 4",
+        "warning",
+    )
+    GARMINCONNECT_SYNC_CONCURRENCY = 4
+try:
+    GARMINCONNECT_HEALTH_FETCH_WORKERS = max(
+        1, int(os.getenv("GARMINCONNECT_HEALTH_FETCH_WORKERS", "4"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid GARMINCONNECT_HEALTH_FETCH_WORKERS value, expected an int; defaulting to 4",
+        "warning",
+    )
+    GARMINCONNECT_HEALTH_FETCH_WORKERS = 4
+WEBSOCKET_PUBSUB_BACKEND = os.getenv("WEBSOCKET_PUBSUB_BACKEND", "postgres").lower()
+if WEBSOCKET_PUBSUB_BACKEND not in ("postgres", "memory"):
+    core_logger.print_to_log_and_console(
+        "Invalid WEBSOCKET_PUBSUB_BACKEND value, expected postgres or memory; defaulting to postgres",
+        "warning",
+    )
+    WEBSOCKET_PUBSUB_BACKEND = "postgres"
+
+SHARED_STATE_BACKEND = os.getenv("SHARED_STATE_BACKEND", "postgres").lower()
+if SHARED_STATE_BACKEND not in ("postgres", "redis", "memory"):
+    core_logger.print_to_log_and_console(
+        "Invalid SHARED_STATE_BACKEND value, expected postgres, redis or memory; defaulting to postgres",
+        "warning",
+    )
+    SHARED_STATE_BACKEND = "postgres"
+SHARED_STATE_REDIS_URL = os.getenv("SHARED_STATE_REDIS_URL", "redis://redis:6379/0")
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "shared").lower()
+if CACHE_BACKEND not in ("shared", "memory", "none"):
+    core_logger.print_to_log_and_console(
+        "Invalid CACHE_BACKEND value, expected shared, memory or none; defaulting to shared",
+        "warning",
+    )
+    CACHE_BACKEND = "shared"
+try:
+    PASSWORD_HASHING_WORKERS = max(1, int(os.getenv("PASSWORD_HASHING_WORKERS", "2")))
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid PASSWORD_HASHING_WORKERS value, expected an int; defaulting to 2",
+        "warning",
+    )
+    PASSWORD_HASHING_WORKERS = 2
+try:
+    PASSWORD_HASHING_MAX_QUEUE = max(
+        0, int(os.getenv("PASSWORD_HASHING_MAX_QUEUE", "32"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid PASSWORD_HASHING_MAX_QUEUE value, expected an int; defaulting to 32",
+        "warning",
+    )
+    PASSWORD_HASHING_MAX_QUEUE = 32
+PASSWORD_HASHER_CALIBRATE = (
+    os.getenv("PASSWORD_HASHER_CALIBRATE", "false").lower() == "true"
+)
+try:
+    PASSWORD_HASHER_TARGET_MS = max(
+        1, int(os.getenv("PASSWORD_HASHER_TARGET_MS", "250"))
+    )
+except ValueError:
+    core_logger.print_to_log_and_console(
+        "Invalid PASSWORD_HASHER_TARGET_MS value, expected an int; defaulting to 250",
+        "warning",
+    )
+    PASSWORD_HASHER_TARGET_MS = 250
 
 
 def read_secret(env_var_name: str, default_value: str | None = None) -> str | None:
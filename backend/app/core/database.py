@@ -1,5 +1,9 @@
 import os
-from sqlalchemy import create_engine
+import zlib
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Connection, create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
 from sqlalchemy.engine.url import URL
 
@@ -31,6 +35,10 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 # Create a base class for declarative models
 Base = declarative_base()
 
+# First key of the advisory locks taken by advisory_lock, keeps them apart
+# from locks taken by other applications sharing the database
+ADVISORY_LOCK_NAMESPACE = 0x656E64  # "end"
+
 
 def get_db():
     """
@@ -57,3 +65,91 @@ def get_db():
     finally:
         # Close the database session
         db.close()
+
+
+def get_advisory_lock_key(name: str) -> int:
+    """
+    Map a lock name to the signed 32-bit key of a PostgreSQL advisory lock.
+
+    Args:
+        name: Lock name, e.g. a scheduler job ID.
+
+    Returns:
+        Key stable across processes and restarts.
+    """
+    return zlib.crc32(name.encode()) - 2**31
+
+
+def hold_advisory_lock(name: str) -> Connection | None:
+    """
+    Try to take a cluster-wide PostgreSQL advisory lock without waiting.
+
+    The lock belongs to a dedicated connection and is held until it is
+    released with release_advisory_lock, or the connection is lost.
+
+    Args:
+        name: Lock name, see get_advisory_lock_key.
+
+    Returns:
+        The connection holding the lock, or None if another session holds it.
+    """
+    params = {"namespace": ADVISORY_LOCK_NAMESPACE, "key": get_advisory_lock_key(name)}
+    connection = engine.connect()
+    try:
+        acquired = connection.execute(
+            text("SELECT pg_try_advisory_lock(:namespace, :key)"), params
+        ).scalar()
+        connection.commit()
+    except Exception:
+        connection.close()
+        raise
+    if not acquired:
+        connection.close()
+        return None
+    return connection
+
+
+def release_advisory_lock(connection: Connection, name: str) -> None:
+    """
+    Release an advisory lock taken by hold_advisory_lock and close its connection.
+
+    Args:
+        connection: Connection returned by hold_advisory_lock.
+        name: Lock name.
+    """
+    params = {"namespace": ADVISORY_LOCK_NAMESPACE, "key": get_advisory_lock_key(name)}
+    try:
+        connection.execute(text("SELECT pg_advisory_unlock(:namespace, :key)"), params)
+        connection.commit()
+    except Exception:
+        # Closing the underlying connection releases the lock
+        connection.invalidate()
+    finally:
+        connection.close()
+
+
+@contextmanager
+def advisory_lock(name: str) -> Iterator[bool]:
+    """
+    Try to take a cluster-wide PostgreSQL advisory lock without waiting.
+
+    The lock belongs to a dedicated connection held until the block exits,
+    so it is released even if the process dies.
+
+    Args:
+        name: Lock name, see get_advisory_lock_key.
+
+    Yields:
+        True if the lock was taken, False if another session holds it.
+
+    Example:
+        with advisory_lock("my_job") as acquired:
+            if acquired:
+                run_job()  # runs on a single backend instance at a time
+    """
+    connection = hold_advisory_lock(name)
+    try:
+        yield connection is not None
+    finally:
+        if connection is not None:
+            release_advisory_lock(connection, name)
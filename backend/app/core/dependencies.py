@@ -38,3 +38,13 @@ def validate_pagination_values(
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Invalid Number of Records",
         )
+
+
+def validate_num_records_value(num_records: int):
+    # Check if num_records higher than 0
+    if not (int(num_records) > 0):
+        # Raise an HTTPException with a 422 Unprocessable Entity status code
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid Number of Records",
+        )
@@ -0,0 +1,178 @@
+"""
+Keyset (cursor) pagination, offered next to the page_number endpoints.
+
+Pages are ordered by sort keys ending with the row ID, all in the same
+direction. The cursor returned with a page encodes the sort keys of its last
+row and the next page starts right after them, so reading deep pages does
+not scan the previous ones and rows inserted meanwhile do not shift pages.
+
+Cursors are opaque URL-safe strings. They also record the sort they were
+issued for and are rejected with a 422 if used with another one.
+"""
+
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Generic, Sequence, TypeVar
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import bindparam, tuple_
+
+T = TypeVar("T")
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """
+    A page of records and the cursor of the next one.
+
+    Attributes:
+        records: Records of the page.
+        next_cursor: Cursor of the next page, None on the last page.
+    """
+
+    records: list[T]
+    next_cursor: str | None = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"date": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        ((kind, encoded),) = value.items()
+        if kind == "datetime":
+            return datetime.fromisoformat(encoded)
+        if kind == "date":
+            return date.fromisoformat(encoded)
+        if kind == "decimal":
+            return Decimal(encoded)
+        raise ValueError(f"Unknown cursor value type {kind}")
+    return value
+
+
+def encode_cursor(sort: str, values: Sequence) -> str:
+    """
+    Encode the sort key values of a row into an opaque cursor.
+
+    Args:
+        sort: Name of the sort the values belong to.
+        values: Sort key values, the row ID last.
+
+    Returns:
+        The URL-safe cursor.
+    """
+    payload = json.dumps(
+        {"sort": sort, "values": [_encode_value(value) for value in values]},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str, num_values: int) -> list:
+    """
+    Decode a cursor issued for the given sort.
+
+    Args:
+        cursor: Cursor returned with the previous page.
+        sort: Name of the current sort.
+        num_values: Number of sort keys of the current sort.
+
+    Returns:
+        The sort key values encoded in the cursor.
+
+    Raises:
+        HTTPException: 422 if the cursor is malformed or issued for another sort.
+    """
+    try:
+        payload = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+        values = [_decode_value(value) for value in payload["values"]]
+        if payload["sort"] != sort or len(values) != num_values:
+            raise ValueError("Cursor issued for another sort")
+        return values
+    except (ValueError, TypeError, KeyError, binascii.Error) as err:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Invalid Cursor",
+        ) from err
+
+
+def order_by_sort_keys(query, sort_keys: Sequence, descending: bool):
+    """
+    Order the query by the sort keys, all in the same direction.
+
+    Args:
+        query: SQLAlchemy query.
+        sort_keys: Column expressions, the ID column last.
+        descending: Whether to sort in descending order.
+
+    Returns:
+        The ordered query.
+    """
+    return query.order_by(
+        *(key.desc() if descending else key.asc() for key in sort_keys)
+    )
+
+
+def get_cursor_page(
+    query,
+    sort_keys: Sequence,
+    descending: bool,
+    num_records: int,
+    cursor: str | None = None,
+    sort: str = "default",
+) -> tuple[list, str | None]:
+    """
+    Fetch the page of the query starting after the cursor.
+
+    Args:
+        query: SQLAlchemy query of a single entity, without ordering.
+        sort_keys: Non-null column expressions, the ID column last.
+        descending: Whether to sort in descending order.
+        num_records: Number of records of the page.
+        cursor: Cursor of the previous page, None for the first page.
+        sort: Name of the sort, cursors are only valid for the same sort.
+
+    Returns:
+        The records of the page and the cursor of the next page, None on the
+        last page.
+
+    Raises:
+        HTTPException: 422 if the cursor is invalid.
+    """
+    if cursor:
+        values = decode_cursor(cursor, sort, len(sort_keys))
+        bound = tuple_(
+            *(
+                bindparam(None, value, type_=key.type)
+                for key, value in zip(sort_keys, values)
+            )
+        )
+        keys = tuple_(*sort_keys)
+        query = query.filter(keys < bound if descending else keys > bound)
+
+    # Select the sort keys to build the next cursor, and one more row to
+    # know if there is a next page
+    rows = (
+        order_by_sort_keys(query.add_columns(*sort_keys), sort_keys, descending)
+        .limit(num_records + 1)
+        .all()
+    )
+
+    next_cursor = None
+    if len(rows) > num_records:
+        rows = rows[:num_records]
+        next_cursor = encode_cursor(sort, list(rows[-1][1:]))
+
+    return [row[0] for row in rows], next_cursor
@@ -3,7 +3,8 @@ Rate limiting middleware for Endurain API.
 
 This module provides rate limiting functionality to protect API endpoints from abuse,
 particularly focusing on OAuth2/OIDC authentication flows. It uses slowapi (built on
-python-limits) to implement per-IP rate limiting with in-memory storage.
+python-limits) to implement per-IP rate limiting. Counters are kept in the shared
+state (see core.shared_state) so limits hold across every backend worker.
 
 Protects endpoints from:
 - Brute-force attacks on authorization endpoints
@@ -25,14 +26,17 @@ Usage:
         ...
 """
 
+import time
+
+from limits.storage import Storage
 from slowapi import Limiter
 from slowapi.errors import RateLimitExceeded
 from fastapi import Request, Response
 from fastapi.responses import JSONResponse
 import core.logger as core_logger
+import core.shared_state as core_shared_state
 import session.utils as session_utils
 
-
 # Predefined rate limit decorators for common use cases
 # These can be imported and used directly on routes
 
@@ -54,15 +58,61 @@ API_WRITE_LIMIT = "30/minute"  # POST/PUT/DELETE (write operations)
 ADMIN_LIMIT = "10/minute"  # Administrative operations
 
 
-# Initialize the rate limiter with in-memory storage
-# For production with multiple backend instances, consider using Redis storage:
-# from slowapi.middleware import SlowAPIMiddleware
-# from slowapi import _rate_limit_exceeded_handler
-# limiter = Limiter(key_func=session_utils.get_ip_address, storage_uri="redis://localhost:6379")
+# Prefix of the rate limit counters in the shared state
+RATE_LIMIT_KEY_PREFIX = "rate_limit:"
+
+
+class SharedStateStorage(Storage):
+    """
+    python-limits storage keeping the counters in the shared state.
+
+    Registered for the ``endurain://`` URI. Only supports the fixed window
+    strategy, the slowapi default.
+    """
+
+    STORAGE_SCHEME = ["endurain"]
+
+    def __init__(self, uri: str | None = None, wrap_exceptions: bool = False, **_):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions)
+
+    @property
+    def base_exceptions(self) -> type[Exception] | tuple[type[Exception], ...]:
+        return Exception
+
+    @property
+    def state(self):
+        return core_shared_state.get_shared_state()
+
+    def incr(self, key: str, expiry: int, amount: int = 1) -> int:
+        return self.state.incr(RATE_LIMIT_KEY_PREFIX + key, amount, expiry)
+
+    def get(self, key: str) -> int:
+        return self.state.get(RATE_LIMIT_KEY_PREFIX + key) or 0
+
+    def get_expiry(self, key: str) -> float:
+        return self.state.get_expiry(RATE_LIMIT_KEY_PREFIX + key) or time.time()
+
+    def check(self) -> bool:
+        try:
+            self.state.get(RATE_LIMIT_KEY_PREFIX + "check")
+            return True
+        except Exception:
+            return False
+
+    def reset(self) -> int | None:
+        return self.state.clear(RATE_LIMIT_KEY_PREFIX)
+
+    def clear(self, key: str) -> None:
+        self.state.delete(RATE_LIMIT_KEY_PREFIX + key)
+
+
+# Initialize the rate limiter with the shared state storage, falling back to
+# per-worker in-memory limits while the shared state is unreachable
 limiter = Limiter(
     key_func=session_utils.get_ip_address,
     default_limits=["100/minute"],  # Global default: 100 requests per minute per IP
-    storage_uri="memory://",  # In-memory storage (single instance only)
+    storage_uri="endurain://",  # Shared state storage (all backend workers)
+    in_memory_fallback_enabled=True,
     headers_enabled=True,  # Include rate limit headers in responses
 )
 
@@ -1,5 +1,29 @@
+"""
+Background jobs shared by every backend instance.
+
+Jobs are persisted in the scheduler_jobs table, which APScheduler does not
+support sharing between running schedulers. Every instance starts its
+scheduler paused, and only the leader, the instance holding the
+scheduler_leader advisory lock for its whole lifetime, adds the jobs and
+processes them. The other instances try to take the lock every
+LEADER_CHECK_SECONDS, so one of them takes over when the leader stops.
+
+A run missed while no instance was leader is executed once by the next
+leader (coalesced), and a job never overlaps its own previous run. Jobs are
+also wrapped by run_job or run_async_job, which take a PostgreSQL advisory
+lock named after the job, so a run started by a former leader, or by the
+startup tasks of any instance, is never run twice at the same time.
+"""
+
+import inspect
+from collections.abc import Callable
+from datetime import datetime, timezone
+
 # from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.util import obj_to_ref, ref_to_obj
+from sqlalchemy import text
 
 import strava.activity_utils as strava_activity_utils
 import strava.utils as strava_utils
@@ -11,18 +35,191 @@ import password_reset_tokens.utils as password_reset_tokens_utils
 
 import sign_up_tokens.utils as sign_up_tokens_utils
 
+import geocoding.utils as geocoding_utils
+
+import core.database as core_database
 import core.logger as core_logger
+import core.shared_state as core_shared_state
+
+# Table storing the scheduled jobs and their next run time
+JOBS_TABLE_NAME = "scheduler_jobs"
+
+# Advisory lock held by the instance running the persisted jobs
+LEADER_LOCK_NAME = "scheduler_leader"
+
+# Seconds between two leader elections, also the time the other instances
+# take to notice a lost leader
+LEADER_CHECK_SECONDS = 30
 
 # scheduler = BackgroundScheduler()
-scheduler = AsyncIOScheduler()
+scheduler = AsyncIOScheduler(
+    jobstores={
+        "default": SQLAlchemyJobStore(
+            engine=core_database.engine, tablename=JOBS_TABLE_NAME
+        )
+    },
+    job_defaults={
+        # Run missed runs once, never overlap a slow run with the next one
+        "coalesce": True,
+        "max_instances": 1,
+        "misfire_grace_time": None,
+    },
+)
+
+# Runs the leader election of this instance, never shared with other instances
+election_scheduler = AsyncIOScheduler()
+
+
+class SchedulerLeadership:
+    """
+    Process the persisted jobs only on the instance holding the leader lock.
+
+    Attributes:
+        scheduler: Scheduler of the persisted jobs, paused unless leader.
+        add_jobs: Adds the persisted jobs, run on every leader election.
+    """
+
+    def __init__(self, scheduler: AsyncIOScheduler, add_jobs: Callable[[], None]):
+        self.scheduler = scheduler
+        self.add_jobs = add_jobs
+        self._connection = None
+
+    @property
+    def is_leader(self) -> bool:
+        return self._connection is not None
+
+    def _leader_lock_held(self) -> bool:
+        try:
+            self._connection.execute(text("SELECT 1"))
+            self._connection.commit()
+            return True
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Scheduler leader lock lost, pausing the scheduler: {err}",
+                "warning",
+                exc=err,
+            )
+            # The lock was released with the lost connection
+            self._connection.invalidate()
+            self._connection.close()
+            self._connection = None
+            self.scheduler.pause()
+            return False
+
+    def elect(self) -> bool:
+        """
+        Take the leader lock if it is free and run the persisted jobs.
+
+        Returns:
+            Whether this instance is the leader.
+        """
+        if self.is_leader and self._leader_lock_held():
+            return True
+
+        try:
+            self._connection = core_database.hold_advisory_lock(LEADER_LOCK_NAME)
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error taking the scheduler leader lock: {err}", "error", exc=err
+            )
+            return False
+        if self._connection is None:
+            return False
+
+        core_logger.print_to_log_and_console(
+            "This instance is the scheduler leader, running the scheduled jobs"
+        )
+        self.add_jobs()
+        self.scheduler.resume()
+        return True
+
+    def release(self) -> None:
+        """
+        Stop processing the persisted jobs and release the leader lock.
+        """
+        if not self.is_leader:
+            return
+        if self.scheduler.running:
+            self.scheduler.pause()
+        core_database.release_advisory_lock(self._connection, LEADER_LOCK_NAME)
+        self._connection = None
+
+
+def run_job(job_id: str, func: Callable | str, *args):
+    """
+    Run a job unless another backend instance is already running it.
+
+    Args:
+        job_id: Job ID, also the name of the advisory lock.
+        func: Function to run, or its "module:name" reference.
+        *args: Arguments passed to the function.
+
+    Returns:
+        The result of the function, or None if the run was skipped.
+    """
+    if isinstance(func, str):
+        func = ref_to_obj(func)
+
+    with core_database.advisory_lock(job_id) as acquired:
+        if not acquired:
+            core_logger.print_to_log(
+                f"Skipping job {job_id}, it is running on another instance"
+            )
+            return None
+        return func(*args)
+
+
+async def run_async_job(job_id: str, func: Callable | str, *args):
+    """
+    Run a coroutine job unless another backend instance is already running it.
+
+    Args:
+        job_id: Job ID, also the name of the advisory lock.
+        func: Coroutine function to run, or its "module:name" reference.
+        *args: Arguments passed to the function.
+
+    Returns:
+        The result of the coroutine, or None if the run was skipped.
+    """
+    if isinstance(func, str):
+        func = ref_to_obj(func)
+
+    with core_database.advisory_lock(job_id) as acquired:
+        if not acquired:
+            core_logger.print_to_log(
+                f"Skipping job {job_id}, it is running on another instance"
+            )
+            return None
+        return await func(*args)
 
 
 def start_scheduler():
+    """
+    Start the scheduler paused and elect this instance leader if none is.
+    """
     if not scheduler.running:
-        # Start the scheduler
-        scheduler.start()
+        # Jobs are only processed once this instance is leader
+        scheduler.start(paused=True)
 
+    if not election_scheduler.running:
+        election_scheduler.start()
+    election_scheduler.add_job(
+        leadership.elect,
+        "interval",
+        seconds=LEADER_CHECK_SECONDS,
+        id="elect_scheduler_leader",
+        name="elect the scheduler leader",
+        replace_existing=True,
+        next_run_time=datetime.now(timezone.utc),
+    )
+
+
+def add_scheduler_jobs():
+    """
+    Add or update every persisted job, run by the scheduler leader.
+    """
     add_scheduler_job(
+        "refresh_strava_tokens",
         strava_utils.refresh_strava_tokens,
         "interval",
         60,
@@ -31,6 +228,7 @@ def start_scheduler():
     )
 
     add_scheduler_job(
+        "retrieve_strava_activities",
         strava_activity_utils.retrieve_strava_users_activities_for_days,
         "interval",
         60,
@@ -39,6 +237,7 @@ def start_scheduler():
     )
 
     add_scheduler_job(
+        "retrieve_garminconnect_activities",
         garmin_activity_utils.retrieve_garminconnect_users_activities_for_days,
         "interval",
         60,
@@ -47,6 +246,7 @@ def start_scheduler():
     )
 
     add_scheduler_job(
+        "retrieve_garminconnect_health",
         garmin_health_utils.retrieve_garminconnect_users_health_for_days,
         "interval",
         240,
@@ -55,6 +255,7 @@ def start_scheduler():
     )
 
     add_scheduler_job(
+        "delete_invalid_password_reset_tokens",
         password_reset_tokens_utils.delete_invalid_tokens_from_db,
         "interval",
         60,
@@ -63,6 +264,7 @@ def start_scheduler():
     )
 
     add_scheduler_job(
+        "delete_invalid_sign_up_tokens",
         sign_up_tokens_utils.delete_invalid_tokens_from_db,
         "interval",
         60,
@@ -70,13 +272,58 @@ def start_scheduler():
         "delete invalid sign-up tokens from the database",
     )
 
+    add_scheduler_job(
+        "delete_expired_cached_locations",
+        geocoding_utils.delete_expired_cached_locations_from_db,
+        "interval",
+        1440,
+        [],
+        "delete expired reverse geocoding cache entries from the database",
+    )
+
+    add_scheduler_job(
+        "delete_expired_shared_state",
+        core_shared_state.delete_expired_shared_state,
+        "interval",
+        15,
+        [],
+        "delete expired shared state entries",
+    )
 
-def add_scheduler_job(func, interval, minutes, args, description):
+
+def add_scheduler_job(job_id, func, interval, minutes, args, description):
+    """
+    Add or update a persisted job, keeping the next run time already stored.
+
+    Args:
+        job_id: Unique job ID, shared by every backend instance.
+        func: Function run by the job.
+        interval: Trigger type.
+        minutes: Minutes between runs.
+        args: Arguments passed to the function.
+        description: Description of the job used in the logs.
+    """
     try:
         core_logger.print_to_log(
             f"Added scheduler job to {description} every {minutes} minutes"
         )
-        scheduler.add_job(func, interval, minutes=minutes, args=args)
+        job_kwargs = {}
+        existing_job = scheduler.get_job(job_id)
+        if existing_job is not None and existing_job.next_run_time is not None:
+            # Keep the schedule across restarts, a past run time runs once now
+            job_kwargs["next_run_time"] = existing_job.next_run_time
+
+        runner = run_async_job if inspect.iscoroutinefunction(func) else run_job
+        scheduler.add_job(
+            runner,
+            interval,
+            minutes=minutes,
+            args=[job_id, obj_to_ref(func), *args],
+            id=job_id,
+            name=description,
+            replace_existing=True,
+            **job_kwargs,
+        )
     except Exception as e:
         core_logger.print_to_log(
             f"Failed to add scheduler job to {description}: {str(e)}", "error"
@@ -84,4 +331,9 @@ def add_scheduler_job(func, interval, minutes, args, description):
 
 
 def stop_scheduler():
+    election_scheduler.shutdown()
+    leadership.release()
     scheduler.shutdown()
+
+
+leadership = SchedulerLeadership(scheduler, add_scheduler_jobs)
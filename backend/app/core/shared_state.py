@@ -0,0 +1,335 @@
+"""
+Key/value state with expiration shared by every backend worker.
+
+Rate limit counters and pending MFA logins, codes and secrets must be visible
+to whichever worker handles the next request. PostgresState keeps them in an
+unlogged table of the application database, RedisState in a Redis-compatible
+server and MemoryState in the process, for a single worker or tests.
+
+Every backend offers the same operations:
+    get(key), set(key, value, ttl_seconds), incr(key, amount, ttl_seconds),
+    get_expiry(key), delete(key), compare_and_delete(key, expected),
+    clear(prefix) and delete_expired().
+
+Values must be JSON serializable. Entries always expire, incr only sets the
+expiration when it creates the entry (fixed window counters).
+"""
+
+import json
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import text
+
+import core.config as core_config
+import core.database as core_database
+import core.logger as core_logger
+
+
+class MemoryState:
+    """
+    Thread-safe shared state held by the current process.
+    """
+
+    def __init__(self):
+        self._store: dict[str, tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def _get_entry(self, key: str) -> tuple[Any, float] | None:
+        entry = self._store.get(key)
+        if entry is not None and entry[1] <= time.time():
+            del self._store[key]
+            return None
+        return entry
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            entry = self._get_entry(key)
+            return None if entry is None else entry[0]
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self._lock:
+            self._store[key] = (value, time.time() + ttl_seconds)
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None:
+                entry = (amount, time.time() + ttl_seconds)
+            else:
+                entry = (entry[0] + amount, entry[1])
+            self._store[key] = entry
+            return entry[0]
+
+    def get_expiry(self, key: str) -> float | None:
+        with self._lock:
+            entry = self._get_entry(key)
+            return None if entry is None else entry[1]
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._store.pop(key, None)
+
+    def compare_and_delete(self, key: str, expected: Any) -> bool:
+        with self._lock:
+            entry = self._get_entry(key)
+            if entry is None or entry[0] != expected:
+                return False
+            del self._store[key]
+            return True
+
+    def clear(self, prefix: str = "") -> int:
+        with self._lock:
+            keys = [key for key in self._store if key.startswith(prefix)]
+            for key in keys:
+                del self._store[key]
+            return len(keys)
+
+    def delete_expired(self) -> int:
+        with self._lock:
+            now = time.time()
+            keys = [key for key, entry in self._store.items() if entry[1] <= now]
+            for key in keys:
+                del self._store[key]
+            return len(keys)
+
+
+class PostgresState:
+    """
+    Shared state kept in the unlogged shared_state table.
+
+    Expired rows are ignored by every query and removed by delete_expired,
+    run periodically by the scheduler.
+    """
+
+    def __init__(self, engine=None):
+        self._engine = engine or core_database.engine
+
+    def _execute(self, query: str, params: dict):
+        with self._engine.begin() as connection:
+            result = connection.execute(text(query), params)
+            return result.scalar() if result.returns_rows else result.rowcount
+
+    def get(self, key: str) -> Any | None:
+        return self._execute(
+            "SELECT value FROM shared_state WHERE key = :key AND expires_at > now()",
+            {"key": key},
+        )
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._execute(
+            """
+            INSERT INTO shared_state (key, value, expires_at)
+            VALUES (
+                :key,
+                CAST(:value AS jsonb),
+                now() + make_interval(secs => CAST(:ttl AS double precision))
+            )
+            ON CONFLICT (key) DO UPDATE
+            SET value = EXCLUDED.value, expires_at = EXCLUDED.expires_at
+            """,
+            {"key": key, "value": json.dumps(value), "ttl": ttl_seconds},
+        )
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        # A single statement keeps concurrent increments atomic
+        return self._execute(
+            """
+            INSERT INTO shared_state (key, value, expires_at)
+            VALUES (
+                :key,
+                to_jsonb(CAST(:amount AS bigint)),
+                now() + make_interval(secs => CAST(:ttl AS double precision))
+            )
+            ON CONFLICT (key) DO UPDATE
+            SET value = CASE
+                    WHEN shared_state.expires_at > now()
+                    THEN to_jsonb(CAST(shared_state.value AS bigint) + CAST(:amount AS bigint))
+                    ELSE EXCLUDED.value
+                END,
+                expires_at = CASE
+                    WHEN shared_state.expires_at > now()
+                    THEN shared_state.expires_at
+                    ELSE EXCLUDED.expires_at
+                END
+            RETURNING CAST(value AS bigint)
+            """,
+            {"key": key, "amount": amount, "ttl": ttl_seconds},
+        )
+
+    def get_expiry(self, key: str) -> float | None:
+        expiry = self._execute(
+            """
+            SELECT EXTRACT(EPOCH FROM expires_at) FROM shared_state
+            WHERE key = :key AND expires_at > now()
+            """,
+            {"key": key},
+        )
+        return None if expiry is None else float(expiry)
+
+    def delete(self, key: str) -> None:
+        self._execute("DELETE FROM shared_state WHERE key = :key", {"key": key})
+
+    def compare_and_delete(self, key: str, expected: Any) -> bool:
+        deleted = self._execute(
+            """
+            DELETE FROM shared_state
+            WHERE key = :key AND value = CAST(:expected AS jsonb) AND expires_at > now()
+            """,
+            {"key": key, "expected": json.dumps(expected)},
+        )
+        return deleted > 0
+
+    def clear(self, prefix: str = "") -> int:
+        return self._execute(
+            "DELETE FROM shared_state WHERE starts_with(key, :prefix)",
+            {"prefix": prefix},
+        )
+
+    def delete_expired(self) -> int:
+        return self._execute("DELETE FROM shared_state WHERE expires_at <= now()", {})
+
+
+class RedisState:
+    """
+    Shared state kept in a Redis-compatible server.
+
+    Requires the optional redis package. Keys are namespaced with KEY_PREFIX
+    and expire on their own.
+    """
+
+    KEY_PREFIX = "endurain:"
+
+    # Sets the expiration only when the increment creates the key
+    INCR_SCRIPT = """
+    local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+    if value == tonumber(ARGV[1]) then
+        redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    end
+    return value
+    """
+
+    COMPARE_AND_DELETE_SCRIPT = """
+    if redis.call('GET', KEYS[1]) == ARGV[1] then
+        return redis.call('DEL', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, client=None):
+        if client is None:
+            import redis
+
+            client = redis.Redis.from_url(url)
+        self._client = client
+        self._incr = client.register_script(self.INCR_SCRIPT)
+        self._compare_and_delete = client.register_script(
+            self.COMPARE_AND_DELETE_SCRIPT
+        )
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        # Canonical encoding, compare_and_delete compares the raw strings
+        return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+    def get(self, key: str) -> Any | None:
+        value = self._client.get(self.KEY_PREFIX + key)
+        return None if value is None else json.loads(value)
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        self._client.set(
+            self.KEY_PREFIX + key,
+            self._dumps(value),
+            px=max(1, int(ttl_seconds * 1000)),
+        )
+
+    def incr(self, key: str, amount: int, ttl_seconds: float) -> int:
+        return int(
+            self._incr(
+                keys=[self.KEY_PREFIX + key],
+                args=[amount, max(1, int(ttl_seconds * 1000))],
+            )
+        )
+
+    def get_expiry(self, key: str) -> float | None:
+        ttl_milliseconds = self._client.pttl(self.KEY_PREFIX + key)
+        if ttl_milliseconds is None or ttl_milliseconds < 0:
+            return None
+        return time.time() + ttl_milliseconds / 1000
+
+    def delete(self, key: str) -> None:
+        self._client.delete(self.KEY_PREFIX + key)
+
+    def compare_and_delete(self, key: str, expected: Any) -> bool:
+        deleted = self._compare_and_delete(
+            keys=[self.KEY_PREFIX + key], args=[self._dumps(expected)]
+        )
+        return bool(deleted)
+
+    def clear(self, prefix: str = "") -> int:
+        keys = list(self._client.scan_iter(match=f"{self.KEY_PREFIX}{prefix}*"))
+        return self._client.delete(*keys) if keys else 0
+
+    def delete_expired(self) -> int:
+        return 0
+
+
+def create_shared_state(backend: str):
+    """
+    Create the shared state of the given backend.
+
+    Falls back to Postgres if the Redis client is not installed.
+
+    Args:
+        backend: postgres, redis or memory.
+
+    Returns:
+        The shared state instance.
+    """
+    if backend == "memory":
+        return MemoryState()
+    if backend == "redis":
+        try:
+            return RedisState(core_config.SHARED_STATE_REDIS_URL)
+        except ImportError as err:
+            core_logger.print_to_log_and_console(
+                f"Redis shared state requires the redis package, using Postgres: {err}",
+                "warning",
+            )
+    return PostgresState()
+
+
+def get_shared_state():
+    """
+    Get the process-wide shared state selected by SHARED_STATE_BACKEND.
+
+    Returns:
+        The shared state instance, created on first use.
+    """
+    global _shared_state
+    if _shared_state is None:
+        with _shared_state_lock:
+            if _shared_state is None:
+                _shared_state = create_shared_state(core_config.SHARED_STATE_BACKEND)
+    return _shared_state
+
+
+def delete_expired_shared_state():
+    """
+    Remove expired shared state entries.
+    """
+    try:
+        deleted = get_shared_state().delete_expired()
+        if deleted:
+            core_logger.print_to_log(
+                f"Deleted {deleted} expired shared state entries", "debug"
+            )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Error in delete_expired_shared_state: {err}", "error", exc=err
+        )
+
+
+_shared_state = None
+_shared_state_lock = threading.Lock()
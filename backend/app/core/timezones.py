@@ -0,0 +1,256 @@
+"""
+Process-wide timezone lookups for activities.
+
+TimezoneFinder loads its polygon data when instantiated, so a single instance
+is created lazily and shared by every parser. Lookups are memoized on
+coordinates rounded to TIMEZONE_CACHE_PRECISION decimal places, which only
+affects points within a few meters of a timezone border.
+
+Activities without coordinates (FIT files without GPS) only carry a UTC
+offset. Those are resolved with an index, built lazily per year, of the
+periods during which each IANA zone uses each offset.
+"""
+
+import bisect
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from zoneinfo import ZoneInfo, available_timezones
+
+from timezonefinder import TimezoneFinder
+
+import core.logger as core_logger
+import core.config as core_config
+
+# Decimal places coordinates are rounded to before the lookup (~11 m)
+TIMEZONE_CACHE_PRECISION = 4
+
+# Number of rounded coordinates kept in the lookup cache
+TIMEZONE_CACHE_SIZE = 4096
+
+_timezone_finder: TimezoneFinder | None = None
+_timezone_finder_lock = threading.Lock()
+
+
+def get_timezone_finder() -> TimezoneFinder:
+    """
+    Get the shared TimezoneFinder instance, creating it on first use.
+
+    The polygon data is loaded in memory when the installed timezonefinder
+    version supports it, trading memory for faster lookups.
+
+    Returns:
+        The shared TimezoneFinder instance.
+    """
+    global _timezone_finder
+
+    if _timezone_finder is None:
+        with _timezone_finder_lock:
+            if _timezone_finder is None:
+                try:
+                    _timezone_finder = TimezoneFinder(in_memory=True)
+                except TypeError:
+                    core_logger.print_to_log(
+                        "TimezoneFinder in memory mode not available, using file mode",
+                        "debug",
+                    )
+                    _timezone_finder = TimezoneFinder()
+
+    return _timezone_finder
+
+
+@lru_cache(maxsize=TIMEZONE_CACHE_SIZE)
+def _timezone_at_rounded(latitude: float, longitude: float) -> str | None:
+    return get_timezone_finder().timezone_at(lat=latitude, lng=longitude)
+
+
+def timezone_at(latitude: float, longitude: float) -> str | None:
+    """
+    Get the timezone name of a coordinate.
+
+    Args:
+        latitude: Latitude in degrees.
+        longitude: Longitude in degrees.
+
+    Returns:
+        IANA timezone name, e.g. "Europe/Lisbon", or None if not found.
+    """
+    return _timezone_at_rounded(
+        round(latitude, TIMEZONE_CACHE_PRECISION),
+        round(longitude, TIMEZONE_CACHE_PRECISION),
+    )
+
+
+# Offset index settings: zones are sampled weekly and offset changes are
+# then located to the minute with a binary search
+OFFSET_INDEX_SAMPLE_INTERVAL = timedelta(days=7)
+OFFSET_INDEX_RESOLUTION = timedelta(minutes=1)
+
+# Number of offset lookups kept in the lookup cache
+OFFSET_CACHE_SIZE = 4096
+
+
+def _utc_offset_seconds(zone: ZoneInfo, moment: datetime) -> int:
+    return int(moment.astimezone(zone).utcoffset().total_seconds())
+
+
+def _zone_offset_periods(
+    zone: ZoneInfo, start: datetime, end: datetime
+) -> list[tuple[datetime, datetime, int]]:
+    """
+    Split a time range into the periods during which a zone keeps its offset.
+
+    Args:
+        zone: Timezone to inspect.
+        start: Start of the range (UTC, inclusive).
+        end: End of the range (UTC, exclusive).
+
+    Returns:
+        List of (period start, period end, offset in seconds) tuples covering
+        the range.
+    """
+    periods = []
+    period_start = start
+    offset = _utc_offset_seconds(zone, start)
+    sample = start
+    while sample < end:
+        next_sample = min(sample + OFFSET_INDEX_SAMPLE_INTERVAL, end)
+        if _utc_offset_seconds(zone, next_sample) != offset or next_sample == end:
+            # Locate the first moment with a different offset between samples
+            low, high = sample, next_sample
+            while high - low > OFFSET_INDEX_RESOLUTION:
+                middle = low + (high - low) / 2
+                if _utc_offset_seconds(zone, middle) == offset:
+                    low = middle
+                else:
+                    high = middle
+            if _utc_offset_seconds(zone, high) == offset:
+                high = next_sample
+            else:
+                # Transitions happen on whole minutes
+                high = high.replace(second=0, microsecond=0)
+                if _utc_offset_seconds(zone, high) == offset:
+                    high += OFFSET_INDEX_RESOLUTION
+            if high >= end:
+                break
+            periods.append((period_start, high, offset))
+            period_start = high
+            offset = _utc_offset_seconds(zone, high)
+            sample = high
+            continue
+        sample = next_sample
+
+    periods.append((period_start, end, offset))
+    return periods
+
+
+def _zone_preference(zone_name: str) -> tuple:
+    # Prefer area based names ("Europe/Lisbon") over fixed offset ("Etc/GMT-1")
+    # and legacy ("WET", "Portugal") names
+    return ("/" not in zone_name, zone_name.startswith("Etc/"), zone_name)
+
+
+@lru_cache(maxsize=None)
+def _offset_index(year: int) -> dict[int, tuple[list[datetime], list[tuple]]]:
+    """
+    Build the offset index of a year.
+
+    Args:
+        year: UTC year to index.
+
+    Returns:
+        Mapping of UTC offset in seconds to a tuple of (sorted period starts,
+        matching (period start, period end, zone names) periods). Zone names
+        within a period are ordered by preference.
+    """
+    start = datetime(year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+
+    # Collect every period boundary of every zone, per offset
+    zone_periods: dict[int, list[tuple[datetime, datetime, str]]] = {}
+    for zone_name in available_timezones():
+        try:
+            zone = ZoneInfo(zone_name)
+        except Exception:
+            continue
+        for period_start, period_end, offset in _zone_offset_periods(zone, start, end):
+            zone_periods.setdefault(offset, []).append(
+                (period_start, period_end, zone_name)
+            )
+
+    # Flatten each offset into non-overlapping periods with the zones active
+    index = {}
+    for offset, periods in zone_periods.items():
+        boundaries = sorted({moment for period in periods for moment in period[:2]})
+        flattened = []
+        for period_start, period_end in zip(boundaries, boundaries[1:]):
+            zone_names = sorted(
+                (
+                    zone_name
+                    for zone_start, zone_end, zone_name in periods
+                    if zone_start <= period_start and period_end <= zone_end
+                ),
+                key=_zone_preference,
+            )
+            if zone_names:
+                flattened.append((period_start, period_end, tuple(zone_names)))
+        index[offset] = ([period[0] for period in flattened], flattened)
+
+    return index
+
+
+@lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def get_timezones_for_offset(offset_seconds: int, moment: datetime) -> tuple[str, ...]:
+    """
+    Get the zones using a UTC offset at a given moment.
+
+    Args:
+        offset_seconds: UTC offset in seconds.
+        moment: Timezone aware moment.
+
+    Returns:
+        Zone names ordered by preference, empty if no zone uses the offset.
+    """
+    moment = moment.astimezone(timezone.utc)
+    starts, periods = _offset_index(moment.year).get(int(offset_seconds), ([], []))
+    position = bisect.bisect_right(starts, moment) - 1
+    if position < 0 or moment >= periods[position][1]:
+        return ()
+    return periods[position][2]
+
+
+def find_timezone_name(
+    offset_seconds: int,
+    reference_date: datetime,
+    preferred_timezones: list[str] | None = None,
+) -> str | None:
+    """
+    Find a timezone that uses a UTC offset at a given date.
+
+    When several zones match, the first match among preferred_timezones (e.g.
+    the user's previous activity timezones) wins, then the server TZ, then
+    area based zone names in alphabetical order.
+
+    Args:
+        offset_seconds: UTC offset in seconds.
+        reference_date: Timezone aware date the offset applies to.
+        preferred_timezones: Zone names to prefer, in order.
+
+    Returns:
+        Zone name or None if the date is naive or no zone matches.
+    """
+    if reference_date.utcoffset() is None:
+        return None
+
+    candidates = get_timezones_for_offset(
+        int(offset_seconds),
+        reference_date.astimezone(timezone.utc).replace(second=0, microsecond=0),
+    )
+    if not candidates:
+        return None
+
+    for preferred_timezone in [*(preferred_timezones or []), core_config.TZ]:
+        if preferred_timezone in candidates:
+            return preferred_timezone
+
+    return candidates[0]
@@ -1,14 +1,16 @@
+import math
 import fitdecode
 from enum import Enum
+from typing import BinaryIO
 
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from timezonefinder import TimezoneFinder
-from zoneinfo import ZoneInfo, available_timezones
 
 import activities.activity.utils as activities_utils
+import activities.activity.trackpoint_utils as activities_trackpoint_utils
 import activities.activity.schema as activities_schema
+import activities.activity.crud as activities_crud
 
 import activities.activity_exercise_titles.schema as activity_exercise_titles_schema
 import activities.activity_exercise_titles.crud as activity_exercise_titles_crud
@@ -26,6 +28,7 @@ import users.user_privacy_settings.schema as users_privacy_settings_schema
 import core.logger as core_logger
 
 import core.config as core_config
+import core.timezones as core_timezones
 
 
 def create_activity_objects(
@@ -37,12 +40,12 @@ def create_activity_objects(
     db: Session = None,
 ) -> list:
     try:
-        # Create an instance of TimezoneFinder
-        tf = TimezoneFinder()
         timezone = core_config.TZ
 
         # Define variables
         gear_id = None
+        # User timezones, only loaded for activities without coordinates
+        previous_timezones = None
 
         if garminconnect_gear:
             user_integrations = garmin_utils.fetch_user_integrations_and_validate_token(
@@ -97,15 +100,24 @@ def create_activity_objects(
 
             if activity_type != 3 and activity_type != 7:
                 if session_record["is_lat_lon_set"]:
-                    timezone = tf.timezone_at(
-                        lat=session_record["lat_lon_waypoints"][0]["lat"],
-                        lng=session_record["lat_lon_waypoints"][0]["lon"],
+                    timezone = core_timezones.timezone_at(
+                        session_record["lat_lon_waypoints"][0]["lat"],
+                        session_record["lat_lon_waypoints"][0]["lon"],
                     )
                 else:
                     if session_record["time_offset"]:
-                        timezone = find_timezone_name(
+                        if previous_timezones is None:
+                            previous_timezones = (
+                                activities_crud.get_recent_timezones_for_user(
+                                    user_id, db
+                                )
+                                if db is not None
+                                else []
+                            )
+                        timezone = core_timezones.find_timezone_name(
                             session_record["time_offset"],
                             session_record["session"]["first_waypoint_time"],
+                            previous_timezones,
                         )
 
             avg_power = session_record["session"]["avg_power"]
@@ -436,13 +448,12 @@ def split_records_by_activity(parsed_data: dict) -> dict:
 
 
 def parse_fit_file(
-    file: str, db: Session, activity_name_input: str | None = None
+    file: str | BinaryIO, db: Session, activity_name_input: str | None = None
 ) -> dict:
     try:
         # Initialize default values for various variables
         sessions = []
         time_offset = 0
-        last_waypoint_time = None
         activity_name = activity_name_input if activity_name_input else "Workout"
 
         # Arrays to store waypoint data
@@ -478,8 +489,8 @@ def parse_fit_file(
         # Dictionary to store file ID data
         file_id = {}
 
-        # Initialize variables to store previous latitude and longitude
-        prev_latitude, prev_longitude = None, None
+        # Record times and positions used to compute speed and pace
+        speed_records = []
 
         # Initialize variables to store whether elevation, power, heart rate, cadence, and velocity are set
         is_lat_lon_set = False
@@ -490,7 +501,7 @@ def parse_fit_file(
         is_velocity_set = False
 
         # Open the FIT file
-        with open(file, "rb") as fit_file:
+        with activities_utils.open_activity_file(file) as fit_file:
             fit_data = fitdecode.FitReader(fit_file)
 
             # Iterate over FIT messages
@@ -660,29 +671,6 @@ def parse_fit_file(
                         if power is not None:
                             is_power_set = True
 
-                        instant_speed = None
-                        # Calculate instant speed, pace, and update waypoint arrays
-                        if (
-                            latitude is not None
-                            and prev_latitude is not None
-                            and longitude is not None
-                            and prev_longitude is not None
-                        ):
-                            instant_speed = activities_utils.calculate_instant_speed(
-                                last_waypoint_time,
-                                time,
-                                latitude,
-                                longitude,
-                                prev_latitude,
-                                prev_longitude,
-                            )
-
-                        # Calculate instance pace
-                        instant_pace = None
-                        if instant_speed:
-                            instant_pace = 1 / instant_speed
-                            is_velocity_set = True
-
                         timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
 
                         # Append waypoint data to respective arrays
@@ -708,19 +696,9 @@ def parse_fit_file(
                         activities_utils.append_if_not_none(
                             power_waypoints, timestamp, power, "power"
                         )
-                        activities_utils.append_if_not_none(
-                            vel_waypoints, timestamp, instant_speed, "vel"
-                        )
-                        activities_utils.append_if_not_none(
-                            pace_waypoints, timestamp, instant_pace, "pace"
-                        )
 
-                        # Update previous latitude, longitude, and last waypoint time
-                        prev_latitude, prev_longitude, last_waypoint_time = (
-                            latitude,
-                            longitude,
-                            time,
-                        )
+                        # Speed and pace are computed for all records after parsing
+                        speed_records.append((time, latitude, longitude))
 
                     if frame.name == "device_settings":
                         time_offset = parse_frame_device_settings(frame)
@@ -732,6 +710,33 @@ def parse_fit_file(
                     if frame.name == "file_id":
                         file_id = parse_frame_file_id(frame)
 
+        # Calculate instant speed and pace for all records at once
+        kinematics = activities_trackpoint_utils.compute_track_kinematics(
+            [record[0] for record in speed_records],
+            [record[1] for record in speed_records],
+            [record[2] for record in speed_records],
+        )
+        for index, (time, _, _) in enumerate(speed_records):
+            instant_speed = kinematics["speeds"][index].item()
+
+            # Speed needs the position of the record and of the previous one
+            if index == 0 or math.isnan(instant_speed):
+                continue
+
+            # Calculate instance pace
+            instant_pace = None
+            if instant_speed:
+                instant_pace = 1 / instant_speed
+                is_velocity_set = True
+
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+            activities_utils.append_if_not_none(
+                vel_waypoints, timestamp, instant_speed, "vel"
+            )
+            activities_utils.append_if_not_none(
+                pace_waypoints, timestamp, instant_pace, "pace"
+            )
+
         # Check if exercises titles is not none
         if exercises_titles:
             activity_exercise_titles_crud.create_activity_exercise_titles(
@@ -1152,16 +1157,3 @@ def calculate_pace(distance, total_timer_time, activity_type, split_summary, len
 
         return time_active, time_active / distance
     return total_timer_time, 0
-
-
-def find_timezone_name(offset_seconds, reference_date):
-    for tz_name in available_timezones():
-        tz = ZoneInfo(tz_name)
-        if reference_date.utcoffset() is None:  # Skip invalid timezones
-            continue
-
-        # Get the UTC offset for the reference date
-        utc_offset = reference_date.astimezone(tz).utcoffset()
-
-        if utc_offset.total_seconds() == offset_seconds:
-            return tz_name
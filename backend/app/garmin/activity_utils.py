@@ -1,3 +1,5 @@
+import asyncio
+import io
 import os
 import zipfile
 
@@ -14,12 +16,16 @@ import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
 import activities.activity.crud as activities_crud
 
-import users.user.crud as users_crud
+import users.user_integrations.crud as user_integrations_crud
 
 import websocket.schema as websocket_schema
 
 from core.database import SessionLocal
 
+# Maximum number of days the scheduled sync goes back to catch up with a
+# user whose last successful sync is older than the requested window
+MAX_CATCH_UP_DAYS = 30
+
 
 async def fetch_and_process_activities_by_dates(
     garminconnect_client: garminconnect.Garmin,
@@ -28,11 +34,15 @@ async def fetch_and_process_activities_by_dates(
     user_id: int,
     websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
+    synced_at: datetime | None = None,
 ) -> list[activities_schema.Activity] | None:
     try:
-        # Fetch Garmin Connect activities for the specified date range
-        garmin_activities = garminconnect_client.get_activities_by_date(
-            str(start_date.date()), str(end_date.date())
+        # Fetch Garmin Connect activities for the specified date range, the
+        # client blocks so it runs off the event loop
+        garmin_activities = await asyncio.to_thread(
+            garminconnect_client.get_activities_by_date,
+            str(start_date.date()),
+            str(end_date.date()),
         )
     except Exception as err:
         core_logger.print_to_log(
@@ -52,18 +62,18 @@ async def fetch_and_process_activities_by_dates(
 
     parsed_activities = []
 
+    # Check which activities are already stored in the database in one query
+    stored_activity_ids = activities_crud.get_garminconnect_activity_ids_from_user_id(
+        [activity["activityId"] for activity in garmin_activities], user_id, db
+    )
+
     # Download activities
     for activity in garmin_activities:
         # Get the activity ID
         activity_id = activity["activityId"]
         activity_name = activity["activityName"]
 
-        # Check if the activity is already stored in the database
-        activity_db = activities_crud.get_activity_by_garminconnect_id_from_user_id(
-            activity_id, user_id, db
-        )
-
-        if activity_db:
+        if activity_id in stored_activity_ids:
             # Log an informational event if the activity is already stored
             core_logger.print_to_log(
                 f"User {user_id}: Activity {activity_id} already stored in the database"
@@ -73,55 +83,69 @@ async def fetch_and_process_activities_by_dates(
         core_logger.print_to_log(f"User {user_id}: Processing activity {activity_id}")
 
         # Get activity gear
-        activity_gear = garminconnect_client.get_activity_gear(activity_id)
+        activity_gear = await asyncio.to_thread(
+            garminconnect_client.get_activity_gear, activity_id
+        )
 
         # Download the activity in original format (.zip file)
-        zip_data = garminconnect_client.download_activity(
-            activity_id, dl_fmt=garminconnect_client.ActivityDownloadFormat.ORIGINAL
+        zip_data = await asyncio.to_thread(
+            garminconnect_client.download_activity,
+            activity_id,
+            dl_fmt=garminconnect_client.ActivityDownloadFormat.ORIGINAL,
         )
-        # Save the zip file
-        output_file = f"{core_config.FILES_DIR}/{str(activity_id)}.zip"
+        # Read the ZIP from memory, only the stored original file is written
+        # to disk, once, into the processed directory
+        with zipfile.ZipFile(io.BytesIO(zip_data)) as zip_ref:
+            for zip_info in zip_ref.infolist():
+                if zip_info.is_dir():
+                    continue
+
+                # Parse and store the activity from the file content
+                parsed_activities.extend(
+                    await activities_utils.parse_and_store_activity_from_file(
+                        user_id,
+                        os.path.basename(zip_info.filename),
+                        websocket_manager,
+                        db,
+                        True,
+                        activity_gear,
+                        activity_name,
+                        zip_ref.read(zip_info),
+                    )
+                    or []
+                )
 
-        # Write the ZIP data to the output file
-        with open(output_file, "wb") as fb:
-            fb.write(zip_data)
+    if synced_at is not None:
+        # Every activity of the range was processed, store the sync watermark
+        user_integrations_crud.set_user_garminconnect_activities_synced_at(
+            user_id, synced_at, db
+        )
 
-        # Array to store the names of extracted files
-        extracted_files = []
+    # Return the number of activities processed
+    return parsed_activities if parsed_activities else None
 
-        # Open the ZIP file
-        with zipfile.ZipFile(output_file, "r") as zip_ref:
-            # Extract all contents to the specified directory
-            zip_ref.extractall(core_config.FILES_DIR)
-            # Populate the array with file names
-            extracted_files = zip_ref.namelist()
 
-        try:
-            os.remove(output_file)
-        except OSError as err:
-            core_logger.print_to_log(
-                f"Error removing file {output_file}: {err}", "error", exc=err
-            )
+def get_sync_start_date(
+    synced_at: datetime | None, days: int, now: datetime
+) -> datetime:
+    """
+    Get the start of the date range synced for a user by the scheduled job.
 
-        for file_path_suffix in extracted_files:
-            # Parse and store the activity from the extracted file
-            full_file_path = os.path.join(core_config.FILES_DIR, file_path_suffix)
+    Args:
+        synced_at: Date of the user's last successful sync (UTC), if any.
+        days: Number of days always synced, covers activities uploaded late.
+        now: Date of the sync (UTC).
 
-            parsed_activities.extend(
-                await activities_utils.parse_and_store_activity_from_file(
-                    user_id,
-                    full_file_path,
-                    websocket_manager,
-                    db,
-                    True,
-                    activity_gear,
-                    activity_name,
-                )
-                or []
-            )
+    Returns:
+        The earliest of now - days and the last successful sync, going back
+        at most MAX_CATCH_UP_DAYS.
+    """
+    start_date = now - timedelta(days=days)
+    if synced_at is None:
+        return start_date
 
-    # Return the number of activities processed
-    return parsed_activities if parsed_activities else None
+    synced_at = synced_at.replace(tzinfo=timezone.utc)
+    return max(min(start_date, synced_at), now - timedelta(days=MAX_CATCH_UP_DAYS))
 
 
 async def retrieve_garminconnect_users_activities_for_days(days: int):
@@ -130,36 +154,54 @@ async def retrieve_garminconnect_users_activities_for_days(days: int):
     # Create a new database session using context manager
     with SessionLocal() as db:
         try:
-            # Get all users
-            users = users_crud.get_all_users(db)
+            # Get the users with Garmin Connect linked and their sync watermark
+            linked_user_integrations = (
+                user_integrations_crud.get_garminconnect_linked_user_integrations(db)
+            )
+            users_sync = [
+                (
+                    user_integrations.user_id,
+                    user_integrations.garminconnect_activities_synced_at,
+                )
+                for user_integrations in linked_user_integrations
+            ]
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error getting users in retrieve_garminconnect_users_activities_for_days: {err}",
+                "error",
+                exc=err,
+            )
+            return
 
-            # Calculate the start date and end date
-            calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
-            calculated_end_date = datetime.now(timezone.utc)
+    # Calculate the end date, also stored as the watermark of each user
+    calculated_end_date = datetime.now(timezone.utc)
 
-            # Iterate through all users
-            for user in users:
+    # Process a bounded number of users at a time, each with its own session
+    semaphore = asyncio.Semaphore(core_config.GARMINCONNECT_SYNC_CONCURRENCY)
+
+    async def sync_user(user_id: int, synced_at: datetime | None):
+        async with semaphore:
+            with SessionLocal() as user_db:
                 try:
                     await get_user_garminconnect_activities_by_dates(
-                        calculated_start_date,
+                        get_sync_start_date(synced_at, days, calculated_end_date),
                         calculated_end_date,
-                        user.id,
+                        user_id,
                         websocket_manager,
-                        db,
+                        user_db,
+                        synced_at=calculated_end_date.replace(tzinfo=None),
                     )
                 except Exception as err:
                     # Log specific errors for each user
                     core_logger.print_to_log(
-                        f"Error processing activities for user {user.id} in retrieve_garminconnect_users_activities_for_days: {err}",
+                        f"Error processing activities for user {user_id} in retrieve_garminconnect_users_activities_for_days: {err}",
                         "error",
                         exc=err,
                     )
-        except Exception as err:
-            core_logger.print_to_log(
-                f"Error getting users in retrieve_garminconnect_users_activities_for_days: {err}",
-                "error",
-                exc=err,
-            )
+
+    await asyncio.gather(
+        *(sync_user(user_id, synced_at) for user_id, synced_at in users_sync)
+    )
 
 
 def get_user_garminconnect_client(user_id: int, db: Session):
@@ -197,10 +239,14 @@ async def get_user_garminconnect_activities_by_dates(
     user_id: int,
     websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
+    synced_at: datetime | None = None,
 ) -> list[activities_schema.Activity] | None:
     try:
-        # Get the Garmin Connect client for the user
-        garminconnect_client = get_user_garminconnect_client(user_id, db)
+        # Get the Garmin Connect client for the user, logging in blocks so it
+        # runs off the event loop
+        garminconnect_client = await asyncio.to_thread(
+            get_user_garminconnect_client, user_id, db
+        )
 
         if garminconnect_client is not None:
             # Fetch Garmin Connect activities for the specified date range
@@ -212,6 +258,7 @@ async def get_user_garminconnect_activities_by_dates(
                     user_id,
                     websocket_manager,
                     db,
+                    synced_at,
                 )
             )
 
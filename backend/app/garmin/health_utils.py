@@ -1,10 +1,12 @@
 import os
 import zipfile
 
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, date, timezone
 import garminconnect
 from sqlalchemy.orm import Session
 
+import core.config as core_config
 import core.logger as core_logger
 
 import garmin.utils as garmin_utils
@@ -57,14 +59,11 @@ def fetch_and_process_bc_by_dates(
         # Return 0 to indicate no body composition were processed
         return 0
 
-    # Set the count of processed body composition to 0
-    count_processed = 0
-    # Process body composition
-    for bc in garmin_bc["dateWeightList"]:
-        health_weight = health_weight_schema.HealthWeight(
+    health_weights = [
+        health_weight_schema.HealthWeight(
             user_id=user_id,
             date=bc["calendarDate"],
-            weight=bc["weight"] / 1000 if bc["weight"] is not None else None,
+            weight=bc["weight"] / 1000,
             bmi=bc["bmi"],
             body_fat=bc["bodyFat"],
             body_water=bc["bodyWater"],
@@ -77,26 +76,13 @@ def fetch_and_process_bc_by_dates(
             metabolic_age=bc["metabolicAge"],
             source=health_weight_schema.Source.GARMIN,
         )
+        for bc in garmin_bc["dateWeightList"]
+        # Weight is required to store a health weight entry
+        if bc["weight"] is not None
+    ]
 
-        health_weight_db = health_weight_crud.get_health_weight_by_date(
-            user_id, health_weight.date, db
-        )
-
-        if health_weight_db:
-            health_weight.id = health_weight_db.id
-            health_weight_crud.edit_health_weight(user_id, health_weight, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Body composition edited for date {health_weight.date}"
-            )
-        else:
-            health_weight_crud.create_health_weight(user_id, health_weight, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Body composition created for date {health_weight.date}"
-            )
-        # Increment the count of processed body composition
-        count_processed += 1
-    # Return the count of processed body composition
-    return count_processed
+    # Store the body composition and return the count of processed entries
+    return health_weight_crud.bulk_upsert_health_weight(user_id, health_weights, db)
 
 
 def fetch_and_process_ds_by_dates(
@@ -133,39 +119,283 @@ def fetch_and_process_ds_by_dates(
         # Return 0 to indicate no daily steps were processed
         return 0
 
-    # Set the count of processed steps to 0
-    count_processed = 0
-    # Process steps
-    for ds in garmin_ds:
-        if ds["totalSteps"] is None:
-            continue
-
-        health_steps = health_steps_schema.HealthSteps(
+    health_steps_entries = [
+        health_steps_schema.HealthSteps(
             user_id=user_id,
             date=ds["calendarDate"],
             steps=ds["totalSteps"],
             source=health_steps_schema.Source.GARMIN,
         )
+        for ds in garmin_ds
+        if ds["totalSteps"] is not None
+    ]
+
+    # Store the steps and return the count of processed entries
+    return health_steps_crud.bulk_upsert_health_steps(user_id, health_steps_entries, db)
+
+
+def fetch_sleep_data_by_date(
+    garminconnect_client: garminconnect.Garmin, date_string: str, user_id: int
+) -> dict | None:
+    """
+    Fetch the sleep data of a single day from Garmin Connect.
+
+    Args:
+        garminconnect_client: Authenticated Garmin Connect client.
+        date_string: Day to fetch, as "%Y-%m-%d".
+        user_id: ID of the user the sleep data belongs to.
+
+    Returns:
+        Garmin Connect sleep data, or None if the request failed or the day
+        has no sleep data.
+    """
+    try:
+        garmin_sleep = garminconnect_client.get_sleep_data(date_string)
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Error fetching sleep data for user {user_id} on {date_string}: {err}",
+            "error",
+            exc=err,
+        )
+        return None
 
-        health_steps_db = health_steps_crud.get_health_steps_by_date(
-            user_id, health_steps.date, db
+    if (
+        garmin_sleep is None
+        or "dailySleepDTO" not in garmin_sleep
+        or not garmin_sleep["dailySleepDTO"]
+    ):
+        core_logger.print_to_log(
+            f"User {user_id}: No Garmin Connect sleep data found for {date_string}"
         )
+        return None
 
-        if health_steps_db:
-            health_steps.id = health_steps_db.id
-            health_steps_crud.edit_health_steps(user_id, health_steps, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Daily steps edited for date {health_steps.date}"
+    return garmin_sleep
+
+
+def build_health_sleep(
+    garmin_sleep: dict, user_id: int
+) -> health_sleep_schema.HealthSleep:
+    """
+    Convert the Garmin Connect sleep data of a day into a health sleep entry.
+
+    Args:
+        garmin_sleep: Garmin Connect sleep data, see fetch_sleep_data_by_date.
+        user_id: ID of the user the sleep data belongs to.
+
+    Returns:
+        Health sleep entry for the calendar date of the sleep data.
+    """
+    sleep_dto = garmin_sleep["dailySleepDTO"]
+
+    # Convert timestamps from milliseconds to datetime
+    sleep_start_gmt = (
+        datetime.fromtimestamp(
+            sleep_dto["sleepStartTimestampGMT"] / 1000,
+            tz=timezone.utc,
+        )
+        if sleep_dto.get("sleepStartTimestampGMT")
+        else None
+    )
+    sleep_end_gmt = (
+        datetime.fromtimestamp(
+            sleep_dto["sleepEndTimestampGMT"] / 1000,
+            tz=timezone.utc,
+        )
+        if sleep_dto.get("sleepEndTimestampGMT")
+        else None
+    )
+    sleep_start_local = (
+        datetime.fromtimestamp(
+            sleep_dto["sleepStartTimestampLocal"] / 1000,
+            tz=timezone.utc,
+        )
+        if sleep_dto.get("sleepStartTimestampLocal")
+        else None
+    )
+    sleep_end_local = (
+        datetime.fromtimestamp(
+            sleep_dto["sleepEndTimestampLocal"] / 1000,
+            tz=timezone.utc,
+        )
+        if sleep_dto.get("sleepEndTimestampLocal")
+        else None
+    )
+
+    # Process sleep stages from sleepLevels array
+    sleep_stages = []
+    if "sleepLevels" in garmin_sleep and garmin_sleep["sleepLevels"]:
+        for level in garmin_sleep["sleepLevels"]:
+            activity_level = level.get("activityLevel")
+
+            # Validate and convert activity_level to enum
+            try:
+                # Map Garmin activity levels to sleep stage types
+                # 0=deep, 1=light, 2=REM, 3=awake
+                stage_type = health_sleep_schema.SleepStageType(activity_level)
+            except (TypeError, ValueError):
+                # Skip unknown or missing levels
+                continue
+
+            start_gmt_str = level.get("startGMT")
+            end_gmt_str = level.get("endGMT")
+
+            start_gmt = (
+                datetime.strptime(
+                    start_gmt_str,
+                    "%Y-%m-%dT%H:%M:%S.%f",
+                ).replace(tzinfo=timezone.utc)
+                if start_gmt_str
+                else None
             )
-        else:
-            health_steps_crud.create_health_steps(user_id, health_steps, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Daily steps created for date {health_steps.date}"
+            end_gmt = (
+                datetime.strptime(
+                    end_gmt_str,
+                    "%Y-%m-%dT%H:%M:%S.%f",
+                ).replace(tzinfo=timezone.utc)
+                if end_gmt_str
+                else None
             )
-        # Increment the count of processed steps
-        count_processed += 1
-    # Return the count of processed steps
-    return count_processed
+
+            duration_seconds = None
+            if start_gmt and end_gmt:
+                duration_seconds = int((end_gmt - start_gmt).total_seconds())
+
+            sleep_stage = health_sleep_schema.HealthSleepStage(
+                stage_type=stage_type,
+                start_time_gmt=start_gmt,
+                end_time_gmt=end_gmt,
+                duration_seconds=duration_seconds,
+            )
+            sleep_stages.append(sleep_stage)
+
+    # Extract sleep scores
+    sleep_scores = sleep_dto.get("sleepScores", {})
+    overall_score = sleep_scores.get("overall", {})
+    total_duration_score = sleep_scores.get(
+        "totalDuration",
+        {},
+    )
+    awake_count_score = sleep_scores.get("awakeCount", {})
+    deep_percentage_score = sleep_scores.get(
+        "deepPercentage",
+        {},
+    )
+    light_percentage_score = sleep_scores.get(
+        "lightPercentage",
+        {},
+    )
+    rem_percentage_score = sleep_scores.get(
+        "remPercentage",
+        {},
+    )
+    sleep_stress_score = sleep_scores.get("stress", {})
+
+    return health_sleep_schema.HealthSleep(
+        user_id=user_id,
+        date=sleep_dto["calendarDate"],
+        sleep_start_time_gmt=sleep_start_gmt,
+        sleep_end_time_gmt=sleep_end_gmt,
+        sleep_start_time_local=sleep_start_local,
+        sleep_end_time_local=sleep_end_local,
+        total_sleep_seconds=sleep_dto.get("sleepTimeSeconds"),
+        nap_time_seconds=sleep_dto.get("napTimeSeconds"),
+        unmeasurable_sleep_seconds=sleep_dto.get("unmeasurableSleepSeconds"),
+        deep_sleep_seconds=sleep_dto.get("deepSleepSeconds"),
+        light_sleep_seconds=sleep_dto.get("lightSleepSeconds"),
+        rem_sleep_seconds=sleep_dto.get("remSleepSeconds"),
+        awake_sleep_seconds=sleep_dto.get("awakeSleepSeconds"),
+        avg_heart_rate=(
+            int(sleep_dto.get("avgHeartRate"))
+            if sleep_dto.get("avgHeartRate") is not None
+            else None
+        ),
+        min_heart_rate=None,
+        max_heart_rate=None,
+        avg_spo2=(
+            int(sleep_dto.get("averageSpO2Value"))
+            if sleep_dto.get("averageSpO2Value") is not None
+            else None
+        ),
+        lowest_spo2=sleep_dto.get("lowestSpO2Value"),
+        highest_spo2=sleep_dto.get("highestSpO2Value"),
+        avg_respiration=(
+            int(sleep_dto.get("averageRespirationValue"))
+            if sleep_dto.get("averageRespirationValue") is not None
+            else None
+        ),
+        lowest_respiration=(
+            int(sleep_dto.get("lowestRespirationValue"))
+            if sleep_dto.get("lowestRespirationValue") is not None
+            else None
+        ),
+        highest_respiration=(
+            int(sleep_dto.get("highestRespirationValue"))
+            if sleep_dto.get("highestRespirationValue") is not None
+            else None
+        ),
+        avg_stress_level=(
+            int(sleep_dto.get("avgSleepStress"))
+            if sleep_dto.get("avgSleepStress") is not None
+            else None
+        ),
+        awake_count=sleep_dto.get("awakeCount"),
+        restless_moments_count=None,
+        sleep_score_overall=overall_score.get("value"),
+        sleep_score_duration=total_duration_score.get("qualifierKey"),
+        sleep_score_quality=overall_score.get("qualifierKey"),
+        garminconnect_sleep_id=str(sleep_dto.get("id")),
+        sleep_stages=sleep_stages if sleep_stages else None,
+        source=health_sleep_schema.Source.GARMIN,
+        hrv_status=(
+            health_sleep_schema.HRVStatus(garmin_sleep.get("hrvStatus"))
+            if garmin_sleep.get("hrvStatus")
+            and garmin_sleep.get("hrvStatus")
+            in health_sleep_schema.HRVStatus._value2member_map_
+            else None
+        ),
+        resting_heart_rate=garmin_sleep.get("restingHeartRate"),
+        avg_skin_temp_deviation=garmin_sleep.get("avgSkinTempDeviationC"),
+        awake_count_score=(
+            health_sleep_schema.SleepScore(awake_count_score.get("qualifierKey"))
+            if awake_count_score
+            and awake_count_score.get("qualifierKey")
+            in health_sleep_schema.SleepScore._value2member_map_
+            else None
+        ),
+        rem_percentage_score=(
+            health_sleep_schema.SleepScore(rem_percentage_score.get("qualifierKey"))
+            if rem_percentage_score
+            and rem_percentage_score.get("qualifierKey")
+            in health_sleep_schema.SleepScore._value2member_map_
+            else None
+        ),
+        deep_percentage_score=(
+            health_sleep_schema.SleepScore(deep_percentage_score.get("qualifierKey"))
+            if deep_percentage_score
+            and deep_percentage_score.get("qualifierKey")
+            in health_sleep_schema.SleepScore._value2member_map_
+            else None
+        ),
+        light_percentage_score=(
+            health_sleep_schema.SleepScore(light_percentage_score.get("qualifierKey"))
+            if light_percentage_score
+            and light_percentage_score.get("qualifierKey")
+            in health_sleep_schema.SleepScore._value2member_map_
+            else None
+        ),
+        avg_sleep_stress=(
+            int(sleep_dto.get("avgSleepStress"))
+            if sleep_dto.get("avgSleepStress") is not None
+            else None
+        ),
+        sleep_stress_score=(
+            health_sleep_schema.SleepScore(sleep_stress_score.get("qualifierKey"))
+            if sleep_stress_score
+            and sleep_stress_score.get("qualifierKey")
+            in health_sleep_schema.SleepScore._value2member_map_
+            else None
+        ),
+    )
 
 
 def fetch_and_process_sleep_by_dates(
@@ -178,6 +408,10 @@ def fetch_and_process_sleep_by_dates(
     """
     Fetch and process sleep data from Garmin Connect.
 
+    get_sleep_data only supports a single date, so the days are fetched
+    concurrently by up to GARMINCONNECT_HEALTH_FETCH_WORKERS threads and
+    stored with a single bulk upsert.
+
     Args:
         garminconnect_client: Authenticated Garmin Connect client.
         start_date: Start date for sleep data retrieval.
@@ -188,274 +422,37 @@ def fetch_and_process_sleep_by_dates(
     Returns:
         Number of sleep records processed.
     """
-    count_processed = 0
+    date_strings = []
     current_date = start_date
-
-    # Iterate through each date since get_sleep_data only supports
-    # single date
     while current_date <= end_date:
-        date_string = current_date.strftime("%Y-%m-%d")
-
-        try:
-            garmin_sleep = garminconnect_client.get_sleep_data(date_string)
-        except Exception as err:
-            core_logger.print_to_log(
-                f"Error fetching sleep data for user "
-                f"{user_id} on {date_string}: {err}",
-                "error",
-                exc=err,
-            )
-            current_date += timedelta(days=1)
-            continue
-
-        if (
-            garmin_sleep is None
-            or "dailySleepDTO" not in garmin_sleep
-            or not garmin_sleep["dailySleepDTO"]
-        ):
-            core_logger.print_to_log(
-                f"User {user_id}: No Garmin Connect sleep data "
-                f"found for {date_string}"
-            )
-            current_date += timedelta(days=1)
-            continue
+        date_strings.append(current_date.strftime("%Y-%m-%d"))
+        current_date += timedelta(days=1)
 
-        sleep_dto = garmin_sleep["dailySleepDTO"]
+    if not date_strings:
+        return 0
 
-        # Convert timestamps from milliseconds to datetime
-        sleep_start_gmt = (
-            datetime.fromtimestamp(
-                sleep_dto["sleepStartTimestampGMT"] / 1000,
-                tz=timezone.utc,
-            )
-            if sleep_dto.get("sleepStartTimestampGMT")
-            else None
-        )
-        sleep_end_gmt = (
-            datetime.fromtimestamp(
-                sleep_dto["sleepEndTimestampGMT"] / 1000,
-                tz=timezone.utc,
-            )
-            if sleep_dto.get("sleepEndTimestampGMT")
-            else None
+    with ThreadPoolExecutor(
+        max_workers=min(
+            core_config.GARMINCONNECT_HEALTH_FETCH_WORKERS, len(date_strings)
         )
-        sleep_start_local = (
-            datetime.fromtimestamp(
-                sleep_dto["sleepStartTimestampLocal"] / 1000,
-                tz=timezone.utc,
+    ) as executor:
+        garmin_sleeps = list(
+            executor.map(
+                lambda date_string: fetch_sleep_data_by_date(
+                    garminconnect_client, date_string, user_id
+                ),
+                date_strings,
             )
-            if sleep_dto.get("sleepStartTimestampLocal")
-            else None
-        )
-        sleep_end_local = (
-            datetime.fromtimestamp(
-                sleep_dto["sleepEndTimestampLocal"] / 1000,
-                tz=timezone.utc,
-            )
-            if sleep_dto.get("sleepEndTimestampLocal")
-            else None
-        )
-
-        # Process sleep stages from sleepLevels array
-        sleep_stages = []
-        if "sleepLevels" in garmin_sleep and garmin_sleep["sleepLevels"]:
-            for level in garmin_sleep["sleepLevels"]:
-                activity_level = level.get("activityLevel")
-
-                # Validate and convert activity_level to enum
-                try:
-                    # Map Garmin activity levels to sleep stage types
-                    # 0=deep, 1=light, 2=REM, 3=awake
-                    stage_type = health_sleep_schema.SleepStageType(activity_level)
-                except (TypeError, ValueError):
-                    # Skip unknown or missing levels
-                    continue
-
-                start_gmt_str = level.get("startGMT")
-                end_gmt_str = level.get("endGMT")
-
-                start_gmt = (
-                    datetime.strptime(
-                        start_gmt_str,
-                        "%Y-%m-%dT%H:%M:%S.%f",
-                    ).replace(tzinfo=timezone.utc)
-                    if start_gmt_str
-                    else None
-                )
-                end_gmt = (
-                    datetime.strptime(
-                        end_gmt_str,
-                        "%Y-%m-%dT%H:%M:%S.%f",
-                    ).replace(tzinfo=timezone.utc)
-                    if end_gmt_str
-                    else None
-                )
-
-                duration_seconds = None
-                if start_gmt and end_gmt:
-                    duration_seconds = int((end_gmt - start_gmt).total_seconds())
-
-                sleep_stage = health_sleep_schema.HealthSleepStage(
-                    stage_type=stage_type,
-                    start_time_gmt=start_gmt,
-                    end_time_gmt=end_gmt,
-                    duration_seconds=duration_seconds,
-                )
-                sleep_stages.append(sleep_stage)
-
-        # Extract sleep scores
-        sleep_scores = sleep_dto.get("sleepScores", {})
-        overall_score = sleep_scores.get("overall", {})
-        total_duration_score = sleep_scores.get(
-            "totalDuration",
-            {},
-        )
-        awake_count_score = sleep_scores.get("awakeCount", {})
-        deep_percentage_score = sleep_scores.get(
-            "deepPercentage",
-            {},
-        )
-        light_percentage_score = sleep_scores.get(
-            "lightPercentage",
-            {},
-        )
-        rem_percentage_score = sleep_scores.get(
-            "remPercentage",
-            {},
-        )
-        sleep_stress_score = sleep_scores.get("stress", {})
-
-        health_sleep = health_sleep_schema.HealthSleep(
-            user_id=user_id,
-            date=sleep_dto["calendarDate"],
-            sleep_start_time_gmt=sleep_start_gmt,
-            sleep_end_time_gmt=sleep_end_gmt,
-            sleep_start_time_local=sleep_start_local,
-            sleep_end_time_local=sleep_end_local,
-            total_sleep_seconds=sleep_dto.get("sleepTimeSeconds"),
-            nap_time_seconds=sleep_dto.get("napTimeSeconds"),
-            unmeasurable_sleep_seconds=sleep_dto.get("unmeasurableSleepSeconds"),
-            deep_sleep_seconds=sleep_dto.get("deepSleepSeconds"),
-            light_sleep_seconds=sleep_dto.get("lightSleepSeconds"),
-            rem_sleep_seconds=sleep_dto.get("remSleepSeconds"),
-            awake_sleep_seconds=sleep_dto.get("awakeSleepSeconds"),
-            avg_heart_rate=(
-                int(sleep_dto.get("avgHeartRate"))
-                if sleep_dto.get("avgHeartRate") is not None
-                else None
-            ),
-            min_heart_rate=None,
-            max_heart_rate=None,
-            avg_spo2=(
-                int(sleep_dto.get("averageSpO2Value"))
-                if sleep_dto.get("averageSpO2Value") is not None
-                else None
-            ),
-            lowest_spo2=sleep_dto.get("lowestSpO2Value"),
-            highest_spo2=sleep_dto.get("highestSpO2Value"),
-            avg_respiration=(
-                int(sleep_dto.get("averageRespirationValue"))
-                if sleep_dto.get("averageRespirationValue") is not None
-                else None
-            ),
-            lowest_respiration=(
-                int(sleep_dto.get("lowestRespirationValue"))
-                if sleep_dto.get("lowestRespirationValue") is not None
-                else None
-            ),
-            highest_respiration=(
-                int(sleep_dto.get("highestRespirationValue"))
-                if sleep_dto.get("highestRespirationValue") is not None
-                else None
-            ),
-            avg_stress_level=(
-                int(sleep_dto.get("avgSleepStress"))
-                if sleep_dto.get("avgSleepStress") is not None
-                else None
-            ),
-            awake_count=sleep_dto.get("awakeCount"),
-            restless_moments_count=None,
-            sleep_score_overall=overall_score.get("value"),
-            sleep_score_duration=total_duration_score.get("qualifierKey"),
-            sleep_score_quality=overall_score.get("qualifierKey"),
-            garminconnect_sleep_id=str(sleep_dto.get("id")),
-            sleep_stages=sleep_stages if sleep_stages else None,
-            source=health_sleep_schema.Source.GARMIN,
-            hrv_status=(
-                health_sleep_schema.HRVStatus(garmin_sleep.get("hrvStatus"))
-                if garmin_sleep.get("hrvStatus")
-                and garmin_sleep.get("hrvStatus")
-                in health_sleep_schema.HRVStatus._value2member_map_
-                else None
-            ),
-            resting_heart_rate=garmin_sleep.get("restingHeartRate"),
-            avg_skin_temp_deviation=garmin_sleep.get("avgSkinTempDeviationC"),
-            awake_count_score=(
-                health_sleep_schema.SleepScore(awake_count_score.get("qualifierKey"))
-                if awake_count_score
-                and awake_count_score.get("qualifierKey")
-                in health_sleep_schema.SleepScore._value2member_map_
-                else None
-            ),
-            rem_percentage_score=(
-                health_sleep_schema.SleepScore(rem_percentage_score.get("qualifierKey"))
-                if rem_percentage_score
-                and rem_percentage_score.get("qualifierKey")
-                in health_sleep_schema.SleepScore._value2member_map_
-                else None
-            ),
-            deep_percentage_score=(
-                health_sleep_schema.SleepScore(
-                    deep_percentage_score.get("qualifierKey")
-                )
-                if deep_percentage_score
-                and deep_percentage_score.get("qualifierKey")
-                in health_sleep_schema.SleepScore._value2member_map_
-                else None
-            ),
-            light_percentage_score=(
-                health_sleep_schema.SleepScore(
-                    light_percentage_score.get("qualifierKey")
-                )
-                if light_percentage_score
-                and light_percentage_score.get("qualifierKey")
-                in health_sleep_schema.SleepScore._value2member_map_
-                else None
-            ),
-            avg_sleep_stress=(
-                int(sleep_dto.get("avgSleepStress"))
-                if sleep_dto.get("avgSleepStress") is not None
-                else None
-            ),
-            sleep_stress_score=(
-                health_sleep_schema.SleepScore(sleep_stress_score.get("qualifierKey"))
-                if sleep_stress_score
-                and sleep_stress_score.get("qualifierKey")
-                in health_sleep_schema.SleepScore._value2member_map_
-                else None
-            ),
         )
 
-        health_sleep_db = health_sleep_crud.get_health_sleep_by_date(
-            user_id, health_sleep.date, db
-        )
-
-        if health_sleep_db:
-            health_sleep.id = health_sleep_db.id
-            health_sleep_crud.edit_health_sleep(user_id, health_sleep, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Sleep data edited for date " f"{health_sleep.date}"
-            )
-        else:
-            health_sleep_crud.create_health_sleep(user_id, health_sleep, db)
-            core_logger.print_to_log(
-                f"User {user_id}: Sleep data created for date " f"{health_sleep.date}"
-            )
-
-        count_processed += 1
-        current_date += timedelta(days=1)
+    health_sleep_entries = [
+        build_health_sleep(garmin_sleep, user_id)
+        for garmin_sleep in garmin_sleeps
+        if garmin_sleep is not None
+    ]
 
-    return count_processed
+    # Store the sleep data and return the count of processed entries
+    return health_sleep_crud.bulk_upsert_health_sleep(user_id, health_sleep_entries, db)
 
 
 def retrieve_garminconnect_users_health_for_days(days: int):
@@ -1,5 +1,7 @@
 from pydantic import BaseModel
 
+import core.shared_state as core_shared_state
+
 
 class GarminLogin(BaseModel):
     username: str
@@ -11,27 +13,42 @@ class MFARequest(BaseModel):
 
 
 class MFACodeStore:
-    def __init__(self):
-        self._store = {}
+    """
+    Garmin Connect MFA codes, kept in the shared state so the code may be
+    submitted to another backend worker than the one linking the account.
+    """
+
+    KEY_PREFIX = "garmin_mfa_code:"
+
+    def __init__(self, ttl_seconds: int = 300):
+        self._ttl_seconds = ttl_seconds
 
     def add_code(self, user_id, code):
-        self._store[user_id] = code
+        core_shared_state.get_shared_state().set(
+            f"{self.KEY_PREFIX}{user_id}", code, self._ttl_seconds
+        )
 
     def get_code(self, user_id):
-        return self._store.get(user_id)
-
-    def delete_code(self, user_id):
-        if user_id in self._store:
-            del self._store[user_id]
+        return core_shared_state.get_shared_state().get(f"{self.KEY_PREFIX}{user_id}")
+
+    def delete_code(self, user_id, code=None):
+        """
+        Delete the code of a user, only if it is still the given code if any.
+        """
+        shared_state = core_shared_state.get_shared_state()
+        if code is None:
+            shared_state.delete(f"{self.KEY_PREFIX}{user_id}")
+        else:
+            shared_state.compare_and_delete(f"{self.KEY_PREFIX}{user_id}", code)
 
     def has_code(self, user_id):
-        return user_id in self._store
+        return self.get_code(user_id) is not None
 
     def clear_all(self):
-        self._store.clear()
+        core_shared_state.get_shared_state().clear(self.KEY_PREFIX)
 
     def __repr__(self):
-        return f"{self._store}"
+        return f"MFACodeStore(ttl={self._ttl_seconds}s)"
 
 
 def get_mfa_store():
@@ -34,8 +34,11 @@ async def get_mfa(
 
     # Wait for the MFA code
     for _ in range(60):  # Timeout after 60 seconds
-        if mfa_codes.has_code(user_id):
-            return mfa_codes.get_code(user_id)
+        code = mfa_codes.get_code(user_id)
+        if code is not None:
+            # Only consume this code, a newer one may already be submitted
+            mfa_codes.delete_code(user_id, code)
+            return code
         await asyncio.sleep(1)
 
     return None
@@ -129,8 +132,7 @@ async def link_garminconnect(
             detail="Internal server error while linking Garmin Connect",
         ) from err
     finally:
-        if mfa_codes.has_code(user_id):
-            mfa_codes.delete_code(user_id)
+        mfa_codes.delete_code(user_id)
 
 
 def login_garminconnect_using_tokens(oauth1_token, oauth2_token):
@@ -8,7 +8,10 @@ import gears.gear.schema as gears_schema
 import gears.gear.utils as gears_utils
 import gears.gear.models as gears_models
 
+import users.user_default_gear.crud as user_default_gear_crud
+
 import core.logger as core_logger
+import core.pagination as core_pagination
 
 
 def get_gear_user_by_id(
@@ -79,6 +82,41 @@ def get_gear_users_with_pagination(
         ) from err
 
 
+def get_gear_users_with_cursor(
+    user_id: int, db: Session, num_records: int = 5, cursor: str | None = None
+) -> core_pagination.CursorPage[gears_schema.Gear]:
+    try:
+        # Get the gear page after the cursor, ordered by nickname
+        gears, next_cursor = core_pagination.get_cursor_page(
+            db.query(gears_models.Gear).filter(gears_models.Gear.user_id == user_id),
+            [gears_models.Gear.nickname, gears_models.Gear.id],
+            False,
+            num_records,
+            cursor,
+        )
+
+        # Format the created_at date
+        for g in gears:
+            g = gears_utils.serialize_gear(g)
+
+        # Return the gear page
+        return core_pagination.CursorPage[gears_schema.Gear](
+            records=gears, next_cursor=next_cursor
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_gear_users_with_cursor: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_gear_user(user_id: int, db: Session) -> list[gears_schema.Gear] | None:
     try:
         # Get the gear by user ID from the database
@@ -510,6 +548,9 @@ def delete_gear(gear_id: int, db: Session):
 
         # Commit the transaction
         db.commit()
+
+        # The deleted gear is unset from the default gear of its user
+        user_default_gear_crud.USER_DEFAULT_GEAR_CACHE.invalidate()
     except HTTPException as http_err:
         raise http_err
     except Exception as err:
@@ -542,6 +583,9 @@ def delete_all_strava_gear_for_user(user_id: int, db: Session):
         if num_deleted != 0:
             # Commit the transaction
             db.commit()
+
+            # The deleted gear is unset from the user default gear
+            user_default_gear_crud.USER_DEFAULT_GEAR_CACHE.invalidate(user_id)
     except Exception as err:
         # Rollback the transaction
         db.rollback()
@@ -574,6 +618,9 @@ def delete_all_garminconnect_gear_for_user(user_id: int, db: Session):
         if num_deleted != 0:
             # Commit the transaction
             db.commit()
+
+            # The deleted gear is unset from the user default gear
+            user_default_gear_crud.USER_DEFAULT_GEAR_CACHE.invalidate(user_id)
     except Exception as err:
         # Rollback the transaction
         db.rollback()
@@ -1,6 +1,6 @@
 from typing import Annotated, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
 from sqlalchemy.orm import Session
 
 import auth.security as auth_security
@@ -10,6 +10,8 @@ import gears.gear.crud as gears_crud
 import gears.gear.dependencies as gears_dependencies
 
 import core.database as core_database
+import core.dependencies as core_dependencies
+import core.pagination as core_pagination
 
 # Define the API router
 router = APIRouter()
@@ -69,6 +71,29 @@ async def read_gear_user_pagination(
     )
 
 
+@router.get(
+    "/num_records/{num_records}",
+    response_model=core_pagination.CursorPage[gears_schema.Gear],
+)
+async def read_gear_user_cursor(
+    num_records: int,
+    _validate_num_records_value: Annotated[
+        Callable, Depends(core_dependencies.validate_num_records_value)
+    ],
+    _check_scopes: Annotated[
+        Callable, Security(auth_security.check_scopes, scopes=["gears:read"])
+    ],
+    token_user_id: Annotated[int, Depends(auth_security.get_sub_from_access_token)],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    cursor: str | None = Query(None),
+):
+    # Return the gear page after the cursor
+    return gears_crud.get_gear_users_with_cursor(token_user_id, db, num_records, cursor)
+
+
 @router.get(
     "/number",
     response_model=int,
@@ -0,0 +1,163 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import Session
+from sqlalchemy.dialects.postgresql import insert
+
+import geocoding.models as geocoding_models
+
+import core.logger as core_logger
+
+
+def get_cached_locations_by_cell_keys(
+    cell_keys: list[str], ttl_days: int, db: Session
+) -> dict[str, dict]:
+    """
+    Get the cached locations of a list of cells.
+
+    Args:
+        cell_keys: Cell keys to look up.
+        ttl_days: Maximum age of a cached location in days.
+        db: Database session.
+
+    Returns:
+        Mapping of cell key to a {"city", "town", "country"} dictionary for
+        every cell that is cached and not expired.
+
+    Raises:
+        HTTPException: 500 if the cache could not be read.
+    """
+    if not cell_keys:
+        return {}
+
+    try:
+        cached_locations = (
+            db.query(geocoding_models.ReverseGeocodingCache)
+            .filter(
+                geocoding_models.ReverseGeocodingCache.cell_key.in_(cell_keys),
+                geocoding_models.ReverseGeocodingCache.created_at
+                >= datetime.now(timezone.utc) - timedelta(days=ttl_days),
+            )
+            .all()
+        )
+
+        return {
+            cached_location.cell_key: {
+                "city": cached_location.city,
+                "town": cached_location.town,
+                "country": cached_location.country,
+            }
+            for cached_location in cached_locations
+        }
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_cached_locations_by_cell_keys: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def upsert_cached_locations(
+    locations: dict[str, dict], provider: str, db: Session
+) -> None:
+    """
+    Insert or refresh cached locations in a single statement.
+
+    Args:
+        locations: Mapping of cell key to a {"city", "town", "country"} dictionary.
+        provider: Reverse geocoding provider that resolved the locations.
+        db: Database session.
+
+    Raises:
+        HTTPException: 500 if the cache could not be written.
+    """
+    if not locations:
+        return
+
+    try:
+        now = datetime.now(timezone.utc)
+        statement = insert(geocoding_models.ReverseGeocodingCache).values(
+            [
+                {
+                    "cell_key": cell_key,
+                    "provider": provider,
+                    "city": location["city"],
+                    "town": location["town"],
+                    "country": location["country"],
+                    "created_at": now,
+                }
+                for cell_key, location in locations.items()
+            ]
+        )
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=["cell_key"],
+                set_={
+                    "city": statement.excluded.city,
+                    "town": statement.excluded.town,
+                    "country": statement.excluded.country,
+                    "created_at": statement.excluded.created_at,
+                },
+            )
+        )
+        db.commit()
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in upsert_cached_locations: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def delete_expired_cached_locations(ttl_days: int, db: Session) -> int:
+    """
+    Delete cached locations older than the cache TTL.
+
+    Args:
+        ttl_days: Maximum age of a cached location in days.
+        db: Database session.
+
+    Returns:
+        Number of deleted cached locations.
+
+    Raises:
+        HTTPException: 500 if the cached locations could not be deleted.
+    """
+    try:
+        num_deleted = (
+            db.query(geocoding_models.ReverseGeocodingCache)
+            .filter(
+                geocoding_models.ReverseGeocodingCache.created_at
+                < datetime.now(timezone.utc) - timedelta(days=ttl_days)
+            )
+            .delete()
+        )
+
+        # Commit the transaction
+        db.commit()
+
+        return num_deleted
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in delete_expired_cached_locations: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, DateTime, func
+from core.database import Base
+
+
+class ReverseGeocodingCache(Base):
+    """
+    SQLAlchemy model caching reverse geocoding results.
+
+    Coordinates are bucketed into cells by rounding them to a configurable
+    number of decimal places, so activities starting near each other share
+    the same lookup.
+
+    Attributes:
+        id (int): Primary key, auto-incremented unique identifier.
+        cell_key (str): Provider, precision and rounded coordinates of the
+            cell, e.g. "nominatim:3:38.712:-9.139". Unique.
+        provider (str): Reverse geocoding provider that resolved the cell.
+        city (str): City of the cell. Optional field.
+        town (str): Town of the cell. Optional field.
+        country (str): Country of the cell. Optional field.
+        created_at (datetime): When the cell was resolved, in UTC, used for
+            the TTL.
+
+    Indexes:
+        - cell_key: Unique index for lookups
+        - created_at: Indexed to purge expired cells
+    """
+
+    __tablename__ = "reverse_geocoding_cache"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cell_key = Column(
+        String(length=64),
+        nullable=False,
+        unique=True,
+        index=True,
+        comment="Provider, precision and rounded coordinates of the cell",
+    )
+    provider = Column(
+        String(length=45),
+        nullable=False,
+        comment="Reverse geocoding provider",
+    )
+    city = Column(String(length=250), nullable=True, comment="Cell city")
+    town = Column(String(length=250), nullable=True, comment="Cell town")
+    country = Column(String(length=250), nullable=True, comment="Cell country")
+    created_at = Column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now(),
+        index=True,
+        comment="Cell resolution date (DATETIME)",
+    )
@@ -0,0 +1,395 @@
+"""
+Reverse geocoding with a two level cache.
+
+Coordinates are bucketed into cells by rounding them to
+REVERSE_GEO_CACHE_PRECISION decimal places. A cell is looked up in an
+in-process LRU, then in the reverse_geocoding_cache table, and only then
+requested from the configured provider, which is throttled to
+REVERSE_GEO_RATE_LIMIT requests per second.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from urllib.parse import urlencode
+
+import requests
+from fastapi import HTTPException, status
+
+import geocoding.crud as geocoding_crud
+
+import core.logger as core_logger
+import core.config as core_config
+from core.database import SessionLocal
+
+# Cells resolved by prefill_location_cache written to the database at once
+PREFILL_STORE_BATCH_SIZE = 20
+
+
+class LocationLRUCache:
+    """
+    Thread-safe LRU cache of resolved locations with a time to live.
+
+    Attributes:
+        max_size: Maximum number of cells kept in memory.
+        ttl_seconds: Time a cell is kept in memory.
+    """
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[dict, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cell_key: str) -> dict | None:
+        """
+        Get the location of a cell, if cached and not expired.
+
+        Args:
+            cell_key: Cell key, see get_cell_key.
+
+        Returns:
+            The cached location or None.
+        """
+        with self._lock:
+            entry = self._entries.get(cell_key)
+            if entry is None:
+                return None
+            location, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[cell_key]
+                return None
+            self._entries.move_to_end(cell_key)
+            return location
+
+    def set(self, cell_key: str, location: dict) -> None:
+        """
+        Cache the location of a cell, evicting the least recently used cells.
+
+        Args:
+            cell_key: Cell key, see get_cell_key.
+            location: Location dictionary with city, town and country.
+        """
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._entries[cell_key] = (location, time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(cell_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """
+        Remove every cell from the cache.
+        """
+        with self._lock:
+            self._entries.clear()
+
+
+location_cache = LocationLRUCache(
+    core_config.REVERSE_GEO_CACHE_SIZE,
+    core_config.REVERSE_GEO_CACHE_TTL_DAYS * 86400,
+)
+
+
+def get_cell_key(latitude: float, longitude: float) -> str:
+    """
+    Get the cache cell key of a coordinate.
+
+    Args:
+        latitude: Latitude in degrees.
+        longitude: Longitude in degrees.
+
+    Returns:
+        Key made of the provider, the precision and the rounded coordinates,
+        e.g. "nominatim:3:38.712:-9.139".
+    """
+    precision = core_config.REVERSE_GEO_CACHE_PRECISION
+    # Adding 0.0 turns -0.000 into 0.000 so both map to the same cell
+    return (
+        f"{core_config.REVERSE_GEO_PROVIDER}:{precision}:"
+        f"{round(latitude, precision) + 0.0:.{precision}f}:"
+        f"{round(longitude, precision) + 0.0:.{precision}f}"
+    )
+
+
+def _is_cache_enabled() -> bool:
+    return core_config.REVERSE_GEO_CACHE_TTL_DAYS > 0
+
+
+def _get_db_cached_locations(cell_keys: list[str]) -> dict[str, dict]:
+    """
+    Read cells from the database cache, ignoring cache errors.
+
+    Args:
+        cell_keys: Cell keys to look up.
+
+    Returns:
+        Mapping of cell key to location for the cached cells.
+    """
+    try:
+        with SessionLocal() as db:
+            return geocoding_crud.get_cached_locations_by_cell_keys(
+                cell_keys, core_config.REVERSE_GEO_CACHE_TTL_DAYS, db
+            )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Unable to read the reverse geocoding cache: {err}", "warning"
+        )
+        return {}
+
+
+def _store_db_cached_locations(locations: dict[str, dict]) -> None:
+    """
+    Write cells to the database cache, ignoring cache errors.
+
+    Args:
+        locations: Mapping of cell key to location.
+    """
+    try:
+        with SessionLocal() as db:
+            geocoding_crud.upsert_cached_locations(
+                locations, core_config.REVERSE_GEO_PROVIDER, db
+            )
+    except Exception as err:
+        core_logger.print_to_log(
+            f"Unable to write the reverse geocoding cache: {err}", "warning"
+        )
+
+
+def fetch_location_from_provider(latitude: float, longitude: float) -> dict | None:
+    """
+    Request the location of a coordinate from the reverse geocoding provider.
+
+    Args:
+        latitude: Latitude in degrees.
+        longitude: Longitude in degrees.
+
+    Returns:
+        Location dictionary with city, town and country, or None if no
+        provider is configured.
+
+    Raises:
+        HTTPException: 424 if the provider request failed.
+    """
+    # Create a dictionary with the parameters for the request
+    if core_config.REVERSE_GEO_PROVIDER == "nominatim":
+        # Create the URL for the request
+        url_params = {
+            "format": "jsonv2",
+            "lat": latitude,
+            "lon": longitude,
+        }
+        protocol = "https"
+        if not core_config.NOMINATIM_API_USE_HTTPS:
+            protocol = "http"
+        url = f"{protocol}://{core_config.NOMINATIM_API_HOST}/reverse?{urlencode(url_params)}"
+    elif core_config.REVERSE_GEO_PROVIDER == "photon":
+        # Create the URL for the request
+        url_params = {
+            "lat": latitude,
+            "lon": longitude,
+        }
+        protocol = "https"
+        if not core_config.PHOTON_API_USE_HTTPS:
+            protocol = "http"
+        url = f"{protocol}://{core_config.PHOTON_API_HOST}/reverse?{urlencode(url_params)}"
+    elif core_config.REVERSE_GEO_PROVIDER == "geocode":
+        # Check if the API key is set
+        if core_config.GEOCODES_MAPS_API == "changeme":
+            return None
+        # Create the URL for the request
+        url_params = {
+            "lat": latitude,
+            "lon": longitude,
+            "api_key": core_config.GEOCODES_MAPS_API,
+        }
+        url = f"https://geocode.maps.co/reverse?{urlencode(url_params)}"
+    else:
+        # If no provider is set, return None
+        return None
+
+    # Throttle requests according to configured rate limit
+    if core_config.REVERSE_GEO_MIN_INTERVAL > 0:
+        with core_config.REVERSE_GEO_LOCK:
+            now = time.monotonic()
+            interval = core_config.REVERSE_GEO_MIN_INTERVAL - (
+                now - core_config.REVERSE_GEO_LAST_CALL
+            )
+            if interval > 0:
+                time.sleep(interval)
+            core_config.REVERSE_GEO_LAST_CALL = time.monotonic()
+
+    # Make the request and get the response
+    try:
+        headers = {
+            "User-Agent": f"Endurain/{core_config.API_VERSION} (ReverseGeocoding)"
+        }
+        # Make the request and get the response
+        response = requests.get(url, headers=headers, timeout=10)
+        response.raise_for_status()
+
+        if core_config.REVERSE_GEO_PROVIDER in ("geocode", "nominatim"):
+            # Get the data from the response
+            data = response.json().get("address", {})
+            # Return the location based on the coordinates
+            # Note: 'town' is used for district in Geocode API
+            return {
+                "city": data.get("city"),
+                "town": data.get("town"),
+                "country": data.get("country"),
+            }
+
+        # Get the data from the response
+        data_root = response.json().get("features", [])
+        data = data_root[0].get("properties", {}) if data_root else {}
+        # Return the location based on the coordinates
+        # Note: 'district' is used for city and 'city' is used for town in Photon API
+        return {
+            "city": data.get("district"),
+            "town": data.get("city"),
+            "country": data.get("country"),
+        }
+    except Exception as err:
+        # Log the error
+        core_logger.print_to_log_and_console(
+            f"Error in fetch_location_from_provider - {str(err)}", "error"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_424_FAILED_DEPENDENCY,
+            detail=f"Error in fetch_location_from_provider: {str(err)}",
+        ) from err
+
+
+def get_location(latitude: float, longitude: float) -> dict:
+    """
+    Resolve the city, town and country of a coordinate.
+
+    Args:
+        latitude: Latitude in degrees.
+        longitude: Longitude in degrees.
+
+    Returns:
+        Location dictionary with city, town and country. All values are None
+        if no provider is configured.
+
+    Raises:
+        HTTPException: 424 if the provider request failed.
+    """
+    if not _is_cache_enabled():
+        return fetch_location_from_provider(latitude, longitude) or _empty_location()
+
+    cell_key = get_cell_key(latitude, longitude)
+    location = location_cache.get(cell_key)
+    if location is not None:
+        return location
+
+    location = _get_db_cached_locations([cell_key]).get(cell_key)
+    if location is None:
+        location = fetch_location_from_provider(latitude, longitude)
+        if location is None:
+            return _empty_location()
+        _store_db_cached_locations({cell_key: location})
+
+    location_cache.set(cell_key, location)
+    return location
+
+
+def prefill_location_cache(
+    coordinates: list[tuple[float, float]], max_seconds: float | None = None
+) -> int:
+    """
+    Resolve many coordinates at once, ahead of parsing the activities.
+
+    Coordinates are bucketed into cells, cached cells are loaded with a single
+    query and only the remaining cells are requested from the provider, the
+    cells shared by the most coordinates first. New cells are written every
+    PREFILL_STORE_BATCH_SIZE cells, so the ones resolved are kept if the
+    prefill is interrupted.
+
+    Args:
+        coordinates: List of (latitude, longitude) tuples. Tuples with a None
+            value are ignored.
+        max_seconds: Stop requesting cells after this time, the remaining
+            cells are resolved when their activities are parsed.
+
+    Returns:
+        Number of cells requested from the provider.
+    """
+    if not _is_cache_enabled():
+        return 0
+
+    cells: dict[str, tuple[float, float]] = {}
+    cell_counts: Counter[str] = Counter()
+    for latitude, longitude in coordinates:
+        if latitude is None or longitude is None:
+            continue
+        cell_key = get_cell_key(latitude, longitude)
+        cells.setdefault(cell_key, (latitude, longitude))
+        cell_counts[cell_key] += 1
+
+    missing_cell_keys = [
+        cell_key
+        for cell_key, _ in cell_counts.most_common()
+        if location_cache.get(cell_key) is None
+    ]
+    cached_locations = _get_db_cached_locations(missing_cell_keys)
+    for cell_key, location in cached_locations.items():
+        location_cache.set(cell_key, location)
+
+    deadline = None if max_seconds is None else time.monotonic() + max_seconds
+    fetched_cells = 0
+    pending_locations = {}
+    try:
+        for cell_key in missing_cell_keys:
+            if cell_key in cached_locations:
+                continue
+            if deadline is not None and time.monotonic() >= deadline:
+                break
+            try:
+                location = fetch_location_from_provider(*cells[cell_key])
+            except HTTPException:
+                # Already logged, the cell is retried when the activity is parsed
+                continue
+            if location is None:
+                break
+            location_cache.set(cell_key, location)
+            pending_locations[cell_key] = location
+            fetched_cells += 1
+            if len(pending_locations) >= PREFILL_STORE_BATCH_SIZE:
+                _store_db_cached_locations(pending_locations)
+                pending_locations = {}
+    finally:
+        if pending_locations:
+            _store_db_cached_locations(pending_locations)
+
+    return fetched_cells
+
+
+def delete_expired_cached_locations_from_db():
+    """
+    Remove reverse geocoding cache cells older than REVERSE_GEO_CACHE_TTL_DAYS.
+
+    Intended to run as a scheduled maintenance task.
+    """
+    if not _is_cache_enabled():
+        return
+
+    with SessionLocal() as db:
+        num_deleted = geocoding_crud.delete_expired_cached_locations(
+            core_config.REVERSE_GEO_CACHE_TTL_DAYS, db
+        )
+
+        if num_deleted > 0:
+            core_logger.print_to_log_and_console(
+                f"Deleted {num_deleted} expired reverse geocoding cache entries",
+                "info",
+            )
+
+
+def _empty_location() -> dict:
+    return {
+        "city": None,
+        "town": None,
+        "country": None,
+    }
@@ -1,32 +1,33 @@
+from typing import BinaryIO
+
 import gpxpy
-from geopy.distance import geodesic
-from timezonefinder import TimezoneFinder
 from sqlalchemy.orm import Session
-from datetime import datetime
 
 from fastapi import HTTPException, status
 
 import activities.activity.utils as activities_utils
+import activities.activity.trackpoint_utils as activities_trackpoint_utils
 import activities.activity.schema as activities_schema
 
+import activities.activity_laps.utils as activity_laps_utils
+
 import users.user_default_gear.utils as user_default_gear_utils
 
 import users.user_privacy_settings.schema as users_privacy_settings_schema
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
 
 
 def parse_gpx_file(
-    file: str,
+    file: str | BinaryIO,
     user_id: int,
     user_privacy_settings: users_privacy_settings_schema.UsersPrivacySettings,
     db: Session,
     activity_name_input: str | None = None,
 ) -> dict:
     try:
-        # Create an instance of TimezoneFinder
-        tf = TimezoneFinder()
         timezone = core_config.TZ
 
         # Initialize default values for various variables
@@ -65,8 +66,8 @@ def parse_gpx_file(
         vel_waypoints = []
         pace_waypoints = []
 
-        # Initialize variables to store previous latitude and longitude
-        prev_latitude, prev_longitude = None, None
+        # Trackpoints with time data, in file order
+        trackpoints = []
 
         # Initialize variables to store whether elevation, power, heart rate, cadence, and velocity are set
         is_lat_lon_set = False
@@ -77,7 +78,7 @@ def parse_gpx_file(
         is_velocity_set = False
 
         # Parse the GPX file
-        with open(file, "r") as gpx_file:
+        with activities_utils.open_activity_file(file, "r") as gpx_file:
             gpx = gpxpy.parse(gpx_file)
 
             if gpx.tracks:
@@ -111,16 +112,6 @@ def parse_gpx_file(
                                 if time is None:
                                     continue
 
-                                # Calculate distance between waypoints
-                                if (
-                                    prev_latitude is not None
-                                    and prev_longitude is not None
-                                ):
-                                    distance += geodesic(
-                                        (prev_latitude, prev_longitude),
-                                        (latitude, longitude),
-                                    ).meters
-
                                 if elevation != 0:
                                     is_elevation_set = True
 
@@ -200,62 +191,19 @@ def parse_gpx_file(
                                 else:
                                     power = None
 
-                                # Calculate instant speed, pace, and update waypoint arrays
-                                instant_speed = (
-                                    activities_utils.calculate_instant_speed(
-                                        last_waypoint_time,
+                                # Store the trackpoint, speed and pace are computed for the whole track below
+                                trackpoints.append(
+                                    (
                                         time,
                                         latitude,
                                         longitude,
-                                        prev_latitude,
-                                        prev_longitude,
-                                    )
-                                )
-
-                                # Calculate instance pace
-                                instant_pace = 0
-                                if instant_speed > 0:
-                                    instant_pace = 1 / instant_speed
-                                    is_velocity_set = True
-
-                                timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
-
-                                # Append waypoint data to respective arrays
-                                if latitude is not None and longitude is not None:
-                                    lat_lon_waypoints.append(
-                                        {
-                                            "time": timestamp,
-                                            "lat": latitude,
-                                            "lon": longitude,
-                                        }
+                                        elevation,
+                                        heart_rate,
+                                        cadence,
+                                        power,
                                     )
-                                    is_lat_lon_set = True
-
-                                activities_utils.append_if_not_none(
-                                    ele_waypoints, timestamp, elevation, "ele"
-                                )
-                                activities_utils.append_if_not_none(
-                                    hr_waypoints, timestamp, heart_rate, "hr"
-                                )
-                                activities_utils.append_if_not_none(
-                                    cad_waypoints, timestamp, cadence, "cad"
-                                )
-                                activities_utils.append_if_not_none(
-                                    power_waypoints, timestamp, power, "power"
-                                )
-                                activities_utils.append_if_not_none(
-                                    vel_waypoints, timestamp, instant_speed, "vel"
-                                )
-                                activities_utils.append_if_not_none(
-                                    pace_waypoints, timestamp, instant_pace, "pace"
-                                )
-
-                                # Update previous latitude, longitude, and last waypoint time
-                                prev_latitude, prev_longitude, last_waypoint_time = (
-                                    latitude,
-                                    longitude,
-                                    time,
                                 )
+                                last_waypoint_time = time
                     else:
                         raise HTTPException(
                             status_code=status.HTTP_400_BAD_REQUEST,
@@ -274,6 +222,66 @@ def parse_gpx_file(
                 detail="Invalid GPX file - no trackpoints with valid time data found",
             )
 
+        # Compute distance, instant speed and pace for all trackpoints at once
+        kinematics = activities_trackpoint_utils.compute_track_kinematics(
+            [trackpoint[0] for trackpoint in trackpoints],
+            [trackpoint[1] for trackpoint in trackpoints],
+            [trackpoint[2] for trackpoint in trackpoints],
+        )
+        distance = float(kinematics["cumulative_distances"][-1])
+
+        for (
+            (
+                time,
+                latitude,
+                longitude,
+                elevation,
+                heart_rate,
+                cadence,
+                power,
+            ),
+            instant_speed,
+            instant_pace,
+        ) in zip(
+            trackpoints,
+            kinematics["speeds"].tolist(),
+            kinematics["paces"].tolist(),
+        ):
+            if instant_speed > 0:
+                is_velocity_set = True
+
+            timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+            # Append waypoint data to respective arrays
+            if latitude is not None and longitude is not None:
+                lat_lon_waypoints.append(
+                    {
+                        "time": timestamp,
+                        "lat": latitude,
+                        "lon": longitude,
+                    }
+                )
+                is_lat_lon_set = True
+
+            activities_utils.append_if_not_none(
+                ele_waypoints, timestamp, elevation, "ele"
+            )
+            activities_utils.append_if_not_none(
+                hr_waypoints, timestamp, heart_rate, "hr"
+            )
+            activities_utils.append_if_not_none(
+                cad_waypoints, timestamp, cadence, "cad"
+            )
+            activities_utils.append_if_not_none(
+                power_waypoints, timestamp, power, "power"
+            )
+            activities_utils.append_if_not_none(
+                vel_waypoints, timestamp, instant_speed, "vel"
+            )
+            activities_utils.append_if_not_none(
+                pace_waypoints, timestamp, instant_pace, "pace"
+            )
+
         # Calculate elevation gain/loss, pace, average speed, and average power
         if ele_waypoints:
             ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
@@ -321,9 +329,9 @@ def parse_gpx_file(
 
         if activity_type != 3 and activity_type != 7:
             if is_lat_lon_set:
-                timezone = tf.timezone_at(
-                    lat=lat_lon_waypoints[0]["lat"],
-                    lng=lat_lon_waypoints[0]["lon"],
+                timezone = core_timezones.timezone_at(
+                    lat_lon_waypoints[0]["lat"],
+                    lat_lon_waypoints[0]["lon"],
                 )
 
         # Create an Activity object with parsed data
@@ -387,6 +395,7 @@ def parse_gpx_file(
             hr_waypoints,
             cad_waypoints,
             vel_waypoints,
+            activity_type=activity_type,
         )
 
         # Return parsed data as a dictionary
@@ -429,228 +438,18 @@ def generate_activity_laps(
     hr_waypoints: list[dict],
     cad_waypoints: list[dict],
     vel_waypoints: list[dict],
-    distance_per_lap_km: float = 1.0,
+    distance_per_lap_km: float | None = None,
+    activity_type: int | None = None,
+    time_per_lap_seconds: float | None = None,
 ) -> list[dict]:
-    laps = []
-    current_lap_distance = 0.0
-    lap_start = None
-    lap_ele_waypoints = []
-    lap_power_waypoints = []
-    lap_hr_waypoints = []
-    lap_cad_waypoints = []
-    lap_vel_waypoints = []
-
-    def filter_waypoints(waypoints, start_time, end_time):
-        return [
-            waypoint
-            for waypoint in waypoints
-            if datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-            <= datetime.strptime(waypoint["time"], "%Y-%m-%dT%H:%M:%S")
-            <= datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-        ]
-
-    for i in range(1, len(lat_lon_waypoints)):
-        # Get the current and previous waypoints
-        prev_point = lat_lon_waypoints[i - 1]
-        current_point = lat_lon_waypoints[i]
-
-        # Calculate the distance between the two waypoints
-        segment_distance = geodesic(
-            (prev_point["lat"], prev_point["lon"]),
-            (current_point["lat"], current_point["lon"]),
-        ).kilometers
-
-        # Accumulate the distance
-        current_lap_distance += segment_distance
-
-        # Set the start of the lap if not already set
-        if lap_start is None:
-            lap_start = prev_point
-
-        # Check if the current lap distance exceeds or equals the lap distance
-        if current_lap_distance >= distance_per_lap_km:
-            # Filter waypoints for the current lap
-            start_time = lap_start["time"]
-            end_time = current_point["time"]
-            lap_ele_waypoints = filter_waypoints(ele_waypoints, start_time, end_time)
-            lap_power_waypoints = filter_waypoints(
-                power_waypoints, start_time, end_time
-            )
-            lap_hr_waypoints = filter_waypoints(hr_waypoints, start_time, end_time)
-            lap_cad_waypoints = filter_waypoints(cad_waypoints, start_time, end_time)
-            lap_vel_waypoints = filter_waypoints(vel_waypoints, start_time, end_time)
-            ele_gain = None
-            ele_loss = None
-            avg_hr = None
-            max_hr = None
-            avg_cadence = None
-            max_cadence = None
-            avg_speed = None
-            max_speed = None
-            avg_power = None
-            max_power = None
-            np = None
-
-            # Calculate total ascent and descent
-            if lap_ele_waypoints:
-                ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
-                    elevations=lap_ele_waypoints
-                )
-
-            # Calculate average and maximum heart rate
-            if lap_hr_waypoints:
-                avg_hr, max_hr = activities_utils.calculate_avg_and_max(
-                    lap_hr_waypoints, "hr"
-                )
-
-            # Calculate average and maximum cadence
-            if lap_cad_waypoints:
-                avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
-                    lap_cad_waypoints, "cad"
-                )
-
-            # Calculate average and maximum velocity
-            if lap_vel_waypoints:
-                avg_speed, max_speed = activities_utils.calculate_avg_and_max(
-                    lap_vel_waypoints, "vel"
-                )
-
-            # Calculate average and maximum power
-            if lap_power_waypoints:
-                avg_power, max_power = activities_utils.calculate_avg_and_max(
-                    lap_power_waypoints, "power"
-                )
-
-                # Calculate normalised power
-                np = activities_utils.calculate_np(lap_power_waypoints)
-
-            # Create a lap
-            laps.append(
-                {
-                    "start_time": lap_start["time"],
-                    "start_position_lat": lap_start["lat"],
-                    "start_position_long": lap_start["lon"],
-                    "end_position_lat": current_point["lat"],
-                    "end_position_long": current_point["lon"],
-                    "total_elapsed_time": (
-                        datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                        - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                    ).total_seconds(),
-                    "total_timer_time": (
-                        datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                        - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                    ).total_seconds(),
-                    "total_distance": current_lap_distance * 1000,
-                    "avg_heart_rate": round(avg_hr) if avg_hr else None,
-                    "max_heart_rate": round(max_hr) if max_hr else None,
-                    "avg_cadence": round(avg_cadence) if avg_cadence else None,
-                    "max_cadence": round(max_cadence) if max_cadence else None,
-                    "avg_power": round(avg_power) if avg_power else None,
-                    "max_power": round(max_power) if max_power else None,
-                    "total_ascent": round(ele_gain) if ele_gain else None,
-                    "total_descent": round(ele_loss) if ele_loss else None,
-                    "normalized_power": round(np) if np else None,
-                    "enhanced_avg_pace": (
-                        1 / avg_speed
-                        if avg_speed != 0 and avg_speed is not None
-                        else None
-                    ),
-                    "enhanced_avg_speed": avg_speed,
-                    "enhanced_max_pace": (
-                        1 / max_speed
-                        if max_speed != 0 and max_speed is not None
-                        else None
-                    ),
-                    "enhanced_max_speed": max_speed,
-                }
-            )
-
-            # Reset for the next lap
-            lap_start = current_point
-            current_lap_distance = 0.0
-
-    # Add the final lap if it exists and is less than the lap distance
-    if lap_start is not None and current_lap_distance > 0:
-        start_time = lap_start["time"]
-        end_time = lat_lon_waypoints[-1]["time"]
-        lap_ele_waypoints = filter_waypoints(ele_waypoints, start_time, end_time)
-        lap_power_waypoints = filter_waypoints(power_waypoints, start_time, end_time)
-        lap_hr_waypoints = filter_waypoints(hr_waypoints, start_time, end_time)
-        lap_cad_waypoints = filter_waypoints(cad_waypoints, start_time, end_time)
-        lap_vel_waypoints = filter_waypoints(vel_waypoints, start_time, end_time)
-        ele_gain, ele_loss = None, None
-        avg_hr, max_hr = None, None
-        avg_cadence, max_cadence = None, None
-        avg_speed, max_speed = None, None
-        avg_power, max_power, np = None, None, None
-
-        # Calculate total ascent and descent
-        if lap_ele_waypoints:
-            ele_gain, ele_loss = activities_utils.compute_elevation_gain_and_loss(
-                lap_ele_waypoints
-            )
-
-        # Calculate average and maximum heart rate
-        if lap_hr_waypoints:
-            avg_hr, max_hr = activities_utils.calculate_avg_and_max(
-                lap_hr_waypoints, "hr"
-            )
-
-        # Calculate average and maximum cadence
-        if lap_cad_waypoints:
-            avg_cadence, max_cadence = activities_utils.calculate_avg_and_max(
-                lap_cad_waypoints, "cad"
-            )
-
-        # Calculate average and maximum velocity
-        if lap_vel_waypoints:
-            avg_speed, max_speed = activities_utils.calculate_avg_and_max(
-                lap_vel_waypoints, "vel"
-            )
-
-        # Calculate average and maximum power
-        if lap_power_waypoints:
-            avg_power, max_power = activities_utils.calculate_avg_and_max(
-                lap_power_waypoints, "power"
-            )
-
-            # Calculate normalised power
-            np = activities_utils.calculate_np(lap_power_waypoints)
-
-        laps.append(
-            {
-                "start_time": lap_start["time"],
-                "start_position_lat": lap_start["lat"],
-                "start_position_long": lap_start["lon"],
-                "end_position_lat": lat_lon_waypoints[-1]["lat"],
-                "end_position_long": lat_lon_waypoints[-1]["lon"],
-                "total_elapsed_time": (
-                    datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                    - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                ).total_seconds(),
-                "total_timer_time": (
-                    datetime.strptime(end_time, "%Y-%m-%dT%H:%M:%S")
-                    - datetime.strptime(start_time, "%Y-%m-%dT%H:%M:%S")
-                ).total_seconds(),
-                "total_distance": current_lap_distance * 1000,
-                "avg_heart_rate": round(avg_hr) if avg_hr else None,
-                "max_heart_rate": round(max_hr) if max_hr else None,
-                "avg_cadence": round(avg_cadence) if avg_cadence else None,
-                "max_cadence": round(max_cadence) if max_cadence else None,
-                "avg_power": round(avg_power) if avg_power else None,
-                "max_power": round(max_power) if max_power else None,
-                "total_ascent": round(ele_gain) if ele_gain else None,
-                "total_descent": round(ele_loss) if ele_loss else None,
-                "normalized_power": round(np) if np else None,
-                "enhanced_avg_pace": (
-                    1 / avg_speed if avg_speed != 0 and avg_speed is not None else None
-                ),
-                "enhanced_avg_speed": avg_speed,
-                "enhanced_max_pace": (
-                    1 / max_speed if max_speed != 0 and max_speed is not None else None
-                ),
-                "enhanced_max_speed": max_speed,
-            }
-        )
-
-    return laps
+    return activity_laps_utils.generate_auto_laps(
+        lat_lon_waypoints,
+        ele_waypoints,
+        power_waypoints,
+        hr_waypoints,
+        cad_waypoints,
+        vel_waypoints,
+        distance_per_lap_km=distance_per_lap_km,
+        time_per_lap_seconds=time_per_lap_seconds,
+        activity_type=activity_type,
+    )
@@ -2,11 +2,16 @@ from fastapi import HTTPException, status
 from sqlalchemy import func, desc
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert
 
 import health_sleep.schema as health_sleep_schema
 import health_sleep.models as health_sleep_models
 
 import core.logger as core_logger
+import core.pagination as core_pagination
+
+# Rows per INSERT statement, keeps the bound parameters under the PostgreSQL limit
+UPSERT_BATCH_SIZE = 500
 
 
 def get_health_sleep_number(user_id: int, db: Session) -> int:
@@ -135,6 +140,55 @@ def get_health_sleep_with_pagination(
         ) from err
 
 
+def get_health_sleep_with_cursor(
+    user_id: int, db: Session, num_records: int = 5, cursor: str | None = None
+) -> tuple[list[health_sleep_models.HealthSleep], str | None]:
+    """
+    Retrieve a page of health sleep records for a specific user after a cursor.
+
+    Keyset variant of get_health_sleep_with_pagination, ordered by date and ID in
+    descending order (most recent first).
+
+    Args:
+        user_id (int): The ID of the user whose health sleep records are to be retrieved.
+        db (Session): The SQLAlchemy database session used for querying.
+        num_records (int, optional): The number of records per page. Defaults to 5.
+        cursor (str | None, optional): Cursor of the previous page, None for the
+            first page.
+
+    Returns:
+        tuple[list[health_sleep_models.HealthSleep], str | None]: The HealthSleep model instances of the
+            page and the cursor of the next page, None on the last page.
+
+    Raises:
+        HTTPException: 422 Unprocessable Entity if the cursor is invalid, 500
+            Internal Server Error if any database operation fails.
+    """
+    try:
+        # Get the health_sleep page after the cursor from the database
+        return core_pagination.get_cursor_page(
+            db.query(health_sleep_models.HealthSleep).filter(
+                health_sleep_models.HealthSleep.user_id == user_id
+            ),
+            [health_sleep_models.HealthSleep.date, health_sleep_models.HealthSleep.id],
+            True,
+            num_records,
+            cursor,
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_health_sleep_with_cursor: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def get_health_sleep_by_date(
     user_id: int, date: str, db: Session
 ) -> health_sleep_models.HealthSleep | None:
@@ -321,6 +375,77 @@ def edit_health_sleep(
         ) from err
 
 
+def bulk_upsert_health_sleep(
+    user_id: int,
+    health_sleep_entries: list[health_sleep_schema.HealthSleep],
+    db: Session,
+) -> int:
+    """
+    Insert or update the health sleep entries of a user in a single transaction.
+
+    Entries are written with INSERT ... ON CONFLICT (user_id, date) DO UPDATE,
+    so the entry already stored for a date is overwritten instead of being
+    looked up first. When several entries share a date, the last one wins.
+
+    Args:
+        user_id (int): The ID of the user who owns the entries.
+        health_sleep_entries (list[health_sleep_schema.HealthSleep]): The entries to store, each with a date.
+        db (Session): The database session object.
+
+    Returns:
+        int: The number of entries inserted or updated.
+
+    Raises:
+        HTTPException: 500 Internal Server Error if the entries could not be stored.
+    """
+    if not health_sleep_entries:
+        return 0
+
+    try:
+        # Keep the last entry of each date, a statement cannot update a row twice
+        rows_by_date = {
+            entry.date: {
+                **entry.model_dump(exclude={"id", "user_id"}, mode="json"),
+                "user_id": user_id,
+            }
+            for entry in health_sleep_entries
+        }
+        rows = list(rows_by_date.values())
+
+        for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+            statement = insert(health_sleep_models.HealthSleep).values(
+                rows[start : start + UPSERT_BATCH_SIZE]
+            )
+            db.execute(
+                statement.on_conflict_do_update(
+                    index_elements=["user_id", "date"],
+                    set_={
+                        column: statement.excluded[column]
+                        for column in rows[0]
+                        if column not in ("user_id", "date")
+                    },
+                )
+            )
+
+        # Commit the transaction
+        db.commit()
+
+        return len(rows)
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in bulk_upsert_health_sleep: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def delete_health_sleep(user_id: int, health_sleep_id: int, db: Session) -> None:
     """
     Delete a health sleep record for a specific user.
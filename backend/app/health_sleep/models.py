@@ -5,6 +5,7 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    UniqueConstraint,
     DECIMAL,
     JSON,
 )
@@ -66,6 +67,9 @@ class HealthSleep(Base):
     """
 
     __tablename__ = "health_sleep"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_health_sleep_user_id_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(
@@ -248,6 +248,7 @@ class HealthSleepListResponse(BaseModel):
         total (int): Total number of sleep records for the user.
         num_records (int | None): Number of records returned in this response.
         page_number (int | None): Page number of the current response.
+        next_cursor (str | None): Cursor of the next page in cursor pagination.
         records (list[HealthSleep]): List of health sleep measurements.
 
     Configuration:
@@ -259,6 +260,7 @@ class HealthSleepListResponse(BaseModel):
     total: int
     num_records: int | None = None
     page_number: int | None = None
+    next_cursor: str | None = None
     records: list[HealthSleep]
 
     model_config = ConfigDict(
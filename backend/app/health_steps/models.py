@@ -4,6 +4,7 @@ from sqlalchemy import (
     String,
     Date,
     ForeignKey,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from core.database import Base
@@ -36,6 +37,9 @@ class HealthSteps(Base):
     """
 
     __tablename__ = "health_steps"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_health_steps_user_id_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(
@@ -1,6 +1,6 @@
 from typing import Annotated, Callable
 
-from fastapi import APIRouter, Depends, Security, HTTPException
+from fastapi import APIRouter, Depends, Security, HTTPException, Query
 from sqlalchemy.orm import Session
 
 import health_steps.schema as health_steps_schema
@@ -118,6 +118,65 @@ async def read_health_steps_all_pagination(
     )
 
 
+@router.get(
+    "/num_records/{num_records}",
+    response_model=health_steps_schema.HealthStepsListResponse,
+)
+async def read_health_steps_all_cursor(
+    num_records: int,
+    _check_scopes: Annotated[
+        Callable, Security(auth_security.check_scopes, scopes=["health:read"])
+    ],
+    _validate_num_records_value: Annotated[
+        Callable, Depends(core_dependencies.validate_num_records_value)
+    ],
+    token_user_id: Annotated[
+        int,
+        Depends(auth_security.get_sub_from_access_token),
+    ],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    cursor: str | None = Query(None),
+) -> health_steps_schema.HealthStepsListResponse:
+    """
+    Retrieve health steps records for the authenticated user with cursor pagination.
+
+    Cursor variant of the page_number endpoint: the next page starts after the
+    cursor returned with the previous one, so deep pages stay fast and do not
+    shift when records are added.
+
+    Args:
+        num_records (int): The number of records to return per page.
+        _check_scopes (Callable): Dependency that validates the required OAuth scopes.
+        _validate_num_records_value (Callable): Dependency that validates num_records.
+        token_user_id (int): The user ID extracted from the access token.
+        db (Session): Database session dependency.
+        cursor (str | None): Cursor returned with the previous page, None for the first page.
+
+    Returns:
+        HealthStepsListResponse: Response containing:
+            - total (int): Total number of health steps records for the user.
+            - num_records (int): Number of records requested per page.
+            - next_cursor (str | None): Cursor of the next page, None on the last page.
+            - records (list): List of health steps records for the requested page.
+
+    Raises:
+        HTTPException: If authentication fails or required scopes are missing.
+        HTTPException: If num_records or the cursor are invalid.
+    """
+    # Get the total count and records from the database
+    total = health_steps_crud.get_health_steps_number(token_user_id, db)
+    records, next_cursor = health_steps_crud.get_health_steps_with_cursor(
+        token_user_id, db, num_records, cursor
+    )
+
+    return health_steps_schema.HealthStepsListResponse(
+        total=total, num_records=num_records, next_cursor=next_cursor, records=records
+    )
+
+
 @router.post("", status_code=201)
 async def create_health_steps(
     health_steps: health_steps_schema.HealthSteps,
@@ -57,6 +57,7 @@ class HealthStepsListResponse(BaseModel):
         total (int): Total number of steps records for the user.
         num_records (int | None): Number of records returned in this response.
         page_number (int | None): Page number of the current response.
+        next_cursor (str | None): Cursor of the next page in cursor pagination.
         records (list[HealthSteps]): List of health steps measurements.
 
     Configuration:
@@ -68,6 +69,7 @@ class HealthStepsListResponse(BaseModel):
     total: int
     num_records: int | None = None
     page_number: int | None = None
+    next_cursor: str | None = None
     records: list[HealthSteps]
 
     model_config = ConfigDict(
@@ -4,6 +4,7 @@ from sqlalchemy import (
     String,
     Date,
     ForeignKey,
+    UniqueConstraint,
     DECIMAL,
 )
 from sqlalchemy.orm import relationship
@@ -40,6 +41,9 @@ class HealthWeight(Base):
     """
 
     __tablename__ = "health_weight"
+    __table_args__ = (
+        UniqueConstraint("user_id", "date", name="uq_health_weight_user_id_date"),
+    )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     user_id = Column(
@@ -76,6 +76,7 @@ class HealthWeightListResponse(BaseModel):
         total (int): Total number of weight records for the user.
         num_records (int | None): Number of records returned in this response.
         page_number (int | None): Page number of the current response.
+        next_cursor (str | None): Cursor of the next page in cursor pagination.
         records (list[HealthWeight]): List of health weight measurements.
 
     Configuration:
@@ -87,6 +88,7 @@ class HealthWeightListResponse(BaseModel):
     total: int
     num_records: int | None = None
     page_number: int | None = None
+    next_cursor: str | None = None
     records: list[HealthWeight]
 
     model_config = ConfigDict(
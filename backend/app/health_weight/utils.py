@@ -47,6 +47,44 @@ def calculate_bmi(
     return health_weight
 
 
+def calculate_missing_bmis(
+    health_weights: list[health_weight_schema.HealthWeight],
+    user_id: int,
+    db: Session,
+) -> list[health_weight_schema.HealthWeight]:
+    """
+    Calculate the BMI of the health weight records that have a weight but no BMI.
+
+    The user is loaded once for all the records, unlike calculate_bmi.
+
+    Args:
+        health_weights (list[health_weight_schema.HealthWeight]): The health weight
+            records to update in place.
+        user_id (int): The unique identifier of the user.
+        db (Session): The database session object for querying user data.
+
+    Returns:
+        list[health_weight_schema.HealthWeight]: The same health weight records.
+    """
+    missing_bmis = [
+        health_weight
+        for health_weight in health_weights
+        if health_weight.bmi is None and health_weight.weight is not None
+    ]
+    if not missing_bmis:
+        return health_weights
+
+    # Get the user from the database
+    user = users_crud.get_user_by_id(user_id, db)
+    if user is None or user.height is None:
+        return health_weights
+
+    for health_weight in missing_bmis:
+        health_weight.bmi = float(health_weight.weight) / ((user.height / 100) ** 2)
+
+    return health_weights
+
+
 def calculate_bmi_all_user_entries(user_id: int, db: Session) -> None:
     """
     Calculate and update BMI for all health weight entries of a specific user.
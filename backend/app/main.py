@@ -16,6 +16,8 @@ import core.middleware as core_middleware
 import core.migrations as core_migrations
 import core.rate_limit as core_rate_limit
 
+import auth.password_hasher as auth_password_hasher
+
 import garmin.activity_utils as garmin_activity_utils
 import garmin.health_utils as garmin_health_utils
 
@@ -26,6 +28,8 @@ import password_reset_tokens.utils as password_reset_tokens_utils
 
 import sign_up_tokens.utils as sign_up_tokens_utils
 
+import websocket.schema as websocket_schema
+
 from core.routes import router as api_router
 
 
@@ -43,6 +47,15 @@ async def startup_event():
     # Migration check
     core_migrations.check_migrations()
 
+    # Pick Argon2 parameters matching this hardware, older hashes are upgraded on login
+    if core_config.PASSWORD_HASHER_CALIBRATE:
+        auth_password_hasher.calibrate_password_hasher(
+            core_config.PASSWORD_HASHER_TARGET_MS
+        )
+
+    # Relay WebSocket notifications between backend workers
+    await websocket_schema.websocket_manager.start()
+
     # Create a scheduler to run background jobs
     core_scheduler.start_scheduler()
 
@@ -50,41 +63,67 @@ async def startup_event():
     core_logger.print_to_log_and_console(
         "Refreshing Strava tokens on startup on startup"
     )
-    strava_utils.refresh_strava_tokens(True)
+    core_scheduler.run_job(
+        "refresh_strava_tokens", strava_utils.refresh_strava_tokens, True
+    )
 
     # Retrieve last day activities from Garmin Connect and Strava
     core_logger.print_to_log_and_console(
         "Retrieving last day activities from Garmin Connect and Strava on startup"
     )
-    await garmin_activity_utils.retrieve_garminconnect_users_activities_for_days(1)
-    await strava_activity_utils.retrieve_strava_users_activities_for_days(1, True)
+    # Each startup task takes the lock of its scheduler job, so only one
+    # backend instance runs it when several start at the same time
+    await core_scheduler.run_async_job(
+        "retrieve_garminconnect_activities",
+        garmin_activity_utils.retrieve_garminconnect_users_activities_for_days,
+        1,
+    )
+    await core_scheduler.run_async_job(
+        "retrieve_strava_activities",
+        strava_activity_utils.retrieve_strava_users_activities_for_days,
+        1,
+        True,
+    )
 
     # Retrieve last day health stats from Garmin Connect
     core_logger.print_to_log_and_console(
         "Retrieving last day health stats from Garmin Connect on startup"
     )
-    garmin_health_utils.retrieve_garminconnect_users_health_for_days(1)
+    core_scheduler.run_job(
+        "retrieve_garminconnect_health",
+        garmin_health_utils.retrieve_garminconnect_users_health_for_days,
+        1,
+    )
 
     # Delete invalid password reset tokens
     core_logger.print_to_log_and_console(
         "Deleting invalid password reset tokens from the database"
     )
-    password_reset_tokens_utils.delete_invalid_tokens_from_db()
+    core_scheduler.run_job(
+        "delete_invalid_password_reset_tokens",
+        password_reset_tokens_utils.delete_invalid_tokens_from_db,
+    )
 
     # Delete invalid sign-up tokens
     core_logger.print_to_log_and_console(
         "Deleting invalid sign-up tokens from the database"
     )
-    sign_up_tokens_utils.delete_invalid_tokens_from_db()
+    core_scheduler.run_job(
+        "delete_invalid_sign_up_tokens",
+        sign_up_tokens_utils.delete_invalid_tokens_from_db,
+    )
 
 
-def shutdown_event():
+async def shutdown_event():
     # Log the shutdown event
     core_logger.print_to_log_and_console("Backend shutdown event")
 
     # Shutdown the scheduler when the application is shutting down
     core_scheduler.stop_scheduler()
 
+    # Stop relaying WebSocket notifications
+    await websocket_schema.websocket_manager.stop()
+
 
 def create_app() -> FastAPI:
     # Define the FastAPI object
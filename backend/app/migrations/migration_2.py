@@ -1,5 +1,3 @@
-from timezonefinder import TimezoneFinder
-
 from sqlalchemy.orm import Session
 
 import activities.activity.crud as activities_crud
@@ -12,14 +10,12 @@ import health_weight.crud as health_weight_crud
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
 
 
 def process_migration_2(db: Session):
     core_logger.print_to_log_and_console("Started migration 2")
 
-    # Create an instance of TimezoneFinder
-    tf = TimezoneFinder()
-
     # Initialize flag to track if all activities and health_weight were processed without errors
     activities_processed_with_no_errors = True
     health_weight_processed_with_no_errors = True
@@ -67,9 +63,9 @@ def process_migration_2(db: Session):
                     continue
 
                 if activity_stream_coord:
-                    timezone = tf.timezone_at(
-                        lat=activity_stream_coord.stream_waypoints[0]["lat"],
-                        lng=activity_stream_coord.stream_waypoints[0]["lon"],
+                    timezone = core_timezones.timezone_at(
+                        activity_stream_coord.stream_waypoints[0]["lat"],
+                        activity_stream_coord.stream_waypoints[0]["lon"],
                     )
 
                 activity.timezone = timezone
@@ -0,0 +1,92 @@
+from sqlalchemy.orm import Session
+
+import core.logger as core_logger
+
+import migrations.crud as migrations_crud
+
+import activities.activity_streams.models as activity_streams_models
+
+# Number of streams converted per transaction
+STREAMS_BATCH_SIZE = 200
+
+
+def process_migration_7(db: Session):
+    core_logger.print_to_log_and_console("Started migration 7")
+
+    streams_processed_with_no_errors = True
+    last_stream_id = 0
+
+    while True:
+        try:
+            # Get the next batch of streams still stored as JSON waypoints
+            streams = (
+                db.query(activity_streams_models.ActivityStreams)
+                .filter(
+                    activity_streams_models.ActivityStreams.id > last_stream_id,
+                    activity_streams_models.ActivityStreams.stream_data.is_(None),
+                    activity_streams_models.ActivityStreams.stream_waypoints_json.isnot(
+                        None
+                    ),
+                )
+                .order_by(activity_streams_models.ActivityStreams.id)
+                .limit(STREAMS_BATCH_SIZE)
+                .all()
+            )
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 7 - Error fetching activity streams: {err}",
+                "error",
+                exc=err,
+            )
+            streams_processed_with_no_errors = False
+            break
+
+        if not streams:
+            break
+
+        for stream in streams:
+            try:
+                # Re-assigning the waypoints stores them in the columnar encoding
+                stream.stream_waypoints = stream.stream_waypoints_json
+            except Exception as err:
+                core_logger.print_to_log_and_console(
+                    f"Migration 7 - Error encoding activity stream {stream.id}: {err}",
+                    "warning",
+                    exc=err,
+                )
+                streams_processed_with_no_errors = False
+
+        last_stream_id = streams[-1].id
+
+        try:
+            db.commit()
+        except Exception as err:
+            db.rollback()
+            core_logger.print_to_log_and_console(
+                f"Migration 7 - Error storing encoded activity streams: {err}",
+                "error",
+                exc=err,
+            )
+            streams_processed_with_no_errors = False
+
+        # Release the decoded waypoints of the processed batch
+        db.expunge_all()
+
+    # Mark migration as executed
+    if streams_processed_with_no_errors:
+        try:
+            migrations_crud.set_migration_as_executed(7, db)
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 7 - Failed to set migration as executed: {err}",
+                "error",
+                exc=err,
+            )
+            return
+    else:
+        core_logger.print_to_log_and_console(
+            "Migration 7 failed to process all activity streams. Will try again later.",
+            "error",
+        )
+
+    core_logger.print_to_log_and_console("Finished migration 7")
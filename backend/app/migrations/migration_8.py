@@ -0,0 +1,72 @@
+from sqlalchemy.orm import Session
+
+import core.logger as core_logger
+
+import migrations.crud as migrations_crud
+
+import activities.activity.models as activity_models
+import activities.activity_streams.constants as activity_streams_constants
+import activities.activity_streams.crud as activity_streams_crud
+import activities.activity_streams.models as activity_streams_models
+
+
+def process_migration_8(db: Session):
+    core_logger.print_to_log_and_console("Started migration 8")
+
+    users_processed_with_no_errors = True
+
+    try:
+        # Get the users with HR streams
+        user_ids = [
+            user_id
+            for (user_id,) in db.query(activity_models.Activity.user_id)
+            .join(
+                activity_streams_models.ActivityStreams,
+                activity_streams_models.ActivityStreams.activity_id
+                == activity_models.Activity.id,
+            )
+            .filter(
+                activity_streams_models.ActivityStreams.stream_type
+                == activity_streams_constants.STREAM_TYPE_HR
+            )
+            .distinct()
+            .all()
+        ]
+    except Exception as err:
+        core_logger.print_to_log_and_console(
+            f"Migration 8 - Error fetching users with HR streams: {err}",
+            "error",
+            exc=err,
+        )
+        return
+
+    for user_id in user_ids:
+        try:
+            # Compute and store the HR zones of all the user HR streams
+            activity_streams_crud.edit_user_hr_zone_percentages(user_id, db)
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 8 - Error computing HR zones for user {user_id}: {err}",
+                "warning",
+                exc=err,
+            )
+            users_processed_with_no_errors = False
+
+    # Mark migration as executed
+    if users_processed_with_no_errors:
+        try:
+            migrations_crud.set_migration_as_executed(8, db)
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Migration 8 - Failed to set migration as executed: {err}",
+                "error",
+                exc=err,
+            )
+            return
+    else:
+        core_logger.print_to_log_and_console(
+            "Migration 8 failed to process all HR streams. Will try again later.",
+            "error",
+        )
+
+    core_logger.print_to_log_and_console("Finished migration 8")
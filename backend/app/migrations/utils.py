@@ -7,6 +7,8 @@ import migrations.migration_3 as migrations_migration_3
 import migrations.migration_4 as migrations_migration_4
 import migrations.migration_5 as migrations_migration_5
 import migrations.migration_6 as migrations_migration_6
+import migrations.migration_7 as migrations_migration_7
+import migrations.migration_8 as migrations_migration_8
 
 import core.logger as core_logger
 
@@ -44,3 +46,11 @@ def check_migrations_not_executed(db: Session):
             if migration.id == 6:
                 # Execute the migration
                 migrations_migration_6.process_migration_6(db)
+
+            if migration.id == 7:
+                # Execute the migration
+                migrations_migration_7.process_migration_7(db)
+
+            if migration.id == 8:
+                # Execute the migration
+                migrations_migration_8.process_migration_8(db)
@@ -7,6 +7,7 @@ import notifications.schema as notifications_schema
 import notifications.utils as notifications_utils
 
 import core.logger as core_logger
+import core.pagination as core_pagination
 
 
 def get_user_notification_by_id(
@@ -155,6 +156,64 @@ def get_user_notifications_with_pagination(
         ) from err
 
 
+def get_user_notifications_with_cursor(
+    user_id: int, db: Session, num_records: int = 5, cursor: str | None = None
+) -> core_pagination.CursorPage[notifications_schema.Notification]:
+    """
+    Retrieve a page of notifications for a specific user after a cursor.
+
+    Keyset variant of get_user_notifications_with_pagination, newest first.
+
+    Args:
+        user_id (int): The ID of the user whose notifications are to be retrieved.
+        db (Session): The SQLAlchemy database session.
+        num_records (int, optional): The number of notifications to retrieve per page (default is 5).
+        cursor (str | None, optional): The cursor of the previous page, None for the first page.
+
+    Returns:
+        CursorPage[notifications_schema.Notification]:
+            The serialized Notification objects of the page and the cursor of the next page.
+
+    Raises:
+        HTTPException: If the cursor is invalid or an internal server error occurs.
+    """
+    try:
+        # Get the notifications page after the cursor
+        notifications, next_cursor = core_pagination.get_cursor_page(
+            db.query(notifications_models.Notification).filter(
+                notifications_models.Notification.user_id == user_id
+            ),
+            [
+                notifications_models.Notification.created_at,
+                notifications_models.Notification.id,
+            ],
+            True,
+            num_records,
+            cursor,
+        )
+
+        # Serialize each notification
+        for notification in notifications:
+            notification = notifications_utils.serialize_notification(notification)
+
+        # Return the notifications page
+        return core_pagination.CursorPage[notifications_schema.Notification](
+            records=notifications, next_cursor=next_cursor
+        )
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_user_notifications_with_cursor: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def create_notification(notification: notifications_schema.Notification, db: Session):
     """
     Creates a new notification for a specified user and saves it to the database.
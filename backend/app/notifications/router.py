@@ -1,6 +1,6 @@
 from typing import Annotated, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Security
 from sqlalchemy.orm import Session
 
 import auth.security as auth_security
@@ -11,6 +11,7 @@ import notifications.schema as notifications_schema
 
 import core.database as core_database
 import core.dependencies as core_dependencies
+import core.pagination as core_pagination
 
 # Define the API router
 router = APIRouter()
@@ -108,6 +109,40 @@ async def read_notifications_user_pagination(
     )
 
 
+@router.get(
+    "/num_records/{num_records}",
+    response_model=core_pagination.CursorPage[notifications_schema.Notification],
+)
+async def read_notifications_user_cursor(
+    num_records: int,
+    _validate_num_records_value: Annotated[
+        Callable, Depends(core_dependencies.validate_num_records_value)
+    ],
+    token_user_id: Annotated[int, Depends(auth_security.get_sub_from_access_token)],
+    db: Annotated[
+        Session,
+        Depends(core_database.get_db),
+    ],
+    cursor: str | None = Query(None),
+):
+    """
+    Retrieve a page of notifications for the authenticated user after a cursor.
+
+    Args:
+        num_records (int): The number of notification records per page.
+        token_user_id (int): The ID of the authenticated user, extracted from the access token.
+        db (Session): The database session dependency.
+        cursor (str | None): The cursor returned with the previous page, None for the first page.
+
+    Returns:
+        CursorPage[Notification]: The notifications of the page and the cursor of the next page.
+    """
+    # Return the notifications page
+    return notifications_crud.get_user_notifications_with_cursor(
+        token_user_id, db, num_records, cursor
+    )
+
+
 @router.put(
     "/{notification_id}/mark_as_read",
 )
@@ -25,83 +25,99 @@ def serialize_notification(notification: notifications_schema.Notification):
 
 
 async def create_new_activity_notification(
-    user_id: int, activity_id: int, websocket_manager: websocket_schema.WebSocketManager
+    user_id: int,
+    activity_id: int,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session | None = None,
 ):
-    # Create a new database session using context manager
-    with SessionLocal() as db:
-        try:
-            # Create a notification for the new activity
-            notification = notifications_crud.create_notification(
-                notifications_schema.Notification(
-                    user_id=user_id,
-                    type=notifications_constants.TYPE_NEW_ACTIVITY,
-                    options={"activity_id": activity_id},
-                ),
-                db,
+    if db is None:
+        # Create a new database session using context manager
+        with SessionLocal() as db:
+            return await create_new_activity_notification(
+                user_id, activity_id, websocket_manager, db
             )
 
-            # Notify the frontend about the new activity
-            json_data = {
-                "message": "NEW_ACTIVITY_NOTIFICATION",
-                "notification_id": notification.id,
-            }
-            await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
+    try:
+        # Create a notification for the new activity
+        notification = notifications_crud.create_notification(
+            notifications_schema.Notification(
+                user_id=user_id,
+                type=notifications_constants.TYPE_NEW_ACTIVITY,
+                options={"activity_id": activity_id},
+            ),
+            db,
+        )
 
-            # Return the serialized notification
-            return notification
-        except HTTPException as http_err:
-            raise http_err
-        except Exception as err:
-            # Log the exception
-            core_logger.print_to_log(
-                f"Error in create_new_activity_notification: {err}", "error", exc=err
-            )
-            # Raise an HTTPException with a 500 Internal Server Error status code
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal Server Error",
-            ) from err
+        # Notify the frontend about the new activity
+        json_data = {
+            "message": "NEW_ACTIVITY_NOTIFICATION",
+            "notification_id": notification.id,
+        }
+        await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
+
+        # Return the serialized notification
+        return notification
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in create_new_activity_notification: {err}", "error", exc=err
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
 
 
 async def create_new_duplicate_start_time_activity_notification(
-    user_id: int, activity_id: int, websocket_manager: websocket_schema.WebSocketManager
+    user_id: int,
+    activity_id: int,
+    websocket_manager: websocket_schema.WebSocketManager,
+    db: Session | None = None,
 ):
-    # Create a new database session using context manager
-    with SessionLocal() as db:
-        try:
-            # Create a notification for the new activity
-            notification = notifications_crud.create_notification(
-                notifications_schema.Notification(
-                    user_id=user_id,
-                    type=notifications_constants.TYPE_DUPLICATE_ACTIVITY,
-                    options={"activity_id": activity_id},
-                ),
-                db,
+    if db is None:
+        # Create a new database session using context manager
+        with SessionLocal() as db:
+            return await create_new_duplicate_start_time_activity_notification(
+                user_id, activity_id, websocket_manager, db
             )
 
-            # Notify the frontend about the new activity
-            json_data = {
-                "message": "NEW_DUPLICATE_ACTIVITY_START_TIME_NOTIFICATION",
-                "notification_id": notification.id,
-            }
-            await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
+    try:
+        # Create a notification for the new activity
+        notification = notifications_crud.create_notification(
+            notifications_schema.Notification(
+                user_id=user_id,
+                type=notifications_constants.TYPE_DUPLICATE_ACTIVITY,
+                options={"activity_id": activity_id},
+            ),
+            db,
+        )
 
-            # Return the serialized notification
-            return notification
-        except HTTPException as http_err:
-            raise http_err
-        except Exception as err:
-            # Log the exception
-            core_logger.print_to_log(
-                f"Error in create_new_duplicate_start_time_activity_notification: {err}",
-                "error",
-                exc=err,
-            )
-            # Raise an HTTPException with a 500 Internal Server Error status code
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Internal Server Error",
-            ) from err
+        # Notify the frontend about the new activity
+        json_data = {
+            "message": "NEW_DUPLICATE_ACTIVITY_START_TIME_NOTIFICATION",
+            "notification_id": notification.id,
+        }
+        await websocket_utils.notify_frontend(user_id, websocket_manager, json_data)
+
+        # Return the serialized notification
+        return notification
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in create_new_duplicate_start_time_activity_notification: {err}",
+            "error",
+            exc=err,
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
 
 
 async def create_new_follower_request_notification(
@@ -678,6 +678,7 @@ class ImportService:
         activity_exercise_titles_data: list[Any],
         original_activity_id: int,
         new_activity_id: int,
+        max_heart_rate: int | None = None,
     ) -> None:
         """
         Import all components for a single activity.
@@ -691,6 +692,7 @@ class ImportService:
             activity_exercise_titles_data: Exercise titles.
             original_activity_id: Old activity ID.
             new_activity_id: New activity ID.
+            max_heart_rate: User maximum heart rate for the HR zones.
         """
         # Import laps - filter for this activity
         if activity_laps_data:
@@ -742,7 +744,9 @@ class ImportService:
                 streams.append(stream)
 
             if streams:
-                activity_streams_crud.create_activity_streams(streams, self.db)
+                activity_streams_crud.create_activity_streams(
+                    streams, self.db, max_heart_rate
+                )
                 self.counts["activity_streams"] += len(streams)
 
         # Import workout steps
@@ -935,6 +939,9 @@ class ImportService:
                         activity_exercise_titles_data,
                         original_activity_id,
                         new_activity.id,
+                        activity_streams_crud.get_user_max_heart_rate(
+                            self.user_id, activity.start_time, self.db
+                        ),
                     )
 
                 self.counts["activities"] += 1
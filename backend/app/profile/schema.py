@@ -1,8 +1,7 @@
-import time
-import threading
 from pydantic import BaseModel
 import core.cryptography as core_cryptography
 import core.logger as core_logger
+import core.shared_state as core_shared_state
 
 
 class MFARequest(BaseModel):
@@ -66,15 +65,17 @@ class MFAStatusResponse(BaseModel):
 
 class MFASecretStore:
     """
-    Thread-safe storage for temporary MFA secrets with TTL.
+    Storage for temporary MFA secrets with TTL.
+
+    Secrets are encrypted and kept in the shared state, so the MFA setup may
+    be confirmed on any backend worker.
 
     Attributes:
-        _store: Internal storage for encrypted secrets.
-        _lock: Thread synchronization lock.
         _ttl_seconds: Time-to-live for stored secrets.
-        _cleanup_thread: Background thread for cleanup.
     """
 
+    KEY_PREFIX = "mfa_secret:"
+
     def __init__(self, ttl_seconds: int = 300):
         """
         Initialize the MFA secret store.
@@ -82,51 +83,7 @@ class MFASecretStore:
         Args:
             ttl_seconds: Time-to-live for secrets in seconds.
         """
-        self._store = (
-            {}
-        )  # Format: {user_id: {"encrypted_secret": str, "expires_at": float}}
-        self._lock = threading.RLock()  # Reentrant lock for thread safety
         self._ttl_seconds = ttl_seconds
-        self._cleanup_thread = None
-        self._start_cleanup_thread()
-
-    def _start_cleanup_thread(self):
-        """
-        Start the background cleanup thread if not running.
-        """
-        if self._cleanup_thread is None or not self._cleanup_thread.is_alive():
-            self._cleanup_thread = threading.Thread(
-                target=self._cleanup_expired_secrets,
-                daemon=True,
-                name="MFA-Secret-Cleanup",
-            )
-            self._cleanup_thread.start()
-
-    def _cleanup_expired_secrets(self):
-        """
-        Continuously remove expired secrets from storage.
-        """
-        while True:
-            try:
-                current_time = time.time()
-                with self._lock:
-                    expired_users = [
-                        user_id
-                        for user_id, data in self._store.items()
-                        if current_time > data["expires_at"]
-                    ]
-                    for user_id in expired_users:
-                        del self._store[user_id]
-                        core_logger.print_to_log(
-                            f"Cleaned up expired MFA secret for user {user_id}", "debug"
-                        )
-
-                time.sleep(30)
-            except Exception as err:
-                core_logger.print_to_log(
-                    f"Error in MFA secret cleanup thread: {err}", "error", exc=err
-                )
-                time.sleep(60)
 
     def add_secret(self, user_id: int, secret: str) -> None:
         """
@@ -145,13 +102,9 @@ class MFASecretStore:
             if not encrypted_secret:
                 raise ValueError("Failed to encrypt MFA secret")
 
-            expires_at = time.time() + self._ttl_seconds
-
-            with self._lock:
-                self._store[user_id] = {
-                    "encrypted_secret": encrypted_secret,
-                    "expires_at": expires_at,
-                }
+            core_shared_state.get_shared_state().set(
+                f"{self.KEY_PREFIX}{user_id}", encrypted_secret, self._ttl_seconds
+            )
 
             core_logger.print_to_log(
                 f"Securely stored MFA secret for user {user_id} (expires in {self._ttl_seconds}s)",
@@ -175,26 +128,14 @@ class MFASecretStore:
             expired.
         """
         try:
-            with self._lock:
-                if user_id not in self._store:
-                    return None
-
-                data = self._store[user_id]
-
-                # Check if expired
-                if time.time() > data["expires_at"]:
-                    del self._store[user_id]
-                    core_logger.print_to_log(
-                        f"MFA secret expired for user {user_id}", "debug"
-                    )
-                    return None
-
-                # Decrypt and return
-                decrypted_secret = core_cryptography.decrypt_token_fernet(
-                    data["encrypted_secret"]
-                )
-                return decrypted_secret
+            encrypted_secret = core_shared_state.get_shared_state().get(
+                f"{self.KEY_PREFIX}{user_id}"
+            )
+            if encrypted_secret is None:
+                return None
 
+            # Decrypt and return
+            return core_cryptography.decrypt_token_fernet(encrypted_secret)
         except Exception as err:
             core_logger.print_to_log(
                 f"Failed to get MFA secret for user {user_id}: {err}", "error", exc=err
@@ -209,12 +150,10 @@ class MFASecretStore:
             user_id: The user ID whose secret to delete.
         """
         try:
-            with self._lock:
-                if user_id in self._store:
-                    del self._store[user_id]
-                    core_logger.print_to_log(
-                        f"Securely deleted MFA secret for user {user_id}", "debug"
-                    )
+            core_shared_state.get_shared_state().delete(f"{self.KEY_PREFIX}{user_id}")
+            core_logger.print_to_log(
+                f"Securely deleted MFA secret for user {user_id}", "debug"
+            )
         except Exception as err:
             core_logger.print_to_log(
                 f"Failed to delete MFA secret for user {user_id}: {err}",
@@ -233,16 +172,10 @@ class MFASecretStore:
             True if a valid secret exists, False otherwise.
         """
         try:
-            with self._lock:
-                if user_id not in self._store:
-                    return False
-
-                # Check if expired
-                if time.time() > self._store[user_id]["expires_at"]:
-                    del self._store[user_id]
-                    return False
-
-                return True
+            return (
+                core_shared_state.get_shared_state().get(f"{self.KEY_PREFIX}{user_id}")
+                is not None
+            )
         except Exception as err:
             core_logger.print_to_log(
                 f"Failed to check MFA secret for user {user_id}: {err}",
@@ -256,12 +189,10 @@ class MFASecretStore:
         Remove all MFA secrets from storage.
         """
         try:
-            with self._lock:
-                cleared_count = len(self._store)
-                self._store.clear()
-                core_logger.print_to_log(
-                    f"Cleared {cleared_count} MFA secrets from store", "info"
-                )
+            cleared_count = core_shared_state.get_shared_state().clear(self.KEY_PREFIX)
+            core_logger.print_to_log(
+                f"Cleared {cleared_count} MFA secrets from store", "info"
+            )
         except Exception as err:
             core_logger.print_to_log(
                 f"Failed to clear MFA secret store: {err}", "error", exc=err
@@ -271,41 +202,25 @@ class MFASecretStore:
         """
         Get statistics about the secret store.
 
+        Expired secrets are removed by the shared state, so only the
+        configuration is reported.
+
         Returns:
-            Dictionary with total, expired, and active secret
-            counts.
+            Dictionary with the shared state backend and TTL.
         """
-        try:
-            with self._lock:
-                current_time = time.time()
-                total_count = len(self._store)
-                expired_count = sum(
-                    1
-                    for data in self._store.values()
-                    if current_time > data["expires_at"]
-                )
-
-                return {
-                    "total_secrets": total_count,
-                    "expired_secrets": expired_count,
-                    "active_secrets": total_count - expired_count,
-                    "ttl_seconds": self._ttl_seconds,
-                }
-        except Exception as err:
-            core_logger.print_to_log(
-                f"Failed to get MFA secret store stats: {err}", "error", exc=err
-            )
-            return {"error": str(err)}
+        return {
+            "backend": type(core_shared_state.get_shared_state()).__name__,
+            "ttl_seconds": self._ttl_seconds,
+        }
 
     def __repr__(self) -> str:
         """
         Return a string representation of the store.
 
         Returns:
-            String showing active secrets and TTL.
+            String showing the TTL.
         """
-        stats = self.get_stats()
-        return f"MFASecretStore(active={stats.get('active_secrets', 0)}, ttl={self._ttl_seconds}s)"
+        return f"MFASecretStore(ttl={self._ttl_seconds}s)"
 
 
 def get_mfa_secret_store():
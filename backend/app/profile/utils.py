@@ -7,6 +7,7 @@ import time
 import psutil
 from io import BytesIO
 from fastapi import HTTPException, status
+from sqlalchemy import LargeBinary
 from sqlalchemy.orm import Session
 from typing import Type, Any, Dict, TypeVar
 
@@ -336,6 +337,11 @@ def sqlalchemy_obj_to_dict(obj):
     """
     Convert SQLAlchemy object to dictionary.
 
+    Binary columns (e.g. encoded activity stream data) are skipped, their
+    content is exported through the matching decoded attribute. Columns
+    generated by the database (e.g. activity search columns) are skipped too,
+    they are rebuilt on import.
+
     Args:
         obj: SQLAlchemy model instance or other object.
 
@@ -343,7 +349,11 @@ def sqlalchemy_obj_to_dict(obj):
         Dictionary with column names and values.
     """
     if hasattr(obj, "__table__"):
-        return {c.name: getattr(obj, c.name) for c in obj.__table__.columns}
+        return {
+            c.name: getattr(obj, c.name)
+            for c in obj.__table__.columns
+            if not isinstance(c.type, LargeBinary) and c.computed is None
+        }
     return obj
 
 
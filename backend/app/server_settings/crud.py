@@ -4,9 +4,16 @@ from sqlalchemy.orm import Session
 import server_settings.schema as server_settings_schema
 import server_settings.models as server_settings_models
 
+import core.cache as core_cache
 import core.logger as core_logger
 
+# Read on every public activity, sign-up and stream request
+SERVER_SETTINGS_CACHE = core_cache.TTLCache(
+    "server_settings", max_size=1, ttl_seconds=300, copy=core_cache.detached_copy
+)
 
+
+@core_cache.cached(SERVER_SETTINGS_CACHE, key=lambda db: 1)
 def get_server_settings(db: Session):
     try:
         # Get the user from the database
@@ -61,6 +68,9 @@ def edit_server_settings(
         # Commit the transaction
         db.commit()
 
+        # Drop the cached server settings on every worker
+        SERVER_SETTINGS_CACHE.invalidate()
+
         return db_server_settings
     except HTTPException as http_err:
         raise http_err
@@ -127,7 +127,7 @@ def edit_session_object(
     )
 
 
-def create_session(
+async def create_session(
     session_id: str,
     user: users_schema.UserRead,
     request: Request,
@@ -159,7 +159,7 @@ def create_session(
         session_id,
         user,
         request,
-        password_hasher.hash_password(refresh_token),
+        await password_hasher.hash_password_async(refresh_token),
         exp,
     )
 
@@ -167,7 +167,7 @@ def create_session(
     session_crud.create_session(new_session, db)
 
 
-def edit_session(
+async def edit_session(
     session: session_schema.UsersSessions,
     request: Request,
     new_refresh_token: str,
@@ -195,7 +195,7 @@ def edit_session(
     # Update the session
     updated_session = edit_session_object(
         request,
-        password_hasher.hash_password(new_refresh_token),
+        await password_hasher.hash_password_async(new_refresh_token),
         exp,
         session,
     )
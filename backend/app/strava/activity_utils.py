@@ -1,12 +1,14 @@
+import asyncio
+
 from fastapi import HTTPException, status
 from datetime import datetime, timedelta, timezone
 from sqlalchemy.orm import Session
 from stravalib.client import Client
 from stravalib.exc import AccessUnauthorized
-from timezonefinder import TimezoneFinder
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
 
 import activities.activity.schema as activities_schema
 import activities.activity.crud as activities_crud
@@ -50,8 +52,9 @@ async def fetch_and_process_activities(
 
     # Fetch Strava activities after the specified start date
     try:
-        strava_activities = list(
-            strava_client.get_activities(after=start_date, before=end_date)
+        # Pages are fetched while iterating, off the event loop
+        strava_activities = await asyncio.to_thread(
+            list, strava_client.get_activities(after=start_date, before=end_date)
         )
     except AccessUnauthorized as auth_err:
         # Log a more specific error message for authentication issues
@@ -135,8 +138,6 @@ def parse_activity(
     user_integrations: user_integrations_schema.UsersIntegrations,
     db: Session,
 ) -> dict:
-    # Create an instance of TimezoneFinder
-    tf = TimezoneFinder()
     timezone = core_config.TZ
 
     # Get the detailed activity
@@ -293,9 +294,9 @@ def parse_activity(
 
     if activity_type != 3 and activity_type != 7:
         if is_lat_lon_set:
-            timezone = tf.timezone_at(
-                lat=lat_lon_waypoints[0]["lat"],
-                lng=lat_lon_waypoints[0]["lon"],
+            timezone = core_timezones.timezone_at(
+                lat_lon_waypoints[0]["lat"],
+                lat_lon_waypoints[0]["lon"],
             )
 
     # Create the activity object
@@ -372,37 +373,39 @@ async def save_activity_streams_laps(
     websocket_manager: websocket_schema.WebSocketManager,
     db: Session,
 ) -> activities_schema.Activity:
-    # Create the activity and get the ID
-    created_activity = await activities_crud.create_activity(
-        activity, websocket_manager, db
-    )
-
-    if stream_data is not None:
-        # Create the empty array of activity streams
-        activity_streams = []
-
-        # Create the activity streams objects
-        for is_set, stream_type, waypoints in stream_data:
-            if is_set:
-                activity_streams.append(
-                    activity_streams_schema.ActivityStreams(
-                        activity_id=created_activity.id,
-                        stream_type=stream_type,
-                        stream_waypoints=waypoints,
-                        strava_activity_stream_id=None,
-                    )
+    def build_children(activity_id: int) -> list:
+        children = []
+
+        if stream_data is not None:
+            # Create the activity streams objects
+            children.extend(
+                activity_streams_crud.build_activity_streams(
+                    [
+                        activity_streams_schema.ActivityStreams(
+                            activity_id=activity_id,
+                            stream_type=stream_type,
+                            stream_waypoints=waypoints,
+                            strava_activity_stream_id=None,
+                        )
+                        for is_set, stream_type, waypoints in stream_data
+                        if is_set
+                    ],
+                    activity_streams_crud.get_user_max_heart_rate(
+                        activity.user_id, activity.start_time, db
+                    ),
                 )
+            )
 
-        # Create the activity streams in the database
-        activity_streams_crud.create_activity_streams(activity_streams, db)
+        if laps is not None:
+            # Create the laps objects
+            children.extend(activity_laps_crud.build_activity_laps(laps, activity_id))
 
-    # Append activity id to laps
-    if laps is not None:
-        # Create the laps in the database
-        activity_laps_crud.create_activity_laps(laps, created_activity.id, db)
+        return children
 
-    # return the created activity
-    return created_activity
+    # Create the activity with its streams and laps in a single transaction
+    return await activities_crud.create_activity(
+        activity, websocket_manager, db, build_children=build_children
+    )
 
 
 async def process_activity(
@@ -426,8 +429,10 @@ async def process_activity(
         f"User {user_id}: Strava activity {activity.id} will be processed"
     )
 
-    # Parse the activity and streams
-    parsed_activity = parse_activity(
+    # Parse the activity and streams, the Strava client blocks so it runs off
+    # the event loop
+    parsed_activity = await asyncio.to_thread(
+        parse_activity,
         activity,
         user_id,
         user_privacy_settings,
@@ -705,41 +710,52 @@ async def retrieve_strava_users_activities_for_days(
             calculated_start_date = datetime.now(timezone.utc) - timedelta(days=days)
             calculated_end_date = datetime.now(timezone.utc)
 
-            # Process the activities for each user
+            # Process the activities for each user, a bounded number of users
+            # at a time. Each user sync uses its own database session
             if users:
-                for user in users:
-                    try:
-                        await get_user_garminconnect_activities_by_dates(
-                            calculated_start_date,
-                            calculated_end_date,
-                            user.id,
-                            None,
-                            None,
-                            is_startup,
-                        )
-                    except HTTPException as err:
-                        # Log the error but continue processing other users
-                        core_logger.print_to_log(
-                            f"User {user.id}: Error processing Strava activities: {str(err)}",
-                            "error",
-                            exc=err,
-                        )
-                        # Don't reraise the exception if we're in startup mode
-                        if not is_startup:
+                semaphore = asyncio.Semaphore(core_config.STRAVA_SYNC_CONCURRENCY)
+
+                async def sync_user(user_id: int):
+                    async with semaphore:
+                        try:
+                            await get_user_garminconnect_activities_by_dates(
+                                calculated_start_date,
+                                calculated_end_date,
+                                user_id,
+                                None,
+                                None,
+                                is_startup,
+                            )
+                        except HTTPException as err:
+                            # Log the error but continue processing other users
+                            core_logger.print_to_log(
+                                f"User {user_id}: Error processing Strava activities: {str(err)}",
+                                "error",
+                                exc=err,
+                            )
                             raise err
-                    except Exception as err:
-                        # Log the error but continue processing other users
-                        core_logger.print_to_log(
-                            f"User {user.id}: Unexpected error processing Strava activities: {str(err)}",
-                            "error",
-                            exc=err,
-                        )
-                        # Don't reraise the exception if we're in startup mode
-                        if not is_startup:
+                        except Exception as err:
+                            # Log the error but continue processing other users
+                            core_logger.print_to_log(
+                                f"User {user_id}: Unexpected error processing Strava activities: {str(err)}",
+                                "error",
+                                exc=err,
+                            )
                             raise HTTPException(
                                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                                 detail="Internal Server Error",
                             ) from err
+
+                results = await asyncio.gather(
+                    *(sync_user(user.id) for user in users), return_exceptions=True
+                )
+
+                # Don't reraise the exception if we're in startup mode
+                errors = [
+                    result for result in results if isinstance(result, Exception)
+                ]
+                if errors and not is_startup:
+                    raise errors[0]
         except HTTPException as err:
             # Log an error event if an HTTPException occurred
             core_logger.print_to_log(
@@ -0,0 +1,134 @@
+"""
+Process-wide throttling of Strava API requests.
+
+Strava enforces its rate limits per application, not per athlete, so every
+Strava client created by the server shares a single StravaRateLimiter. It is a
+token bucket refilled at the 15-minute limit spread over the 15 minutes, whose
+limits are updated from the X-RateLimit/X-ReadRateLimit headers of each
+response. Once Strava reports a limit as exhausted, requests wait until the
+15-minute or daily window resets.
+
+stravalib calls the limiter after each response, so a client thread waits
+before sending its next request. Calls made from the event loop thread (e.g.
+request handlers) consume tokens but never sleep, so they cannot stall the
+server.
+"""
+
+import asyncio
+import threading
+import time
+
+from stravalib.util import limiter
+
+# Default Strava read limits, replaced by the limits in the response headers
+DEFAULT_SHORT_LIMIT = 100
+DEFAULT_LONG_LIMIT = 1000
+SHORT_WINDOW_SECONDS = 15 * 60
+
+# Requests allowed back to back before requests are paced
+BURST_SIZE = 10
+
+
+def _is_event_loop_thread() -> bool:
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class StravaRateLimiter(limiter.RateLimiter):
+    """
+    Token bucket shared by every Strava client of the process.
+
+    Attributes:
+        short_limit: Requests allowed per 15 minutes.
+        long_limit: Requests allowed per day.
+    """
+
+    def __init__(
+        self,
+        short_limit: int = DEFAULT_SHORT_LIMIT,
+        long_limit: int = DEFAULT_LONG_LIMIT,
+        burst_size: int = BURST_SIZE,
+        clock=time.monotonic,
+        sleep=time.sleep,
+    ):
+        super().__init__()
+        self.short_limit = short_limit
+        self.long_limit = long_limit
+        self._capacity = float(burst_size)
+        self._tokens = float(burst_size)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated_at = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        rate = self.short_limit / SHORT_WINDOW_SECONDS
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated_at) * rate
+        )
+        self._updated_at = now
+
+    def update_from_headers(self, response_headers: dict, method) -> None:
+        """
+        Update the limits and block the bucket if Strava reports them exhausted.
+
+        Args:
+            response_headers: Headers of a Strava API response.
+            method: HTTP method of the request.
+        """
+        rates = limiter.get_rates_from_response_headers(response_headers, method)
+        if rates is None:
+            return
+
+        with self._lock:
+            self.short_limit = max(1, rates.short_limit)
+            self.long_limit = max(1, rates.long_limit)
+
+            if rates.long_usage >= rates.long_limit:
+                wait = limiter.get_seconds_until_next_day()
+            elif rates.short_usage >= rates.short_limit:
+                wait = limiter.get_seconds_until_next_quarter()
+            else:
+                return
+            self._blocked_until = max(self._blocked_until, self._clock() + wait)
+
+    def acquire(self, block: bool = True) -> float:
+        """
+        Take a token for the next request.
+
+        Args:
+            block: Whether to wait for the token. When False the token is taken
+                immediately, delaying the requests of other threads instead.
+
+        Returns:
+            Number of seconds waited.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                wait = self._blocked_until - now
+                if wait <= 0:
+                    if self._tokens >= 1 or not block:
+                        self._tokens -= 1
+                        return waited
+                    wait = (1 - self._tokens) * SHORT_WINDOW_SECONDS / self.short_limit
+                elif not block:
+                    self._tokens -= 1
+                    return waited
+
+            self._sleep(wait)
+            waited += wait
+
+    def __call__(self, response_headers: dict, method) -> None:
+        self.update_from_headers(response_headers, method)
+        self.acquire(block=not _is_event_loop_thread())
+
+
+# Limiter shared by every Strava client
+rate_limiter = StravaRateLimiter()
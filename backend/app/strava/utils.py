@@ -15,6 +15,8 @@ import users.user_integrations.crud as user_integrations_crud
 
 import users.user.crud as users_crud
 
+import strava.rate_limiter as strava_rate_limiter
+
 from core.database import SessionLocal
 
 
@@ -158,6 +160,7 @@ def create_strava_client(
                 else None
             ),
             token_expires=epoch_time,
+            rate_limiter=strava_rate_limiter.rate_limiter,
         )
     except Exception as err:
         # Log the error and re-raise the exception
@@ -1,15 +1,17 @@
+import math
 from collections import defaultdict
-from timezonefinder import TimezoneFinder
 from datetime import datetime
 
 import tcxreader
 import activities.activity.schema as activities_schema
 import activities.activity.utils as activities_utils
+import activities.activity.trackpoint_utils as activities_trackpoint_utils
 
 import users.user_default_gear.utils as user_default_gear_utils
 
 import core.logger as core_logger
 import core.config as core_config
+import core.timezones as core_timezones
 
 
 def parse_tcx_file(
@@ -18,8 +20,6 @@ def parse_tcx_file(
     tcx_file = tcxreader.TCXReader().read(file)
     trackpoints = tcx_file.trackpoints_to_dict()
 
-    # Create an instance of TimezoneFinder
-    tf = TimezoneFinder()
     timezone = core_config.TZ
 
     # Initialize variables
@@ -32,7 +32,6 @@ def parse_tcx_file(
     avg_power = None
     max_power = None
     np = None
-    last_waypoint_time, prev_latitude, prev_longitude = None, None, None
     cad_waypoints = []
     vel_waypoints = []
     pace_waypoints = []
@@ -169,29 +168,21 @@ def parse_tcx_file(
         if hasattr(trackpoint, "tpx_ext") and "Watts" in trackpoint.tpx_ext
     ]
 
-    for trackpoint in trackpoints:
-        latitude, longitude, time = (
-            trackpoint["latitude"],
-            trackpoint["longitude"],
-            trackpoint["time"],
-        )
-
-        timestamp = time.strftime("%Y-%m-%dT%H:%M:%S")
+    # Calculate instant speed and pace for all trackpoints at once
+    kinematics = activities_trackpoint_utils.compute_track_kinematics(
+        [trackpoint["time"] for trackpoint in trackpoints],
+        [trackpoint.get("latitude") for trackpoint in trackpoints],
+        [trackpoint.get("longitude") for trackpoint in trackpoints],
+    )
 
-        # Calculate instant speed, pace, and update waypoint arrays
-        instant_speed = activities_utils.calculate_instant_speed(
-            last_waypoint_time,
-            time,
-            latitude,
-            longitude,
-            prev_latitude,
-            prev_longitude,
-        )
+    for trackpoint, instant_speed, instant_pace in zip(
+        trackpoints, kinematics["speeds"].tolist(), kinematics["paces"].tolist()
+    ):
+        # Trackpoints without a position have no speed
+        if math.isnan(instant_speed):
+            continue
 
-        # Calculate instance pace
-        instant_pace = 0
-        if instant_speed > 0:
-            instant_pace = 1 / instant_speed
+        timestamp = trackpoint["time"].strftime("%Y-%m-%dT%H:%M:%S")
 
         activities_utils.append_if_not_none(
             vel_waypoints, timestamp, instant_speed, "vel"
@@ -200,13 +191,6 @@ def parse_tcx_file(
             pace_waypoints, timestamp, instant_pace, "pace"
         )
 
-        # Update previous latitude, longitude, and last waypoint time
-        prev_latitude, prev_longitude, last_waypoint_time = (
-            latitude,
-            longitude,
-            time,
-        )
-
     distance = round(tcx_file.distance) if tcx_file.distance else 0
 
     if lat_lon_waypoints:
@@ -227,9 +211,9 @@ def parse_tcx_file(
             country = location_data["country"]
 
         # Get timezone based on the first waypoint's coordinates
-        timezone = tf.timezone_at(
-            lat=trackpoints[0]["latitude"],
-            lng=trackpoints[0]["longitude"],
+        timezone = core_timezones.timezone_at(
+            trackpoints[0]["latitude"],
+            trackpoints[0]["longitude"],
         )
 
     if power_waypoints:
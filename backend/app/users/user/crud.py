@@ -14,11 +14,19 @@ import users.user_identity_providers.crud as user_idp_crud
 
 import health_weight.utils as health_weight_utils
 
+import activities.activity_streams.crud as activity_streams_crud
+
 import server_settings.utils as server_settings_utils
 import server_settings.schema as server_settings_schema
 
+import core.cache as core_cache
 import core.logger as core_logger
 
+# Users read by ID on most requests, invalidated by every user change below
+USERS_CACHE = core_cache.TTLCache(
+    "users", max_size=1024, ttl_seconds=300, copy=core_cache.detached_copy
+)
+
 
 def authenticate_user(username: str, db: Session) -> users_models.User | None:
     try:
@@ -198,6 +206,7 @@ def get_user_by_email(email: str, db: Session):
         ) from err
 
 
+@core_cache.cached(USERS_CACHE, key=lambda user_id, db: user_id)
 def get_user_by_id(user_id: int, db: Session):
     try:
         # Get the user from the database
@@ -359,6 +368,7 @@ def edit_user(user_id: int, user: users_schema.UserRead, db: Session):
             )
 
         height_before = db_user.height
+        heart_rate_before = (db_user.max_heart_rate, db_user.birthdate)
 
         # Check if the photo_path is being updated
         if user.photo_path:
@@ -376,10 +386,17 @@ def edit_user(user_id: int, user: users_schema.UserRead, db: Session):
         # Commit the transaction
         db.commit()
 
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
+
         if height_before != db_user.height:
             # Update the user's health data
             health_weight_utils.calculate_bmi_all_user_entries(user_id, db)
 
+        if heart_rate_before != (db_user.max_heart_rate, db_user.birthdate):
+            # Update the HR zones of the user's activities
+            activity_streams_crud.edit_user_hr_zone_percentages(user_id, db)
+
         if db_user.photo_path is None:
             # Delete the user photo in the filesystem
             users_utils.delete_user_photo_filesystem(db_user.id)
@@ -470,6 +487,9 @@ def approve_user(user_id: int, db: Session):
 
         # Commit the transaction
         db.commit()
+
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
     except HTTPException as http_err:
         raise http_err
     except Exception as err:
@@ -549,6 +569,9 @@ def verify_user_email(
 
         # Commit the transaction
         db.commit()
+
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
     except HTTPException as http_err:
         raise http_err
     except Exception as err:
@@ -588,6 +611,9 @@ def edit_user_password(
 
         # Commit the transaction
         db.commit()
+
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
     except Exception as err:
         # Rollback the transaction
         db.rollback()
@@ -617,6 +643,9 @@ def edit_user_photo_path(user_id: int, photo_path: str, db: Session):
         # Commit the transaction
         db.commit()
 
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
+
         # Return the photo path
         return photo_path
     except Exception as err:
@@ -648,6 +677,9 @@ def delete_user_photo(user_id: int, db: Session):
         # Commit the transaction
         db.commit()
 
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
+
         # Delete the user photo in the filesystem
         users_utils.delete_user_photo_filesystem(user_id)
     except Exception as err:
@@ -681,6 +713,9 @@ def delete_user(user_id: int, db: Session):
         # Commit the transaction
         db.commit()
 
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
+
         # Delete the user photo in the filesystem
         users_utils.delete_user_photo_filesystem(user_id)
     except HTTPException as http_err:
@@ -748,6 +783,9 @@ def enable_user_mfa(user_id: int, encrypted_secret: str, db: Session):
         db_user.mfa_enabled = True
         db_user.mfa_secret = encrypted_secret
         db.commit()
+
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
         db.refresh(db_user)
     except Exception as err:
         db.rollback()
@@ -794,6 +832,9 @@ def disable_user_mfa(user_id: int, db: Session):
         db_user.mfa_enabled = False
         db_user.mfa_secret = None
         db.commit()
+
+        # Drop the cached user on every worker
+        USERS_CACHE.invalidate(user_id)
         db.refresh(db_user)
     except Exception as err:
         db.rollback()
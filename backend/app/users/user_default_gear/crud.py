@@ -4,9 +4,19 @@ from sqlalchemy.orm import Session
 import users.user_default_gear.models as user_default_gear_models
 import users.user_default_gear.schema as user_default_gear_schema
 
+import core.cache as core_cache
 import core.logger as core_logger
 
+# Read for every parsed activity file and synced activity
+USER_DEFAULT_GEAR_CACHE = core_cache.TTLCache(
+    "user_default_gear",
+    max_size=1024,
+    ttl_seconds=300,
+    copy=core_cache.detached_copy,
+)
 
+
+@core_cache.cached(USER_DEFAULT_GEAR_CACHE, key=lambda user_id, db: user_id)
 def get_user_default_gear_by_user_id(user_id: int, db: Session):
     try:
         # Get the user default gear by the user id
@@ -71,7 +81,9 @@ def create_user_default_gear(user_id: int, db: Session):
 
 
 def edit_user_default_gear(
-    user_default_gear: user_default_gear_schema.UserDefaultGear, user_id: int, db: Session
+    user_default_gear: user_default_gear_schema.UserDefaultGear,
+    user_id: int,
+    db: Session,
 ):
     try:
         # Get the user default gear from the database
@@ -99,6 +111,9 @@ def edit_user_default_gear(
         # Commit the transaction
         db.commit()
 
+        # Drop the cached user default gear on every worker
+        USER_DEFAULT_GEAR_CACHE.invalidate(user_id)
+
         return db_user_default_gear
     except HTTPException as http_err:
         raise http_err
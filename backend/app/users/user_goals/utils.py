@@ -9,7 +9,7 @@ import users.user_goals.schema as user_goals_schema
 import users.user_goals.models as user_goals_models
 import users.user_goals.crud as user_goals_crud
 
-import activities.activity.crud as activity_crud
+import activities.activity_summaries.crud as activity_summaries_crud
 import core.logger as core_logger
 
 
@@ -65,14 +65,13 @@ def calculate_goal_progress_by_activity_type(
     Calculates the progress of a user's goal for a specific activity type within a given time interval.
     This function determines the progress of a goal (calories, distance, elevation, duration, or number of activities)
     based on the user's activities of a specified type (run, bike, swim, walk) within the interval defined by the goal.
-    It fetches relevant activities from the database, aggregates the required metrics, and computes the percentage
-    completion of the goal.
+    It reads the required metrics from the daily activity rollup and computes the percentage completion of the goal.
     Args:
         goal (user_goals_models.UserGoal): The user goal object containing goal details and parameters.
         date (str): The reference date (in 'YYYY-MM-DD' format) to determine the interval for progress calculation.
-        db (Session): The SQLAlchemy database session used for querying activities.
+        db (Session): The SQLAlchemy database session used for querying the activity rollup.
     Returns:
-        user_goals_schema.UserGoalProgress | None: An object containing progress details for the goal, or None if no activities are found.
+        user_goals_schema.UserGoalProgress | None: An object containing progress details for the goal.
     Raises:
         HTTPException: If an error occurs during processing or database access.
     """
@@ -92,9 +91,9 @@ def calculate_goal_progress_by_activity_type(
         # Get activity types based on goal.activity_type, default to [10, 19]
         activity_types = TYPE_MAP.get(goal.activity_type, DEFAULT_TYPES)
 
-        # Fetch all activities in a single query
-        activities = activity_crud.get_user_activities_per_timeframe_and_activity_types(
-            goal.user_id, activity_types, start_date, end_date, db, True
+        # Sum the goal metrics from the daily activity rollup
+        totals = activity_summaries_crud.get_user_activity_totals(
+            db, goal.user_id, activity_types, start_date.date(), end_date.date()
         )
 
         # Calculate totals based on goal type
@@ -105,25 +104,21 @@ def calculate_goal_progress_by_activity_type(
         total_elevation = 0
         total_duration = 0
 
-        if activities:
+        if totals.activity_count:
             if goal.goal_type == user_goals_schema.GoalType.CALORIES:
-                total_calories = sum(activity.calories or 0 for activity in activities)
+                total_calories = totals.total_calories
                 percentage_completed = (total_calories / goal.goal_calories) * 100
             elif goal.goal_type == user_goals_schema.GoalType.DISTANCE:
-                total_distance = sum(activity.distance or 0 for activity in activities)
+                total_distance = totals.total_distance
                 percentage_completed = (total_distance / goal.goal_distance) * 100
             elif goal.goal_type == user_goals_schema.GoalType.ELEVATION:
-                total_elevation = sum(
-                    activity.elevation_gain or 0 for activity in activities
-                )
+                total_elevation = totals.total_elevation_gain
                 percentage_completed = (total_elevation / goal.goal_elevation) * 100
             elif goal.goal_type == user_goals_schema.GoalType.DURATION:
-                total_duration = sum(
-                    activity.total_elapsed_time or 0 for activity in activities
-                )
+                total_duration = totals.total_elapsed_time
                 percentage_completed = (total_duration / goal.goal_duration) * 100
             elif goal.goal_type == user_goals_schema.GoalType.ACTIVITIES:
-                total_activities_number = len(activities)
+                total_activities_number = totals.activity_count
                 percentage_completed = (
                     total_activities_number / goal.goal_activities_number
                 ) * 100
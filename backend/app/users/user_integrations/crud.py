@@ -357,6 +357,73 @@ def set_user_garminconnect_sync_gear(
         ) from err
 
 
+def get_garminconnect_linked_user_integrations(db: Session):
+    try:
+        # Get the user integrations with Garmin Connect tokens, JSON nulls
+        # are filtered out after the query
+        users_integrations = (
+            db.query(user_integrations_models.UsersIntegrations)
+            .filter(
+                user_integrations_models.UsersIntegrations.garminconnect_oauth1.isnot(
+                    None
+                )
+            )
+            .all()
+        )
+
+        # Return the linked user integrations
+        return [
+            user_integrations
+            for user_integrations in users_integrations
+            if user_integrations.garminconnect_oauth1
+            and user_integrations.garminconnect_oauth2
+        ]
+    except Exception as err:
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in get_garminconnect_linked_user_integrations: {err}",
+            "error",
+            exc=err,
+        )
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
+def set_user_garminconnect_activities_synced_at(
+    user_id: int, synced_at: datetime, db: Session
+):
+    try:
+        # Get the user integrations by the user id
+        user_integrations = get_user_integrations_by_user_id(user_id, db)
+
+        # Set the user Garmin Connect activities sync watermark
+        user_integrations.garminconnect_activities_synced_at = synced_at
+
+        # Commit the changes to the database
+        db.commit()
+    except HTTPException as http_err:
+        raise http_err
+    except Exception as err:
+        # Rollback the transaction
+        db.rollback()
+
+        # Log the exception
+        core_logger.print_to_log(
+            f"Error in set_user_garminconnect_activities_synced_at: {err}",
+            "error",
+            exc=err,
+        )
+
+        # Raise an HTTPException with a 500 Internal Server Error status code
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from err
+
+
 def unlink_garminconnect_account(user_id: int, db: Session):
     try:
         # Get the user integrations by the user id
@@ -374,6 +441,7 @@ def unlink_garminconnect_account(user_id: int, db: Session):
         user_integrations.garminconnect_oauth1 = None
         user_integrations.garminconnect_oauth2 = None
         user_integrations.garminconnect_sync_gear = False
+        user_integrations.garminconnect_activities_synced_at = None
 
         # Commit the changes to the database
         db.commit()
@@ -67,6 +67,12 @@ class UsersIntegrations(Base):
         default=False,
         comment="Whether Garmin Connect gear is to be synced",
     )
+    garminconnect_activities_synced_at = Column(
+        DateTime,
+        default=None,
+        nullable=True,
+        comment="Date of the last successful Garmin Connect activities sync",
+    )
 
     # Define a relationship to the User model
     user = relationship("User", back_populates="users_integrations")
@@ -4,9 +4,19 @@ from sqlalchemy.orm import Session
 import users.user_privacy_settings.schema as user_privacy_settings_schema
 import users.user_privacy_settings.models as user_privacy_settings_models
 
+import core.cache as core_cache
 import core.logger as core_logger
 
+# Read on every activity upload and sync
+USER_PRIVACY_SETTINGS_CACHE = core_cache.TTLCache(
+    "user_privacy_settings",
+    max_size=1024,
+    ttl_seconds=300,
+    copy=core_cache.detached_copy,
+)
 
+
+@core_cache.cached(USER_PRIVACY_SETTINGS_CACHE, key=lambda user_id, db: user_id)
 def get_user_privacy_settings_by_user_id(user_id: int, db: Session):
     try:
         # Get the user privacy settings by the user id
@@ -91,8 +101,21 @@ def edit_user_privacy_settings(
     db: Session,
 ):
     try:
-        # Get the user privacy settings by the user id
-        db_user_privacy_settings = get_user_privacy_settings_by_user_id(user_id, db)
+        # Get the user privacy settings by the user id, not from the cache as
+        # they are updated in this session
+        db_user_privacy_settings = (
+            db.query(user_privacy_settings_models.UsersPrivacySettings)
+            .filter(
+                user_privacy_settings_models.UsersPrivacySettings.user_id == user_id
+            )
+            .first()
+        )
+
+        if db_user_privacy_settings is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User privacy settings not found",
+            )
 
         # Dictionary of the fields to update if they are not None
         user_privacy_settings_data = user_privacy_settings_data.model_dump(
@@ -106,6 +129,9 @@ def edit_user_privacy_settings(
         db.commit()
         db.refresh(db_user_privacy_settings)
 
+        # Drop the cached user privacy settings on every worker
+        USER_PRIVACY_SETTINGS_CACHE.invalidate(user_id)
+
         # Return the updated user privacy settings
         return db_user_privacy_settings
     except HTTPException:
@@ -0,0 +1,187 @@
+"""
+Pub/sub backends delivering WebSocket messages across backend workers.
+
+Any worker can publish a message for a user; the worker holding the user's
+socket delivers it. PostgresPubSub relays messages with LISTEN/NOTIFY on a
+dedicated connection. InProcessPubSub delivers them within the process and is
+used with a single worker or when Postgres LISTEN is unavailable.
+"""
+
+import asyncio
+import json
+from collections.abc import Awaitable, Callable
+
+import psycopg
+from psycopg import sql
+
+import core.database as core_database
+import core.logger as core_logger
+
+# NOTIFY channel shared by every worker
+CHANNEL = "endurain_websocket"
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7999
+
+# Seconds to wait before reconnecting a lost LISTEN connection
+RECONNECT_DELAY_SECONDS = 5
+
+# Delivers a message to the sockets of a user held by this worker
+MessageHandler = Callable[[int, dict], Awaitable[None]]
+
+
+def get_database_conninfo() -> str:
+    """
+    Build the psycopg connection string of the application database.
+
+    Returns:
+        Connection URL using the SQLAlchemy engine settings.
+    """
+    return core_database.db_url.set(drivername="postgresql").render_as_string(
+        hide_password=False
+    )
+
+
+class InProcessPubSub:
+    """
+    Deliver published messages to the sockets of the current process only.
+
+    Attributes:
+        distributed: Whether messages reach other workers.
+    """
+
+    distributed = False
+
+    def __init__(self, handler: MessageHandler):
+        self.handler = handler
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def publish(self, user_id: int, message: dict) -> None:
+        await self.handler(user_id, message)
+
+
+class PostgresPubSub:
+    """
+    Relay published messages to every worker with Postgres LISTEN/NOTIFY.
+
+    Attributes:
+        distributed: Whether messages reach other workers.
+    """
+
+    distributed = True
+
+    def __init__(
+        self,
+        handler: MessageHandler,
+        conninfo: str,
+        channel: str = CHANNEL,
+        connect=psycopg.AsyncConnection.connect,
+    ):
+        self.handler = handler
+        self._conninfo = conninfo
+        self._channel = channel
+        self._connect = connect
+        self._listen_connection = None
+        self._publish_connection = None
+        self._listener: asyncio.Task | None = None
+
+    async def _open_listen_connection(self):
+        connection = await self._connect(self._conninfo, autocommit=True)
+        await connection.execute(
+            sql.SQL("LISTEN {}").format(sql.Identifier(self._channel))
+        )
+        return connection
+
+    async def start(self) -> None:
+        """
+        Start listening for messages.
+
+        Raises:
+            Exception: If the LISTEN connection could not be opened.
+        """
+        self._listen_connection = await self._open_listen_connection()
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+        for connection in (self._listen_connection, self._publish_connection):
+            if connection is not None:
+                await connection.close()
+        self._listen_connection = None
+        self._publish_connection = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                if self._listen_connection is None:
+                    self._listen_connection = await self._open_listen_connection()
+                async for notify in self._listen_connection.notifies():
+                    await self._dispatch(notify.payload)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                core_logger.print_to_log(
+                    f"WebSocket LISTEN connection lost, reconnecting: {err}",
+                    "warning",
+                    exc=err,
+                )
+                if self._listen_connection is not None:
+                    await self._listen_connection.close()
+                    self._listen_connection = None
+                await asyncio.sleep(RECONNECT_DELAY_SECONDS)
+
+    async def _dispatch(self, payload: str) -> None:
+        try:
+            data = json.loads(payload)
+            await self.handler(data["user_id"], data["message"])
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error delivering WebSocket message {payload[:200]}: {err}",
+                "error",
+                exc=err,
+            )
+
+    async def publish(self, user_id: int, message: dict) -> None:
+        """
+        Publish a message for the worker holding the user's sockets.
+
+        Messages too large for NOTIFY are delivered to this worker only.
+
+        Args:
+            user_id: ID of the user to notify.
+            message: JSON-serializable message.
+
+        Raises:
+            Exception: If the message could not be published.
+        """
+        payload = json.dumps({"user_id": user_id, "message": message}, default=str)
+        if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+            core_logger.print_to_log(
+                f"WebSocket message for user {user_id} too large for NOTIFY, delivering locally",
+                "warning",
+            )
+            await self.handler(user_id, message)
+            return
+
+        try:
+            if self._publish_connection is None or self._publish_connection.closed:
+                self._publish_connection = await self._connect(
+                    self._conninfo, autocommit=True
+                )
+            await self._publish_connection.execute(
+                "SELECT pg_notify(%s, %s)", (self._channel, payload)
+            )
+        except Exception:
+            self._publish_connection = None
+            raise
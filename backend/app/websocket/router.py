@@ -2,6 +2,7 @@ from typing import Annotated
 
 from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
 import websocket.schema as websocket_schema
+import websocket.utils as websocket_utils
 
 # Define the API router
 router = APIRouter()
@@ -20,9 +21,10 @@ async def websocket_endpoint(
     await websocket_manager.connect(user_id, websocket)
 
     try:
-        while True:
-            # Handle incoming messages if necessary (currently just keeping connection alive)
-            data = await websocket.receive_json()
+        # Ping the client and close the connection once it stops answering
+        await websocket_utils.keep_alive(websocket)
     except WebSocketDisconnect:
-        # Disconnect using the manager
-        websocket_manager.disconnect(user_id)
+        pass
+    finally:
+        # Disconnect this socket using the manager, other tabs stay connected
+        websocket_manager.disconnect(user_id, websocket)
@@ -1,30 +1,170 @@
-from fastapi import WebSocket
+import asyncio
+from contextlib import suppress
+
+from fastapi import WebSocket, status
 from typing import Dict
 
+import websocket.pubsub as websocket_pubsub
+
+import core.config as core_config
+import core.logger as core_logger
+
+# Seconds a send may take before the socket is dropped as a slow consumer
+SEND_TIMEOUT_SECONDS = 5
+
+# Seconds to wait for a dropped socket to close
+CLOSE_TIMEOUT_SECONDS = 1
+
 
 class WebSocketManager:
     def __init__(self):
-        self.active_connections: Dict[int, WebSocket] = {}
+        self.active_connections: Dict[int, set[WebSocket]] = {}
+        self.pubsub = websocket_pubsub.InProcessPubSub(self.deliver)
+        # Event loop owning the sockets and the pub/sub connections
+        self.loop: asyncio.AbstractEventLoop | None = None
+
+    async def start(self):
+        """
+        Start the pub/sub backend selected by WEBSOCKET_PUBSUB_BACKEND.
+
+        Falls back to in-process delivery if Postgres LISTEN is unavailable.
+        """
+        self.loop = asyncio.get_running_loop()
+        if core_config.WEBSOCKET_PUBSUB_BACKEND != "postgres":
+            return
+
+        pubsub = websocket_pubsub.PostgresPubSub(
+            self.deliver, websocket_pubsub.get_database_conninfo()
+        )
+        try:
+            await pubsub.start()
+        except Exception as err:
+            core_logger.print_to_log_and_console(
+                f"Unable to start Postgres WebSocket pub/sub, messages only reach sockets of this worker: {err}",
+                "warning",
+            )
+            return
+        self.pubsub = pubsub
+
+    async def stop(self):
+        await self.pubsub.stop()
 
     async def connect(self, user_id: int, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections[user_id] = websocket
+        self.active_connections.setdefault(user_id, set()).add(websocket)
+
+    def disconnect(self, user_id: int, websocket: WebSocket | None = None):
+        """
+        Forget a socket of a user, or every socket of the user if None.
+        """
+        if websocket is None:
+            self.active_connections.pop(user_id, None)
+            return
+
+        websockets = self.active_connections.get(user_id)
+        if websockets is not None:
+            websockets.discard(websocket)
+            if not websockets:
+                del self.active_connections[user_id]
+
+    async def deliver(self, user_id: int, message: dict):
+        """
+        Send a message to the user's sockets held by this worker.
+        """
+        await self.send_message(user_id, message)
+
+    async def publish(self, user_id: int, message: dict):
+        """
+        Send a message to the user's sockets, whichever worker holds them.
+
+        If the message cannot be published it is delivered to this worker only.
+        Messages published from another event loop, e.g. a bulk import thread,
+        are handed to the loop owning the sockets and pub/sub connections.
+        """
+        if (
+            self.loop is not None
+            and self.loop.is_running()
+            and self.loop is not asyncio.get_running_loop()
+        ):
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(
+                    self.publish(user_id, message), self.loop
+                )
+            )
+            return
+
+        try:
+            await self.pubsub.publish(user_id, message)
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Error publishing WebSocket message for user {user_id}, delivering locally: {err}",
+                "error",
+                exc=err,
+            )
+            await self.deliver(user_id, message)
+
+    def is_reachable(self, user_id: int) -> bool:
+        """
+        Check whether a user may have a socket connected to any worker.
+
+        Workers do not share their connections, so with a distributed backend
+        users without a local socket are assumed to be connected elsewhere.
+        """
+        return user_id in self.active_connections or self.pubsub.distributed
+
+    async def _send(self, user_id: int, websocket: WebSocket, message: dict) -> bool:
+        """
+        Send a message to a socket, dropping it if it is dead or too slow.
+
+        Returns:
+            Whether the message was sent.
+        """
+        try:
+            await asyncio.wait_for(websocket.send_json(message), SEND_TIMEOUT_SECONDS)
+            return True
+        except Exception as err:
+            core_logger.print_to_log(
+                f"Dropping WebSocket of user {user_id} after failed send: {err!r}",
+                "warning",
+            )
+            self.disconnect(user_id, websocket)
+            with suppress(Exception):
+                await asyncio.wait_for(
+                    websocket.close(code=status.WS_1013_TRY_AGAIN_LATER),
+                    CLOSE_TIMEOUT_SECONDS,
+                )
+            return False
+
+    async def send_message(self, user_id: int, message: dict) -> int:
+        """
+        Send a message concurrently to every socket of a user held by this worker.
 
-    def disconnect(self, user_id: int):
-        if user_id in self.active_connections:
-            del self.active_connections[user_id]
+        Returns:
+            Number of sockets the message was sent to.
+        """
+        websockets = list(self.active_connections.get(user_id, ()))
+        results = await asyncio.gather(
+            *(self._send(user_id, websocket, message) for websocket in websockets)
+        )
+        return sum(results)
 
-    async def send_message(self, user_id: int, message: str):
-        if user_id in self.active_connections:
-            websocket = self.active_connections[user_id]
-            await websocket.send_json(message)
+    async def broadcast(self, message: dict) -> int:
+        """
+        Send a message concurrently to every socket held by this worker.
 
-    async def broadcast(self, message: str):
-        for websocket in self.active_connections.values():
-            await websocket.send_json(message)
+        Returns:
+            Number of sockets the message was sent to.
+        """
+        sends = [
+            self._send(user_id, websocket, message)
+            for user_id, websockets in list(self.active_connections.items())
+            for websocket in list(websockets)
+        ]
+        results = await asyncio.gather(*sends)
+        return sum(results)
 
-    def get_connection(self, user_id: int) -> WebSocket | None:
-        return self.active_connections.get(user_id)
+    def get_connections(self, user_id: int) -> set[WebSocket]:
+        return set(self.active_connections.get(user_id, ()))
 
 
 def get_websocket_manager():
@@ -1,13 +1,25 @@
-from fastapi import HTTPException, status
+import asyncio
+
+from fastapi import HTTPException, WebSocket, status
+from starlette.websockets import WebSocketState
 
 import websocket.schema as websocket_schema
 
+# Seconds without a client message before the server sends a ping
+PING_INTERVAL_SECONDS = 30
+
+# Seconds the client has to answer a ping before the socket is closed
+PONG_TIMEOUT_SECONDS = 10
+
 
 async def notify_frontend(
     user_id: int, websocket_manager: websocket_schema.WebSocketManager, json_data: dict
 ):
     """
-    Sends a JSON message to the frontend via an active WebSocket connection for a specific user.
+    Sends a JSON message to the frontend via the WebSocket connection of a specific user.
+
+    The message is published to every backend worker and delivered by the worker
+    holding the user's connection.
 
     Args:
         user_id (int): The ID of the user to notify.
@@ -15,16 +27,61 @@ async def notify_frontend(
         json_data (dict): The JSON-serializable data to send to the frontend.
 
     Raises:
-        HTTPException: If there is no active WebSocket connection for the specified user.
+        HTTPException: If an MFA request is sent while the user has no active WebSocket connection.
     """
     # Check if the user has an active WebSocket connection
-
-    websocket = websocket_manager.get_connection(user_id)
-    if websocket:
-        await websocket.send_json(json_data)
-    else:
+    if not websocket_manager.is_reachable(user_id):
         if json_data.get("message") == "MFA_REQUIRED":
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"No active WebSocket connection for user {user_id}",
             )
+        return
+
+    await websocket_manager.publish(user_id, json_data)
+
+
+async def keep_alive(
+    websocket: WebSocket,
+    ping_interval: float = PING_INTERVAL_SECONDS,
+    pong_timeout: float = PONG_TIMEOUT_SECONDS,
+):
+    """
+    Keep a WebSocket connection alive with an application-level ping/pong.
+
+    The server sends {"message": "PING"} after ping_interval seconds without
+    a client message, and closes the connection if nothing arrives within
+    pong_timeout seconds. Any client message counts as a pong, and client
+    pings are answered with {"message": "PONG"}.
+
+    Args:
+        websocket (WebSocket): The accepted WebSocket connection.
+        ping_interval (float): Seconds of silence before pinging the client.
+        pong_timeout (float): Seconds to wait for the client after a ping.
+
+    Raises:
+        WebSocketDisconnect: When the client disconnects.
+    """
+    awaiting_pong = False
+    # The manager closes sockets it drops as slow consumers
+    while websocket.application_state == WebSocketState.CONNECTED:
+        try:
+            data = await asyncio.wait_for(
+                websocket.receive_json(),
+                pong_timeout if awaiting_pong else ping_interval,
+            )
+        except asyncio.TimeoutError:
+            if awaiting_pong:
+                # The client stopped answering, free the connection
+                await websocket.close(code=status.WS_1001_GOING_AWAY)
+                return
+            await websocket.send_json({"message": "PING"})
+            awaiting_pong = True
+            continue
+        except (ValueError, KeyError):
+            # Ignore messages that are not JSON text, the client is alive
+            data = None
+
+        awaiting_pong = False
+        if isinstance(data, dict) and data.get("message") == "PING":
+            await websocket.send_json({"message": "PONG"})
@@ -0,0 +1,353 @@
+import gzip
+import os
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import fitdecode
+import pytest
+from fastapi import HTTPException
+
+import activities.activity.bulk_import_service as bulk_import_service
+
+GPX_FILE = """<?xml version="1.0" encoding="UTF-8"?>
+<gpx version="1.1" xmlns="http://www.topografix.com/GPX/1/1">
+  <metadata><name>Morning Ride</name></metadata>
+  <trk><trkseg>
+    <trkpt lat="38.7223" lon="-9.1393"><time>2024-01-01T08:00:00Z</time></trkpt>
+    <trkpt lat="38.7300" lon="-9.1400"><time>2024-01-01T08:00:10Z</time></trkpt>
+  </trkseg></trk>
+</gpx>
+"""
+
+TCX_FILE = """<?xml version="1.0" encoding="UTF-8"?>
+<TrainingCenterDatabase xmlns="http://www.garmin.com/xmlschemas/TrainingCenterDatabase/v2">
+  <Activities><Activity Sport="Running"><Lap><Track>
+    <Trackpoint><Time>2024-01-01T08:00:00Z</Time></Trackpoint>
+    <Trackpoint>
+      <Time>2024-01-01T08:00:01Z</Time>
+      <Position>
+        <LatitudeDegrees>41.1579</LatitudeDegrees>
+        <LongitudeDegrees>-8.6291</LongitudeDegrees>
+      </Position>
+    </Trackpoint>
+  </Track></Lap></Activity></Activities>
+</TrainingCenterDatabase>
+"""
+
+
+class TestReadStartCoordinates:
+    """
+    Test suite for read_start_coordinates function.
+    """
+
+    def test_gpx_first_track_point(self, tmp_path):
+        """
+        Test that the first GPX track point is read.
+        """
+        # Arrange
+        file_path = tmp_path / "ride.gpx"
+        file_path.write_text(GPX_FILE)
+
+        # Act
+        result = bulk_import_service.read_start_coordinates(str(file_path))
+
+        # Assert
+        assert result == (38.7223, -9.1393)
+
+    def test_gzipped_tcx_first_position(self, tmp_path):
+        """
+        Test that gzipped files are read, skipping track points without position.
+        """
+        # Arrange
+        file_path = tmp_path / "run.tcx.gz"
+        with gzip.open(file_path, "wt") as file:
+            file.write(TCX_FILE)
+
+        # Act
+        result = bulk_import_service.read_start_coordinates(str(file_path))
+
+        # Assert
+        assert result == (41.1579, -8.6291)
+
+    def test_fit_first_record_position(self, tmp_path):
+        """
+        Test that the first FIT record position is converted to degrees.
+        """
+        # Arrange
+        file_path = tmp_path / "ride.fit"
+        file_path.write_bytes(b"")
+        values = {"position_lat": 2**30, "position_long": -(2**29)}
+        record = MagicMock(spec=fitdecode.FitDataMessage)
+        record.name = "record"
+        record.get_value.side_effect = lambda field, fallback: values[field]
+        reader = MagicMock()
+        reader.__enter__.return_value = [record]
+
+        # Act
+        with patch.object(
+            bulk_import_service.fitdecode, "FitReader", return_value=reader
+        ):
+            result = bulk_import_service.read_start_coordinates(str(file_path))
+
+        # Assert
+        assert result == (90.0, -45.0)
+
+    def test_unreadable_or_unsupported_files(self, tmp_path):
+        """
+        Test that files without a readable position return None.
+        """
+        # Arrange
+        broken = tmp_path / "broken.gpx"
+        broken.write_text("<gpx>")
+        unsupported = tmp_path / "notes.txt"
+        unsupported.write_text("text")
+
+        # Act & Assert
+        assert bulk_import_service.read_start_coordinates(str(broken)) is None
+        assert bulk_import_service.read_start_coordinates(str(unsupported)) is None
+        assert (
+            bulk_import_service.read_start_coordinates(str(tmp_path / "missing.gpx"))
+            is None
+        )
+
+
+class TestPrefillImportLocations:
+    """
+    Test suite for prefill_import_locations function.
+    """
+
+    def test_start_coordinates_prefilled_at_once(self, tmp_path):
+        """
+        Test that the start coordinates of every file are prefilled in one call.
+        """
+        # Arrange
+        gpx_path = tmp_path / "ride.gpx"
+        gpx_path.write_text(GPX_FILE)
+        txt_path = tmp_path / "notes.txt"
+        txt_path.write_text("text")
+
+        # Act
+        with patch.object(
+            bulk_import_service.geocoding_utils,
+            "prefill_location_cache",
+            return_value=1,
+        ) as mock_prefill, patch.object(
+            bulk_import_service.core_logger, "print_to_log"
+        ):
+            bulk_import_service.prefill_import_locations([str(gpx_path), str(txt_path)])
+
+        # Assert
+        mock_prefill.assert_called_once_with(
+            [(38.7223, -9.1393)], bulk_import_service.LOCATION_PREFILL_MAX_SECONDS
+        )
+
+    def test_prefill_errors_do_not_stop_the_import(self, tmp_path):
+        """
+        Test that prefill errors are logged and not raised.
+        """
+        # Arrange
+        gpx_path = tmp_path / "ride.gpx"
+        gpx_path.write_text(GPX_FILE)
+
+        # Act
+        with patch.object(
+            bulk_import_service.geocoding_utils,
+            "prefill_location_cache",
+            side_effect=Exception("Provider error"),
+        ), patch.object(bulk_import_service.core_logger, "print_to_log") as mock_log:
+            bulk_import_service.prefill_import_locations([str(gpx_path)])
+
+        # Assert
+        assert mock_log.call_args.args[1] == "warning"
+
+
+def thread_pool(max_workers, mp_context, initializer, initargs):
+    """
+    Runs the parser in threads of the test process, where it is stubbed.
+    """
+    return ThreadPoolExecutor(max_workers=max_workers)
+
+
+def parse_stub(user_id, file_path):
+    """
+    Parses every file into one activity, except the broken and empty ones.
+    """
+    if "broken" in file_path:
+        raise RuntimeError("Invalid file")
+    if "empty" in file_path:
+        return None
+    return file_path, ".gpx", [{"name": os.path.basename(file_path)}]
+
+
+async def store_stub(parsed_activities, file_path, file_extension, manager, db):
+    """
+    Stores every parsed file as one activity, except the unstorable ones.
+    """
+    if "unstorable" in file_path:
+        raise HTTPException(status_code=500, detail="Database error")
+    return [MagicMock(id=len(file_path))]
+
+
+@pytest.fixture
+def bulk_import_dir(tmp_path, monkeypatch):
+    """
+    Points the bulk import directories to a temporary directory.
+    """
+    import_dir = tmp_path / "bulk_import"
+    import_dir.mkdir()
+    monkeypatch.setattr(
+        bulk_import_service.core_config, "FILES_BULK_IMPORT_DIR", str(import_dir)
+    )
+    monkeypatch.setattr(
+        bulk_import_service.core_config,
+        "FILES_BULK_IMPORT_IMPORT_ERRORS_DIR",
+        str(import_dir / "import_errors"),
+    )
+    monkeypatch.setattr(bulk_import_service.core_config, "BULK_IMPORT_WORKERS", 1)
+    return import_dir
+
+
+def run_import(import_dir, file_names: list[str]) -> list[dict]:
+    """
+    Import files with the stubbed parser and storage.
+
+    Returns:
+        The WebSocket messages sent to the user.
+    """
+    file_paths = []
+    for file_name in file_names:
+        (import_dir / file_name).write_text(GPX_FILE)
+        file_paths.append(str(import_dir / file_name))
+    messages = []
+
+    with patch.object(
+        bulk_import_service, "ProcessPoolExecutor", thread_pool
+    ), patch.object(
+        bulk_import_service, "parse_file_in_process", parse_stub
+    ), patch.object(
+        bulk_import_service, "prefill_import_locations"
+    ), patch.object(
+        bulk_import_service.core_database, "SessionLocal"
+    ), patch.object(
+        bulk_import_service.activities_utils,
+        "store_parsed_activities",
+        side_effect=store_stub,
+    ), patch.object(
+        bulk_import_service,
+        "_notify_progress",
+        side_effect=lambda user_id, manager, loop, json_data: messages.append(
+            json_data
+        ),
+    ), patch.object(
+        bulk_import_service.core_logger, "print_to_log"
+    ), patch.object(
+        bulk_import_service.core_logger, "print_to_log_and_console"
+    ):
+        bulk_import_service.import_files(1, file_paths, MagicMock())
+
+    return messages
+
+
+class TestImportFiles:
+    """
+    Test suite for import_files function.
+    """
+
+    def test_files_are_stored_in_batches(self, bulk_import_dir, monkeypatch):
+        """
+        Test that parsed files are stored BULK_IMPORT_WRITE_BATCH_SIZE at a time.
+        """
+        # Arrange
+        monkeypatch.setattr(
+            bulk_import_service.core_config, "BULK_IMPORT_WRITE_BATCH_SIZE", 2
+        )
+        batch_sizes = []
+        store_batch = bulk_import_service._BulkImportWriter._store_batch
+
+        async def recording_store_batch(writer, pending):
+            batch_sizes.append(len(pending))
+            await store_batch(writer, pending)
+
+        # Act
+        with patch.object(
+            bulk_import_service._BulkImportWriter,
+            "_store_batch",
+            recording_store_batch,
+        ):
+            messages = run_import(
+                bulk_import_dir, [f"ride_{index}.gpx" for index in range(5)]
+            )
+
+        # Assert
+        assert batch_sizes == [2, 2, 1]
+        assert [message["status"] for message in messages[:-1]] == ["processed"] * 5
+        assert all(message["activity_ids"] for message in messages[:-1])
+        assert messages[-1] == {
+            "message": bulk_import_service.BULK_IMPORT_COMPLETED_MESSAGE,
+            "processed": 5,
+            "failed": 0,
+            "failed_files": [],
+            "skipped": 0,
+            "skipped_files": [],
+            "total": 5,
+        }
+
+    def test_failed_and_skipped_files(self, bulk_import_dir):
+        """
+        Test that failed files are moved to import_errors and empty ones skipped.
+        """
+        # Act
+        messages = run_import(
+            bulk_import_dir,
+            ["ride.gpx", "broken.gpx", "empty.gpx", "unstorable.gpx"],
+        )
+
+        # Assert
+        statuses = {
+            message["file"]: (message["status"], message["error"])
+            for message in messages[:-1]
+        }
+        assert statuses == {
+            "ride.gpx": ("processed", None),
+            "broken.gpx": ("failed", "Invalid file"),
+            "empty.gpx": ("skipped", None),
+            "unstorable.gpx": ("failed", "Database error"),
+        }
+        completed = messages[-1]
+        assert (completed["processed"], completed["failed"], completed["skipped"]) == (
+            1,
+            2,
+            1,
+        )
+        assert sorted(completed["failed_files"]) == ["broken.gpx", "unstorable.gpx"]
+        assert completed["skipped_files"] == ["empty.gpx"]
+        assert sorted(os.listdir(bulk_import_dir / "import_errors")) == [
+            "broken.gpx",
+            "unstorable.gpx",
+        ]
+        assert (bulk_import_dir / "empty.gpx").exists()
+
+
+class TestGetImportErrorFiles:
+    """
+    Test suite for get_import_error_files function.
+    """
+
+    def test_failed_files_are_moved_back_for_retry(self, bulk_import_dir):
+        """
+        Test that the requested failed files are moved back to bulk_import.
+        """
+        # Arrange
+        errors_dir = bulk_import_dir / "import_errors"
+        errors_dir.mkdir()
+        for file_name in ("broken.gpx", "unstorable.gpx"):
+            (errors_dir / file_name).write_text(GPX_FILE)
+
+        # Act
+        with patch.object(bulk_import_service.core_logger, "print_to_log_and_console"):
+            retry_files = bulk_import_service.get_import_error_files(["broken.gpx"])
+
+        # Assert
+        assert retry_files == [str(bulk_import_dir / "broken.gpx")]
+        assert (bulk_import_dir / "broken.gpx").exists()
+        assert os.listdir(errors_dir) == ["unstorable.gpx"]
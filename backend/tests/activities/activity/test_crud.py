@@ -0,0 +1,129 @@
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException, status
+from sqlalchemy.dialects import postgresql
+
+import activities.activity.crud as activities_crud
+
+
+class TestCreateActivity:
+    """
+    Test suite for create_activity function.
+    """
+
+    @pytest.fixture
+    def activity(self):
+        """
+        Creates a mock activity schema object.
+        """
+        return MagicMock(user_id=1, start_time=datetime(2024, 7, 1, 10), id=None)
+
+    async def test_activity_and_children_committed_once(self, mock_db, activity):
+        """
+        Test that the activity and its children are stored in one transaction.
+        """
+        # Arrange
+        db_activity = MagicMock(id=42, created_at=datetime(2024, 7, 1, 12))
+        children = [MagicMock(), MagicMock()]
+        build_children = MagicMock(return_value=children)
+        events = []
+        mock_db.commit.side_effect = lambda: events.append("commit")
+
+        async def notify(*args):
+            events.append("notification")
+
+        with patch.object(
+            activities_crud, "get_activity_by_start_time", return_value=None
+        ), patch.object(
+            activities_crud.activities_utils,
+            "transform_schema_activity_to_model_activity",
+            return_value=db_activity,
+        ), patch.object(
+            activities_crud.notifications_utils,
+            "create_new_activity_notification",
+            AsyncMock(side_effect=notify),
+        ) as mock_notification:
+            # Act
+            result = await activities_crud.create_activity(
+                activity, MagicMock(), mock_db, build_children=build_children
+            )
+
+        # Assert
+        assert result.id == 42
+        build_children.assert_called_once_with(42)
+        mock_db.bulk_save_objects.assert_called_once_with(children)
+        mock_db.commit.assert_called_once()
+        assert events == ["commit", "notification"]
+        assert mock_notification.call_args.args[3] is mock_db
+
+    async def test_rollback_when_children_fail(self, mock_db, activity):
+        """
+        Test that nothing is committed or notified if a child insert fails.
+        """
+        # Arrange
+        mock_db.bulk_save_objects.side_effect = Exception("Database error")
+
+        with patch.object(
+            activities_crud, "get_activity_by_start_time", return_value=None
+        ), patch.object(
+            activities_crud.activities_utils,
+            "transform_schema_activity_to_model_activity",
+            return_value=MagicMock(id=42),
+        ), patch.object(
+            activities_crud.notifications_utils,
+            "create_new_activity_notification",
+            AsyncMock(),
+        ) as mock_notification:
+            # Act & Assert
+            with pytest.raises(HTTPException) as exc_info:
+                await activities_crud.create_activity(
+                    activity,
+                    MagicMock(),
+                    mock_db,
+                    build_children=lambda activity_id: [MagicMock()],
+                )
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_db.commit.assert_not_called()
+        mock_db.rollback.assert_called_once()
+        mock_notification.assert_not_called()
+
+
+class TestStartDateFilters:
+    """
+    Test suite for start_date_filters function.
+    """
+
+    def test_filters_keep_start_time_unwrapped(self):
+        """
+        Test that the local date range is also expressed as a plain UTC range.
+        """
+        # Act
+        filters = activities_crud.start_date_filters(
+            date(2024, 7, 1), datetime(2024, 7, 31, 18, tzinfo=timezone.utc)
+        )
+
+        # Assert
+        compiled = [
+            condition.compile(
+                dialect=postgresql.dialect(),
+                compile_kwargs={"literal_binds": True},
+            )
+            for condition in filters
+        ]
+        sql = [str(condition) for condition in compiled]
+        assert sql[0] == "activities.start_time >= '2024-06-30 10:00:00'"
+        assert "timezone(coalesce(activities.timezone" in sql[1]
+        assert sql[1].endswith(">= '2024-07-01 00:00:00'")
+        assert sql[2] == "activities.start_time < '2024-08-01 12:00:00'"
+        assert sql[3].endswith("< '2024-08-01 00:00:00'")
+        assert not any("date(" in condition for condition in sql)
+
+    def test_no_dates_no_filters(self):
+        """
+        Test that no filters are returned without dates.
+        """
+        # Act & Assert
+        assert activities_crud.start_date_filters(None, None) == []
@@ -0,0 +1,337 @@
+"""
+Postgres regression tests for the hot activity list and summary queries: query
+plans, and activity dates in the activity timezone.
+
+They need a disposable Postgres database, given as a SQLAlchemy URL in
+TEST_POSTGRES_URL, and are skipped otherwise. The tables are created in a
+temporary schema dropped at the end.
+"""
+
+import os
+import uuid
+from datetime import date, datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+
+import activities.activity.crud as activities_crud
+import activities.activity.models as activities_models
+import activities.activity_summaries.crud as activity_summaries_crud
+import activities.activity_summaries.models as activity_summaries_models
+import activities.activity_summaries.utils as activity_summaries_utils
+import gears.gear.models as gears_models
+import users.user.models as users_models
+
+TEST_POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(
+    not TEST_POSTGRES_URL, reason="TEST_POSTGRES_URL is not set"
+)
+
+NUM_USERS = 20
+ACTIVITIES_PER_USER = 1500
+
+
+@pytest.fixture(scope="module")
+def postgres_db():
+    """
+    Creates the activities tables in a temporary schema, fills them and yields a session.
+    """
+    # Registers every model referenced by the activity relationships
+    import core.routes  # noqa: F401
+
+    schema = f"query_plans_{uuid.uuid4().hex[:8]}"
+    admin_engine = create_engine(TEST_POSTGRES_URL)
+    with admin_engine.begin() as connection:
+        connection.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        connection.execute(text(f'CREATE SCHEMA "{schema}"'))
+
+    engine = create_engine(
+        TEST_POSTGRES_URL, connect_args={"options": f"-csearch_path={schema},public"}
+    )
+    activities_models.Activity.metadata.create_all(
+        engine,
+        tables=[
+            users_models.User.__table__,
+            gears_models.Gear.__table__,
+            activities_models.Activity.__table__,
+            activity_summaries_models.UserDailyActivityRollup.__table__,
+        ],
+    )
+    with engine.begin() as connection:
+        connection.execute(
+            text("""
+            INSERT INTO users (id, name, username, email, password, preferred_language, access_type)
+            SELECT user_id, 'User', 'user' || user_id, 'user' || user_id || '@example.com', 'x', 'us', 1
+            FROM generate_series(1, :num_users) AS user_id
+            """),
+            {"num_users": NUM_USERS},
+        )
+        connection.execute(
+            text("""
+            INSERT INTO activities (
+                user_id, name, distance, activity_type, start_time, end_time, timezone,
+                total_elapsed_time, total_timer_time, elevation_gain, calories,
+                created_at, visibility, is_hidden, hide_start_time, hide_location,
+                hide_map, hide_hr, hide_power, hide_cadence, hide_elevation,
+                hide_speed, hide_pace, hide_laps, hide_workout_sets_steps, hide_gear
+            )
+            SELECT
+                user_id, 'Activity', 10000, 1 + number % 10,
+                TIMESTAMP '2020-01-01' + number * INTERVAL '1 day 3 hours',
+                TIMESTAMP '2020-01-01' + number * INTERVAL '1 day 3 hours' + INTERVAL '1 hour',
+                'Europe/Lisbon', 3600, 3600, 100, 500, now(), 0, false,
+                false, false, false, false, false, false, false, false, false,
+                false, false, false
+            FROM generate_series(1, :num_users) AS user_id,
+                generate_series(1, :activities_per_user) AS number
+            """),
+            {"num_users": NUM_USERS, "activities_per_user": ACTIVITIES_PER_USER},
+        )
+
+    with Session(engine) as db:
+        activity_summaries_utils.rebuild_user_daily_activity_rollup(db)
+        db.connection().exec_driver_sql("ANALYZE")
+        db.commit()
+        yield db
+
+    engine.dispose()
+    with admin_engine.begin() as connection:
+        connection.execute(text(f'DROP SCHEMA "{schema}" CASCADE'))
+    admin_engine.dispose()
+
+
+def explain_queries(db: Session, run) -> list[dict]:
+    """
+    Runs the callable and returns the plans of the SELECT queries it executed.
+    """
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        run()
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    return [
+        db.connection()
+        .exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+        .scalar()[0]["Plan"]
+        for statement, parameters in statements
+    ]
+
+
+def plan_nodes(plan: dict) -> list[dict]:
+    """
+    Returns the plan node and all of its descendants.
+    """
+    nodes = [plan]
+    for child in plan.get("Plans", []):
+        nodes += plan_nodes(child)
+    return nodes
+
+
+def assert_index_scans(plans: list[dict], relation: str, indexes: set[str]):
+    nodes = [node for plan in plans for node in plan_nodes(plan)]
+    scans = [node for node in nodes if node.get("Relation Name") == relation]
+    assert scans, f"no scan of {relation}"
+    assert all(
+        node["Node Type"] != "Seq Scan" for node in scans
+    ), f"{relation} is scanned sequentially"
+    # Bitmap heap scans name their index on the child bitmap index scan
+    used_indexes = {node["Index Name"] for node in nodes if "Index Name" in node}
+    assert used_indexes & indexes, f"{relation} scanned with {used_indexes}"
+
+
+class TestActivityQueryPlans:
+    """
+    Test suite asserting that the activity lists use the composite indexes.
+    """
+
+    def test_paginated_list_uses_user_start_time_index(self, postgres_db):
+        """
+        Test that the newest activities page is read from the (user_id, start_time) index.
+        """
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activities_crud.get_user_activities_with_pagination(
+                1, postgres_db, 1, 5, user_is_owner=True
+            ),
+        )
+
+        # Assert
+        assert_index_scans(plans, "activities", {"ix_activities_user_id_start_time"})
+
+    def test_cursor_page_uses_user_start_time_index(self, postgres_db):
+        """
+        Test that a page after a cursor is read from the (user_id, start_time, id) index.
+        """
+        # Arrange
+        first_page = activities_crud.get_user_activities_with_cursor(
+            1, postgres_db, 5, user_is_owner=True
+        )
+
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activities_crud.get_user_activities_with_cursor(
+                1, postgres_db, 5, first_page.next_cursor, user_is_owner=True
+            ),
+        )
+
+        # Assert
+        assert_index_scans(plans, "activities", {"ix_activities_user_id_start_time"})
+
+    @pytest.mark.parametrize("activity_type", [None, 3])
+    def test_date_range_filters_use_start_time_indexes(
+        self, postgres_db, activity_type
+    ):
+        """
+        Test that local date ranges are resolved with index range scans.
+        """
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activities_crud.get_user_activities_with_pagination(
+                1,
+                postgres_db,
+                1,
+                5,
+                activity_type=activity_type,
+                start_date=date(2021, 3, 1),
+                end_date=date(2021, 3, 31),
+                user_is_owner=True,
+            ),
+        )
+
+        # Assert
+        assert_index_scans(
+            plans,
+            "activities",
+            {
+                "ix_activities_user_id_start_time",
+                "ix_activities_user_id_activity_type_start_time",
+            },
+        )
+
+    @pytest.mark.parametrize("name_search", ["activ", "Lisbon run"])
+    def test_name_search_uses_search_indexes(self, postgres_db, name_search):
+        """
+        Test that name and location searches are resolved from the search indexes.
+        """
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activities_crud.get_user_activities_with_pagination(
+                1, postgres_db, 1, 5, name_search=name_search, user_is_owner=True
+            ),
+        )
+
+        # Assert
+        assert_index_scans(
+            plans,
+            "activities",
+            {
+                "ix_activities_search_text_trgm",
+                "ix_activities_search_vector",
+                "ix_activities_user_id_start_time",
+            },
+        )
+
+    def test_timeframe_uses_start_time_index(self, postgres_db):
+        """
+        Test that the weekly activities of a user are read from the start time index.
+        """
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activities_crud.get_user_activities_per_timeframe(
+                1,
+                datetime(2021, 3, 1, tzinfo=timezone.utc),
+                datetime(2021, 3, 7, tzinfo=timezone.utc),
+                postgres_db,
+                True,
+            ),
+        )
+
+        # Assert
+        assert_index_scans(plans, "activities", {"ix_activities_user_id_start_time"})
+
+
+class TestSummaryQueryPlans:
+    """
+    Test suite asserting that the summaries read the rollup primary key.
+    """
+
+    def test_yearly_summary_uses_rollup_primary_key(self, postgres_db):
+        """
+        Test that a yearly summary reads a range of the rollup primary key.
+        """
+        # Act
+        plans = explain_queries(
+            postgres_db,
+            lambda: activity_summaries_crud.get_yearly_summary(postgres_db, 1, 2021),
+        )
+
+        # Assert
+        assert_index_scans(
+            plans, "user_daily_activity_rollup", {"user_daily_activity_rollup_pkey"}
+        )
+
+
+class TestLocalActivityDates:
+    """
+    Test suite asserting that lists and summaries date activities alike.
+    """
+
+    def test_activity_before_local_midnight(self, postgres_db):
+        """
+        Test that an activity at 23:30 local, next day in UTC, is on the local day.
+        """
+        # Arrange
+        activity_id = postgres_db.execute(text("""
+            INSERT INTO activities (
+                user_id, name, distance, activity_type, start_time, end_time, timezone,
+                total_elapsed_time, total_timer_time, elevation_gain, calories,
+                created_at, visibility, is_hidden, hide_start_time, hide_location,
+                hide_map, hide_hr, hide_power, hide_cadence, hide_elevation,
+                hide_speed, hide_pace, hide_laps, hide_workout_sets_steps, hide_gear
+            ) VALUES (
+                1, 'Late run', 5000, 1, TIMESTAMP '2019-06-02 03:30',
+                TIMESTAMP '2019-06-02 04:00', 'America/New_York', 1800, 1800, 0,
+                300, now(), 0, false, false, false, false, false, false, false,
+                false, false, false, false, false, false
+            ) RETURNING id
+            """)).scalar_one()
+
+        try:
+            # Act
+            activity_summaries_utils.add_activities_to_rollup(
+                postgres_db, activities_models.Activity.id == activity_id
+            )
+            rollup_days = postgres_db.execute(text("""
+                SELECT day FROM user_daily_activity_rollup
+                WHERE user_id = 1 AND day BETWEEN '2019-06-01' AND '2019-06-02'
+                """)).scalars().all()
+            listed = activities_crud.get_user_activities_with_pagination(
+                1,
+                postgres_db,
+                1,
+                5,
+                start_date=date(2019, 6, 1),
+                end_date=date(2019, 6, 1),
+                user_is_owner=True,
+            )
+
+            # Assert
+            assert rollup_days == [date(2019, 6, 1)]
+            assert [activity.id for activity in listed] == [activity_id]
+        finally:
+            postgres_db.rollback()
@@ -0,0 +1,88 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import activities.activity.search as activities_search
+
+
+def compile_sql(expression) -> tuple[str, list]:
+    compiled = expression.compile(dialect=postgresql.dialect())
+    return str(compiled), list(compiled.params.values())
+
+
+class TestBuildPrefixTsquery:
+    """
+    Test suite for build_prefix_tsquery.
+    """
+
+    @pytest.mark.parametrize(
+        "search_term, expected",
+        [
+            ("run", "'run':*"),
+            ("morning run", "'morning':* & 'run':*"),
+            ("são paulo's 10k", "'são':* & 'paulo':* & 's':* & '10k':*"),
+            ("  -- ", None),
+            ("", None),
+        ],
+    )
+    def test_words_are_prefix_matched(self, search_term, expected):
+        """
+        Test that every word of the term is matched as a prefix.
+        """
+        # Act
+        result = activities_search.build_prefix_tsquery(search_term)
+
+        # Assert
+        assert result == expected
+
+
+class TestSearchFilter:
+    """
+    Test suite for the name and location search filters.
+    """
+
+    def test_search_filter_matches_words_or_substring(self):
+        """
+        Test that the filter matches the full-text query or any substring.
+        """
+        # Act
+        sql, params = compile_sql(activities_search.search_filter("Morning+Run"))
+
+        # Assert
+        assert "activities.search_vector @@ to_tsquery(" in sql
+        assert "activities.search_text LIKE " in sql
+        assert params == ["simple", "'morning':* & 'run':*", "%morning run%"]
+
+    def test_search_filter_without_words(self):
+        """
+        Test that a term without words only uses the substring match.
+        """
+        # Act
+        sql, params = compile_sql(activities_search.search_filter("%2D"))
+
+        # Assert
+        assert "@@" not in sql
+        assert params == ["%-%"]
+
+    def test_name_contains_filter_checks_name(self):
+        """
+        Test that name searches use search_text and recheck the name only.
+        """
+        # Act
+        sql, params = compile_sql(activities_search.name_contains_filter("Lisbon"))
+
+        # Assert
+        assert "activities.search_text LIKE " in sql
+        assert "lower(activities.name) LIKE " in sql
+        assert params == ["%lisbon%", "%lisbon%"]
+
+    def test_search_rank(self):
+        """
+        Test that the rank uses the full-text query, and is None without words.
+        """
+        # Act
+        sql, params = compile_sql(activities_search.search_rank("trail"))
+
+        # Assert
+        assert sql.startswith("ts_rank(activities.search_vector, to_tsquery(")
+        assert params == ["simple", "'trail':*"]
+        assert activities_search.search_rank("--") is None
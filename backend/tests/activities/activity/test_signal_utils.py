@@ -0,0 +1,131 @@
+import statistics
+
+import numpy as np
+import pytest
+
+import activities.activity.signal_utils as activities_signal_utils
+
+
+def reference_window_filter(values, window_size, function):
+    """
+    Apply a centred, edge-truncated window filter one sample at a time.
+    """
+    half = window_size // 2
+    return [
+        function(values[max(0, i - half) : min(len(values), i + half + 1)])
+        for i in range(len(values))
+    ]
+
+
+class TestRunningFilters:
+    """
+    Test suite for the running median and moving-average filters.
+    """
+
+    @pytest.mark.parametrize("size", [1, 3, 6, 7, 8, 500])
+    @pytest.mark.parametrize("window_size", [2, 3, 6])
+    def test_running_median_matches_reference(self, size, window_size):
+        """
+        Test the running median against statistics.median on each window.
+        """
+        # Arrange
+        values = np.random.default_rng(size).normal(100, 5, size).tolist()
+
+        # Act
+        filtered = activities_signal_utils.running_median(values, window_size)
+
+        # Assert
+        np.testing.assert_allclose(
+            filtered,
+            reference_window_filter(values, window_size, statistics.median),
+        )
+
+    @pytest.mark.parametrize("size", [1, 2, 5, 500])
+    @pytest.mark.parametrize("window_size", [2, 3, 6])
+    def test_running_mean_matches_reference(self, size, window_size):
+        """
+        Test the moving average against statistics.mean on each window.
+        """
+        # Arrange
+        values = np.random.default_rng(size).normal(100, 5, size).tolist()
+
+        # Act
+        filtered = activities_signal_utils.running_mean(values, window_size)
+
+        # Assert
+        np.testing.assert_allclose(
+            filtered, reference_window_filter(values, window_size, statistics.mean)
+        )
+
+    def test_small_windows_and_empty_streams_are_copied(self):
+        """
+        Test that windows below 2 and empty streams are returned unchanged.
+        """
+        # Assert
+        assert activities_signal_utils.running_median([1, 5, 2], 1).tolist() == [
+            1,
+            5,
+            2,
+        ]
+        assert activities_signal_utils.running_mean([], 3).size == 0
+
+
+class TestThresholdGainAndLoss:
+    """
+    Test suite for threshold-based gain and loss.
+    """
+
+    def test_ignores_changes_below_threshold(self):
+        """
+        Test that only changes larger than the threshold are counted.
+        """
+        # Act
+        gain, loss = activities_signal_utils.threshold_gain_and_loss(
+            [10, 10.05, 12, 11.95, 9], 0.1
+        )
+
+        # Assert
+        assert gain == pytest.approx(1.95)
+        assert loss == pytest.approx(2.95)
+
+
+class TestRejectOutliers:
+    """
+    Test suite for the Hampel outlier filter.
+    """
+
+    def test_replaces_spikes_and_keeps_climbs(self):
+        """
+        Test that a GPS elevation spike is removed but a steady climb is kept.
+        """
+        # Arrange
+        values = np.linspace(100, 150, 100)
+        values[40] = 400
+
+        # Act
+        cleaned = activities_signal_utils.reject_outliers(values, min_deviation=5)
+
+        # Assert
+        assert cleaned[40] == pytest.approx(np.linspace(100, 150, 100)[40], abs=1)
+        np.testing.assert_allclose(np.delete(cleaned, 40), np.delete(values, 40))
+
+    def test_smooth_elevation_with_outlier_rejection(self):
+        """
+        Test that rejecting outliers removes the gain added by a spike.
+        """
+        # Arrange
+        values = [100.0] * 50
+        values[25] = 160.0
+
+        # Act
+        with_spike = activities_signal_utils.smooth_elevation(values, 1, 3)
+        without_spike = activities_signal_utils.smooth_elevation(
+            values, 1, 3, outlier_window=7
+        )
+
+        # Assert
+        assert activities_signal_utils.threshold_gain_and_loss(with_spike, 0.1)[0] > 0
+        assert activities_signal_utils.threshold_gain_and_loss(without_spike, 0.1) == (
+            0,
+            0,
+        )
@@ -0,0 +1,189 @@
+import math
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from geopy.distance import geodesic
+
+import activities.activity.trackpoint_utils as activities_trackpoint_utils
+
+
+class TestSegmentDistances:
+    """
+    Test suite for the vectorized geodesic distance kernel.
+    """
+
+    def test_matches_geopy_geodesic(self):
+        """
+        Test that segment distances match geopy's geodesic within a millimetre.
+        """
+        # Arrange
+        rng = np.random.default_rng(42)
+        latitudes = (38.7 + np.cumsum(rng.normal(0, 1e-4, 2000))).tolist()
+        longitudes = (-9.1 + np.cumsum(rng.normal(0, 1e-4, 2000))).tolist()
+
+        # Act
+        distances = activities_trackpoint_utils.segment_distances(latitudes, longitudes)
+
+        # Assert
+        expected = [
+            geodesic(
+                (latitudes[i - 1], longitudes[i - 1]), (latitudes[i], longitudes[i])
+            ).meters
+            for i in range(1, len(latitudes))
+        ]
+        assert distances.shape == (len(latitudes) - 1,)
+        np.testing.assert_allclose(distances, expected, rtol=0, atol=1e-3)
+
+    @pytest.mark.parametrize(
+        "start, end",
+        [
+            ((0.0, 0.0), (0.0, 1.0)),
+            ((89.9, 10.0), (89.9, -170.0)),
+            ((-33.9, 18.4), (51.5, -0.1)),
+            ((10.0, 179.9), (10.0, -179.9)),
+        ],
+    )
+    def test_long_and_edge_case_distances(self, start, end):
+        """
+        Test equatorial, polar, long and antimeridian segments.
+        """
+        # Act
+        distances = activities_trackpoint_utils.segment_distances(
+            [start[0], end[0]], [start[1], end[1]]
+        )
+
+        # Assert
+        assert distances[0] == pytest.approx(geodesic(start, end).meters, abs=1e-3)
+
+    def test_nearly_antipodal_points_fall_back_to_geopy(self):
+        """
+        Test that pairs where Vincenty does not converge still get a distance.
+        """
+        # Arrange
+        start, end = (0.0, 0.0), (0.5, 179.7)
+
+        # Act
+        distances = activities_trackpoint_utils.segment_distances(
+            [start[0], end[0]], [start[1], end[1]]
+        )
+
+        # Assert
+        assert distances[0] == pytest.approx(geodesic(start, end).meters, abs=1e-3)
+
+    def test_coincident_and_missing_points(self):
+        """
+        Test that repeated points are 0 m apart and missing positions are NaN.
+        """
+        # Act
+        distances = activities_trackpoint_utils.segment_distances(
+            [38.7, 38.7, None, 38.8], [-9.1, -9.1, None, -9.2]
+        )
+
+        # Assert
+        assert distances[0] == 0
+        assert math.isnan(distances[1])
+        assert math.isnan(distances[2])
+
+    def test_one_sided_missing_latitude(self):
+        """
+        Test that a point missing only its latitude gives NaN segments.
+        """
+        # Act
+        distances = activities_trackpoint_utils.segment_distances(
+            [38.7, None, 38.71], [-9.1, -9.1, -9.1]
+        )
+
+        # Assert
+        assert math.isnan(distances[0])
+        assert math.isnan(distances[1])
+
+    def test_short_tracks(self):
+        """
+        Test that tracks with fewer than two points have no segments.
+        """
+        # Assert
+        assert activities_trackpoint_utils.segment_distances([], []).size == 0
+        assert activities_trackpoint_utils.segment_distances([1.0], [2.0]).size == 0
+
+
+class TestComputeTrackKinematics:
+    """
+    Test suite for the per-track distance, speed and pace computation.
+    """
+
+    def test_speed_and_pace(self):
+        """
+        Test speed and pace against per-point geodesic calculations.
+        """
+        # Arrange
+        times = [
+            datetime(2024, 1, 15, 10, 0, 0),
+            datetime(2024, 1, 15, 10, 0, 5),
+            datetime(2024, 1, 15, 10, 0, 5),
+            datetime(2024, 1, 15, 10, 0, 15),
+        ]
+        latitudes = [38.7, 38.7001, 38.7002, 38.7004]
+        longitudes = [-9.1, -9.1, -9.1, -9.1]
+
+        # Act
+        kinematics = activities_trackpoint_utils.compute_track_kinematics(
+            times, latitudes, longitudes
+        )
+
+        # Assert
+        first_segment = geodesic((38.7, -9.1), (38.7001, -9.1)).meters
+        last_segment = geodesic((38.7002, -9.1), (38.7004, -9.1)).meters
+        speeds = kinematics["speeds"]
+        assert speeds[0] == 0
+        assert speeds[1] == pytest.approx(first_segment / 5)
+        assert speeds[2] == 0
+        assert speeds[3] == pytest.approx(last_segment / 10)
+        assert kinematics["paces"][0] == 0
+        assert kinematics["paces"][1] == pytest.approx(5 / first_segment)
+        assert kinematics["cumulative_distances"][-1] == pytest.approx(
+            geodesic((38.7, -9.1), (38.7004, -9.1)).meters
+        )
+
+    def test_missing_position_speed_is_nan(self):
+        """
+        Test that speeds next to a missing position are NaN.
+        """
+        # Arrange
+        times = ["2024-01-15T10:00:00", "2024-01-15T10:00:01", "2024-01-15T10:00:02"]
+
+        # Act
+        kinematics = activities_trackpoint_utils.compute_track_kinematics(
+            times, [38.7, None, 38.7], [-9.1, None, -9.1]
+        )
+
+        # Assert
+        assert math.isnan(kinematics["speeds"][1])
+        assert math.isnan(kinematics["speeds"][2])
+        assert kinematics["paces"][1] == 0
+        assert kinematics["cumulative_distances"][-1] == 0
+
+
+class TestToEpochSeconds:
+    """
+    Test suite for trackpoint time conversion.
+    """
+
+    def test_datetimes_and_strings_match(self):
+        """
+        Test that aware datetimes with microseconds use their wall-clock seconds.
+        """
+        # Arrange
+        datetimes = [
+            datetime(2024, 1, 15, 10, 0, 0, 900000, tzinfo=timezone.utc),
+            datetime(2024, 1, 15, 10, 0, 1, tzinfo=timezone.utc),
+        ]
+        strings = ["2024-01-15T10:00:00", "2024-01-15T10:00:01"]
+
+        # Act
+        from_datetimes = activities_trackpoint_utils.to_epoch_seconds(datetimes)
+        from_strings = activities_trackpoint_utils.to_epoch_seconds(strings)
+
+        # Assert
+        assert from_datetimes.tolist() == from_strings.tolist()
+        assert np.diff(from_datetimes).tolist() == [1]
@@ -0,0 +1,113 @@
+import asyncio
+import gzip
+import io
+from unittest.mock import MagicMock, patch
+
+import activities.activity.utils as activities_utils
+
+
+class TestOpenActivityFile:
+    """
+    Test suite for open_activity_file function.
+    """
+
+    def test_path_is_opened(self, tmp_path):
+        """
+        Test that paths are opened and closed.
+        """
+        # Arrange
+        file_path = tmp_path / "activity.fit"
+        file_path.write_bytes(b"data")
+
+        # Act
+        with activities_utils.open_activity_file(str(file_path)) as file:
+            content = file.read()
+
+        # Assert
+        assert content == b"data"
+        assert file.closed
+
+    def test_file_object_is_rewound_and_left_open(self):
+        """
+        Test that in-memory files are reused from the start.
+        """
+        # Arrange
+        buffer = io.BytesIO(b"data")
+        buffer.read()
+
+        # Act
+        with activities_utils.open_activity_file(buffer) as file:
+            content = file.read()
+
+        # Assert
+        assert file is buffer
+        assert content == b"data"
+        assert not buffer.closed
+
+
+class TestParseActivityFileFromMemory:
+    """
+    Test suite for parsing activity files held in memory.
+    """
+
+    def test_gzipped_data_is_decompressed_in_memory(self, mock_db, tmp_path):
+        """
+        Test that gzipped content is parsed without writing a temporary file.
+        """
+        # Arrange
+        parsed_info = {"activity": MagicMock()}
+
+        with patch.object(activities_utils.users_crud, "get_user_by_id"), patch.object(
+            activities_utils.users_privacy_settings_crud,
+            "get_user_privacy_settings_by_user_id",
+        ), patch.object(
+            activities_utils, "parse_file", return_value=parsed_info
+        ) as mock_parse_file, patch.object(
+            activities_utils, "handle_gzipped_file"
+        ) as mock_handle_gzipped_file:
+            # Act
+            result = activities_utils.parse_activity_file(
+                1,
+                "activity.gpx.gz",
+                mock_db,
+                file_data=gzip.compress(b"<gpx/>"),
+            )
+
+        # Assert
+        assert result == ("activity.gpx", ".gpx", [parsed_info])
+        assert mock_parse_file.call_args.args[-1] == b"<gpx/>"
+        mock_handle_gzipped_file.assert_not_called()
+
+
+class TestStoreParsedActivities:
+    """
+    Test suite for store_parsed_activities function.
+    """
+
+    def test_in_memory_file_written_once_to_processed_dir(self, mock_db, tmp_path):
+        """
+        Test that in-memory files are written straight to the processed directory.
+        """
+
+        # Arrange
+        async def store_activity(activity, websocket_manager, db):
+            return MagicMock(id=activity)
+
+        with patch.object(
+            activities_utils, "store_activity", side_effect=store_activity
+        ), patch.object(
+            activities_utils.core_config, "FILES_PROCESSED_DIR", str(tmp_path)
+        ), patch.object(
+            activities_utils, "move_file"
+        ) as mock_move_file:
+            # Act
+            created_activities = asyncio.run(
+                activities_utils.store_parsed_activities(
+                    [3, 4], "123_ACTIVITY.fit", ".fit", MagicMock(), mock_db, b"fit"
+                )
+            )
+
+        # Assert
+        assert [activity.id for activity in created_activities] == [3, 4]
+        assert (tmp_path / "3_4.fit").read_bytes() == b"fit"
+        mock_move_file.assert_not_called()
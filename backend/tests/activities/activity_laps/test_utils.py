@@ -0,0 +1,204 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import activities.activity_laps.utils as activity_laps_utils
+
+import core.config as core_config
+
+# Roughly 11.1 m between consecutive points, one point per second
+LATITUDE_STEP = 0.0001
+
+
+def build_waypoints(count: int) -> dict:
+    """
+    Build a straight northbound track with one waypoint per second.
+    """
+    start = datetime(2024, 1, 15, 8, 0, 0)
+    times = [
+        (start + timedelta(seconds=index)).strftime("%Y-%m-%dT%H:%M:%S")
+        for index in range(count)
+    ]
+    return {
+        "lat_lon_waypoints": [
+            {"time": time, "lat": 38.7 + index * LATITUDE_STEP, "lon": -9.1}
+            for index, time in enumerate(times)
+        ],
+        "ele_waypoints": [
+            {"time": time, "ele": 50 + index} for index, time in enumerate(times)
+        ],
+        "power_waypoints": [{"time": time, "power": 200} for time in times],
+        "hr_waypoints": [
+            {"time": time, "hr": 100 + index % 50} for index, time in enumerate(times)
+        ],
+        "cad_waypoints": [{"time": time, "cad": 80} for time in times],
+        "vel_waypoints": [{"time": time, "vel": 11.1} for time in times],
+    }
+
+
+class TestSplitLapBoundaries:
+    """
+    Test suite for the lap boundary search.
+    """
+
+    def test_splits_on_threshold_and_keeps_partial_lap(self):
+        """
+        Test that laps end on the first point reaching the lap size.
+        """
+        # Act
+        boundaries = activity_laps_utils.split_lap_boundaries(
+            [0, 4, 10, 12, 21, 25], 10, lambda start, end: True
+        )
+
+        # Assert
+        assert boundaries == [(0, 2), (2, 4), (4, 5)]
+
+    def test_partial_lap_can_be_dropped(self):
+        """
+        Test that the final partial lap is only kept when accepted.
+        """
+        # Act
+        boundaries = activity_laps_utils.split_lap_boundaries(
+            [0, 10, 10], 10, lambda start, end: False
+        )
+
+        # Assert
+        assert boundaries == [(0, 1)]
+
+    @pytest.mark.parametrize("values", [[], [0]])
+    def test_short_series(self, values):
+        """
+        Test that series with fewer than two points have no laps.
+        """
+        # Assert
+        assert (
+            activity_laps_utils.split_lap_boundaries(values, 1, lambda s, e: True) == []
+        )
+
+
+class TestGenerateAutoLaps:
+    """
+    Test suite for auto lap generation.
+    """
+
+    def test_distance_laps(self):
+        """
+        Test 1 km laps with a final partial lap.
+        """
+        # Arrange
+        waypoints = build_waypoints(200)
+
+        # Act
+        laps = activity_laps_utils.generate_auto_laps(**waypoints)
+
+        # Assert
+        assert len(laps) == 3
+        assert [lap["lap_trigger"] for lap in laps] == ["distance"] * 3
+        assert laps[0]["total_distance"] == pytest.approx(1000, abs=12)
+        boundary = int(laps[0]["total_elapsed_time"])
+        assert waypoints["lat_lon_waypoints"][boundary]["lat"] == pytest.approx(
+            laps[0]["end_position_lat"]
+        )
+        assert laps[1]["start_time"] == waypoints["lat_lon_waypoints"][boundary]["time"]
+        assert laps[0]["total_ascent"] is not None
+        assert laps[0]["avg_power"] == 200
+        assert laps[0]["enhanced_avg_speed"] == pytest.approx(11.1)
+        assert sum(lap["total_distance"] for lap in laps) == pytest.approx(
+            199 * 11.1, rel=0.01
+        )
+
+    def test_time_laps(self):
+        """
+        Test laps split by elapsed time.
+        """
+        # Arrange
+        waypoints = build_waypoints(151)
+
+        # Act
+        laps = activity_laps_utils.generate_auto_laps(
+            **waypoints, time_per_lap_seconds=60
+        )
+
+        # Assert
+        assert [lap["total_elapsed_time"] for lap in laps] == [60, 60, 30]
+        assert [lap["lap_trigger"] for lap in laps] == ["time"] * 3
+
+    def test_custom_distance_per_activity_type(self, monkeypatch):
+        """
+        Test that the lap distance configured for the activity type is used.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "AUTO_LAP_DISTANCES_KM", {8: 0.1})
+        waypoints = build_waypoints(50)
+
+        # Act
+        swim_laps = activity_laps_utils.generate_auto_laps(**waypoints, activity_type=8)
+        run_laps = activity_laps_utils.generate_auto_laps(**waypoints, activity_type=1)
+
+        # Assert
+        assert len(swim_laps) == 5
+        assert len(run_laps) == 1
+
+    def test_time_laps_per_activity_type(self, monkeypatch):
+        """
+        Test that activity types with a configured lap duration split by time.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "AUTO_LAP_SECONDS", {3: 60})
+        waypoints = build_waypoints(151)
+
+        # Act
+        laps = activity_laps_utils.generate_auto_laps(**waypoints, activity_type=3)
+        distance_laps = activity_laps_utils.generate_auto_laps(
+            **waypoints, activity_type=3, distance_per_lap_km=1
+        )
+
+        # Assert
+        assert [lap["lap_trigger"] for lap in laps] == ["time"] * 3
+        assert {lap["lap_trigger"] for lap in distance_laps} == {"distance"}
+
+    def test_stream_slices_are_inclusive(self):
+        """
+        Test that waypoints on a lap boundary belong to both laps.
+        """
+        # Arrange
+        waypoints = build_waypoints(200)
+        boundary = int(
+            activity_laps_utils.generate_auto_laps(**waypoints)[0]["total_elapsed_time"]
+        )
+        waypoints["hr_waypoints"] = [
+            {"time": waypoint["time"], "hr": 100 if index != boundary else 190}
+            for index, waypoint in enumerate(waypoints["lat_lon_waypoints"])
+        ]
+
+        # Act
+        laps = activity_laps_utils.generate_auto_laps(**waypoints)
+
+        # Assert
+        assert laps[0]["max_heart_rate"] == 190
+        assert laps[1]["max_heart_rate"] == 190
+        assert laps[2]["max_heart_rate"] == 100
+
+    def test_unsorted_streams(self):
+        """
+        Test that streams out of time order are still sliced correctly.
+        """
+        # Arrange
+        waypoints = build_waypoints(200)
+        waypoints["hr_waypoints"] = list(reversed(waypoints["hr_waypoints"]))
+        expected = activity_laps_utils.generate_auto_laps(**build_waypoints(200))
+
+        # Act
+        laps = activity_laps_utils.generate_auto_laps(**waypoints)
+
+        # Assert
+        assert [lap["avg_heart_rate"] for lap in laps] == [
+            lap["avg_heart_rate"] for lap in expected
+        ]
+
+    def test_single_point(self):
+        """
+        Test that a track with a single point has no laps.
+        """
+        # Assert
+        assert activity_laps_utils.generate_auto_laps(**build_waypoints(1)) == []
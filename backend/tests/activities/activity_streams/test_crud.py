@@ -0,0 +1,114 @@
+from unittest.mock import MagicMock, patch
+
+import activities.activity.models as activity_models
+import activities.activity_streams.constants as activity_streams_constants
+import activities.activity_streams.crud as activity_streams_crud
+import activities.activity_streams.models as activity_streams_models
+import activities.activity_streams.schema as activity_streams_schema
+
+
+class TestBuildActivityStreams:
+    """
+    Test suite for build_activity_streams function.
+    """
+
+    def test_hr_zones_computed_for_hr_streams(self):
+        """
+        Test that only HR streams store their zone percentages.
+        """
+        # Arrange
+        waypoints = [{"time": index, "hr": 150} for index in range(10)]
+        streams = [
+            activity_streams_schema.ActivityStreams(
+                activity_id=1, stream_type=stream_type, stream_waypoints=waypoints
+            )
+            for stream_type in (
+                activity_streams_constants.STREAM_TYPE_HR,
+                activity_streams_constants.STREAM_TYPE_POWER,
+            )
+        ]
+
+        # Act
+        with patch.object(
+            activity_streams_models, "ActivityStreams"
+        ) as mock_activity_streams:
+            activity_streams_crud.build_activity_streams(streams, 200)
+
+        # Assert
+        hr_call, power_call = mock_activity_streams.call_args_list
+        assert hr_call.kwargs["hr_zone_percentages"]["zone_3"] == {
+            "percent": 100.0,
+            "hr": "140 - 159",
+        }
+        assert hr_call.kwargs["stream_waypoints"] == waypoints
+        assert power_call.kwargs["hr_zone_percentages"] is None
+
+    def test_no_hr_zones_without_max_heart_rate(self):
+        """
+        Test that no zones are stored when the user max heart rate is unknown.
+        """
+        # Arrange
+        stream = activity_streams_schema.ActivityStreams(
+            activity_id=1,
+            stream_type=activity_streams_constants.STREAM_TYPE_HR,
+            stream_waypoints=[{"time": 0, "hr": 150}],
+        )
+
+        # Act
+        with patch.object(
+            activity_streams_models, "ActivityStreams"
+        ) as mock_activity_streams:
+            activity_streams_crud.build_activity_streams([stream])
+
+        # Assert
+        assert mock_activity_streams.call_args.kwargs["hr_zone_percentages"] is None
+
+
+class TestGetActivitiesStreams:
+    """
+    Test suite for get_activities_streams function.
+    """
+
+    def test_streams_served_without_user_lookups(self, mock_db):
+        """
+        Test that a feed issues a single streams query whatever its size.
+        """
+        # Arrange
+        activities = [MagicMock(id=index, user_id=1) for index in range(20)]
+        streams = [
+            MagicMock(
+                activity_id=index,
+                stream_type=activity_streams_constants.STREAM_TYPE_HR,
+            )
+            for index in range(20)
+        ]
+        mock_db.query.return_value.filter.return_value.all.return_value = streams
+
+        # Act
+        result = activity_streams_crud.get_activities_streams(
+            [activity.id for activity in activities], 1, mock_db, activities
+        )
+
+        # Assert
+        assert result == streams
+        mock_db.query.assert_called_once_with(activity_streams_models.ActivityStreams)
+
+    def test_activities_loaded_once(self, mock_db):
+        """
+        Test that missing activities are loaded in one query.
+        """
+        # Arrange
+        mock_db.query.return_value.filter.return_value.all.side_effect = [
+            [MagicMock(id=1, user_id=2)],
+            [],
+        ]
+
+        # Act
+        result = activity_streams_crud.get_activities_streams([1], 2, mock_db)
+
+        # Assert
+        assert result == []
+        assert [call.args[0] for call in mock_db.query.call_args_list] == [
+            activity_models.Activity,
+            activity_streams_models.ActivityStreams,
+        ]
@@ -0,0 +1,186 @@
+from datetime import date, datetime
+
+import pytest
+
+import activities.activity_streams.utils as activity_streams_utils
+
+
+class TestEncodeStreamWaypoints:
+    """
+    Test suite for the columnar activity stream encoding.
+    """
+
+    def test_round_trip_iso_times(self):
+        """
+        Test that ISO timestamp streams are decoded to identical waypoints.
+        """
+        # Arrange
+        waypoints = [
+            {"time": f"2024-01-15T10:{minute:02d}:{second:02d}", "hr": 120 + second}
+            for minute in range(10)
+            for second in range(60)
+        ]
+
+        # Act
+        encoded = activity_streams_utils.encode_stream_waypoints(waypoints)
+
+        # Assert
+        assert encoded is not None
+        assert activity_streams_utils.decode_stream_waypoints(encoded) == waypoints
+
+    def test_round_trip_numeric_times_and_multiple_values(self):
+        """
+        Test that Strava-style offset times and lat/lon pairs round-trip.
+        """
+        # Arrange
+        waypoints = [
+            {"time": index, "lat": 38.7 + index / 1e5, "lon": -9.1 - index / 1e5}
+            for index in range(500)
+        ]
+
+        # Act
+        encoded = activity_streams_utils.encode_stream_waypoints(waypoints)
+
+        # Assert
+        assert activity_streams_utils.decode_stream_waypoints(encoded) == waypoints
+
+    def test_round_trip_null_values_and_float_times(self):
+        """
+        Test that None values and float times are preserved.
+        """
+        # Arrange
+        waypoints = [
+            {"time": index * 0.5, "pace": None if index % 3 == 0 else 0.25}
+            for index in range(30)
+        ]
+
+        # Act
+        encoded = activity_streams_utils.encode_stream_waypoints(waypoints)
+
+        # Assert
+        assert activity_streams_utils.decode_stream_waypoints(encoded) == waypoints
+
+    def test_encoded_stream_is_smaller_than_json(self):
+        """
+        Test that the encoding is much smaller than the JSON representation.
+        """
+        # Arrange
+        import json
+
+        waypoints = [
+            {
+                "time": f"2024-01-15T{10 + i // 3600:02d}:{i // 60 % 60:02d}:{i % 60:02d}",
+                "hr": 140,
+            }
+            for i in range(3600)
+        ]
+
+        # Act
+        encoded = activity_streams_utils.encode_stream_waypoints(waypoints)
+
+        # Assert
+        assert len(encoded) * 10 < len(json.dumps(waypoints))
+
+    @pytest.mark.parametrize(
+        "waypoints",
+        [
+            None,
+            [],
+            [{"hr": 120}],
+            [{"time": "2024-01-15", "hr": 120}],
+            [{"time": None, "hr": 120}],
+            [{"time": 1, "hr": "high"}],
+            [{"time": 1, "hr": True}],
+            [{"time": 1, "hr": 120}, {"time": 2, "cad": 80}],
+        ],
+    )
+    def test_unencodable_streams_return_none(self, waypoints):
+        """
+        Test that streams outside the columnar layout are left as JSON.
+        """
+        # Act & Assert
+        assert activity_streams_utils.encode_stream_waypoints(waypoints) is None
+
+    def test_decode_invalid_blob_raises(self):
+        """
+        Test that decoding an unknown blob raises ValueError.
+        """
+        # Act & Assert
+        with pytest.raises(ValueError):
+            activity_streams_utils.decode_stream_waypoints(b"not a stream")
+
+
+class TestHrZonePercentages:
+    """
+    Test suite for the heart rate zone helpers.
+    """
+
+    def test_zone_percentages_and_boundaries(self):
+        """
+        Test that values on a zone boundary belong to the upper zone.
+        """
+        # Act
+        zones = activity_streams_utils.calculate_hr_zone_percentages(
+            [100, 120, 140, 160, 180, 200, None, 119], 200
+        )
+
+        # Assert
+        assert zones == {
+            "zone_1": {"percent": 28.57, "hr": "< 120"},
+            "zone_2": {"percent": 14.29, "hr": "120 - 139"},
+            "zone_3": {"percent": 14.29, "hr": "140 - 159"},
+            "zone_4": {"percent": 14.29, "hr": "160 - 179"},
+            "zone_5": {"percent": 28.57, "hr": ">= 180"},
+        }
+
+    @pytest.mark.parametrize(
+        "hr_values, max_heart_rate", [([120], None), ([], 190), ([None], 190)]
+    )
+    def test_zone_percentages_without_data(self, hr_values, max_heart_rate):
+        """
+        Test that no zones are computed without values or maximum heart rate.
+        """
+        # Act & Assert
+        assert (
+            activity_streams_utils.calculate_hr_zone_percentages(
+                hr_values, max_heart_rate
+            )
+            is None
+        )
+
+    @pytest.mark.parametrize(
+        "max_heart_rate, birthdate, start_time, expected",
+        [
+            (185, date(1990, 5, 1), "2024-01-15T10:00:00", 185),
+            (None, date(1990, 5, 1), "2024-01-15T10:00:00", 186),
+            (None, date(1990, 5, 1), datetime(2020, 6, 1, 8), 190),
+            (None, None, "2024-01-15T10:00:00", None),
+        ],
+    )
+    def test_max_heart_rate(self, max_heart_rate, birthdate, start_time, expected):
+        """
+        Test that the age formula uses the activity year.
+        """
+        # Act & Assert
+        assert (
+            activity_streams_utils.calculate_max_heart_rate(
+                max_heart_rate, birthdate, start_time
+            )
+            == expected
+        )
+
+    def test_hr_values_from_encoded_and_json_streams(self):
+        """
+        Test that heart rate values are read from both stream storages.
+        """
+        # Arrange
+        waypoints = [{"time": index, "hr": 120 + index} for index in range(5)]
+
+        # Act
+        encoded = activity_streams_utils.get_stream_hr_values(
+            activity_streams_utils.encode_stream_waypoints(waypoints), None
+        )
+        json_values = activity_streams_utils.get_stream_hr_values(None, waypoints)
+
+        # Assert
+        assert encoded == json_values == [120, 121, 122, 123, 124]
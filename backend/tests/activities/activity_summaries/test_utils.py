@@ -0,0 +1,144 @@
+import re
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+import activities.activity.crud as activities_crud
+import activities.activity.models as activities_models
+import activities.activity.schema as activities_schema
+import activities.activity_summaries.utils as activity_summaries_utils
+
+
+def compile_statement(statement) -> str:
+    # Bind parameter names depend on the statement, only their position matters
+    return re.sub(
+        r"%\(\w+\)s", "?", str(statement.compile(dialect=postgresql.dialect()))
+    )
+
+
+class TestApplyActivitiesToRollup:
+    """
+    Test suite for the daily activity rollup maintenance.
+    """
+
+    def test_add_upserts_daily_totals(self, mock_db):
+        """
+        Test that adding activities sums them into the existing rollup rows.
+        """
+        # Act
+        activity_summaries_utils.add_activities_to_rollup(
+            mock_db, activities_models.Activity.id == 1
+        )
+
+        # Assert
+        mock_db.execute.assert_called_once()
+        sql = compile_statement(mock_db.execute.call_args.args[0])
+        assert "INSERT INTO user_daily_activity_rollup" in sql
+        assert (
+            "CAST(timezone(coalesce(activities.timezone, ?::VARCHAR), "
+            "timezone(?::VARCHAR, activities.start_time)) AS DATE)" in sql
+        )
+        assert "ON CONFLICT (user_id, day, activity_type) DO UPDATE" in sql
+        assert "activity_count = (user_daily_activity_rollup.activity_count" in sql
+
+    def test_rollup_day_matches_list_filters(self, mock_db):
+        """
+        Test that the rollup dates activities like the list date filters.
+        """
+        # Arrange
+        list_filter = activities_crud.start_date_filters(date(2024, 6, 1), None)[1]
+
+        # Act
+        activity_summaries_utils.add_activities_to_rollup(mock_db)
+
+        # Assert
+        sql = compile_statement(mock_db.execute.call_args.args[0])
+        local_start_time = compile_statement(list_filter.left)
+        assert local_start_time.startswith("timezone(coalesce(activities.timezone")
+        assert f"CAST({local_start_time} AS DATE)" in sql
+
+    def test_remove_subtracts_and_drops_empty_days(self, mock_db):
+        """
+        Test that removing activities subtracts them and deletes empty rows.
+        """
+        # Act
+        activity_summaries_utils.remove_activities_from_rollup(
+            mock_db, activities_models.Activity.id == 1
+        )
+
+        # Assert
+        upsert, cleanup = (
+            compile_statement(call.args[0]) for call in mock_db.execute.call_args_list
+        )
+        assert "ON CONFLICT" in upsert
+        assert cleanup.startswith("DELETE FROM user_daily_activity_rollup")
+        assert "activity_count <=" in cleanup
+
+
+class TestActivityWritesUpdateRollup:
+    """
+    Test suite for the rollup updates done by the activity CRUD operations.
+    """
+
+    @pytest.mark.parametrize(
+        "activity_type, updates_rollup",
+        [(2, True), (1, False)],
+    )
+    def test_edit_moves_activity_when_summed_fields_change(
+        self, mock_db, activity_type, updates_rollup
+    ):
+        """
+        Test that only changes of summed fields update the rollup, in the same transaction.
+        """
+        # Arrange
+        db_activity = MagicMock(id=7, activity_type=1)
+        mock_db.query.return_value.filter.return_value.first.return_value = db_activity
+        events = []
+        mock_db.commit.side_effect = lambda: events.append("commit")
+
+        with patch.object(
+            activities_crud.activity_summaries_utils,
+            "remove_activities_from_rollup",
+            side_effect=lambda *args: events.append("remove"),
+        ), patch.object(
+            activities_crud.activity_summaries_utils,
+            "add_activities_to_rollup",
+            side_effect=lambda *args: events.append("add"),
+        ):
+            # Act
+            activities_crud.edit_activity(
+                1,
+                activities_schema.ActivityEdit(
+                    id=7, name="Morning run", activity_type=activity_type
+                ),
+                mock_db,
+            )
+
+        # Assert
+        if updates_rollup:
+            assert events == ["remove", "add", "commit"]
+            mock_db.flush.assert_called_once()
+        else:
+            assert events == ["commit"]
+
+    def test_delete_removes_activity_before_commit(self, mock_db):
+        """
+        Test that the activity leaves the rollup in the deleting transaction.
+        """
+        # Arrange
+        mock_db.query.return_value.filter.return_value.delete.return_value = 1
+        events = []
+        mock_db.commit.side_effect = lambda: events.append("commit")
+
+        with patch.object(
+            activities_crud.activity_summaries_utils,
+            "remove_activities_from_rollup",
+            side_effect=lambda *args: events.append("remove"),
+        ):
+            # Act
+            activities_crud.delete_activity(7, mock_db)
+
+        # Assert
+        assert events == ["remove", "commit"]
@@ -1,10 +1,18 @@
+import asyncio
+import threading
+from unittest.mock import MagicMock, patch
+
+import argon2
 import pytest
 import re
 import string
+from fastapi import HTTPException
 from pwdlib import PasswordHash
 from pwdlib.hashers.argon2 import Argon2Hasher
 from pwdlib.hashers.bcrypt import BcryptHasher
 
+import auth.password_hasher as auth_password_hasher
+import core.shared_state as core_shared_state
 from auth.password_hasher import PasswordHasher, PasswordPolicyError
 
 
@@ -481,3 +489,185 @@ class TestPasswordHasherSecurity:
         assert "must be ≥ 8" in str(exc_info.value) or "must be >= 8" in str(
             exc_info.value
         )
+
+
+class TestPasswordHashingPool:
+    """
+    Test suite for the bounded pool running password hashing off the event loop.
+    """
+
+    async def test_async_methods_run_on_the_pool(self):
+        """
+        Test that async hashing and verification run on the pool threads.
+        """
+        # Arrange
+        pool = auth_password_hasher.PasswordHashingPool(max_workers=2, max_queue=2)
+        hasher = PasswordHasher(hasher=BcryptHasher(rounds=4), pool=pool)
+        threads = []
+        original_hash = hasher.hash_password
+
+        def record_thread(password):
+            threads.append(threading.current_thread().name)
+            return original_hash(password)
+
+        # Act
+        with patch.object(hasher, "hash_password", side_effect=record_thread):
+            hashed = await hasher.hash_password_async("Password1!")
+        is_valid, updated_hash = await hasher.verify_and_update_async(
+            "Password1!", hashed
+        )
+
+        # Assert
+        assert threads[0].startswith("password-hashing")
+        assert (is_valid, updated_hash) == (True, None)
+        stats = pool.get_stats()
+        assert stats["completed"] == 2
+        assert (stats["queued"], stats["running"]) == (0, 0)
+
+    async def test_full_queue_is_rejected(self):
+        """
+        Test that operations beyond the workers and queue get a 503.
+        """
+        # Arrange
+        pool = auth_password_hasher.PasswordHashingPool(max_workers=1, max_queue=1)
+        release = threading.Event()
+        blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        # Act
+        with (
+            patch.object(auth_password_hasher.core_logger, "print_to_log"),
+            pytest.raises(HTTPException) as exc_info,
+        ):
+            await pool.run(release.wait)
+        release.set()
+        await asyncio.gather(*blocked)
+        stats = pool.get_stats()
+
+        # Assert
+        assert exc_info.value.status_code == 503
+        assert stats["rejected"] == 1
+        assert stats["max_queued"] == 1
+        assert stats["completed"] == 2
+
+
+class TestArgon2Calibration:
+    """
+    Test suite for the startup Argon2 calibration.
+    """
+
+    def test_calibration_picks_lowest_time_cost_reaching_target(self):
+        """
+        Test that the time cost grows until the hash reaches the target latency.
+        """
+        # Arrange
+        def benchmark(time_cost, memory_cost, parallelism):
+            return time_cost * 60.0
+
+        # Act
+        with patch.object(auth_password_hasher.core_logger, "print_to_log_and_console"):
+            parameters = auth_password_hasher.calibrate_argon2(
+                250, memory_cost=19456, parallelism=1, benchmark=benchmark
+            )
+
+        # Assert
+        assert parameters == {"time_cost": 5, "memory_cost": 19456, "parallelism": 1}
+
+    def test_calibration_never_goes_below_default_time_cost(self):
+        """
+        Test that slow hardware keeps at least the argon2 default time cost.
+        """
+        # Arrange
+        benchmark = MagicMock(return_value=5000.0)
+
+        # Act
+        with patch.object(auth_password_hasher.core_logger, "print_to_log_and_console"):
+            parameters = auth_password_hasher.calibrate_argon2(
+                250, memory_cost=19456, parallelism=1, benchmark=benchmark
+            )
+
+        # Assert
+        assert parameters["time_cost"] >= 3
+        assert parameters["time_cost"] == argon2.DEFAULT_TIME_COST
+        benchmark.assert_called_once_with(argon2.DEFAULT_TIME_COST, 19456, 1)
+
+    def test_weaker_shared_parameters_are_recalibrated(self):
+        """
+        Test that shared parameters below the argon2 default time cost are not reused.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        state.set(
+            auth_password_hasher.ARGON2_PARAMETERS_KEY,
+            {"time_cost": 1, "memory_cost": 8192, "parallelism": 1, "target_ms": 250},
+            60,
+        )
+        hasher = PasswordHasher(hasher=[Argon2Hasher(), BcryptHasher()])
+
+        # Act
+        with (
+            patch.object(
+                auth_password_hasher.core_shared_state,
+                "get_shared_state",
+                return_value=state,
+            ),
+            patch.object(auth_password_hasher, "password_hasher", hasher),
+            patch.object(
+                auth_password_hasher,
+                "calibrate_argon2",
+                return_value={"time_cost": 3, "memory_cost": 8192, "parallelism": 1},
+            ) as mock_calibrate,
+        ):
+            auth_password_hasher.calibrate_password_hasher(250)
+
+        # Assert
+        mock_calibrate.assert_called_once_with(250)
+        assert "m=8192,t=3,p=1" in hasher.hash_password("Password1!")
+
+    def test_calibrated_parameters_upgrade_old_hashes(self):
+        """
+        Test that hashes made with other parameters are rehashed on verification.
+        """
+        # Arrange
+        hasher = PasswordHasher(
+            hasher=[Argon2Hasher(time_cost=1, memory_cost=8192), BcryptHasher()]
+        )
+        old_hash = hasher.hash_password("Password1!")
+
+        # Act
+        hasher.use_argon2_parameters(time_cost=2, memory_cost=8192, parallelism=1)
+        is_valid, updated_hash = hasher.verify_and_update("Password1!", old_hash)
+
+        # Assert
+        assert is_valid is True
+        assert "t=2" in updated_hash
+        assert hasher.verify_and_update("Password1!", updated_hash) == (True, None)
+
+    def test_calibration_is_shared_between_backends(self):
+        """
+        Test that parameters stored in the shared state are reused without benchmarking.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        state.set(
+            auth_password_hasher.ARGON2_PARAMETERS_KEY,
+            {"time_cost": 4, "memory_cost": 8192, "parallelism": 1, "target_ms": 250},
+            60,
+        )
+        hasher = PasswordHasher(hasher=[Argon2Hasher(), BcryptHasher()])
+
+        # Act
+        with (
+            patch.object(
+                auth_password_hasher.core_shared_state,
+                "get_shared_state",
+                return_value=state,
+            ),
+            patch.object(auth_password_hasher, "password_hasher", hasher),
+            patch.object(auth_password_hasher, "calibrate_argon2") as mock_calibrate,
+        ):
+            auth_password_hasher.calibrate_password_hasher(250)
+
+        # Assert
+        mock_calibrate.assert_not_called()
+        assert "m=8192,t=4,p=1" in hasher.hash_password("Password1!")
@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
+from types import SimpleNamespace
+from unittest.mock import patch
 
 import pytest
 from fastapi import HTTPException
 
+import auth.security as auth_security
 import auth.token_manager as auth_token_manager
 
 
@@ -441,3 +444,97 @@ class TestTokenManagerSecurity:
         assert (
             exp_time.tzinfo == timezone.utc
         ), "Expiration time should be in UTC timezone"
+
+
+class TestDecodedTokenCache:
+    """
+    Test suite for the caches sparing repeated token signature verification.
+    """
+
+    def test_decode_token_verifies_signature_once(
+        self, token_manager, sample_user_read
+    ):
+        """
+        Test that decoding the same token twice only verifies it once.
+        """
+        # Arrange
+        _, token = token_manager.create_token(
+            "session-id", sample_user_read, auth_token_manager.TokenType.ACCESS
+        )
+
+        # Act
+        with patch.object(
+            auth_token_manager.jwt, "decode", wraps=auth_token_manager.jwt.decode
+        ) as mock_decode:
+            first = token_manager.decode_token(token)
+            second = token_manager.decode_token(token)
+
+        # Assert
+        assert first is second
+        mock_decode.assert_called_once()
+
+    def test_cache_is_bounded_and_skips_expired_tokens(self, sample_user_read):
+        """
+        Test that the least recently used tokens are evicted and expired ones re-verified.
+        """
+        # Arrange
+        manager = auth_token_manager.TokenManager(
+            secret_key="test-secret-key-for-testing-only-min-32-chars", cache_size=2
+        )
+        tokens = [
+            manager.create_token(
+                f"session-{i}", sample_user_read, auth_token_manager.TokenType.ACCESS
+            )[1]
+            for i in range(3)
+        ]
+
+        # Act
+        for token in tokens:
+            manager.decode_token(token)
+        with patch.object(auth_token_manager.time, "time", return_value=2**40):
+            expired = manager.decode_token(tokens[2])
+
+        # Assert
+        assert len(manager._decoded_tokens) == 2
+        assert expired is not None
+        assert len(manager._decoded_tokens) == 2
+
+    def test_invalid_token_is_not_cached(self, token_manager):
+        """
+        Test that tokens failing verification are never cached.
+        """
+        # Act
+        with pytest.raises(HTTPException):
+            token_manager.decode_token("invalid.token.here")
+
+        # Assert
+        assert len(token_manager._decoded_tokens) == 0
+
+    def test_security_dependencies_share_request_claims(
+        self, token_manager, sample_user_read
+    ):
+        """
+        Test that the claims are decoded once and shared through request.state.
+        """
+        # Arrange
+        _, token = token_manager.create_token(
+            "session-id", sample_user_read, auth_token_manager.TokenType.ACCESS
+        )
+        request = SimpleNamespace(state=SimpleNamespace())
+
+        # Act
+        with patch.object(
+            token_manager, "decode_token", wraps=token_manager.decode_token
+        ) as mock_decode:
+            claims = auth_security.get_access_token_claims(
+                request, token, token_manager
+            )
+            again = auth_security.get_access_token_claims(request, token, token_manager)
+        sub = auth_security.get_sub_from_access_token(claims, token_manager)
+        sid = auth_security.get_sid_from_access_token(claims, token_manager)
+
+        # Assert
+        mock_decode.assert_called_once_with(token)
+        assert again is claims
+        assert request.state.decoded_tokens == {token: claims}
+        assert (sub, sid) == (sample_user_read.id, "session-id")
@@ -0,0 +1,282 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import Column, Integer, String, create_engine
+from sqlalchemy.orm import Session, declarative_base
+
+import core.cache as core_cache
+import core.shared_state as core_shared_state
+
+Base = declarative_base()
+
+
+class Item(Base):
+    __tablename__ = "items"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(50), nullable=False)
+
+
+@pytest.fixture
+def memory_backend():
+    """
+    Enables the cache with worker-local invalidations.
+    """
+    with patch.object(core_cache.core_config, "CACHE_BACKEND", "memory"):
+        yield
+
+
+@pytest.fixture
+def shared_backend():
+    """
+    Enables the cache with invalidations shared through an in-memory state.
+    """
+    state = core_shared_state.MemoryState()
+    with patch.object(core_cache.core_config, "CACHE_BACKEND", "shared"), patch.object(
+        core_cache.core_shared_state, "get_shared_state", return_value=state
+    ), patch.object(core_cache, "SHARED_SYNC_SECONDS", 0):
+        yield state
+
+
+class TestTTLCache:
+    """
+    Test suite for the in-process TTL and LRU cache.
+    """
+
+    def test_hits_misses_and_stats(self, memory_backend):
+        """
+        Test that lookups are counted.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_stats")
+        cache.set("a", 1)
+
+        # Act
+        hit = cache.get("a")
+        miss = cache.get("b")
+
+        # Assert
+        assert (hit, miss) == (1, core_cache.MISSING)
+        assert cache.stats() == {
+            "size": 1,
+            "hits": 1,
+            "misses": 1,
+            "hit_ratio": 0.5,
+            "evictions": 0,
+            "invalidations": 0,
+        }
+        assert core_cache.get_caches_stats()["test_stats"]["hits"] == 1
+
+    def test_least_recently_used_entry_is_evicted(self, memory_backend):
+        """
+        Test that the least recently used entry is evicted when full.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_lru", max_size=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+
+        # Act
+        cache.set("c", 3)
+
+        # Assert
+        assert cache.get("b") is core_cache.MISSING
+        assert (cache.get("a"), cache.get("c")) == (1, 3)
+        assert cache.evictions == 1
+
+    def test_entries_expire(self, memory_backend):
+        """
+        Test that entries are not served after their TTL.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_ttl", ttl_seconds=10)
+        with patch.object(core_cache.time, "monotonic", return_value=100):
+            cache.set("a", 1)
+
+        # Act & Assert
+        with patch.object(core_cache.time, "monotonic", return_value=109):
+            assert cache.get("a") == 1
+        with patch.object(core_cache.time, "monotonic", return_value=110):
+            assert cache.get("a") is core_cache.MISSING
+
+    def test_values_are_copied(self, memory_backend):
+        """
+        Test that callers never share the cached value.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_copy", copy=dict)
+        value = {"a": 1}
+        cache.set("key", value)
+
+        # Act
+        value["a"] = 2
+        first = cache.get("key")
+        first["a"] = 3
+
+        # Assert
+        assert cache.get("key") == {"a": 1}
+
+    def test_values_read_before_invalidation_are_not_stored(self, memory_backend):
+        """
+        Test that a value loaded before an invalidation is discarded.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_version")
+        version = cache.version
+
+        # Act
+        cache.invalidate("key")
+        cache.set("key", "stale", version)
+
+        # Assert
+        assert cache.get("key") is core_cache.MISSING
+
+    def test_invalidate_keys_or_all(self, memory_backend):
+        """
+        Test that invalidate drops the given keys, or every entry.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_invalidate")
+        for key in ("a", "b", "c"):
+            cache.set(key, key)
+
+        # Act
+        cache.invalidate("a")
+        kept = cache.get("b")
+        cache.invalidate()
+
+        # Assert
+        assert kept == "b"
+        assert cache.stats()["size"] == 0
+        assert cache.invalidations == 2
+
+    def test_disabled_cache(self):
+        """
+        Test that nothing is cached with CACHE_BACKEND none.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_disabled")
+
+        # Act
+        with patch.object(core_cache.core_config, "CACHE_BACKEND", "none"):
+            cache.set("a", 1)
+            result = cache.get("a")
+
+        # Assert
+        assert result is core_cache.MISSING
+
+
+class TestSharedInvalidation:
+    """
+    Test suite for the invalidations shared across workers.
+    """
+
+    def test_invalidation_reaches_other_workers(self, shared_backend):
+        """
+        Test that another worker drops its entries after an invalidation.
+        """
+        # Arrange
+        worker_1 = core_cache.TTLCache("test_shared")
+        worker_2 = core_cache.TTLCache("test_shared")
+        worker_1.set("a", 1)
+        worker_2.set("a", 1)
+        worker_2.set("b", 2)
+
+        # Act
+        worker_1.invalidate("a")
+
+        # Assert
+        assert worker_2.get("b") is core_cache.MISSING
+        assert worker_2.get("a") is core_cache.MISSING
+        assert shared_backend.get("cache:test_shared:generation") == 1
+
+    def test_own_invalidation_keeps_other_entries(self, shared_backend):
+        """
+        Test that a worker keeps its other entries after its own invalidation.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_shared_own")
+        cache.get("a")
+        cache.invalidate()
+        cache.set("a", 1)
+        cache.set("b", 2)
+
+        # Act
+        cache.invalidate("a")
+
+        # Assert
+        assert cache.get("b") == 2
+
+    def test_shared_state_errors_clear_entries(self, shared_backend):
+        """
+        Test that entries are dropped when the generation cannot be read.
+        """
+        # Arrange
+        cache = core_cache.TTLCache("test_shared_error")
+        cache.set("a", 1)
+
+        # Act
+        with patch.object(
+            core_cache.core_shared_state,
+            "get_shared_state",
+            side_effect=Exception("Connection error"),
+        ), patch.object(core_cache.core_logger, "print_to_log"):
+            result = cache.get("a")
+
+        # Assert
+        assert result is core_cache.MISSING
+
+
+class TestCached:
+    """
+    Test suite for the cached decorator.
+    """
+
+    def test_results_are_cached_by_key(self, memory_backend):
+        """
+        Test that the getter only runs on misses, and None is not cached.
+        """
+        # Arrange
+        getter = MagicMock(side_effect=lambda item_id, db: item_id or None)
+        cached_getter = core_cache.cached(
+            core_cache.TTLCache("test_decorator"), key=lambda item_id, db: item_id
+        )(getter)
+
+        # Act
+        results = [cached_getter(1, "db"), cached_getter(1, db="db")]
+        cached_getter(0, "db")
+        cached_getter(0, "db")
+
+        # Assert
+        assert results == [1, 1]
+        assert getter.call_count == 3
+        assert cached_getter.cache.stats()["size"] == 1
+
+
+class TestDetachedCopy:
+    """
+    Test suite for detached_copy.
+    """
+
+    def test_copy_of_expired_instance(self):
+        """
+        Test that the copy holds the column values and is not in the session.
+        """
+        # Arrange
+        engine = create_engine("sqlite://")
+        Base.metadata.create_all(engine)
+        with Session(engine) as db:
+            item = Item(id=1, name="Bike")
+            db.add(item)
+            db.commit()
+
+            # Act
+            copy = core_cache.detached_copy(item)
+            copy.name = "Changed"
+            db.commit()
+
+            # Assert
+            assert copy is not item
+            assert copy not in db
+            assert (copy.id, item.name) == (1, "Bike")
@@ -0,0 +1,153 @@
+from datetime import date, datetime
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import Column, Date, Integer
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session, declarative_base
+
+import core.pagination as core_pagination
+
+Base = declarative_base()
+
+
+class Entry(Base):
+    __tablename__ = "entries"
+
+    id = Column(Integer, primary_key=True)
+    date = Column(Date, nullable=False)
+
+
+class TestCursorEncoding:
+    """
+    Test suite for the cursor encoding.
+    """
+
+    def test_round_trip(self):
+        """
+        Test that the sort key values survive the encoding.
+        """
+        # Arrange
+        values = [datetime(2024, 5, 1, 7, 30), date(2024, 5, 1), Decimal("1.5"), "a", 7]
+
+        # Act
+        cursor = core_pagination.encode_cursor("start_time:desc", values)
+
+        # Assert
+        assert "=" not in cursor
+        assert (
+            core_pagination.decode_cursor(cursor, "start_time:desc", len(values))
+            == values
+        )
+
+    @pytest.mark.parametrize("cursor", ["not a cursor", "e30", "W10"])
+    def test_malformed_cursor(self, cursor):
+        """
+        Test that malformed cursors are rejected with a 422.
+        """
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            core_pagination.decode_cursor(cursor, "default", 2)
+
+        assert exc_info.value.status_code == 422
+        assert exc_info.value.detail == "Invalid Cursor"
+
+    @pytest.mark.parametrize("sort, num_values", [("name:asc", 2), ("default", 3)])
+    def test_cursor_of_another_sort(self, sort, num_values):
+        """
+        Test that cursors issued for another sort are rejected with a 422.
+        """
+        # Arrange
+        cursor = core_pagination.encode_cursor("default", ["a", 1])
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            core_pagination.decode_cursor(cursor, sort, num_values)
+
+        assert exc_info.value.status_code == 422
+
+
+class TestGetCursorPage:
+    """
+    Test suite for get_cursor_page.
+    """
+
+    def test_first_page_with_next_page(self):
+        """
+        Test that one extra row is fetched to build the next cursor.
+        """
+        # Arrange
+        query = MagicMock()
+        rows = query.add_columns.return_value.order_by.return_value.limit.return_value
+        rows.all.return_value = [
+            ("first", date(2024, 5, 2), 2),
+            ("second", date(2024, 5, 1), 1),
+            ("third", date(2024, 4, 30), 3),
+        ]
+
+        # Act
+        records, next_cursor = core_pagination.get_cursor_page(
+            query, [Entry.date, Entry.id], True, 2
+        )
+
+        # Assert
+        assert records == ["first", "second"]
+        query.filter.assert_not_called()
+        query.add_columns.return_value.order_by.return_value.limit.assert_called_once_with(
+            3
+        )
+        assert core_pagination.decode_cursor(next_cursor, "default", 2) == [
+            date(2024, 5, 1),
+            1,
+        ]
+
+    def test_last_page(self):
+        """
+        Test that the last page has no next cursor.
+        """
+        # Arrange
+        query = MagicMock()
+        rows = query.add_columns.return_value.order_by.return_value.limit.return_value
+        rows.all.return_value = [("only", date(2024, 5, 2), 2)]
+
+        # Act
+        records, next_cursor = core_pagination.get_cursor_page(
+            query, [Entry.date, Entry.id], True, 2
+        )
+
+        # Assert
+        assert records == ["only"]
+        assert next_cursor is None
+
+    @pytest.mark.parametrize("descending, operator", [(True, "<"), (False, ">")])
+    def test_page_after_cursor(self, descending, operator):
+        """
+        Test that the next page compares the sort keys as a row value.
+        """
+        # Arrange
+        query = Session().query(Entry)
+        cursor = core_pagination.encode_cursor("default", [date(2024, 5, 1), 1])
+        captured = {}
+
+        def capture(self, *args, **kwargs):
+            captured["statement"] = self.statement
+            return []
+
+        # Act
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            monkeypatch.setattr(type(query), "all", capture)
+            core_pagination.get_cursor_page(
+                query, [Entry.date, Entry.id], descending, 5, cursor
+            )
+
+        # Assert
+        sql = str(
+            captured["statement"].compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+        )
+        assert f"(entries.date, entries.id) {operator} ('2024-05-01', 1)" in sql
+        direction = "DESC" if descending else "ASC"
+        assert f"ORDER BY entries.date {direction}, entries.id {direction}" in sql
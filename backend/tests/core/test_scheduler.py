@@ -0,0 +1,344 @@
+import asyncio
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from apscheduler.schedulers.base import STATE_PAUSED, STATE_RUNNING
+
+import core.database as core_database
+import core.scheduler as core_scheduler
+
+
+def fake_advisory_lock(acquired: bool):
+    @contextmanager
+    def advisory_lock(name):
+        yield acquired
+
+    return advisory_lock
+
+
+def sync_job(value):
+    return value * 2
+
+
+async def async_job(value):
+    return value * 3
+
+
+# Runs of record_run, by every scheduler of the test
+job_runs = []
+
+
+def record_run():
+    job_runs.append(datetime.now(timezone.utc))
+
+
+class FakeLeaderLock:
+    """
+    Advisory lock shared by the schedulers of a test, held by one at a time.
+    """
+
+    def __init__(self):
+        self.connection = None
+
+    def hold(self, name):
+        if self.connection is not None:
+            return None
+        self.connection = MagicMock()
+        return self.connection
+
+    def release(self, connection, name):
+        self.connection = None
+
+
+class TestAdvisoryLockKey:
+    """
+    Test suite for the advisory lock key mapping.
+    """
+
+    def test_key_is_stable_signed_int32(self):
+        """
+        Test that keys are deterministic and fit a PostgreSQL int4.
+        """
+        # Act
+        key = core_database.get_advisory_lock_key("retrieve_strava_activities")
+
+        # Assert
+        assert key == core_database.get_advisory_lock_key("retrieve_strava_activities")
+        assert key != core_database.get_advisory_lock_key("refresh_strava_tokens")
+        assert -(2**31) <= key < 2**31
+
+
+class TestRunJob:
+    """
+    Test suite for run_job and run_async_job.
+    """
+
+    def test_run_job_runs_when_lock_acquired(self):
+        """
+        Test that the job runs on the instance holding the lock.
+        """
+        # Act
+        with patch.object(
+            core_scheduler.core_database, "advisory_lock", fake_advisory_lock(True)
+        ):
+            result = core_scheduler.run_job("job", sync_job, 2)
+
+        # Assert
+        assert result == 4
+
+    def test_run_job_resolves_references(self):
+        """
+        Test that persisted "module:name" references are resolved.
+        """
+        # Act
+        with patch.object(
+            core_scheduler.core_database, "advisory_lock", fake_advisory_lock(True)
+        ):
+            result = core_scheduler.run_job("job", f"{__name__}:sync_job", 5)
+
+        # Assert
+        assert result == 10
+
+    def test_run_job_skips_when_lock_taken(self):
+        """
+        Test that the job is skipped while another instance runs it.
+        """
+        # Arrange
+        func = MagicMock()
+
+        # Act
+        with patch.object(
+            core_scheduler.core_database, "advisory_lock", fake_advisory_lock(False)
+        ):
+            result = core_scheduler.run_job("job", func, 2)
+
+        # Assert
+        assert result is None
+        func.assert_not_called()
+
+    def test_run_async_job(self):
+        """
+        Test that coroutine jobs are awaited, or skipped without the lock.
+        """
+        # Act
+        with patch.object(
+            core_scheduler.core_database, "advisory_lock", fake_advisory_lock(True)
+        ):
+            result = asyncio.run(core_scheduler.run_async_job("job", async_job, 2))
+        with patch.object(
+            core_scheduler.core_database, "advisory_lock", fake_advisory_lock(False)
+        ):
+            skipped = asyncio.run(core_scheduler.run_async_job("job", async_job, 2))
+
+        # Assert
+        assert result == 6
+        assert skipped is None
+
+
+class TestAddSchedulerJob:
+    """
+    Test suite for add_scheduler_job with a persisted job store.
+    """
+
+    def run_with_scheduler(self, database_url, callback):
+        async def run():
+            scheduler = AsyncIOScheduler(
+                jobstores={
+                    "default": SQLAlchemyJobStore(
+                        url=database_url, tablename=core_scheduler.JOBS_TABLE_NAME
+                    )
+                },
+                job_defaults={"coalesce": True, "max_instances": 1},
+            )
+            with patch.object(core_scheduler, "scheduler", scheduler):
+                scheduler.start(paused=True)
+                try:
+                    return callback(scheduler)
+                finally:
+                    scheduler.shutdown(wait=False)
+
+        return asyncio.run(run())
+
+    def test_jobs_use_runner_matching_function(self, tmp_path):
+        """
+        Test that jobs are wrapped by the lock runner with a stable ID.
+        """
+        # Arrange
+        database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+
+        def add_jobs(scheduler):
+            core_scheduler.add_scheduler_job(
+                "sync", sync_job, "interval", 60, [1], "sync job"
+            )
+            core_scheduler.add_scheduler_job(
+                "async", async_job, "interval", 60, [1], "async job"
+            )
+            return scheduler.get_job("sync"), scheduler.get_job("async")
+
+        # Act
+        sync, async_ = self.run_with_scheduler(database_url, add_jobs)
+
+        # Assert
+        assert sync.func is core_scheduler.run_job
+        assert sync.args == ("sync", f"{__name__}:sync_job", 1)
+        assert async_.func is core_scheduler.run_async_job
+        assert sync.max_instances == 1
+        assert sync.coalesce is True
+
+    def test_restart_keeps_stored_next_run_time(self, tmp_path):
+        """
+        Test that re-adding a job on startup keeps its persisted schedule.
+        """
+        # Arrange
+        database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+        missed_run_time = datetime.now(timezone.utc) - timedelta(minutes=30)
+
+        def add_job(scheduler):
+            core_scheduler.add_scheduler_job(
+                "sync", sync_job, "interval", 60, [1], "sync job"
+            )
+            scheduler.modify_job("sync", next_run_time=missed_run_time)
+
+        def restart(scheduler):
+            core_scheduler.add_scheduler_job(
+                "sync", sync_job, "interval", 60, [2], "sync job"
+            )
+            return scheduler.get_jobs()
+
+        # Act
+        self.run_with_scheduler(database_url, add_job)
+        jobs = self.run_with_scheduler(database_url, restart)
+
+        # Assert
+        assert len(jobs) == 1
+        assert jobs[0].next_run_time == missed_run_time
+        assert jobs[0].args == ("sync", f"{__name__}:sync_job", 2)
+
+
+class TestSchedulerLeadership:
+    """
+    Test suite for the scheduler leader election on a shared job store.
+    """
+
+    def build_leadership(self, database_url):
+        scheduler = AsyncIOScheduler(
+            jobstores={
+                "default": SQLAlchemyJobStore(
+                    url=database_url, tablename=core_scheduler.JOBS_TABLE_NAME
+                )
+            },
+            job_defaults={"coalesce": True, "max_instances": 1},
+        )
+        scheduler.start(paused=True)
+
+        def add_jobs():
+            scheduler.add_job(
+                record_run,
+                "interval",
+                minutes=60,
+                id="record_run",
+                replace_existing=True,
+                next_run_time=datetime.now(timezone.utc),
+            )
+
+        return core_scheduler.SchedulerLeadership(scheduler, add_jobs)
+
+    async def test_due_job_runs_once_with_two_schedulers(self, tmp_path):
+        """
+        Test that only the leader processes the jobs of the shared store.
+        """
+        # Arrange
+        database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+        lock = FakeLeaderLock()
+        first = self.build_leadership(database_url)
+        second = self.build_leadership(database_url)
+        submitted_by = []
+        for name, leadership in (("first", first), ("second", second)):
+            leadership.scheduler.add_listener(
+                lambda event, name=name: submitted_by.append(name),
+                EVENT_JOB_SUBMITTED,
+            )
+        job_runs.clear()
+
+        # Act
+        with (
+            patch.object(core_scheduler.core_database, "hold_advisory_lock", lock.hold),
+            patch.object(core_scheduler.core_logger, "print_to_log_and_console"),
+        ):
+            elected = [first.elect(), second.elect()]
+            # The other instance looks for due jobs before the leader does
+            second.scheduler._process_jobs()
+            await asyncio.sleep(0.5)
+
+        # Assert
+        assert elected == [True, False]
+        assert submitted_by == ["first"]
+        assert len(job_runs) == 1
+        assert first.scheduler.state == STATE_RUNNING
+        assert second.scheduler.state == STATE_PAUSED
+        for leadership in (first, second):
+            leadership.scheduler.shutdown(wait=False)
+
+    async def test_other_instance_takes_over_a_stopped_leader(self, tmp_path):
+        """
+        Test that the lock is released on stop and another instance takes over.
+        """
+        # Arrange
+        database_url = f"sqlite:///{tmp_path / 'jobs.db'}"
+        lock = FakeLeaderLock()
+        first = self.build_leadership(database_url)
+        second = self.build_leadership(database_url)
+
+        # Act
+        with (
+            patch.object(core_scheduler.core_database, "hold_advisory_lock", lock.hold),
+            patch.object(
+                core_scheduler.core_database, "release_advisory_lock", lock.release
+            ),
+            patch.object(core_scheduler.core_logger, "print_to_log_and_console"),
+        ):
+            first.elect()
+            second.elect()
+            first.release()
+            elected = second.elect()
+
+        # Assert
+        assert elected is True
+        assert not first.is_leader
+        assert first.scheduler.state == STATE_PAUSED
+        assert second.scheduler.state == STATE_RUNNING
+        assert len(second.scheduler.get_jobs()) == 1
+        for leadership in (first, second):
+            leadership.scheduler.shutdown(wait=False)
+
+    async def test_lost_lock_pauses_the_scheduler(self, tmp_path):
+        """
+        Test that a leader whose lock connection fails stops processing jobs.
+        """
+        # Arrange
+        leadership = self.build_leadership(f"sqlite:///{tmp_path / 'jobs.db'}")
+        connection = MagicMock()
+        connection.execute.side_effect = Exception("connection lost")
+
+        # Act
+        with (
+            patch.object(
+                core_scheduler.core_database,
+                "hold_advisory_lock",
+                side_effect=[connection, None],
+            ),
+            patch.object(core_scheduler.core_logger, "print_to_log_and_console"),
+            patch.object(core_scheduler.core_logger, "print_to_log"),
+        ):
+            leadership.elect()
+            elected = leadership.elect()
+
+        # Assert
+        assert elected is False
+        connection.invalidate.assert_called_once()
+        assert leadership.scheduler.state == STATE_PAUSED
+        leadership.scheduler.shutdown(wait=False)
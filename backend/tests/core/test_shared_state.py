@@ -0,0 +1,229 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import core.rate_limit as core_rate_limit
+import core.shared_state as core_shared_state
+
+import auth.schema as auth_schema
+import garmin.schema as garmin_schema
+import profile.schema as profile_schema
+
+
+class TestMemoryState:
+    """
+    Test suite for the in-process shared state semantics shared by every backend.
+    """
+
+    def test_entries_expire(self):
+        """
+        Test that entries are no longer returned once expired.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+
+        # Act
+        state.set("kept", {"a": 1}, 60)
+        state.set("expired", 1, 0)
+
+        # Assert
+        assert state.get("kept") == {"a": 1}
+        assert state.get("expired") is None
+        assert state.get_expiry("expired") is None
+
+    def test_incr_keeps_window_until_expired(self):
+        """
+        Test that incr sets the expiration only when it creates the counter.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+
+        # Act
+        first = state.incr("counter", 1, 60)
+        expiry = state.get_expiry("counter")
+        second = state.incr("counter", 2, 120)
+        state.incr("short", 5, 0)
+        restarted = state.incr("short", 1, 60)
+
+        # Assert
+        assert (first, second) == (1, 3)
+        assert state.get_expiry("counter") == expiry
+        assert restarted == 1
+
+    def test_compare_and_delete(self):
+        """
+        Test that compare_and_delete only removes the expected value.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        state.set("code", "123456", 60)
+
+        # Act
+        mismatch = state.compare_and_delete("code", "654321")
+        match = state.compare_and_delete("code", "123456")
+
+        # Assert
+        assert mismatch is False
+        assert match is True
+        assert state.get("code") is None
+
+    def test_clear_and_delete_expired(self):
+        """
+        Test that clear only removes the prefix and delete_expired the expired entries.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        state.set("a:1", 1, 60)
+        state.set("a:2", 2, 60)
+        state.set("b:1", 3, 60)
+        state.set("b:2", 4, 0)
+
+        # Act
+        cleared = state.clear("a:")
+        expired = state.delete_expired()
+
+        # Assert
+        assert (cleared, expired) == (2, 1)
+        assert state.get("b:1") == 3
+
+
+class TestCreateSharedState:
+    """
+    Test suite for the shared state backend selection.
+    """
+
+    def test_redis_without_client_falls_back_to_postgres(self):
+        """
+        Test that a missing redis package does not prevent the startup.
+        """
+        # Arrange & Act
+        with (
+            patch.object(
+                core_shared_state.RedisState,
+                "__init__",
+                side_effect=ImportError("No module named 'redis'"),
+            ),
+            patch.object(core_shared_state.core_logger, "print_to_log_and_console"),
+        ):
+            state = core_shared_state.create_shared_state("redis")
+
+        # Assert
+        assert isinstance(state, core_shared_state.PostgresState)
+
+    def test_redis_state_encodes_values(self):
+        """
+        Test that the Redis backend namespaces keys and encodes values as JSON.
+        """
+        # Arrange
+        client = MagicMock()
+        client.get.return_value = b'{"a":1}'
+        state = core_shared_state.RedisState("redis://", client=client)
+
+        # Act
+        state.set("key", {"a": 1}, 1.5)
+        value = state.get("key")
+
+        # Assert
+        client.set.assert_called_once_with("endurain:key", '{"a":1}', px=1500)
+        assert value == {"a": 1}
+
+
+class TestSharedStateStorage:
+    """
+    Test suite for the rate limiter storage backed by the shared state.
+    """
+
+    def test_counters_live_in_the_shared_state(self):
+        """
+        Test that the limiter counters are shared through the shared state.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        storage = core_rate_limit.SharedStateStorage("endurain://")
+
+        # Act
+        with patch.object(
+            core_rate_limit.core_shared_state, "get_shared_state", return_value=state
+        ):
+            storage.incr("login/1.2.3.4", 60)
+            count = storage.incr("login/1.2.3.4", 60)
+            value = storage.get("login/1.2.3.4")
+            expiry = storage.get_expiry("login/1.2.3.4")
+            storage.reset()
+            reset_value = storage.get("login/1.2.3.4")
+
+        # Assert
+        assert (count, value) == (2, 2)
+        assert state.get("rate_limit:login/1.2.3.4") is None
+        assert time.time() < expiry <= time.time() + 60
+        assert reset_value == 0
+
+    def test_limiter_uses_the_shared_storage(self):
+        """
+        Test that the limiter is configured with the shared state storage.
+        """
+        # Assert
+        assert isinstance(
+            core_rate_limit.limiter._storage, core_rate_limit.SharedStateStorage
+        )
+
+
+class TestMFAStores:
+    """
+    Test suite for the MFA stores kept in the shared state.
+    """
+
+    def test_stores_share_entries_between_instances(self):
+        """
+        Test that an entry added by one worker's store is seen by another's.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+
+        # Act
+        with (
+            patch.object(core_shared_state, "get_shared_state", return_value=state),
+            patch.object(
+                profile_schema.core_cryptography,
+                "encrypt_token_fernet",
+                side_effect=lambda secret: f"encrypted:{secret}",
+            ),
+            patch.object(
+                profile_schema.core_cryptography,
+                "decrypt_token_fernet",
+                side_effect=lambda secret: secret.removeprefix("encrypted:"),
+            ),
+            patch.object(profile_schema.core_logger, "print_to_log"),
+        ):
+            auth_schema.PendingMFALogin().add_pending_login("alice", 1)
+            garmin_schema.MFACodeStore().add_code(1, "123456")
+            profile_schema.MFASecretStore().add_secret(1, "SECRET")
+
+            pending = auth_schema.PendingMFALogin().get_pending_login("alice")
+            code = garmin_schema.MFACodeStore().get_code(1)
+            secret = profile_schema.MFASecretStore().get_secret(1)
+            stored_secret = state.get("mfa_secret:1")
+
+        # Assert
+        assert (pending, code, secret) == (1, "123456", "SECRET")
+        assert stored_secret == "encrypted:SECRET"
+
+    def test_garmin_code_is_only_deleted_if_unchanged(self):
+        """
+        Test that consuming a code keeps a newer code submitted meanwhile.
+        """
+        # Arrange
+        state = core_shared_state.MemoryState()
+        store = garmin_schema.MFACodeStore()
+
+        # Act
+        with patch.object(core_shared_state, "get_shared_state", return_value=state):
+            store.add_code(1, "111111")
+            store.add_code(1, "222222")
+            store.delete_code(1, "111111")
+            kept = store.has_code(1)
+            store.delete_code(1)
+            deleted = not store.has_code(1)
+
+        # Assert
+        assert kept is True
+        assert deleted is True
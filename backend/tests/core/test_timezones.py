@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo, available_timezones
+
+import core.timezones as core_timezones
+
+
+class TestTimezoneAt:
+    """
+    Test suite for the shared timezone lookup.
+    """
+
+    def test_known_coordinates(self):
+        """
+        Test the timezone of well known coordinates.
+        """
+        # Assert
+        assert core_timezones.timezone_at(38.7223, -9.1393) == "Europe/Lisbon"
+        assert core_timezones.timezone_at(40.7128, -74.0060) == "America/New_York"
+
+    def test_finder_is_shared(self):
+        """
+        Test that a single TimezoneFinder instance is created.
+        """
+        # Assert
+        assert (
+            core_timezones.get_timezone_finder() is core_timezones.get_timezone_finder()
+        )
+
+    def test_lookups_are_memoized_on_rounded_coordinates(self):
+        """
+        Test that nearby coordinates reuse the cached lookup.
+        """
+        # Arrange
+        core_timezones._timezone_at_rounded.cache_clear()
+
+        # Act
+        core_timezones.timezone_at(38.72231, -9.13931)
+        core_timezones.timezone_at(38.72229, -9.13929)
+
+        # Assert
+        cache_info = core_timezones._timezone_at_rounded.cache_info()
+        assert cache_info.misses == 1
+        assert cache_info.hits == 1
+
+
+class TestFindTimezoneName:
+    """
+    Test suite for the UTC offset timezone lookup.
+    """
+
+    def test_offset_matches_zone_at_reference_date(self):
+        """
+        Test that the returned zone uses the offset at the reference date.
+        """
+        # Arrange
+        summer = datetime(2024, 7, 1, 10, tzinfo=timezone(timedelta(hours=2)))
+        winter = datetime(2024, 1, 15, 10, tzinfo=timezone(timedelta(hours=-5)))
+
+        # Act
+        summer_zone = core_timezones.find_timezone_name(7200, summer)
+        winter_zone = core_timezones.find_timezone_name(-18000, winter)
+
+        # Assert
+        assert summer.astimezone(ZoneInfo(summer_zone)).utcoffset() == timedelta(
+            hours=2
+        )
+        assert winter.astimezone(ZoneInfo(winter_zone)).utcoffset() == timedelta(
+            hours=-5
+        )
+
+    def test_candidates_match_brute_force_around_transition(self):
+        """
+        Test the index against every zone right before and after a DST change.
+        """
+        # Arrange
+        transition = datetime(2024, 3, 31, 1, 0, tzinfo=timezone.utc)
+
+        for moment in (transition - timedelta(minutes=1), transition):
+            expected = {
+                zone_name
+                for zone_name in available_timezones()
+                if moment.astimezone(ZoneInfo(zone_name)).utcoffset()
+                == timedelta(hours=1)
+            }
+
+            # Act
+            candidates = core_timezones.get_timezones_for_offset(3600, moment)
+
+            # Assert
+            assert set(candidates) == expected
+
+    def test_preferred_timezones_win(self):
+        """
+        Test that the user's previous timezones are preferred.
+        """
+        # Arrange
+        reference_date = datetime(2024, 7, 1, 10, tzinfo=timezone(timedelta(hours=1)))
+
+        # Act
+        zone_name = core_timezones.find_timezone_name(
+            3600, reference_date, ["America/New_York", "Europe/Lisbon"]
+        )
+
+        # Assert
+        assert zone_name == "Europe/Lisbon"
+
+    def test_area_zones_preferred_over_etc(self):
+        """
+        Test that area based zone names are returned before Etc zones.
+        """
+        # Arrange
+        reference_date = datetime(2024, 7, 1, 10, tzinfo=timezone(timedelta(hours=14)))
+
+        # Act
+        zone_name = core_timezones.find_timezone_name(50400, reference_date)
+
+        # Assert
+        assert zone_name == "Pacific/Kiritimati"
+
+    def test_naive_or_unknown_offset_returns_none(self):
+        """
+        Test that naive dates and unused offsets return None.
+        """
+        # Assert
+        assert core_timezones.find_timezone_name(0, datetime(2024, 7, 1)) is None
+        assert (
+            core_timezones.find_timezone_name(
+                12345, datetime(2024, 7, 1, tzinfo=timezone.utc)
+            )
+            is None
+        )
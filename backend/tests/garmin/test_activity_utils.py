@@ -0,0 +1,171 @@
+import asyncio
+import io
+import zipfile
+from datetime import datetime, timedelta, timezone
+from unittest.mock import MagicMock, patch
+
+import garmin.activity_utils as garmin_activity_utils
+
+
+class TestGetSyncStartDate:
+    """
+    Test suite for the Garmin Connect sync watermark window.
+    """
+
+    now = datetime(2024, 7, 10, 12, tzinfo=timezone.utc)
+
+    def test_without_watermark_uses_requested_days(self):
+        """
+        Test that users never synced get the requested window.
+        """
+        # Assert
+        assert garmin_activity_utils.get_sync_start_date(
+            None, 1, self.now
+        ) == self.now - timedelta(days=1)
+
+    def test_recent_watermark_keeps_requested_days(self):
+        """
+        Test that a recent watermark still covers activities uploaded late.
+        """
+        # Arrange
+        synced_at = datetime(2024, 7, 10, 11)
+
+        # Assert
+        assert garmin_activity_utils.get_sync_start_date(
+            synced_at, 1, self.now
+        ) == self.now - timedelta(days=1)
+
+    def test_old_watermark_catches_up(self):
+        """
+        Test that missed runs are caught up, bounded by MAX_CATCH_UP_DAYS.
+        """
+        # Arrange
+        synced_at = datetime(2024, 7, 5, 8)
+        very_old_synced_at = datetime(2023, 1, 1)
+
+        # Assert
+        assert garmin_activity_utils.get_sync_start_date(
+            synced_at, 1, self.now
+        ) == synced_at.replace(tzinfo=timezone.utc)
+        assert garmin_activity_utils.get_sync_start_date(
+            very_old_synced_at, 1, self.now
+        ) == self.now - timedelta(days=garmin_activity_utils.MAX_CATCH_UP_DAYS)
+
+
+class TestFetchAndProcessActivitiesByDates:
+    """
+    Test suite for fetch_and_process_activities_by_dates function.
+    """
+
+    def test_stored_activities_checked_in_one_query(self, mock_db):
+        """
+        Test that stored activities are skipped and the watermark is stored.
+        """
+        # Arrange
+        client = MagicMock()
+        client.get_activities_by_date.return_value = [
+            {"activityId": 1, "activityName": "Run"},
+            {"activityId": 2, "activityName": "Ride"},
+        ]
+        synced_at = datetime(2024, 7, 10, 12)
+
+        with patch.object(
+            garmin_activity_utils.activities_crud,
+            "get_garminconnect_activity_ids_from_user_id",
+            return_value={1, 2},
+        ) as mock_stored_ids, patch.object(
+            garmin_activity_utils.user_integrations_crud,
+            "set_user_garminconnect_activities_synced_at",
+        ) as mock_set_synced_at:
+            # Act
+            result = asyncio.run(
+                garmin_activity_utils.fetch_and_process_activities_by_dates(
+                    client,
+                    datetime(2024, 7, 9, tzinfo=timezone.utc),
+                    datetime(2024, 7, 10, tzinfo=timezone.utc),
+                    7,
+                    MagicMock(),
+                    mock_db,
+                    synced_at,
+                )
+            )
+
+        # Assert
+        assert result is None
+        mock_stored_ids.assert_called_once_with([1, 2], 7, mock_db)
+        client.download_activity.assert_not_called()
+        mock_set_synced_at.assert_called_once_with(7, synced_at, mock_db)
+
+    def test_watermark_not_stored_when_fetch_fails(self, mock_db):
+        """
+        Test that a failed fetch keeps the previous watermark.
+        """
+        # Arrange
+        client = MagicMock()
+        client.get_activities_by_date.side_effect = Exception("Garmin error")
+
+        with patch.object(
+            garmin_activity_utils.user_integrations_crud,
+            "set_user_garminconnect_activities_synced_at",
+        ) as mock_set_synced_at:
+            # Act
+            result = asyncio.run(
+                garmin_activity_utils.fetch_and_process_activities_by_dates(
+                    client,
+                    datetime(2024, 7, 9, tzinfo=timezone.utc),
+                    datetime(2024, 7, 10, tzinfo=timezone.utc),
+                    7,
+                    MagicMock(),
+                    mock_db,
+                    datetime(2024, 7, 10, 12),
+                )
+            )
+
+        # Assert
+        assert result is None
+        mock_set_synced_at.assert_not_called()
+
+    def test_downloaded_zip_parsed_from_memory(self, mock_db, tmp_path):
+        """
+        Test that ZIP entries are passed to the parser without extracting them.
+        """
+        # Arrange
+        zip_buffer = io.BytesIO()
+        with zipfile.ZipFile(zip_buffer, "w") as zip_file:
+            zip_file.writestr("123_ACTIVITY.fit", b"fit data")
+
+        client = MagicMock()
+        client.get_activities_by_date.return_value = [
+            {"activityId": 123, "activityName": "Run"}
+        ]
+        client.download_activity.return_value = zip_buffer.getvalue()
+        stored_activity = MagicMock()
+
+        with patch.object(
+            garmin_activity_utils.activities_crud,
+            "get_garminconnect_activity_ids_from_user_id",
+            return_value=set(),
+        ), patch.object(
+            garmin_activity_utils.activities_utils,
+            "parse_and_store_activity_from_file",
+            return_value=[stored_activity],
+        ) as mock_parse_and_store, patch.object(
+            garmin_activity_utils.core_config, "FILES_DIR", str(tmp_path)
+        ):
+            # Act
+            result = asyncio.run(
+                garmin_activity_utils.fetch_and_process_activities_by_dates(
+                    client,
+                    datetime(2024, 7, 9, tzinfo=timezone.utc),
+                    datetime(2024, 7, 10, tzinfo=timezone.utc),
+                    7,
+                    MagicMock(),
+                    mock_db,
+                )
+            )
+
+        # Assert
+        assert result == [stored_activity]
+        assert mock_parse_and_store.call_args.args[1] == "123_ACTIVITY.fit"
+        assert mock_parse_and_store.call_args.args[-1] == b"fit data"
+        assert list(tmp_path.iterdir()) == []
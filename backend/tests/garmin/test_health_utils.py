@@ -0,0 +1,144 @@
+import threading
+import time
+from datetime import datetime, timezone
+from unittest.mock import MagicMock, patch
+
+import garmin.health_utils as garmin_health_utils
+
+
+def garmin_sleep_data(date_string: str) -> dict:
+    return {
+        "dailySleepDTO": {
+            "id": 1,
+            "calendarDate": date_string,
+            "sleepTimeSeconds": 28800,
+            "sleepStartTimestampGMT": 1705276800000,
+            "sleepEndTimestampGMT": 1705305600000,
+        },
+        "sleepLevels": [
+            {
+                "activityLevel": 0,
+                "startGMT": "2024-01-15T00:00:00.0",
+                "endGMT": "2024-01-15T01:00:00.0",
+            }
+        ],
+    }
+
+
+class TestFetchAndProcessSleepByDates:
+    """
+    Test suite for the Garmin Connect sleep fetch.
+    """
+
+    start_date = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    end_date = datetime(2024, 1, 10, tzinfo=timezone.utc)
+
+    @patch.object(garmin_health_utils.health_sleep_crud, "bulk_upsert_health_sleep")
+    def test_days_are_fetched_concurrently_and_upserted_once(self, mock_upsert):
+        """
+        Test that days are fetched by several workers and stored in one upsert.
+        """
+        # Arrange
+        lock = threading.Lock()
+        in_flight = 0
+        max_in_flight = 0
+
+        def get_sleep_data(date_string):
+            nonlocal in_flight, max_in_flight
+            with lock:
+                in_flight += 1
+                max_in_flight = max(max_in_flight, in_flight)
+            time.sleep(0.02)
+            with lock:
+                in_flight -= 1
+            # Days without sleep data are skipped
+            if date_string == "2024-01-05":
+                return {"dailySleepDTO": None}
+            return garmin_sleep_data(date_string)
+
+        client = MagicMock()
+        client.get_sleep_data.side_effect = get_sleep_data
+        mock_upsert.return_value = 9
+        db = MagicMock()
+
+        # Act
+        with patch.object(
+            garmin_health_utils.core_config, "GARMINCONNECT_HEALTH_FETCH_WORKERS", 3
+        ):
+            result = garmin_health_utils.fetch_and_process_sleep_by_dates(
+                client, self.start_date, self.end_date, 1, db
+            )
+
+        # Assert
+        assert result == 9
+        assert client.get_sleep_data.call_count == 10
+        assert 1 < max_in_flight <= 3
+        mock_upsert.assert_called_once()
+        user_id, health_sleep_entries, upsert_db = mock_upsert.call_args[0]
+        assert user_id == 1
+        assert upsert_db is db
+        assert [str(entry.date) for entry in health_sleep_entries] == [
+            f"2024-01-{day:02d}" for day in range(1, 11) if day != 5
+        ]
+        assert health_sleep_entries[0].sleep_stages[0].duration_seconds == 3600
+
+    @patch.object(garmin_health_utils.health_sleep_crud, "bulk_upsert_health_sleep")
+    def test_failed_days_are_skipped(self, mock_upsert):
+        """
+        Test that a failing day does not stop the other days from being stored.
+        """
+        # Arrange
+        client = MagicMock()
+        client.get_sleep_data.side_effect = [
+            Exception("API error"),
+            garmin_sleep_data("2024-01-02"),
+        ]
+        mock_upsert.return_value = 1
+
+        # Act
+        result = garmin_health_utils.fetch_and_process_sleep_by_dates(
+            client,
+            self.start_date,
+            datetime(2024, 1, 2, tzinfo=timezone.utc),
+            1,
+            MagicMock(),
+        )
+
+        # Assert
+        assert result == 1
+        health_sleep_entries = mock_upsert.call_args[0][1]
+        assert [str(entry.date) for entry in health_sleep_entries] == ["2024-01-02"]
+
+
+class TestFetchAndProcessDsByDates:
+    """
+    Test suite for the Garmin Connect daily steps fetch.
+    """
+
+    @patch.object(garmin_health_utils.health_steps_crud, "bulk_upsert_health_steps")
+    def test_steps_are_upserted_in_one_call(self, mock_upsert):
+        """
+        Test that the daily steps are stored with a single bulk upsert.
+        """
+        # Arrange
+        client = MagicMock()
+        client.get_daily_steps.return_value = [
+            {"calendarDate": "2024-01-01", "totalSteps": 8000},
+            {"calendarDate": "2024-01-02", "totalSteps": None},
+            {"calendarDate": "2024-01-03", "totalSteps": 12000},
+        ]
+        mock_upsert.return_value = 2
+
+        # Act
+        result = garmin_health_utils.fetch_and_process_ds_by_dates(
+            client,
+            datetime(2024, 1, 1, tzinfo=timezone.utc),
+            datetime(2024, 1, 3, tzinfo=timezone.utc),
+            1,
+            MagicMock(),
+        )
+
+        # Assert
+        assert result == 2
+        health_steps_entries = mock_upsert.call_args[0][1]
+        assert [entry.steps for entry in health_steps_entries] == [8000, 12000]
@@ -0,0 +1,246 @@
+from unittest.mock import patch
+
+import pytest
+
+import geocoding.utils as geocoding_utils
+
+import core.config as core_config
+
+LOCATION = {"city": "Lisboa", "town": "Lisboa", "country": "Portugal"}
+
+
+@pytest.fixture(autouse=True)
+def clear_location_cache():
+    """
+    Start every test with an empty in-process cache.
+    """
+    geocoding_utils.location_cache.clear()
+    yield
+    geocoding_utils.location_cache.clear()
+
+
+class TestGetCellKey:
+    """
+    Test suite for reverse geocoding cell keys.
+    """
+
+    def test_nearby_coordinates_share_a_cell(self, monkeypatch):
+        """
+        Test that coordinates within the precision map to the same cell.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_PROVIDER", "nominatim")
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_PRECISION", 3)
+
+        # Act
+        first = geocoding_utils.get_cell_key(38.71234, -9.13901)
+        second = geocoding_utils.get_cell_key(38.71201, -9.13949)
+        third = geocoding_utils.get_cell_key(38.7136, -9.139)
+
+        # Assert
+        assert first == "nominatim:3:38.712:-9.139"
+        assert second == first
+        assert third != first
+
+    def test_negative_zero_cell(self, monkeypatch):
+        """
+        Test that coordinates rounding to zero share the same cell.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_PRECISION", 2)
+
+        # Assert
+        assert geocoding_utils.get_cell_key(
+            -0.001, 0.001
+        ) == geocoding_utils.get_cell_key(0.001, -0.001)
+
+
+class TestLocationLRUCache:
+    """
+    Test suite for the in-process location cache.
+    """
+
+    def test_evicts_least_recently_used(self):
+        """
+        Test that the least recently used cell is evicted first.
+        """
+        # Arrange
+        cache = geocoding_utils.LocationLRUCache(2, 60)
+        cache.set("a", LOCATION)
+        cache.set("b", LOCATION)
+        cache.get("a")
+
+        # Act
+        cache.set("c", LOCATION)
+
+        # Assert
+        assert cache.get("a") == LOCATION
+        assert cache.get("b") is None
+        assert cache.get("c") == LOCATION
+
+    def test_expired_entries_are_ignored(self):
+        """
+        Test that expired cells are not returned.
+        """
+        # Arrange
+        cache = geocoding_utils.LocationLRUCache(2, -1)
+        cache.set("a", LOCATION)
+
+        # Assert
+        assert cache.get("a") is None
+
+
+class TestGetLocation:
+    """
+    Test suite for cached reverse geocoding.
+    """
+
+    def test_provider_is_called_once_per_cell(self, monkeypatch):
+        """
+        Test that repeated lookups in the same cell hit the caches.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        with patch.object(
+            geocoding_utils, "_get_db_cached_locations", return_value={}
+        ), patch.object(
+            geocoding_utils, "_store_db_cached_locations"
+        ) as store, patch.object(
+            geocoding_utils, "fetch_location_from_provider", return_value=LOCATION
+        ) as fetch:
+            # Act
+            results = [
+                geocoding_utils.get_location(38.7121 + index / 1e5, -9.139)
+                for index in range(5)
+            ]
+
+        # Assert
+        assert results == [LOCATION] * 5
+        fetch.assert_called_once()
+        store.assert_called_once()
+
+    def test_database_cache_is_used_before_provider(self, monkeypatch):
+        """
+        Test that cells cached in the database skip the provider.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        cell_key = geocoding_utils.get_cell_key(38.712, -9.139)
+        with patch.object(
+            geocoding_utils,
+            "_get_db_cached_locations",
+            return_value={cell_key: LOCATION},
+        ), patch.object(geocoding_utils, "fetch_location_from_provider") as fetch:
+            # Act
+            location = geocoding_utils.get_location(38.712, -9.139)
+
+        # Assert
+        assert location == LOCATION
+        fetch.assert_not_called()
+
+    def test_disabled_provider_is_not_cached(self, monkeypatch):
+        """
+        Test that empty results from a disabled provider are not cached.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        with patch.object(
+            geocoding_utils, "_get_db_cached_locations", return_value={}
+        ), patch.object(
+            geocoding_utils, "_store_db_cached_locations"
+        ) as store, patch.object(
+            geocoding_utils, "fetch_location_from_provider", return_value=None
+        ):
+            # Act
+            location = geocoding_utils.get_location(38.712, -9.139)
+
+        # Assert
+        assert location == {"city": None, "town": None, "country": None}
+        store.assert_not_called()
+
+
+class TestPrefillLocationCache:
+    """
+    Test suite for the bulk cache prefill.
+    """
+
+    def test_prefill_requests_each_missing_cell_once(self, monkeypatch):
+        """
+        Test that only uncached cells are requested, once each.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        cached_key = geocoding_utils.get_cell_key(41.15, -8.61)
+        coordinates = [(38.7121, -9.139), (38.7122, -9.139), (41.15, -8.61), (None, 1)]
+        with patch.object(
+            geocoding_utils,
+            "_get_db_cached_locations",
+            return_value={cached_key: LOCATION},
+        ), patch.object(
+            geocoding_utils, "_store_db_cached_locations"
+        ) as store, patch.object(
+            geocoding_utils, "fetch_location_from_provider", return_value=LOCATION
+        ) as fetch:
+            # Act
+            fetched = geocoding_utils.prefill_location_cache(coordinates)
+
+        # Assert
+        assert fetched == 1
+        fetch.assert_called_once_with(38.7121, -9.139)
+        assert list(store.call_args.args[0]) == [
+            geocoding_utils.get_cell_key(38.7121, -9.139)
+        ]
+        assert geocoding_utils.location_cache.get(cached_key) == LOCATION
+
+    def test_prefill_stores_cells_in_chunks(self, monkeypatch):
+        """
+        Test that resolved cells are written as they resolve, shared cells first.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        monkeypatch.setattr(geocoding_utils, "PREFILL_STORE_BATCH_SIZE", 2)
+        coordinates = [(float(index), 0.0) for index in range(5)] + [(4.0, 0.0)]
+        with patch.object(
+            geocoding_utils, "_get_db_cached_locations", return_value={}
+        ), patch.object(
+            geocoding_utils, "_store_db_cached_locations"
+        ) as store, patch.object(
+            geocoding_utils, "fetch_location_from_provider", return_value=LOCATION
+        ) as fetch:
+            # Act
+            fetched = geocoding_utils.prefill_location_cache(coordinates)
+
+        # Assert
+        assert fetched == 5
+        assert fetch.call_args_list[0].args == (4.0, 0.0)
+        assert [len(call.args[0]) for call in store.call_args_list] == [2, 2, 1]
+
+    def test_prefill_stops_at_the_time_limit(self, monkeypatch):
+        """
+        Test that no cell is requested after max_seconds, resolved cells are kept.
+        """
+        # Arrange
+        monkeypatch.setattr(core_config, "REVERSE_GEO_CACHE_TTL_DAYS", 30)
+        clock = {"now": 0.0}
+        monkeypatch.setattr(geocoding_utils.time, "monotonic", lambda: clock["now"])
+
+        def slow_fetch(latitude, longitude):
+            clock["now"] += 11
+            return LOCATION
+
+        with patch.object(
+            geocoding_utils, "_get_db_cached_locations", return_value={}
+        ), patch.object(
+            geocoding_utils, "_store_db_cached_locations"
+        ) as store, patch.object(
+            geocoding_utils, "fetch_location_from_provider", side_effect=slow_fetch
+        ) as fetch:
+            # Act
+            fetched = geocoding_utils.prefill_location_cache(
+                [(1.0, 0.0), (2.0, 0.0), (3.0, 0.0)], max_seconds=10
+            )
+
+        # Assert
+        assert fetched == 1
+        fetch.assert_called_once()
+        store.assert_called_once()
@@ -4,6 +4,7 @@ from decimal import Decimal
 from unittest.mock import MagicMock, patch
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
 
 import health_sleep.crud as health_sleep_crud
 import health_sleep.schema as health_sleep_schema
@@ -433,6 +434,116 @@ class TestEditHealthSleep:
         mock_db.rollback.assert_called_once()
 
 
+class TestBulkUpsertHealthSleep:
+    """
+    Test suite for bulk_upsert_health_sleep function.
+    """
+
+    def test_bulk_upsert_health_sleep_success(self, mock_db):
+        """
+        Test entries are written with a single ON CONFLICT statement and commit.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, 15), total_sleep_seconds=28000
+            ),
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, 16), total_sleep_seconds=27000
+            ),
+        ]
+
+        # Act
+        result = health_sleep_crud.bulk_upsert_health_sleep(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 2
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, date) DO UPDATE" in sql
+        assert "total_sleep_seconds = excluded.total_sleep_seconds" in sql
+
+    def test_bulk_upsert_health_sleep_keeps_last_entry_per_date(self, mock_db):
+        """
+        Test entries sharing a date are collapsed into the last one.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, 15), total_sleep_seconds=28000
+            ),
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, 15), total_sleep_seconds=27000
+            ),
+        ]
+
+        # Act
+        result = health_sleep_crud.bulk_upsert_health_sleep(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 1
+        params = (
+            mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+        )
+        assert params["total_sleep_seconds_m0"] == entries[1].total_sleep_seconds
+
+    @patch.object(health_sleep_crud, "UPSERT_BATCH_SIZE", 2)
+    def test_bulk_upsert_health_sleep_batches_statements(self, mock_db):
+        """
+        Test large inputs are split into several statements in one transaction.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, day), total_sleep_seconds=28000
+            )
+            for day in range(1, 6)
+        ]
+
+        # Act
+        result = health_sleep_crud.bulk_upsert_health_sleep(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 5
+        assert mock_db.execute.call_count == 3
+        mock_db.commit.assert_called_once()
+
+    def test_bulk_upsert_health_sleep_empty(self, mock_db):
+        """
+        Test an empty list does not touch the database.
+        """
+        # Act
+        result = health_sleep_crud.bulk_upsert_health_sleep(1, [], mock_db)
+
+        # Assert
+        assert result == 0
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    def test_bulk_upsert_health_sleep_exception(self, mock_db):
+        """
+        Test exception handling in bulk_upsert_health_sleep.
+        """
+        # Arrange
+        entries = [
+            health_sleep_schema.HealthSleep(
+                date=datetime_date(2024, 1, 15), total_sleep_seconds=28000
+            )
+        ]
+        mock_db.execute.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            health_sleep_crud.bulk_upsert_health_sleep(1, entries, mock_db)
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_db.rollback.assert_called_once()
+
+
 class TestDeleteHealthSleep:
     """
     Test suite for delete_health_sleep function.
@@ -3,6 +3,7 @@ from datetime import date as datetime_date
 from unittest.mock import MagicMock, patch
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
 
 import health_steps.crud as health_steps_crud
 import health_steps.schema as health_steps_schema
@@ -452,6 +453,114 @@ class TestEditHealthSteps:
         mock_db.rollback.assert_called_once()
 
 
+class TestBulkUpsertHealthSteps:
+    """
+    Test suite for bulk_upsert_health_steps function.
+    """
+
+    def test_bulk_upsert_health_steps_success(self, mock_db):
+        """
+        Test entries are written with a single ON CONFLICT statement and commit.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_steps_schema.HealthSteps(
+                date=datetime_date(2024, 1, 15), steps=8000
+            ),
+            health_steps_schema.HealthSteps(
+                date=datetime_date(2024, 1, 16), steps=9000
+            ),
+        ]
+
+        # Act
+        result = health_steps_crud.bulk_upsert_health_steps(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 2
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, date) DO UPDATE" in sql
+        assert "steps = excluded.steps" in sql
+
+    def test_bulk_upsert_health_steps_keeps_last_entry_per_date(self, mock_db):
+        """
+        Test entries sharing a date are collapsed into the last one.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_steps_schema.HealthSteps(
+                date=datetime_date(2024, 1, 15), steps=8000
+            ),
+            health_steps_schema.HealthSteps(
+                date=datetime_date(2024, 1, 15), steps=9000
+            ),
+        ]
+
+        # Act
+        result = health_steps_crud.bulk_upsert_health_steps(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 1
+        params = (
+            mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+        )
+        assert params["steps_m0"] == entries[1].steps
+
+    @patch.object(health_steps_crud, "UPSERT_BATCH_SIZE", 2)
+    def test_bulk_upsert_health_steps_batches_statements(self, mock_db):
+        """
+        Test large inputs are split into several statements in one transaction.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_steps_schema.HealthSteps(
+                date=datetime_date(2024, 1, day), steps=8000
+            )
+            for day in range(1, 6)
+        ]
+
+        # Act
+        result = health_steps_crud.bulk_upsert_health_steps(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 5
+        assert mock_db.execute.call_count == 3
+        mock_db.commit.assert_called_once()
+
+    def test_bulk_upsert_health_steps_empty(self, mock_db):
+        """
+        Test an empty list does not touch the database.
+        """
+        # Act
+        result = health_steps_crud.bulk_upsert_health_steps(1, [], mock_db)
+
+        # Assert
+        assert result == 0
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    def test_bulk_upsert_health_steps_exception(self, mock_db):
+        """
+        Test exception handling in bulk_upsert_health_steps.
+        """
+        # Arrange
+        entries = [
+            health_steps_schema.HealthSteps(date=datetime_date(2024, 1, 15), steps=8000)
+        ]
+        mock_db.execute.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            health_steps_crud.bulk_upsert_health_steps(1, entries, mock_db)
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_db.rollback.assert_called_once()
+
+
 class TestDeleteHealthSteps:
     """
     Test suite for delete_health_steps function.
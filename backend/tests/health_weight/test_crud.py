@@ -3,6 +3,7 @@ from datetime import date as datetime_date
 from unittest.mock import MagicMock, patch
 from fastapi import HTTPException, status
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql
 
 import health_weight.crud as health_weight_crud
 import health_weight.schema as health_weight_schema
@@ -196,6 +197,66 @@ class TestGetHealthWeightWithPagination:
         assert exc_info.value.status_code == (status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class TestGetHealthWeightWithCursor:
+    """
+    Test suite for get_health_weight_with_cursor function.
+    """
+
+    @patch("health_weight.crud.core_pagination.get_cursor_page")
+    def test_get_health_weight_with_cursor_success(self, mock_get_cursor_page, mock_db):
+        """
+        Test that the page is ordered by date and ID, newest first.
+        """
+        # Arrange
+        mock_weight = MagicMock(spec=health_weight_models.HealthWeight)
+        mock_get_cursor_page.return_value = ([mock_weight], "next")
+
+        # Act
+        result = health_weight_crud.get_health_weight_with_cursor(
+            1, mock_db, 5, "cursor"
+        )
+
+        # Assert
+        assert result == ([mock_weight], "next")
+        _, sort_keys, descending, num_records, cursor = (
+            mock_get_cursor_page.call_args.args
+        )
+        assert [key.key for key in sort_keys] == ["date", "id"]
+        assert descending is True
+        assert (num_records, cursor) == (5, "cursor")
+
+    @patch("health_weight.crud.core_pagination.get_cursor_page")
+    def test_get_health_weight_with_cursor_invalid_cursor(
+        self, mock_get_cursor_page, mock_db
+    ):
+        """
+        Test that invalid cursor errors are not turned into 500 errors.
+        """
+        # Arrange
+        mock_get_cursor_page.side_effect = HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid Cursor"
+        )
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            health_weight_crud.get_health_weight_with_cursor(1, mock_db, 5, "bad")
+
+        assert exc_info.value.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+    def test_get_health_weight_with_cursor_exception(self, mock_db):
+        """
+        Test exception handling in get_health_weight_with_cursor.
+        """
+        # Arrange
+        mock_db.query.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            health_weight_crud.get_health_weight_with_cursor(1, mock_db)
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+
+
 class TestGetHealthWeightByDate:
     """
     Test suite for get_health_weight_by_date function.
@@ -476,6 +537,116 @@ class TestEditHealthWeight:
         mock_db.rollback.assert_called_once()
 
 
+class TestBulkUpsertHealthWeight:
+    """
+    Test suite for bulk_upsert_health_weight function.
+    """
+
+    def test_bulk_upsert_health_weight_success(self, mock_db):
+        """
+        Test entries are written with a single ON CONFLICT statement and commit.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=80.0, bmi=24.0
+            ),
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 16), weight=81.0, bmi=24.3
+            ),
+        ]
+
+        # Act
+        result = health_weight_crud.bulk_upsert_health_weight(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 2
+        mock_db.execute.assert_called_once()
+        mock_db.commit.assert_called_once()
+        sql = str(mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, date) DO UPDATE" in sql
+        assert "weight = excluded.weight" in sql
+
+    def test_bulk_upsert_health_weight_keeps_last_entry_per_date(self, mock_db):
+        """
+        Test entries sharing a date are collapsed into the last one.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=80.0, bmi=24.0
+            ),
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=81.0, bmi=24.3
+            ),
+        ]
+
+        # Act
+        result = health_weight_crud.bulk_upsert_health_weight(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 1
+        params = (
+            mock_db.execute.call_args[0][0].compile(dialect=postgresql.dialect()).params
+        )
+        assert params["weight_m0"] == entries[1].weight
+
+    @patch.object(health_weight_crud, "UPSERT_BATCH_SIZE", 2)
+    def test_bulk_upsert_health_weight_batches_statements(self, mock_db):
+        """
+        Test large inputs are split into several statements in one transaction.
+        """
+        # Arrange
+        user_id = 1
+        entries = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, day), weight=80.0, bmi=24.0
+            )
+            for day in range(1, 6)
+        ]
+
+        # Act
+        result = health_weight_crud.bulk_upsert_health_weight(user_id, entries, mock_db)
+
+        # Assert
+        assert result == 5
+        assert mock_db.execute.call_count == 3
+        mock_db.commit.assert_called_once()
+
+    def test_bulk_upsert_health_weight_empty(self, mock_db):
+        """
+        Test an empty list does not touch the database.
+        """
+        # Act
+        result = health_weight_crud.bulk_upsert_health_weight(1, [], mock_db)
+
+        # Assert
+        assert result == 0
+        mock_db.execute.assert_not_called()
+        mock_db.commit.assert_not_called()
+
+    def test_bulk_upsert_health_weight_exception(self, mock_db):
+        """
+        Test exception handling in bulk_upsert_health_weight.
+        """
+        # Arrange
+        entries = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=80.0, bmi=24.0
+            )
+        ]
+        mock_db.execute.side_effect = Exception("Database error")
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            health_weight_crud.bulk_upsert_health_weight(1, entries, mock_db)
+
+        assert exc_info.value.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        mock_db.rollback.assert_called_once()
+
+
 class TestDeleteHealthWeight:
     """
     Test suite for delete_health_weight function.
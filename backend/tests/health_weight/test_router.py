@@ -153,6 +153,55 @@ class TestReadHealthWeightAllPagination:
         mock_get_paginated.assert_called_once_with(1, ANY, 2, 10)
 
 
+class TestReadHealthWeightAllCursor:
+    """
+    Test suite for read_health_weight_all_cursor endpoint.
+    """
+
+    @patch("health_weight.router.health_weight_crud.get_health_weight_number")
+    @patch("health_weight.router.health_weight_crud.get_health_weight_with_cursor")
+    def test_read_health_weight_all_cursor_success(
+        self, mock_get_cursor, mock_get_number, fast_api_client, fast_api_app
+    ):
+        """
+        Test retrieval of a health weight page after a cursor.
+        """
+        # Arrange
+        mock_get_cursor.return_value = ([], "next")
+        mock_get_number.return_value = 20
+
+        # Act
+        response = fast_api_client.get(
+            "/health_weight/num_records/10",
+            params={"cursor": "previous"},
+            headers={"Authorization": "Bearer mock_token"},
+        )
+
+        # Assert
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 20
+        assert data["num_records"] == 10
+        assert data["next_cursor"] == "next"
+        assert data["records"] == []
+        mock_get_cursor.assert_called_once_with(1, ANY, 10, "previous")
+
+    def test_read_health_weight_all_cursor_invalid_num_records(
+        self, fast_api_client, fast_api_app
+    ):
+        """
+        Test that a non positive number of records is rejected.
+        """
+        # Act
+        response = fast_api_client.get(
+            "/health_weight/num_records/0",
+            headers={"Authorization": "Bearer mock_token"},
+        )
+
+        # Assert
+        assert response.status_code == 422
+
+
 class TestCreateHealthWeight:
     """
     Test suite for create_health_weight endpoint.
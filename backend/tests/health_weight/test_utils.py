@@ -140,6 +140,66 @@ class TestCalculateBMI:
             assert abs(result.bmi - expected_bmi) < 0.01
 
 
+class TestCalculateMissingBMIs:
+    """
+    Test suite for calculate_missing_bmis function.
+    """
+
+    @patch("health_weight.utils.users_crud.get_user_by_id")
+    def test_calculate_missing_bmis_loads_user_once(self, mock_get_user):
+        """
+        Test only records without BMI are calculated, with a single user lookup.
+        """
+        # Arrange
+        mock_db = MagicMock(spec=Session)
+        mock_user = MagicMock()
+        mock_user.height = 200
+        mock_get_user.return_value = mock_user
+        health_weights = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=80.0, bmi=None
+            ),
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 16), weight=80.0, bmi=21.0
+            ),
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 17), weight=100.0, bmi=None
+            ),
+        ]
+
+        # Act
+        health_weight_utils.calculate_missing_bmis(health_weights, 1, mock_db)
+
+        # Assert
+        assert [health_weight.bmi for health_weight in health_weights] == [
+            20.0,
+            21.0,
+            25.0,
+        ]
+        mock_get_user.assert_called_once_with(1, mock_db)
+
+    @patch("health_weight.utils.users_crud.get_user_by_id")
+    def test_calculate_missing_bmis_nothing_missing(self, mock_get_user):
+        """
+        Test the user is not loaded when every record has a BMI.
+        """
+        # Arrange
+        health_weights = [
+            health_weight_schema.HealthWeight(
+                date=datetime_date(2024, 1, 15), weight=80.0, bmi=21.0
+            )
+        ]
+
+        # Act
+        health_weight_utils.calculate_missing_bmis(
+            health_weights, 1, MagicMock(spec=Session)
+        )
+
+        # Assert
+        assert health_weights[0].bmi == 21.0
+        mock_get_user.assert_not_called()
+
+
 class TestCalculateBMIAllUserEntries:
     """
     Test suite for calculate_bmi_all_user_entries function.
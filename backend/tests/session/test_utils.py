@@ -1,5 +1,5 @@
 from datetime import datetime, timezone, timedelta
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi import HTTPException, Response
@@ -145,7 +145,7 @@ class TestAuthenticationSecurity:
         ), "Operating system should be set"
         assert updated_session.browser is not None, "Browser should be set"
 
-    def test_authenticate_user_with_valid_credentials(
+    async def test_authenticate_user_with_valid_credentials(
         self, password_hasher, mock_db, sample_user_read
     ):
         """
@@ -177,7 +177,7 @@ class TestAuthenticationSecurity:
         with patch("session.utils.users_crud.authenticate_user") as mock_auth:
             mock_auth.return_value = mock_user_orm
 
-            result = auth_utils.authenticate_user(
+            result = await auth_utils.authenticate_user(
                 "testuser", password, password_hasher, mock_db
             )
 
@@ -185,7 +185,9 @@ class TestAuthenticationSecurity:
             assert result.id == sample_user_read.id, "Should return correct user"
             assert result.username == sample_user_read.username, "Username should match"
 
-    def test_authenticate_user_with_invalid_username(self, password_hasher, mock_db):
+    async def test_authenticate_user_with_invalid_username(
+        self, password_hasher, mock_db
+    ):
         """
         Test that the `auth_utils.authenticate_user` function raises an HTTPException with status code 401
         when provided with an invalid (nonexistent) username. Ensures that the exception detail
@@ -195,14 +197,14 @@ class TestAuthenticationSecurity:
             mock_auth.return_value = None
 
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.authenticate_user(
+                await auth_utils.authenticate_user(
                     "nonexistent", "password", password_hasher, mock_db
                 )
 
             assert exc_info.value.status_code == 401
             assert "username" in exc_info.value.detail.lower()
 
-    def test_authenticate_user_with_invalid_password(
+    async def test_authenticate_user_with_invalid_password(
         self, password_hasher, mock_db, sample_user_read
     ):
         """
@@ -225,14 +227,14 @@ class TestAuthenticationSecurity:
             mock_auth.return_value = mock_user_orm
 
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.authenticate_user(
+                await auth_utils.authenticate_user(
                     "testuser", wrong_password, password_hasher, mock_db
                 )
 
             assert exc_info.value.status_code == 401
             assert "password" in exc_info.value.detail.lower()
 
-    def test_authenticate_user_updates_hash_if_needed(
+    async def test_authenticate_user_updates_hash_if_needed(
         self, password_hasher, mock_db, sample_user_read
     ):
         """
@@ -260,13 +262,15 @@ class TestAuthenticationSecurity:
             with patch("session.utils.users_crud.edit_user_password") as _mock_edit:
                 mock_auth.return_value = mock_user_orm
 
-                result = auth_utils.authenticate_user(
+                result = await auth_utils.authenticate_user(
                     "testuser", password, password_hasher, mock_db
                 )
 
                 assert result is not None, "Authentication should succeed"
 
-    def test_authentication_sql_injection_protection(self, password_hasher, mock_db):
+    async def test_authentication_sql_injection_protection(
+        self, password_hasher, mock_db
+    ):
         """
         Tests that the authentication function is protected against SQL injection attacks.
 
@@ -295,12 +299,12 @@ class TestAuthenticationSecurity:
 
             for username in malicious_usernames:
                 with pytest.raises(HTTPException) as exc_info:
-                    auth_utils.authenticate_user(
+                    await auth_utils.authenticate_user(
                         username, "password", password_hasher, mock_db
                     )
                 assert exc_info.value.status_code == 401
 
-    def test_empty_password_authentication(
+    async def test_empty_password_authentication(
         self, password_hasher, mock_db, sample_user_read
     ):
         """
@@ -321,11 +325,13 @@ class TestAuthenticationSecurity:
             mock_auth.return_value = mock_user_orm
 
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.authenticate_user("testuser", "", password_hasher, mock_db)
+                await auth_utils.authenticate_user(
+                    "testuser", "", password_hasher, mock_db
+                )
 
             assert exc_info.value.status_code == 401
 
-    def test_empty_username_authentication(self, password_hasher, mock_db):
+    async def test_empty_username_authentication(self, password_hasher, mock_db):
         """
         Test that authentication fails with an empty username.
 
@@ -339,13 +345,13 @@ class TestAuthenticationSecurity:
             mock_auth.return_value = None
 
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.authenticate_user(
+                await auth_utils.authenticate_user(
                     "", "RealPassword123!", password_hasher, mock_db
                 )
 
             assert exc_info.value.status_code == 401
 
-    def test_whitespace_password_authentication(
+    async def test_whitespace_password_authentication(
         self, password_hasher, mock_db, sample_user_read
     ):
         """
@@ -373,7 +379,7 @@ class TestAuthenticationSecurity:
             mock_auth.return_value = mock_user_orm
 
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.authenticate_user(
+                await auth_utils.authenticate_user(
                     "testuser", "    ", password_hasher, mock_db
                 )
 
@@ -473,7 +479,7 @@ class TestAuthenticationSecurity:
 
         assert len(session_ids) == 10, "Session IDs should be unique"
 
-    def test_complete_login_for_web_client(
+    async def test_complete_login_for_web_client(
         self, password_hasher, token_manager, mock_db, sample_user_read, mock_request
     ):
         """
@@ -489,8 +495,10 @@ class TestAuthenticationSecurity:
         response = Response()
         mock_request.headers["X-Client-Type"] = "web"
 
-        with patch("session.utils.create_session") as mock_create_session:
-            result = auth_utils.complete_login(
+        with patch(
+            "session.utils.create_session", new_callable=AsyncMock
+        ) as mock_create_session:
+            result = await auth_utils.complete_login(
                 response,
                 mock_request,
                 sample_user_read,
@@ -504,7 +512,7 @@ class TestAuthenticationSecurity:
             assert isinstance(result["session_id"], str), "Session ID should be string"
             mock_create_session.assert_called_once()
 
-    def test_complete_login_for_mobile_client(
+    async def test_complete_login_for_mobile_client(
         self, password_hasher, token_manager, mock_db, sample_user_read, mock_request
     ):
         """
@@ -525,8 +533,10 @@ class TestAuthenticationSecurity:
         response = Response()
         mock_request.headers["X-Client-Type"] = "mobile"
 
-        with patch("session.utils.create_session") as mock_create_session:
-            result = auth_utils.complete_login(
+        with patch(
+            "session.utils.create_session", new_callable=AsyncMock
+        ) as mock_create_session:
+            result = await auth_utils.complete_login(
                 response,
                 mock_request,
                 sample_user_read,
@@ -544,7 +554,7 @@ class TestAuthenticationSecurity:
             assert result["token_type"] == "Bearer", "Token type should be Bearer"
             mock_create_session.assert_called_once()
 
-    def test_complete_login_with_invalid_client_type(
+    async def test_complete_login_with_invalid_client_type(
         self, password_hasher, token_manager, mock_db, sample_user_read, mock_request
     ):
         """
@@ -565,9 +575,9 @@ class TestAuthenticationSecurity:
         """
         response = Response()
 
-        with patch("session.utils.create_session"):
+        with patch("session.utils.create_session", new_callable=AsyncMock):
             with pytest.raises(HTTPException) as exc_info:
-                auth_utils.complete_login(
+                await auth_utils.complete_login(
                     response,
                     mock_request,
                     sample_user_read,
@@ -808,7 +818,7 @@ class TestAuthenticationSecurity:
 
         assert ip == "unknown", "Should return 'unknown' when no client info"
 
-    def test_create_session_creates_and_stores_session(
+    async def test_create_session_creates_and_stores_session(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -834,7 +844,7 @@ class TestAuthenticationSecurity:
         refresh_token = "test-refresh-token"
 
         with patch("session.utils.session_crud.create_session") as mock_create:
-            session_utils.create_session(
+            await session_utils.create_session(
                 session_id,
                 sample_user_read,
                 mock_request,
@@ -871,7 +881,7 @@ class TestAuthenticationSecurity:
                 refresh_token, session_obj.refresh_token
             ), "Hashed token should verify against original"
 
-    def test_create_session_sets_expiration_correctly(
+    async def test_create_session_sets_expiration_correctly(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -898,7 +908,7 @@ class TestAuthenticationSecurity:
                 # Set the expiration days
                 mock_constants.JWT_REFRESH_TOKEN_EXPIRE_DAYS = 30
 
-                session_utils.create_session(
+                await session_utils.create_session(
                     session_id,
                     sample_user_read,
                     mock_request,
@@ -919,7 +929,7 @@ class TestAuthenticationSecurity:
                     timezone.utc
                 ), "Expiration should be in the future"
 
-    def test_edit_session_updates_refresh_token(
+    async def test_edit_session_updates_refresh_token(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -951,7 +961,7 @@ class TestAuthenticationSecurity:
         new_refresh_token = "new-refresh-token"
 
         with patch("session.utils.session_crud.edit_session") as mock_edit:
-            session_utils.edit_session(
+            await session_utils.edit_session(
                 existing_session,
                 mock_request,
                 new_refresh_token,
@@ -986,7 +996,7 @@ class TestAuthenticationSecurity:
                 new_refresh_token, updated_session.refresh_token
             ), "New hashed token should verify against new token"
 
-    def test_edit_session_updates_expiration(
+    async def test_edit_session_updates_expiration(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -1017,7 +1027,7 @@ class TestAuthenticationSecurity:
         new_refresh_token = "new-refresh-token"
 
         with patch("session.utils.session_crud.edit_session") as mock_edit:
-            session_utils.edit_session(
+            await session_utils.edit_session(
                 existing_session,
                 mock_request,
                 new_refresh_token,
@@ -1039,7 +1049,7 @@ class TestAuthenticationSecurity:
                 updated_session.expires_at, datetime
             ), "Expiration should be a datetime"
 
-    def test_edit_session_preserves_created_at(
+    async def test_edit_session_preserves_created_at(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -1070,7 +1080,7 @@ class TestAuthenticationSecurity:
         new_refresh_token = "new-refresh-token"
 
         with patch("session.utils.session_crud.edit_session") as mock_edit:
-            session_utils.edit_session(
+            await session_utils.edit_session(
                 existing_session,
                 mock_request,
                 new_refresh_token,
@@ -1086,7 +1096,7 @@ class TestAuthenticationSecurity:
                 updated_session.created_at == original_created_at
             ), "created_at timestamp should be preserved"
 
-    def test_edit_session_updates_device_information(
+    async def test_edit_session_updates_device_information(
         self, sample_user_read, mock_request, password_hasher, mock_db
     ):
         """
@@ -1120,7 +1130,7 @@ class TestAuthenticationSecurity:
         new_refresh_token = "new-refresh-token"
 
         with patch("session.utils.session_crud.edit_session") as mock_edit:
-            session_utils.edit_session(
+            await session_utils.edit_session(
                 existing_session,
                 mock_request,
                 new_refresh_token,
@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+import strava.activity_utils as strava_activity_utils
+
+
+class TestRetrieveStravaUsersActivitiesForDays:
+    """
+    Test suite for the concurrent Strava sync of every user.
+    """
+
+    def run_sync(self, user_sync, users, is_startup=False):
+        with patch.object(
+            strava_activity_utils, "SessionLocal", MagicMock()
+        ), patch.object(
+            strava_activity_utils.users_crud, "get_all_users", return_value=users
+        ), patch.object(
+            strava_activity_utils,
+            "get_user_garminconnect_activities_by_dates",
+            side_effect=user_sync,
+        ), patch.object(
+            strava_activity_utils.core_config, "STRAVA_SYNC_CONCURRENCY", 2
+        ):
+            asyncio.run(
+                strava_activity_utils.retrieve_strava_users_activities_for_days(
+                    1, is_startup
+                )
+            )
+
+    def test_users_synced_with_bounded_concurrency(self):
+        """
+        Test that every user is synced, at most STRAVA_SYNC_CONCURRENCY at a time.
+        """
+        # Arrange
+        users = [MagicMock(id=user_id) for user_id in range(6)]
+        synced = []
+        running = 0
+        max_running = 0
+
+        async def user_sync(start_date, end_date, user_id, *args):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            synced.append(user_id)
+
+        # Act
+        self.run_sync(user_sync, users)
+
+        # Assert
+        assert sorted(synced) == list(range(6))
+        assert max_running == 2
+
+    def test_failing_user_does_not_stop_others(self):
+        """
+        Test that an error is raised only after every user has been synced.
+        """
+        # Arrange
+        users = [MagicMock(id=user_id) for user_id in range(4)]
+        synced = []
+
+        async def user_sync(start_date, end_date, user_id, *args):
+            if user_id == 0:
+                raise HTTPException(status_code=424, detail="Strava error")
+            synced.append(user_id)
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            self.run_sync(user_sync, users)
+
+        assert exc_info.value.status_code == 424
+        assert sorted(synced) == [1, 2, 3]
@@ -0,0 +1,108 @@
+import asyncio
+from unittest.mock import patch
+
+import strava.rate_limiter as strava_rate_limiter
+
+
+class FakeClock:
+    """
+    Monotonic clock advanced by the fake sleep.
+    """
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_limiter(clock: FakeClock, **kwargs) -> strava_rate_limiter.StravaRateLimiter:
+    return strava_rate_limiter.StravaRateLimiter(
+        clock=clock, sleep=clock.sleep, **kwargs
+    )
+
+
+class TestStravaRateLimiter:
+    """
+    Test suite for the shared Strava token bucket.
+    """
+
+    def test_burst_then_paced(self):
+        """
+        Test that requests beyond the burst are spread over the 15-minute window.
+        """
+        # Arrange
+        clock = FakeClock()
+        limiter = make_limiter(clock, short_limit=90, burst_size=3)
+
+        # Act
+        for _ in range(5):
+            limiter.acquire()
+
+        # Assert, 90 requests per 900 s is one request every 10 s
+        assert clock.sleeps == [10.0, 10.0]
+
+    def test_limits_updated_from_headers(self):
+        """
+        Test that the limits reported by Strava replace the defaults.
+        """
+        # Arrange
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        # Act
+        limiter.update_from_headers(
+            {"X-ReadRateLimit-Usage": "5,50", "X-ReadRateLimit-Limit": "300,3000"},
+            "GET",
+        )
+
+        # Assert
+        assert limiter.short_limit == 300
+        assert limiter.long_limit == 3000
+
+    def test_exhausted_short_limit_waits_for_next_window(self):
+        """
+        Test that an exhausted 15-minute limit blocks until the window resets.
+        """
+        # Arrange
+        clock = FakeClock()
+        limiter = make_limiter(clock)
+
+        with patch.object(
+            strava_rate_limiter.limiter,
+            "get_seconds_until_next_quarter",
+            return_value=120,
+        ):
+            # Act
+            limiter.update_from_headers(
+                {"X-RateLimit-Usage": "100,200", "X-RateLimit-Limit": "100,1000"},
+                "POST",
+            )
+            waited = limiter.acquire()
+
+        # Assert
+        assert waited == 120
+
+    def test_event_loop_thread_never_sleeps(self):
+        """
+        Test that calls made from the event loop consume tokens without sleeping.
+        """
+        # Arrange
+        clock = FakeClock()
+        limiter = make_limiter(clock, burst_size=1)
+
+        async def call_from_loop():
+            limiter({}, "GET")
+            limiter({}, "GET")
+
+        # Act
+        asyncio.run(call_from_loop())
+
+        # Assert
+        assert clock.sleeps == []
+        assert limiter._tokens == -1
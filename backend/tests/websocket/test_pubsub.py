@@ -0,0 +1,248 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+
+import websocket.pubsub as websocket_pubsub
+import websocket.schema as websocket_schema
+import websocket.utils as websocket_utils
+
+
+class FakeConnection:
+    """
+    Async psycopg connection relaying NOTIFY payloads through a queue.
+    """
+
+    def __init__(self, queue: asyncio.Queue):
+        self.queue = queue
+        self.closed = False
+        self.executed = []
+
+    async def execute(self, query, params=None):
+        self.executed.append((query, params))
+        if params is not None:
+            await self.queue.put(params[1])
+
+    async def notifies(self):
+        while True:
+            yield SimpleNamespace(payload=await self.queue.get())
+
+    async def close(self):
+        self.closed = True
+
+
+def create_connect(queue: asyncio.Queue):
+    connections = []
+
+    async def connect(conninfo, autocommit):
+        connection = FakeConnection(queue)
+        connections.append(connection)
+        return connection
+
+    return connect, connections
+
+
+class TestPostgresPubSub:
+    """
+    Test suite for the Postgres LISTEN/NOTIFY backend.
+    """
+
+    def test_published_messages_reach_the_handler(self):
+        """
+        Test that a published message is delivered by the listening worker.
+        """
+
+        # Arrange
+        async def run():
+            queue = asyncio.Queue()
+            connect, connections = create_connect(queue)
+            received = asyncio.Queue()
+
+            async def handler(user_id, message):
+                await received.put((user_id, message))
+
+            pubsub = websocket_pubsub.PostgresPubSub(
+                handler, "conninfo", connect=connect
+            )
+
+            # Act
+            await pubsub.start()
+            await pubsub.publish(7, {"message": "NEW_ACTIVITY", "activity_id": 1})
+            result = await asyncio.wait_for(received.get(), 1)
+            await pubsub.stop()
+            return result, connections
+
+        result, connections = asyncio.run(run())
+
+        # Assert
+        assert result == (7, {"message": "NEW_ACTIVITY", "activity_id": 1})
+        assert len(connections) == 2
+        assert all(connection.closed for connection in connections)
+
+    def test_oversized_messages_are_delivered_locally(self):
+        """
+        Test that messages exceeding the NOTIFY limit skip Postgres.
+        """
+
+        # Arrange
+        async def run():
+            handler = AsyncMock()
+            connect = AsyncMock()
+            pubsub = websocket_pubsub.PostgresPubSub(
+                handler, "conninfo", connect=connect
+            )
+            message = {"data": "x" * websocket_pubsub.MAX_PAYLOAD_BYTES}
+
+            # Act
+            await pubsub.publish(7, message)
+            return handler, connect, message
+
+        handler, connect, message = asyncio.run(run())
+
+        # Assert
+        handler.assert_awaited_once_with(7, message)
+        connect.assert_not_called()
+
+    def test_invalid_payloads_do_not_stop_the_listener(self):
+        """
+        Test that a malformed payload is logged and the next one delivered.
+        """
+
+        # Arrange
+        async def run():
+            queue = asyncio.Queue()
+            connect, _ = create_connect(queue)
+            received = asyncio.Queue()
+
+            async def handler(user_id, message):
+                await received.put((user_id, message))
+
+            pubsub = websocket_pubsub.PostgresPubSub(
+                handler, "conninfo", connect=connect
+            )
+
+            # Act
+            await pubsub.start()
+            await queue.put("not json")
+            await queue.put(json.dumps({"user_id": 1, "message": {"a": 1}}))
+            result = await asyncio.wait_for(received.get(), 1)
+            await pubsub.stop()
+            return result
+
+        with patch.object(websocket_pubsub.core_logger, "print_to_log") as mock_log:
+            result = asyncio.run(run())
+
+        # Assert
+        assert result == (1, {"a": 1})
+        mock_log.assert_called_once()
+
+
+class TestWebSocketManager:
+    """
+    Test suite for the WebSocket manager publishing.
+    """
+
+    def test_in_process_publish_delivers_to_local_socket(self):
+        """
+        Test that the default backend delivers to sockets of the same worker.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        websocket = AsyncMock()
+        manager.active_connections[3] = {websocket}
+
+        # Act
+        asyncio.run(manager.publish(3, {"message": "hello"}))
+
+        # Assert
+        websocket.send_json.assert_awaited_once_with({"message": "hello"})
+        assert manager.is_reachable(3) is True
+        assert manager.is_reachable(4) is False
+
+    def test_publish_failure_falls_back_to_local_delivery(self):
+        """
+        Test that a failing backend still delivers to local sockets.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        websocket = AsyncMock()
+        manager.active_connections[3] = {websocket}
+        manager.pubsub = MagicMock(distributed=True)
+        manager.pubsub.publish = AsyncMock(side_effect=Exception("connection lost"))
+
+        # Act
+        with patch.object(websocket_schema.core_logger, "print_to_log"):
+            asyncio.run(manager.publish(3, {"message": "hello"}))
+
+        # Assert
+        websocket.send_json.assert_awaited_once_with({"message": "hello"})
+
+    def test_start_falls_back_to_in_process(self):
+        """
+        Test that the manager keeps in-process delivery if LISTEN fails.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+
+        # Act
+        with (
+            patch.object(
+                websocket_schema.core_config, "WEBSOCKET_PUBSUB_BACKEND", "postgres"
+            ),
+            patch.object(
+                websocket_pubsub.PostgresPubSub,
+                "start",
+                AsyncMock(side_effect=Exception("refused")),
+            ),
+            patch.object(websocket_schema.core_logger, "print_to_log_and_console"),
+        ):
+            asyncio.run(manager.start())
+
+        # Assert
+        assert isinstance(manager.pubsub, websocket_pubsub.InProcessPubSub)
+
+
+class TestNotifyFrontend:
+    """
+    Test suite for notify_frontend.
+    """
+
+    def test_mfa_requires_reachable_user(self):
+        """
+        Test that MFA requests fail when the user cannot have a socket.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+
+        # Act & Assert
+        with pytest.raises(HTTPException) as exc_info:
+            asyncio.run(
+                websocket_utils.notify_frontend(
+                    1, manager, {"message": "MFA_REQUIRED", "user_id": 1}
+                )
+            )
+        assert exc_info.value.status_code == 400
+
+    def test_distributed_backend_publishes_without_local_socket(self):
+        """
+        Test that messages are published for sockets held by other workers.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        manager.pubsub = MagicMock(distributed=True)
+        manager.pubsub.publish = AsyncMock()
+
+        # Act
+        asyncio.run(
+            websocket_utils.notify_frontend(
+                1, manager, {"message": "MFA_REQUIRED", "user_id": 1}
+            )
+        )
+
+        # Assert
+        manager.pubsub.publish.assert_awaited_once_with(
+            1, {"message": "MFA_REQUIRED", "user_id": 1}
+        )
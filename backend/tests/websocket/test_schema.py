@@ -0,0 +1,143 @@
+import asyncio
+import time
+from unittest.mock import AsyncMock, patch
+
+import websocket.schema as websocket_schema
+
+
+class TestWebSocketManagerRegistry:
+    """
+    Test suite for the per-user socket registry.
+    """
+
+    def test_users_keep_every_socket(self):
+        """
+        Test that a second tab does not replace the first one.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        first, second = AsyncMock(), AsyncMock()
+
+        # Act
+        asyncio.run(manager.connect(1, first))
+        asyncio.run(manager.connect(1, second))
+
+        # Assert
+        assert manager.get_connections(1) == {first, second}
+        first.accept.assert_awaited_once()
+
+    def test_disconnect_removes_only_that_socket(self):
+        """
+        Test that closing a tab keeps the other sockets of the user.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        first, second = AsyncMock(), AsyncMock()
+        manager.active_connections[1] = {first, second}
+
+        # Act
+        manager.disconnect(1, first)
+        remaining = manager.get_connections(1)
+        manager.disconnect(1, second)
+
+        # Assert
+        assert remaining == {second}
+        assert 1 not in manager.active_connections
+
+
+class TestWebSocketManagerSend:
+    """
+    Test suite for concurrent sends.
+    """
+
+    def test_send_message_reaches_every_socket_concurrently(self):
+        """
+        Test that sockets are sent to at the same time, not one after another.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        websockets = [AsyncMock() for _ in range(5)]
+
+        async def slow_send(message):
+            await asyncio.sleep(0.1)
+
+        for websocket in websockets:
+            websocket.send_json.side_effect = slow_send
+        manager.active_connections[1] = set(websockets)
+
+        # Act
+        started = time.perf_counter()
+        sent = asyncio.run(manager.send_message(1, {"message": "hello"}))
+        elapsed = time.perf_counter() - started
+
+        # Assert
+        assert sent == 5
+        assert elapsed < 0.3
+
+    def test_slow_and_dead_sockets_are_dropped(self):
+        """
+        Test that a stalled or failing socket is dropped without delaying others.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        healthy, slow, dead = AsyncMock(), AsyncMock(), AsyncMock()
+
+        async def never_completes(message):
+            await asyncio.sleep(10)
+
+        slow.send_json.side_effect = never_completes
+        dead.send_json.side_effect = RuntimeError("closed")
+        manager.active_connections[1] = {healthy, slow}
+        manager.active_connections[2] = {dead}
+
+        # Act
+        with (
+            patch.object(websocket_schema, "SEND_TIMEOUT_SECONDS", 0.05),
+            patch.object(websocket_schema.core_logger, "print_to_log"),
+        ):
+            sent = asyncio.run(manager.broadcast({"message": "hello"}))
+
+        # Assert
+        assert sent == 1
+        healthy.send_json.assert_awaited_once_with({"message": "hello"})
+        assert manager.get_connections(1) == {healthy}
+        assert 2 not in manager.active_connections
+        slow.close.assert_awaited_once()
+
+
+class TestWebSocketManagerPublish:
+    """
+    Test suite for publishing from other event loops.
+    """
+
+    async def test_publish_from_another_thread_runs_on_the_owning_loop(self):
+        """
+        Test that a bulk import thread publishes on the loop owning the sockets.
+        """
+        # Arrange
+        manager = websocket_schema.WebSocketManager()
+        with patch.object(
+            websocket_schema.core_config, "WEBSOCKET_PUBSUB_BACKEND", "memory"
+        ):
+            await manager.start()
+        owning_loop = asyncio.get_running_loop()
+        websocket = AsyncMock()
+        manager.active_connections[1] = {websocket}
+        publish_loops = []
+
+        async def failing_publish(user_id, message):
+            publish_loops.append(asyncio.get_running_loop())
+            raise RuntimeError("connection lost")
+
+        # Act
+        with (
+            patch.object(manager.pubsub, "publish", side_effect=failing_publish),
+            patch.object(websocket_schema.core_logger, "print_to_log"),
+        ):
+            await asyncio.to_thread(
+                asyncio.run, manager.publish(1, {"message": "progress"})
+            )
+
+        # Assert
+        assert publish_loops == [owning_loop]
+        websocket.send_json.assert_awaited_once_with({"message": "progress"})
@@ -0,0 +1,84 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from starlette.websockets import WebSocketDisconnect, WebSocketState
+
+import websocket.utils as websocket_utils
+
+
+def create_websocket(messages: list):
+    """
+    Create a WebSocket mock receiving the given messages, None meaning silence.
+    """
+    websocket = MagicMock()
+    websocket.application_state = WebSocketState.CONNECTED
+    websocket.send_json = AsyncMock()
+
+    async def close(code):
+        websocket.application_state = WebSocketState.DISCONNECTED
+
+    websocket.close = AsyncMock(side_effect=close)
+    pending = list(messages)
+
+    async def receive_json():
+        if not pending:
+            raise WebSocketDisconnect()
+        message = pending.pop(0)
+        if message is None:
+            await asyncio.sleep(10)
+        return message
+
+    websocket.receive_json = receive_json
+    return websocket
+
+
+class TestKeepAlive:
+    """
+    Test suite for the WebSocket ping/pong keepalive.
+    """
+
+    def test_silent_client_is_pinged_then_closed(self):
+        """
+        Test that a client that never answers a ping is disconnected.
+        """
+        # Arrange
+        websocket = create_websocket([None, None])
+
+        # Act
+        asyncio.run(websocket_utils.keep_alive(websocket, 0.01, 0.01))
+
+        # Assert
+        websocket.send_json.assert_awaited_once_with({"message": "PING"})
+        websocket.close.assert_awaited_once()
+
+    def test_pong_keeps_connection_open(self):
+        """
+        Test that answering the ping keeps the connection until the client leaves.
+        """
+        # Arrange
+        websocket = create_websocket([None, {"message": "PONG"}, None, {}])
+
+        # Act & Assert
+        try:
+            asyncio.run(websocket_utils.keep_alive(websocket, 0.01, 0.05))
+            raise AssertionError("expected WebSocketDisconnect")
+        except WebSocketDisconnect:
+            pass
+        assert websocket.send_json.await_count == 2
+        websocket.close.assert_not_called()
+
+    def test_client_pings_are_answered(self):
+        """
+        Test that pings from the client get a pong.
+        """
+        # Arrange
+        websocket = create_websocket([{"message": "PING"}])
+
+        # Act
+        try:
+            asyncio.run(websocket_utils.keep_alive(websocket, 1, 1))
+        except WebSocketDisconnect:
+            pass
+
+        # Assert
+        websocket.send_json.assert_awaited_once_with({"message": "PONG"})
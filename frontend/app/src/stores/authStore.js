@@ -158,6 +158,16 @@ export const useAuthStore = defineStore('auth', {
         this.user_websocket.onclose = (event) => {
           console.log('WebSocket connection closed:', event.reason)
         }
+        // Answer the server keepalive pings, components replace onmessage
+        this.user_websocket.addEventListener('message', (event) => {
+          try {
+            if (JSON.parse(event.data)?.message === 'PING') {
+              this.user_websocket.send(JSON.stringify({ message: 'PONG' }))
+            }
+          } catch {
+            // Ignore messages that are not JSON
+          }
+        })
       } catch (error) {
         console.error('Failed to initialize WebSocket:', error)
       }